@@ -16,7 +16,6 @@ import hashlib
 import json
 import logging
 import os
-import tempfile
 import time
 import traceback
 from datetime import datetime
@@ -24,10 +23,15 @@ from typing import Any, Optional
 from pathlib import Path
 from urllib.parse import urlencode
 
-import pandas as pd
-import pyreadr
 import requests
 
+from lazy_imports import lazy_module
+
+# pandas/pyreadr load on first use so the web process can import the AFL
+# routes without paying for them (see lazy_imports.py).
+pd = lazy_module("pandas")
+pyreadr = lazy_module("pyreadr")
+
 logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────
@@ -35,6 +39,11 @@ logger = logging.getLogger(__name__)
 # ─────────────────────────────────────────────
 
 FRYZIGG_RDS_URL = "http://www.fryziggafl.net/static/fryziggafl.rds"
+# Persistent Fryzigg cache: raw RDS + revalidation metadata + Feather copy of
+# the parsed frame.  Survives cron containers when data/ is a mounted volume.
+FRYZIGG_CACHE_DIR = Path(os.environ.get("FRYZIGG_CACHE_DIR", "data/cache/fryzigg"))
+FRYZIGG_CACHE_RDS_PATH = FRYZIGG_CACHE_DIR / "fryziggafl.rds"
+FRYZIGG_CACHE_META_PATH = FRYZIGG_CACHE_DIR / "fryziggafl.meta.json"
 
 SQUIGGLE_BASE = "https://api.squiggle.com.au"
 AFLTABLES_BASE = "https://afltables.com/afl"
@@ -1204,8 +1213,129 @@ def _build_afl_current_row(row: pd.Series, details: dict, season: int, match_id:
 # FRYZIGG DATA (historical path)
 # ─────────────────────────────────────────────
 
+def _fryzigg_read_cache_meta() -> dict:
+    try:
+        return json.loads(FRYZIGG_CACHE_META_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _fryzigg_write_cache_meta(meta: dict) -> None:
+    tmp_path = FRYZIGG_CACHE_META_PATH.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(meta, indent=2, sort_keys=True))
+    os.replace(tmp_path, FRYZIGG_CACHE_META_PATH)
+
+
+def _fryzigg_columnar_path(sha256: str) -> Path:
+    return FRYZIGG_CACHE_DIR / f"fryzigg_{sha256[:16]}.feather"
+
+
+def _fryzigg_revalidate_rds(meta: dict) -> tuple[dict, bool]:
+    """
+    Conditionally GET the Fryzigg RDS into the on-disk cache.
+
+    Sends If-None-Match / If-Modified-Since from the cached metadata and
+    streams a changed body straight to disk while hashing it.  Returns the
+    (possibly updated) metadata and whether the file changed.
+    """
+    headers = {"User-Agent": HEADERS["User-Agent"]}
+    have_rds = FRYZIGG_CACHE_RDS_PATH.exists() and meta.get("sha256")
+    if have_rds and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if have_rds and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    started = time.perf_counter()
+    response = requests.get(FRYZIGG_RDS_URL, headers=headers, timeout=120, stream=True)
+    try:
+        if response.status_code == 304 and have_rds:
+            logger.info(
+                "Fryzigg: RDS not modified (sha256=%s) — revalidated in %.2fs",
+                meta["sha256"][:16], time.perf_counter() - started,
+            )
+            return meta, False
+        response.raise_for_status()
+
+        digest = hashlib.sha256()
+        size = 0
+        tmp_path = FRYZIGG_CACHE_RDS_PATH.with_suffix(".rds.part")
+        with open(tmp_path, "wb") as fh:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                if not chunk:
+                    continue
+                fh.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        os.replace(tmp_path, FRYZIGG_CACHE_RDS_PATH)
+    finally:
+        response.close()
+
+    sha256 = digest.hexdigest()
+    changed = sha256 != meta.get("sha256")
+    meta = {
+        "sha256": sha256,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "size_bytes": size,
+        "downloaded_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+    }
+    logger.info(
+        "Fryzigg: downloaded %.1f MB in %.2fs (sha256=%s changed=%s)",
+        size / 1e6, time.perf_counter() - started, sha256[:16], changed,
+    )
+    return meta, changed
+
+
+def _fryzigg_load_columnar(sha256: str) -> Optional[pd.DataFrame]:
+    """Memory-map the Feather copy of a parsed RDS, or None when unavailable."""
+    path = _fryzigg_columnar_path(sha256)
+    if not path.exists():
+        return None
+    started = time.perf_counter()
+    try:
+        from pyarrow import feather
+        df = feather.read_table(path, memory_map=True).to_pandas()
+    except Exception as exc:
+        logger.warning("Fryzigg: columnar cache %s unreadable (%s) — re-parsing RDS", path.name, exc)
+        return None
+    logger.info(
+        "Fryzigg: loaded columnar cache %s (%s rows) in %.2fs",
+        path.name, len(df), time.perf_counter() - started,
+    )
+    return df
+
+
+def _fryzigg_store_columnar(df: pd.DataFrame, sha256: str) -> None:
+    """Write an uncompressed Feather copy keyed by file hash; prune older copies."""
+    path = _fryzigg_columnar_path(sha256)
+    started = time.perf_counter()
+    try:
+        from pyarrow import feather
+        tmp_path = path.with_suffix(".feather.part")
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    except Exception as exc:
+        logger.warning("Fryzigg: could not write columnar cache (%s) — next run re-parses RDS", exc)
+        return
+    for stale in FRYZIGG_CACHE_DIR.glob("fryzigg_*.feather"):
+        if stale != path:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+    logger.info("Fryzigg: wrote columnar cache %s in %.2fs", path.name, time.perf_counter() - started)
+
+
 def _download_fryzigg_rds() -> pd.DataFrame:
-    """Download and cache Fryzigg RDS as DataFrame."""
+    """
+    Load the Fryzigg RDS as a DataFrame via the on-disk cache.
+
+    The raw file lives under FRYZIGG_CACHE_DIR and is revalidated with
+    ETag/Last-Modified on each new process.  The parsed frame is kept as an
+    uncompressed Feather file keyed by the RDS sha256, so unchanged files are
+    memory-mapped instead of going through pyreadr again.  If revalidation
+    fails, the last cached copy is used.
+    """
     if not os.environ.get("AFL_CRON_MODE"):
         # Allow in local dev or when explicitly permitted
         if not (
@@ -1223,16 +1353,24 @@ def _download_fryzigg_rds() -> pd.DataFrame:
         logger.info("Fryzigg: using cached DataFrame (%s rows)", len(_FRYZIGG_CACHE["df"]))
         return _FRYZIGG_CACHE["df"]
 
-    logger.info("Fryzigg: downloading %s ...", FRYZIGG_RDS_URL)
-    response = requests.get(FRYZIGG_RDS_URL, timeout=120)
-    response.raise_for_status()
+    FRYZIGG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    meta = _fryzigg_read_cache_meta()
+    logger.info("Fryzigg: revalidating %s ...", FRYZIGG_RDS_URL)
+    try:
+        meta, changed = _fryzigg_revalidate_rds(meta)
+        _fryzigg_write_cache_meta(meta)
+    except requests.RequestException as exc:
+        if not (FRYZIGG_CACHE_RDS_PATH.exists() and meta.get("sha256")):
+            raise
+        logger.warning("Fryzigg: revalidation failed (%s) — using cached sha256=%s", exc, meta["sha256"][:16])
+        changed = False
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".rds") as tmp:
-        tmp.write(response.content)
-        tmp_path = tmp.name
+    sha256 = meta["sha256"]
+    df = None if changed else _fryzigg_load_columnar(sha256)
 
-    try:
-        result = pyreadr.read_r(tmp_path)
+    if df is None:
+        started = time.perf_counter()
+        result = pyreadr.read_r(str(FRYZIGG_CACHE_RDS_PATH))
         if not result:
             raise ValueError("No objects found in Fryzigg RDS")
 
@@ -1241,16 +1379,14 @@ def _download_fryzigg_rds() -> pd.DataFrame:
             raise ValueError("Fryzigg RDS loaded but DataFrame is empty")
 
         df.columns = [str(col).strip().lower() for col in df.columns]
-        _FRYZIGG_CACHE["df"] = df
-        _FRYZIGG_CACHE["loaded"] = True
+        logger.info("Fryzigg: parsed RDS in %.2fs", time.perf_counter() - started)
+        _fryzigg_store_columnar(df, sha256)
 
-        logger.info("Fryzigg: loaded %s rows, %s columns", len(df), len(df.columns))
-        return df
-    finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
+    _FRYZIGG_CACHE["df"] = df
+    _FRYZIGG_CACHE["loaded"] = True
+
+    logger.info("Fryzigg: loaded %s rows, %s columns", len(df), len(df.columns))
+    return df
 
 
 def _fetch_fryzigg_player_stats_from_rds(season: int) -> list[dict]:
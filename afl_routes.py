@@ -32,6 +32,7 @@ from flask_login import login_required
 # Simple in-memory cache for player headshot images: str(photo_id) -> (bytes, mime) | None
 _headshot_cache: dict[str, tuple[bytes, str] | None] = {}
 _fantasy_player_id_cache: dict[str, int] = {}
+_fantasy_preload_state = {"done": False}
 _HEADSHOT_CACHE_MAX = 2000
 
 from afl_data import (
@@ -2908,6 +2909,8 @@ def register_afl_routes(app, db):
 def _fantasy_photo_id_from_name(first_name: str, last_name: str) -> "int | None":
     """Look up the AFL Fantasy photo id for a player by name."""
     key = f"{first_name.strip().lower()}|{last_name.strip().lower()}"
+    if not _fantasy_preload_state["done"]:
+        _preload_fantasy_ids()
     if key in _fantasy_player_id_cache:
         return _fantasy_player_id_cache[key]
     try:
@@ -4180,7 +4183,8 @@ def _format_game_log_row(game: dict, player_team: str) -> dict:
     }
 
 def _preload_fantasy_ids():
-    """Fetch all Fantasy player IDs once at startup and cache them."""
+    """Fetch all Fantasy player IDs once and cache them (first lookup, not import)."""
+    _fantasy_preload_state["done"] = True
     try:
         resp = _requests.get(
             "https://fantasy.afl.com.au/data/afl/players.json",
@@ -4201,8 +4205,6 @@ def _preload_fantasy_ids():
     except Exception as e:
         logger.warning("Fantasy ID preload failed: %s", e)
 
-_preload_fantasy_ids()
-
 def _merge_fixture_tips(db, fixtures: list[dict], year: int, round_number: int | None = None) -> list[dict]:
     if not fixtures:
         return []
@@ -6,20 +6,26 @@ import subprocess
 import csv
 import io
 import math
+from functools import lru_cache
 from flask import Flask, render_template, redirect, url_for, request, flash, jsonify, session
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash
 from datetime import datetime, date
+from types import SimpleNamespace
+import threading
 import requests
-import tweepy
-from anthropic import Anthropic
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from sqlalchemy import text, bindparam, inspect as sa_inspect
 import uuid
 
-from models import db, User, Meeting, Race, Horse, Prediction, Result, ChatMessage, Component, StrikeRate, Bet
-from puntingform_service import PuntingFormService
+from models import db, User, Meeting, MeetingRunner, Race, Horse, Prediction, Result, ChatMessage, Component, StrikeRate, Bet, ImportJob, BestBetCandidate
+from puntingform_service import PuntingFormAPIError, PuntingFormService, fetch_concurrently
+from import_jobs import ImportJobError, ImportJobQueue, import_job_payload
+from results_settlement import settle_meetings
+from strike_rate_matching import (
+    build_strike_rate_lookup, load_strike_rate_aliases, save_strike_rate_aliases, strike_rate_resolver,
+)
 from scratchings import compute_is_scratched_final, extract_debug_scratch_fields, resolve_official_scratched_set
 from ladbrokes import match_race_uuid, match_race_info, fetch_race_odds, build_next_to_go_races, MELBOURNE_TZ, ODDS_CACHE_TTL
 from afl_routes import register_afl_routes, afl_nightly_sync
@@ -159,8 +165,10 @@ def _rank_active_ladbrokes_market(odds_payload, internal_horses):
     return matched, {'available': True, 'diagnostics': diagnostics, 'fetched_at': (odds_payload or {}).get('fetched_at')}
 
 
-def evaluate_ladbrokes_best_bet_signals(race, meeting, odds_payload, race_match_info=None):
-    """Return per-horse live Ladbrokes Best Bets fields; never uses results.sp/post-race prices."""
+def best_bet_model_ranks(race):
+    """Odds-independent half of the Best Bets Ladbrokes signals, per horse id:
+    Analyzer/PFAI/ML rank, ml_score, the ML top-two gap (on the ML top pick
+    only) and the ML fair win probability in percent."""
     horses = list(getattr(race, 'horses', []) or [])
     active_with_pred = [h for h in horses if not getattr(h, 'is_scratched', False) and getattr(h, 'prediction', None)]
     analyzer_ranked = sorted(active_with_pred, key=lambda h: (h.prediction.score or 0), reverse=True)
@@ -170,20 +178,38 @@ def evaluate_ladbrokes_best_bet_signals(race, meeting, odds_payload, race_match_
     pfai_rank = {h.id: i + 1 for i, h in enumerate(pfai_ranked)}
     ml_rank = {h.id: i + 1 for i, h in enumerate(ml_ranked)}
     ml_gap = (ml_ranked[0].prediction.ml_score - ml_ranked[1].prediction.ml_score) if len(ml_ranked) > 1 else None
-    market, market_state = _rank_active_ladbrokes_market(odds_payload, horses)
     # ML-only fair win probability book (normalised ml_score share of the race),
-    # used solely to compute each horse's Value Edge over the live market below.
-    # Independent of the qualitative sweet-spot/consensus/gap badges above —
-    # never added to `badges`/`cnt` so it can't change their combination logic.
+    # used solely to compute each horse's Value Edge over the live market.
     ml_book = _derive_ml_race_book(
         horses,
         lambda h: None if getattr(h, 'is_scratched', False) or not getattr(h, 'prediction', None) else h.prediction.ml_score,
     )
-    out = {}
+    ranks = {}
     for idx, h in enumerate(horses):
-        m = market.get(h.id, {})
-        is_ml_top_fav = ml_rank.get(h.id) == 1 and m.get('is_favourite') and market_state.get('available')
-        full = analyzer_rank.get(h.id) == pfai_rank.get(h.id) == ml_rank.get(h.id) == 1 and m.get('is_favourite') and market_state.get('available')
+        book_entry = ml_book.get(idx)
+        ranks[h.id] = {
+            'analyzer_rank': analyzer_rank.get(h.id), 'pfai_rank': pfai_rank.get(h.id), 'ml_rank': ml_rank.get(h.id),
+            'ml_score': h.prediction.ml_score if getattr(h, 'prediction', None) else None,
+            'ml_score_gap': ml_gap if ml_rank.get(h.id) == 1 else None,
+            'ml_fair_probability_pct': round(book_entry['ml_fair_probability'] * 100.0, 2) if book_entry else None,
+        }
+    return ranks
+
+
+def apply_ladbrokes_signals(ranks, horses, odds_payload):
+    """Live half: overlay a Ladbrokes market on best_bet_model_ranks output.
+
+    ``horses`` is the race's whole field (id, horse_name, is_scratched), which
+    the market is matched and ranked against; fields are returned for the
+    horse ids in ``ranks`` only.
+    """
+    market, market_state = _rank_active_ladbrokes_market(odds_payload, horses)
+    out = {}
+    for horse_id, r in ranks.items():
+        m = market.get(horse_id, {})
+        ml_gap = r.get('ml_score_gap')
+        is_ml_top_fav = r.get('ml_rank') == 1 and m.get('is_favourite') and market_state.get('available')
+        full = r.get('analyzer_rank') == r.get('pfai_rank') == r.get('ml_rank') == 1 and m.get('is_favourite') and market_state.get('available')
         sweet = bool(is_ml_top_fav and m.get('price') is not None and 2.50 <= m.get('price') <= 3.99)
         gap20 = bool(is_ml_top_fav and ml_gap is not None and ml_gap >= 20)
         badges=[]; reasons=[]
@@ -196,9 +222,10 @@ def evaluate_ladbrokes_best_bet_signals(race, meeting, odds_payload, race_match_
         cnt=len(badges)
 
         # ── Value Edge: model fair win probability minus market-implied probability ──
-        book_entry = ml_book.get(idx)
+        # Independent of the qualitative sweet-spot/consensus/gap badges above —
+        # never added to `badges`/`cnt` so it can't change their combination logic.
         market_implied_pct = (100.0 / m.get('price')) if (market_state.get('available') and m.get('price')) else None
-        ml_fair_probability_pct = round(book_entry['ml_fair_probability'] * 100.0, 2) if book_entry else None
+        ml_fair_probability_pct = r.get('ml_fair_probability_pct')
         value_edge_pct = (
             round(ml_fair_probability_pct - market_implied_pct, 2)
             if ml_fair_probability_pct is not None and market_implied_pct is not None else None
@@ -208,12 +235,12 @@ def evaluate_ladbrokes_best_bet_signals(race, meeting, odds_payload, race_match_
         if is_value_edge_promoted:
             badges.append(f'💎 ML Value Edge +{value_edge_pct:.1f}pp'); reasons.append(f"Qualified because the model's fair win probability clears the market by {value_edge_pct:.1f} percentage points.")
 
-        out[h.id]={
+        out[horse_id]={
             'ladbrokes_fixed_win_price': m.get('price'), 'ladbrokes_market_rank': m.get('market_rank'),
             'is_ladbrokes_favourite': bool(m.get('is_favourite')), 'is_joint_ladbrokes_favourite': bool(m.get('is_joint_favourite')),
             'ladbrokes_odds_updated_at': market_state.get('fetched_at') or (odds_payload or {}).get('fetched_at'),
-            'analyzer_rank': analyzer_rank.get(h.id), 'pfai_rank': pfai_rank.get(h.id), 'ml_rank': ml_rank.get(h.id),
-            'ml_score': h.prediction.ml_score if getattr(h, 'prediction', None) else None, 'ml_score_gap': ml_gap if ml_rank.get(h.id)==1 else None,
+            'analyzer_rank': r.get('analyzer_rank'), 'pfai_rank': r.get('pfai_rank'), 'ml_rank': r.get('ml_rank'),
+            'ml_score': r.get('ml_score'), 'ml_score_gap': ml_gap,
             'is_ml_market_sweet_spot': sweet, 'is_full_model_market_consensus': full, 'is_ml_market_gap_20': gap20,
             'best_bet_signal_count': cnt,
             'best_bet_confidence_level': 'Elite Consensus Best Bet' if cnt==3 else ('Strong Consensus Best Bet' if cnt==2 else (badges[0] if cnt==1 else None)),
@@ -227,6 +254,240 @@ def evaluate_ladbrokes_best_bet_signals(race, meeting, odds_payload, race_match_
         }
     return out
 
+
+def evaluate_ladbrokes_best_bet_signals(race, meeting, odds_payload, race_match_info=None):
+    """Return per-horse live Ladbrokes Best Bets fields; never uses results.sp/post-race prices."""
+    return apply_ladbrokes_signals(best_bet_model_ranks(race), list(getattr(race, 'horses', []) or []), odds_payload)
+
+
+# ── Best Bets candidates ─────────────────────────────────────────────────────
+# Why a runner is a best_bet_candidates row (reason_mask bits). The first four
+# are the page's own qualifying reasons; the last two only mark runners that
+# could qualify once live Ladbrokes odds are overlaid.
+BEST_BET_REASON_COMPONENTS = 1        # an active component matched in the notes
+BEST_BET_REASON_HIGH_CONFIDENCE = 2   # Analyzer win probability >= 80%
+BEST_BET_REASON_JOCKEY_SOLE_RIDE = 4  # the jockey's only ride at the meeting
+BEST_BET_REASON_SIGNAL_AGREEMENT = 8  # Analyzer, PFAI and ML top picks agree
+BEST_BET_REASON_ML_TOP_PICK = 16      # ML top pick: can earn a Ladbrokes signal
+BEST_BET_REASON_VALUE_EDGE = 32       # ML fair probability above VALUE_EDGE_MIN_THRESHOLD_PCT
+BEST_BET_REASON_LABELS = {
+    BEST_BET_REASON_COMPONENTS: 'components',
+    BEST_BET_REASON_HIGH_CONFIDENCE: 'high_confidence',
+    BEST_BET_REASON_JOCKEY_SOLE_RIDE: 'jockey_sole_ride',
+    BEST_BET_REASON_SIGNAL_AGREEMENT: 'signal_agreement',
+    BEST_BET_REASON_ML_TOP_PICK: 'ml_top_pick',
+    BEST_BET_REASON_VALUE_EDGE: 'value_edge',
+}
+BEST_BET_RANK_FIELDS = ('analyzer_rank', 'pfai_rank', 'ml_rank', 'ml_score', 'ml_score_gap', 'ml_fair_probability_pct')
+# pg_advisory_xact_lock class key; the second key is the meeting id, so two
+# writers rebuilding the same meeting run one after the other.
+BEST_BET_CANDIDATES_LOCK = 0x0BE57BE7
+# Meetings uploaded within this many hours are recomputed in the request that
+# changes the active components; older ones are left to the release step or
+# scripts/backfill_best_bet_candidates.py.
+BEST_BET_COMPONENT_RECOMPUTE_HOURS = int(os.environ.get('BEST_BET_COMPONENT_RECOMPUTE_HOURS', '168'))
+
+
+def _parse_win_probability_pct(value):
+    try:
+        return float(str(value or '0').replace('%', '').strip())
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _best_bet_meeting_races(meeting_id):
+    """A meeting's races, runners and predictions from one query, as the
+    race.horses[i].prediction namespaces the Best Bets signal helpers read."""
+    rows = (
+        db.session.query(
+            Race.id, Horse.id, Horse.horse_name, Horse.jockey, Horse.is_scratched, Horse.csv_data,
+            Prediction.id, Prediction.score, Prediction.ml_score, Prediction.win_probability, Prediction.notes,
+        )
+        .join(Horse, Horse.race_id == Race.id)
+        .outerjoin(Prediction, Prediction.horse_id == Horse.id)
+        .filter(Race.meeting_id == meeting_id)
+        .order_by(Race.id, Horse.id)
+        .all()
+    )
+    races = {}
+    for (race_id, horse_id, horse_name, jockey, is_scratched, csv_data,
+         prediction_id, score, ml_score, win_probability, notes) in rows:
+        prediction = None
+        if prediction_id is not None:
+            prediction = SimpleNamespace(score=score, ml_score=ml_score, win_probability=win_probability, notes=notes)
+        races.setdefault(race_id, []).append(SimpleNamespace(
+            id=horse_id, horse_name=horse_name, jockey=jockey, is_scratched=bool(is_scratched),
+            csv_data=csv_data, prediction=prediction,
+        ))
+    return [SimpleNamespace(id=race_id, horses=horses) for race_id, horses in races.items()]
+
+
+def best_bet_candidate_rows(meeting_id, races, components_by_key, computed_at=None):
+    """best_bet_candidates mappings for one meeting's ``races``: every active,
+    priced runner with at least one BEST_BET_REASON_* bit."""
+    computed_at = computed_at or datetime.utcnow()
+    jockey_ride_counts = {}
+    for race in races:
+        for h in race.horses:
+            if h.jockey:
+                jockey_ride_counts[h.jockey] = jockey_ride_counts.get(h.jockey, 0) + 1
+
+    rows = []
+    for race in races:
+        signal_top_ids = top_signal_horse_ids(race.horses)
+        ranks = best_bet_model_ranks(race)
+        horses_in_race = [h for h in race.horses if h.prediction and not h.is_scratched]
+        horses_in_race.sort(key=lambda h: h.prediction.score, reverse=True)
+        if not horses_in_race:
+            continue
+        top_score = horses_in_race[0].prediction.score
+        second_score = horses_in_race[1].prediction.score if len(horses_in_race) > 1 else 0
+
+        for rank_idx, horse in enumerate(horses_in_race):
+            is_top_pick = rank_idx == 0
+            score_gap = (top_score - second_score) if is_top_pick else (
+                horses_in_race[rank_idx - 1].prediction.score - horse.prediction.score
+            )
+            win_probability_pct = _parse_win_probability_pct(horse.prediction.win_probability)
+            component_keys = [
+                match['key'] for match in parse_notes_component_matches(horse.prediction.notes).values()
+                if match['key'] in components_by_key
+            ]
+            horse_ranks = ranks.get(horse.id, {})
+
+            reason_mask = 0
+            if component_keys:
+                reason_mask |= BEST_BET_REASON_COMPONENTS
+            if win_probability_pct >= 80:
+                reason_mask |= BEST_BET_REASON_HIGH_CONFIDENCE
+            if jockey_ride_counts.get(horse.jockey or '', 0) == 1:
+                reason_mask |= BEST_BET_REASON_JOCKEY_SOLE_RIDE
+            if signals_all_agree_top(horse.id, signal_top_ids):
+                reason_mask |= BEST_BET_REASON_SIGNAL_AGREEMENT
+            if horse_ranks.get('ml_rank') == 1:
+                reason_mask |= BEST_BET_REASON_ML_TOP_PICK
+            # Value edge = fair probability - 100/price, so it can only reach
+            # the threshold when the fair probability alone is above it.
+            if (horse_ranks.get('ml_fair_probability_pct') or 0) > VALUE_EDGE_MIN_THRESHOLD_PCT:
+                reason_mask |= BEST_BET_REASON_VALUE_EDGE
+            if not reason_mask:
+                continue
+
+            rows.append({
+                'meeting_id': meeting_id,
+                'race_id': race.id,
+                'horse_id': horse.id,
+                'rank_in_race': rank_idx + 1,
+                'is_top_pick': is_top_pick,
+                'score': horse.prediction.score,
+                'score_gap': score_gap,
+                'win_probability_pct': win_probability_pct,
+                'reason_mask': reason_mask,
+                'reasons': [label for bit, label in BEST_BET_REASON_LABELS.items() if reason_mask & bit],
+                'component_keys': component_keys,
+                **{field: horse_ranks.get(field) for field in BEST_BET_RANK_FIELDS},
+                'computed_at': computed_at,
+            })
+    return rows
+
+
+def refresh_best_bet_candidates(meeting_ids, components_by_key=None):
+    """Rebuild best_bet_candidates for ``meeting_ids`` and stamp their
+    best_bets_computed_at.
+
+    Called when a meeting is imported, ML-scored, its scratchings or pace
+    bias reprice it, or a runner is scratched by hand. Runs in the caller's
+    transaction; the caller commits. On PostgreSQL each meeting is locked for
+    the rest of that transaction first, so concurrent rebuilds of one meeting
+    never collide on the unique horse_id. Returns the number of candidate rows
+    written.
+    """
+    meeting_ids = sorted(set(meeting_ids))
+    if not meeting_ids:
+        return 0
+    if db.session.get_bind().dialect.name == 'postgresql':
+        for meeting_id in meeting_ids:
+            db.session.execute(
+                text('SELECT pg_advisory_xact_lock(:key, :meeting_id)'),
+                {'key': BEST_BET_CANDIDATES_LOCK, 'meeting_id': meeting_id},
+            )
+    if components_by_key is None:
+        components_by_key = build_active_component_lookup(Component.query.filter_by(is_active=True).all())
+    computed_at = datetime.utcnow()
+    rows = []
+    for meeting_id in meeting_ids:
+        rows.extend(best_bet_candidate_rows(meeting_id, _best_bet_meeting_races(meeting_id), components_by_key, computed_at))
+
+    BestBetCandidate.query.filter(BestBetCandidate.meeting_id.in_(meeting_ids)).delete(synchronize_session=False)
+    if rows:
+        db.session.bulk_insert_mappings(BestBetCandidate, rows)
+    Meeting.query.filter(Meeting.id.in_(meeting_ids)).update(
+        {Meeting.best_bets_computed_at: computed_at}, synchronize_session=False,
+    )
+    return len(rows)
+
+
+def invalidate_best_bet_candidates(meeting_ids=None):
+    """Clear best_bets_computed_at for these meetings (every meeting when
+    None) so the next backfill_best_bet_candidates recomputes them."""
+    query = Meeting.query.filter(Meeting.best_bets_computed_at.isnot(None))
+    if meeting_ids is not None:
+        query = query.filter(Meeting.id.in_(list(meeting_ids)))
+    return query.update({Meeting.best_bets_computed_at: None}, synchronize_session=False)
+
+
+def backfill_best_bet_candidates(since=None, batch_size=100, rebuild=False):
+    """Compute candidates for every meeting (uploaded since ``since``) whose
+    best_bets_computed_at is NULL (all of them with rebuild).
+
+    Run by the release step and scripts/backfill_best_bet_candidates.py for
+    meetings imported before the table existed, and after component changes.
+    The Best Bets page only reads the table. Commits once per batch and
+    returns the number of meetings computed.
+    """
+    query = db.session.query(Meeting.id).order_by(Meeting.id)
+    if since is not None:
+        query = query.filter(Meeting.uploaded_at >= since)
+    if not rebuild:
+        query = query.filter(Meeting.best_bets_computed_at.is_(None))
+    meeting_ids = [meeting_id for (meeting_id,) in query.all()]
+    if not meeting_ids:
+        return 0
+
+    components_by_key = build_active_component_lookup(Component.query.filter_by(is_active=True).all())
+    candidates = 0
+    for start in range(0, len(meeting_ids), batch_size):
+        candidates += refresh_best_bet_candidates(meeting_ids[start:start + batch_size], components_by_key)
+        db.session.commit()
+        logger.info(
+            "BEST_BET_CANDIDATES_BACKFILL meetings=%s/%s candidates=%s",
+            min(start + batch_size, len(meeting_ids)), len(meeting_ids), candidates
+        )
+    return len(meeting_ids)
+
+
+def recompute_best_bet_candidates_for_components():
+    """After the active components change: commit the change with every
+    meeting marked stale, then recompute the last
+    BEST_BET_COMPONENT_RECOMPUTE_HOURS of meetings. Returns how many were
+    recomputed."""
+    from datetime import timedelta
+
+    invalidate_best_bet_candidates()
+    db.session.commit()
+    since = datetime.utcnow() - timedelta(hours=BEST_BET_COMPONENT_RECOMPUTE_HOURS)
+    return backfill_best_bet_candidates(since=since)
+
+
+def pending_best_bet_meeting_count(since=None):
+    """Meetings (uploaded since ``since``) whose candidates have not been computed yet."""
+    from sqlalchemy import func
+
+    query = db.session.query(func.count(Meeting.id)).filter(Meeting.best_bets_computed_at.is_(None))
+    if since is not None:
+        query = query.filter(Meeting.uploaded_at >= since)
+    return query.scalar() or 0
+
 def _ml_performance_meeting_name_sql(alias='m'):
     """Temporary SQL fragment for verified ML performance meetings."""
     return f"LEFT({alias}.meeting_name, 6) >= '{ML_PERFORMANCE_MEETING_NAME_CUTOFF}'"
@@ -282,8 +543,38 @@ def rebuildCSV(rows):
 
 app = Flask(__name__)
 
-# Initialize Claude API client
-client = Anthropic(api_key=os.environ.get('ANTHROPIC_API_KEY'))
+
+class LazyClient:
+    """Build an API client on first attribute access, not at import time.
+
+    Importing app.py runs in every gunicorn worker; constructing clients there
+    paid for their imports and validation even on workers that never use
+    them. Attribute access is forwarded to the built instance.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+def _build_anthropic_client():
+    from anthropic import Anthropic
+    return Anthropic(api_key=os.environ.get('ANTHROPIC_API_KEY'))
+
+
+# Claude API client
+client = LazyClient(_build_anthropic_client)
 
 # Initialize rate limiter
 limiter = Limiter(
@@ -319,37 +610,91 @@ TWITTER_API_SECRET = os.environ.get('TWITTER_API_SECRET')
 TWITTER_ACCESS_TOKEN = os.environ.get('TWITTER_ACCESS_TOKEN')
 TWITTER_ACCESS_TOKEN_SECRET = os.environ.get('TWITTER_ACCESS_TOKEN_SECRET')
 
-# Initialize Twitter client
-twitter_client = None
-if all([TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET]):
-    try:
-        twitter_client = tweepy.Client(
-            consumer_key=TWITTER_API_KEY,
-            consumer_secret=TWITTER_API_SECRET,
-            access_token=TWITTER_ACCESS_TOKEN,
-            access_token_secret=TWITTER_ACCESS_TOKEN_SECRET
-        )
-        print("✓ Twitter client initialized successfully")
-    except Exception as e:
-        print(f"✗ Failed to initialize Twitter client: {e}")
-        twitter_client = None
+_twitter_client = {'built': False, 'client': None}
+_twitter_client_lock = threading.Lock()
+
+
+def get_twitter_client():
+    """Twitter client, built on first use; None when credentials are missing."""
+    if not _twitter_client['built']:
+        with _twitter_client_lock:
+            if not _twitter_client['built']:
+                if all([TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET]):
+                    try:
+                        import tweepy
+                        _twitter_client['client'] = tweepy.Client(
+                            consumer_key=TWITTER_API_KEY,
+                            consumer_secret=TWITTER_API_SECRET,
+                            access_token=TWITTER_ACCESS_TOKEN,
+                            access_token_secret=TWITTER_ACCESS_TOKEN_SECRET
+                        )
+                        logger.info("✓ Twitter client initialized successfully")
+                    except Exception as e:
+                        logger.error(f"✗ Failed to initialize Twitter client: {e}")
+                _twitter_client['built'] = True
+    return _twitter_client['client']
 
 # Initialize extensions
 db.init_app(app)
+# Schema changes live in migrations/versions and run from scripts/release.py
+# (release_tasks.py), never at import time. Flask-Migrate pulls in alembic, so
+# it is only attached for `flask db ...`; the release step attaches it itself.
+if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+    from release_tasks import init_migrate
+    init_migrate(app)
 
-# Initialize PuntingForm API service
-pf_service = PuntingFormService()
+# PuntingForm API service; the API key is checked on first use.
+pf_service = LazyClient(PuntingFormService)
 
 login_manager = LoginManager()
 login_manager.login_view = "login"
 login_manager.init_app(app)
 
 register_afl_routes(app, db)
-print([r.rule for r in app.url_map.iter_rules() if 'headshot' in r.rule])
 register_mma_routes(app, db)
 register_ml_shadow_routes(app, db)
 register_bet_tracker_routes(app, db)
 register_budget_tracker_routes(app, db)
+
+# ----- Web process roles -----
+# Route handlers import pandas/numpy/pyreadr/ml_predict on first use
+# (lazy_imports.py), so a worker that only serves pages never loads them.
+# WEB_PROCESS_ROLE splits the two kinds of traffic across processes:
+#   all   (default) one process serves everything
+#   pages gevent page workers; heavy API hits are logged as misrouted
+#   api   threaded workers for the CPU-bound ML/AFL/MMA APIs, with the heavy
+#         modules imported up front so --preload shares them across forks
+# The proxy in front routes HEAVY_ROUTE_PREFIXES to the `api` process.
+WEB_PROCESS_ROLE = os.environ.get('WEB_PROCESS_ROLE', 'all').strip().lower() or 'all'
+HEAVY_ROUTE_PREFIXES = (
+    '/api/afl', '/api/mma', '/api/ml-data', '/api/ml-shadow', '/api/data', '/backtest',
+)
+HEAVY_MODULES = ('numpy', 'pandas', 'pyreadr', 'ml_predict', 'mma_data', 'combination_engine')
+
+
+def warm_heavy_modules(modules=HEAVY_MODULES):
+    """Import the modules the heavy routes defer; returns the ones that loaded."""
+    import importlib
+
+    loaded = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except Exception as e:
+            logger.warning("WARM_IMPORT_FAILED module=%s error=%s", name, e)
+    logger.info("WARM_IMPORTS role=%s modules=%s", WEB_PROCESS_ROLE, ','.join(loaded))
+    return loaded
+
+
+if WEB_PROCESS_ROLE == 'api':
+    warm_heavy_modules()
+elif WEB_PROCESS_ROLE == 'pages':
+    @app.before_request
+    def _log_misrouted_heavy_request():
+        if request.path.startswith(HEAVY_ROUTE_PREFIXES):
+            logger.warning("HEAVY_ROUTE_ON_PAGES_WORKER path=%s", request.path)
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -367,328 +712,88 @@ def shutdown_session(exception=None):
     import gc
     gc.collect()
 
-# Create tables and default admin user
-with app.app_context():
-    db.create_all()
-    try:
-        from ml_predict import NoActiveChampionError, active_production_model_metadata
-        try:
-            active_production_model_metadata(emit_log=True)
-        except NoActiveChampionError as e:
-            # Startup with no champion is a supported state, not a boot
-            # failure: the app serves everything else and simply shows no ML
-            # picks until a model earns promotion.
-            logger.warning("ML_ACTIVE_PRODUCTION_MODEL_AUDIT no_active_champion=True — no ML picks will be generated: %s", e)
-    except Exception as e:
-        logger.warning("ML_ACTIVE_PRODUCTION_MODEL_AUDIT unavailable during startup: %s", e)
-    
-    # Migration: Add PuntingForm integration columns
-    try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        meetings_columns = [col['name'] for col in inspector.get_columns('meetings')]
-        
-        if 'puntingform_id' not in meetings_columns:
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE meetings ADD COLUMN puntingform_id VARCHAR(255)'))
-                conn.commit()
-            print("✓ Added puntingform_id column to meetings table")
-            
-        if 'auto_imported' not in meetings_columns:
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE meetings ADD COLUMN auto_imported BOOLEAN DEFAULT FALSE'))
-                conn.commit()
-            print("✓ Added auto_imported column to meetings table")
-            
-    except Exception as e:
-        print(f"PuntingForm migration check: {e}")
-
-    # Migration: Add Bet Tracker starting bankroll column
-    try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        users_columns = [col['name'] for col in inspector.get_columns('users')]
-
-        if 'bet_tracker_starting_bankroll' not in users_columns:
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE users ADD COLUMN bet_tracker_starting_bankroll FLOAT DEFAULT 0.0'))
-                conn.commit()
-            print("✓ Added bet_tracker_starting_bankroll column to users table")
-    except Exception as e:
-        print(f"Bet Tracker migration check: {e}")
-    
-   # Migration: Add V2 API JSON columns to races table
-    print("DEBUG: Starting V2 API migration check...")
-    try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        races_columns = [col['name'] for col in inspector.get_columns('races')]
-        print(f"DEBUG: Found races columns: {races_columns}")
-        
-        if 'speed_maps_json' not in races_columns:
-            print("DEBUG: speed_maps_json not found, adding columns...")
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE races ADD COLUMN speed_maps_json JSON'))
-                conn.execute(text('ALTER TABLE races ADD COLUMN ratings_json JSON'))
-                conn.execute(text('ALTER TABLE races ADD COLUMN sectionals_json JSON'))
-                conn.commit()
-            print("✓ Added V2 API JSON columns to races table")
-        else:
-            print("DEBUG: V2 columns already exist, skipping")
-            
-    except Exception as e:
-        print(f"V2 API migration ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    # Migration: Add best_bet_flagged_at column if it doesn't exist
-    try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        predictions_columns = [col['name'] for col in inspector.get_columns('predictions')]
-        
-        if 'best_bet_flagged_at' not in predictions_columns:
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE predictions ADD COLUMN best_bet_flagged_at TIMESTAMP'))
-                conn.commit()
-            print("Added best_bet_flagged_at column to predictions table")
-    except Exception as e:
-        print(f"Best Bet migration check: {e}")
-
-    # Persist live Ladbrokes badge snapshots so they can be settled later.
-    try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        predictions_columns = {col['name'] for col in inspector.get_columns('predictions')}
-        signal_columns = {
-            'ladbrokes_signal_mask': 'INTEGER NOT NULL DEFAULT 0',
-            'ladbrokes_signal_price': 'FLOAT',
-            'ladbrokes_signals_captured_at': 'TIMESTAMP',
-        }
-        with db.engine.connect() as conn:
-            changed = False
-            for column_name, column_type in signal_columns.items():
-                if column_name not in predictions_columns:
-                    conn.execute(text(f'ALTER TABLE predictions ADD COLUMN {column_name} {column_type}'))
-                    changed = True
-            if changed:
-                conn.commit()
-                print("Added Ladbrokes signal snapshot columns to predictions table")
-    except Exception as e:
-        print(f"Ladbrokes signal migration check: {e}")
+# Tables, column migrations and seed rows are a release step
+# (python scripts/release.py). RUN_RELEASE_TASKS_ON_STARTUP=1 runs it in-process
+# for a local single-process dev server.
+if os.environ.get('RUN_RELEASE_TASKS_ON_STARTUP') == '1':
+    from release_tasks import run_release_tasks
+    run_release_tasks(app)
 
-    # Persist live ML Value Edge bet snapshots so they can be settled later,
-    # same pattern as the Ladbrokes badge snapshot columns above.
-    try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        predictions_columns = {col['name'] for col in inspector.get_columns('predictions')}
-        value_edge_columns = {
-            'value_edge_pct': 'FLOAT',
-            'value_edge_ml_win_prob_pct': 'FLOAT',
-            'value_edge_price': 'FLOAT',
-            'value_edge_captured_at': 'TIMESTAMP',
-        }
-        with db.engine.connect() as conn:
-            changed = False
-            for column_name, column_type in value_edge_columns.items():
-                if column_name not in predictions_columns:
-                    conn.execute(text(f'ALTER TABLE predictions ADD COLUMN {column_name} {column_type}'))
-                    changed = True
-            if changed:
-                conn.commit()
-                print("Added ML Value Edge snapshot columns to predictions table")
-    except Exception as e:
-        print(f"ML Value Edge migration check: {e}")
-
-    # Joint-Kelly stake recommendation, same snapshot-column pattern as above.
+# ----- Analyzer Integration -----
+# Off by default: resolving names analyzer.js's own exact/abbreviated keys miss
+# gives extra jockeys and trainers a strike rate, which changes the analyzer
+# score and notes of newly imported meetings. Both feed the ML training set,
+# so only turn this on together with a retrain on re-scored meetings.
+ANALYZER_RESOLVE_STRIKE_RATE_NAMES = os.environ.get('ANALYZER_RESOLVE_STRIKE_RATE_NAMES', '0') == '1'
+# sr_type -> (fingerprint of the PuntingForm entries, lookup built from them).
+_analyzer_strike_rate_lookups = {}
+
+
+def _analyzer_strike_rate_lookup(sr_type, entries):
+    """The strike-rate lookup for ``entries``, rebuilt (and seeded with the
+    persisted aliases) only when PuntingForm's data has changed since the last
+    import, so its attached resolver keeps its memoised names across imports."""
+    fingerprint = hash(tuple(sorted(
+        (name, data.get('L100Wins', 0), data.get('L100Runs', 0)) for name, data in entries.items()
+    )))
+    cached = _analyzer_strike_rate_lookups.get(sr_type)
+    if cached and cached[0] == fingerprint:
+        # Per-import match accounting only; the resolver's memo is what is kept.
+        cached[1]['_fuzzy_audit'].clear()
+        return cached[1]
+    lookup = build_strike_rate_lookup(
+        [(name, data.get('L100Wins', 0), data.get('L100Runs', 0)) for name, data in entries.items()]
+    )
     try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        predictions_columns = {col['name'] for col in inspector.get_columns('predictions')}
-        if 'kelly_stake_pct' not in predictions_columns:
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE predictions ADD COLUMN kelly_stake_pct FLOAT'))
-                conn.commit()
-            print("Added kelly_stake_pct column to predictions table")
+        with db.session.begin_nested():
+            strike_rate_resolver(lookup).add_aliases(load_strike_rate_aliases(db.session, sr_type))
     except Exception as e:
-        print(f"Kelly stake migration check: {e}")
+        logger.warning(f"Could not load {sr_type} name aliases: {e}")
+    _analyzer_strike_rate_lookups[sr_type] = (fingerprint, lookup)
+    return lookup
 
-    try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        horses_columns = [col['name'] for col in inspector.get_columns('horses')]
-        
-        if 'is_scratched' not in horses_columns:
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE horses ADD COLUMN is_scratched BOOLEAN DEFAULT FALSE'))
-                conn.commit()
-            print("Added is_scratched column to horses table")
-    except Exception as e:
-        print(f"Scratched migration check: {e}")
 
-    try:
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        meetings_columns = [col['name'] for col in inspector.get_columns('meetings')]
-
-        if 'rail_position' not in meetings_columns:
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE meetings ADD COLUMN rail_position INTEGER DEFAULT 0'))
-                conn.commit()
-            print("Added rail_position column to meetings table")
-
-        if 'pace_bias' not in meetings_columns:
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE meetings ADD COLUMN pace_bias INTEGER DEFAULT 0'))
-                conn.commit()
-            print("Added pace_bias column to meetings table")
-    except Exception as e:
-        print(f"Track bias migration check: {e}")
+def analyzer_strike_rate_data(rows, strike_rate_data):
+    """strike_rate_data for analyzer.js, unchanged unless
+    ANALYZER_RESOLVE_STRIKE_RATE_NAMES is on.
 
-    # Migration: Create components table if it doesn't exist
-    try:
-        from models import Component
-        db.create_all()
-
-        inspector = inspect(db.engine)
-        component_columns = [col['name'] for col in inspector.get_columns('components')]
-        if 'component_key' not in component_columns:
-            with db.engine.connect() as conn:
-                conn.execute(text('ALTER TABLE components ADD COLUMN component_key VARCHAR(120)'))
-                conn.commit()
-            print("✓ Added component_key column to components table")
-        existing_components = Component.query.all()
-        keyed = 0
-        for component in existing_components:
-            desired_key = normalize_component_key(component.component_name)
-            if not component.component_key or component.component_key != desired_key:
-                component.component_key = desired_key
-                keyed += 1
-        if keyed:
-            db.session.commit()
-            print(f"✓ Backfilled stable keys for {keyed} components")
-        
-        component_count = Component.query.count()
-        if component_count == 0:
-            print("Seeding initial components...")
-            
-            starter_components = [
-                {'component_name': 'Age/Sex - 5yo Horse (Entire)',                 'appearances': 21,   'wins': 6,   'strike_rate': 28.6, 'roi_percentage': 224.8, 'is_active': True},
-                {'component_name': 'Days Since Run - Fresh Return (150-199 days)', 'appearances': 16,   'wins': 3,   'strike_rate': 18.8, 'roi_percentage': 193.1, 'is_active': True},
-                {'component_name': 'Colt - Base Bonus',                            'appearances': 841,  'wins': 120, 'strike_rate': 14.3, 'roi_percentage': 66.1,  'is_active': True},
-                {'component_name': 'Country: USA-bred',                            'appearances': 11,   'wins': 1,   'strike_rate': 9.1,  'roi_percentage': 63.6,  'is_active': True},
-                {'component_name': 'Market Expectation - Worst in Field',          'appearances': 8,    'wins': 2,   'strike_rate': 25.0, 'roi_percentage': 62.5,  'is_active': True},
-                {'component_name': 'Colt - 3yo Colt',                             'appearances': 2043, 'wins': 370, 'strike_rate': 18.1, 'roi_percentage': 49.2,  'is_active': True},
-                {'component_name': 'Running Position - Leader Staying',            'appearances': 14,   'wins': 2,   'strike_rate': 14.3, 'roi_percentage': 42.9,  'is_active': True},
-                {'component_name': 'Days Since Run - Too Fresh (250+ days)',       'appearances': 198,  'wins': 28,  'strike_rate': 14.1, 'roi_percentage': 31.8,  'is_active': True},
-                {'component_name': 'Age/Sex - 3yo',                               'appearances': 286,  'wins': 55,  'strike_rate': 19.2, 'roi_percentage': 27.7,  'is_active': True},
-            ]
-            
-            for comp_data in starter_components:
-                comp_data.setdefault('component_key', normalize_component_key(comp_data['component_name']))
-                component = Component(**comp_data)
-                db.session.add(component)
-            
-            db.session.commit()
-            print(f"Added {len(starter_components)} starter components")
-        else:
-            print(f"Components table already has {component_count} entries")
-            
-    except Exception as e:
-        print(f"Component migration check: {e}")
-    # Migration: Upsert profitable components into live DB
-    try:
-        from models import Component
-
-        profitable_components = [
-    # ── Original list ────────────────────────────────────────────────────────
-    {'component_name': 'Age/Sex - 5yo Horse (Entire)',                          'appearances': 21,   'wins': 6,   'strike_rate': 28.6, 'roi_percentage': 224.8, 'is_active': True},
-    {'component_name': 'Colt - Base Bonus',                                     'appearances': 841,  'wins': 120, 'strike_rate': 14.3, 'roi_percentage': 66.1,  'is_active': True},
-    {'component_name': 'Colt - 3yo Colt',                                       'appearances': 2043, 'wins': 370, 'strike_rate': 18.1, 'roi_percentage': 49.2,  'is_active': True},
-    {'component_name': 'Running Position - Leader Staying',                     'appearances': 14,   'wins': 2,   'strike_rate': 14.3, 'roi_percentage': 42.9,  'is_active': True},
-    {'component_name': 'Days Since Run - Too Fresh (250+ days)',                'appearances': 198,  'wins': 28,  'strike_rate': 14.1, 'roi_percentage': 31.8,  'is_active': True},
-    {'component_name': 'Age/Sex - 3yo',                                         'appearances': 286,  'wins': 55,  'strike_rate': 19.2, 'roi_percentage': 27.7,  'is_active': True},
-    {'component_name': 'Pace Angle - Sprint Leader Run Down',                   'appearances': 123,  'wins': 32,  'strike_rate': 26.0, 'roi_percentage': 32.1,  'is_active': True},
-    {'component_name': 'Undefeated on Condition',                               'appearances': 31,   'wins': 7,   'strike_rate': 22.6, 'roi_percentage': 34.0,  'is_active': True},
-    # ── New — Top Pick Notes ROI ─────────────────────────────────────────────
-    {'component_name': 'Running Position - Backmarker Staying',                 'appearances': 6,    'wins': 1,   'strike_rate': 16.7, 'roi_percentage': 333.3, 'is_active': True},
-    {'component_name': 'Last Start - Photo Win (<0.5L)',                        'appearances': 212,  'wins': 48,  'strike_rate': 22.6, 'roi_percentage': 48.0,  'is_active': True},
-    {'component_name': 'Specialist - Undefeated Distance',                      'appearances': 220,  'wins': 54,  'strike_rate': 24.5, 'roi_percentage': 43.3,  'is_active': True},
-    {'component_name': 'Drop back in distance (200-400m)',                          'component_key': 'drop_back_distance_200_400', 'appearances': 45,   'wins': 11,  'strike_rate': 24.4, 'roi_percentage': 37.9,  'is_active': True},
-    {'component_name': 'Running Position - Backmarker Middle',                  'appearances': 37,   'wins': 6,   'strike_rate': 16.2, 'roi_percentage': 31.6,  'is_active': True},
-    {'component_name': 'Specialist - Undefeated Track+Distance',                'appearances': 146,  'wins': 43,  'strike_rate': 29.5, 'roi_percentage': 31.4,  'is_active': True},
-    {'component_name': 'First Up - Specialist Undefeated',                      'appearances': 62,   'wins': 21,  'strike_rate': 33.9, 'roi_percentage': 27.7,  'is_active': True},
-    {'component_name': 'Signal Agreement - Both Signals Agree',                 'appearances': 814,  'wins': 270, 'strike_rate': 33.2, 'roi_percentage': -15.1, 'is_active': True},
-    {'component_name': 'Ran places: 2nd 2nd 3rd',                               'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
-    {'component_name': 'Ran places: 1st 1st 2nd',                               'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
-    {'component_name': 'Ran places: 2nd 1st 1st',                               'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
-    {'component_name': 'Ran places: 2nd 3rd 2nd',                               'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
-    {'component_name': '100% PODIUM at track (1/1) - specialist bonus',         'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
-]
+    With it on, every distinct CSV jockey/trainer name is run through the
+    StrikeRateResolver ml_predict scores with (initials, unique surname,
+    fuzzy, persisted aliases), and the ones it matches are added under their
+    raw CSV spelling, ahead of the original entries, which therefore still
+    win any key collision in analyzer.js. Only newly discovered fuzzy matches
+    are written back to strike_rate_aliases.
+    """
+    if not ANALYZER_RESOLVE_STRIKE_RATE_NAMES:
+        return strike_rate_data
+    resolved_data = {}
+    for sr_type, plural, column in (('jockey', 'jockeys', 'horse jockey'), ('trainer', 'trainers', 'horse trainer')):
+        entries = (strike_rate_data or {}).get(plural) or {}
+        if not isinstance(entries, dict) or not entries:
+            resolved_data[plural] = entries
+            continue
+        resolver = strike_rate_resolver(_analyzer_strike_rate_lookup(sr_type, entries))
+
+        resolved = {}
+        for name in sorted({str(row.get(column) or '').strip() for row in rows} - {''}):
+            data, method = resolver.lookup(name)
+            if data and name not in entries:
+                resolved[name] = {'L100Wins': data['L100Wins'], 'L100Runs': data['L100Runs']}
+        resolved_data[plural] = {**resolved, **entries}
+        logger.info(
+            f"ANALYZER_NAMES_RESOLVED type={sr_type} names={resolver.cache_info()['names']} added={len(resolved)}"
+        )
 
-        added = 0
-        for comp_data in profitable_components:
-            comp_key = comp_data.get('component_key') or normalize_component_key(comp_data['component_name'])
-            existing = Component.query.filter_by(component_key=comp_key).first()
-            if not existing:
-                existing = Component.query.filter_by(component_name=comp_data['component_name']).first()
-            if not existing:
-                component = Component(**comp_data)
-                component.component_key = comp_key
-                db.session.add(component)
-                added += 1
-            else:
-                existing.component_key   = comp_key
-                existing.component_name  = comp_data['component_name']
-                existing.appearances    = comp_data['appearances']
-                existing.wins           = comp_data['wins']
-                existing.strike_rate    = comp_data['strike_rate']
-                existing.roi_percentage = comp_data['roi_percentage']
+        if resolver.discovered:
+            try:
+                with db.session.begin_nested():
+                    save_strike_rate_aliases(db.session, sr_type, resolver.discovered)
+                resolver.discovered.clear()
+            except Exception as e:
+                logger.warning(f"Could not save {sr_type} name aliases: {e}")
+    return resolved_data
 
-        db.session.commit()
-        if added > 0:
-            print(f"✓ Seeded {added} new profitable components")
-        else:
-            print("✓ Profitable components already present — stats updated")
 
-    except Exception as e:
-        db.session.rollback()
-        print(f"Profitable component migration error: {e}")
-    try:
-        from afl_db import init_afl_tables
-        init_afl_tables(db)
-        print("✓ AFL tables initialised")
-    except Exception as e:
-        print(f"AFL table init: {e}")
-    try:
-        from mma_models import init_mma_tables
-        init_mma_tables(db)
-        print("✓ MMA tables initialised")
-    except Exception as e:
-        print(f"MMA table init: {e}")
-    # Budget Tracker: seed default categories/debt config and ensure the current fortnight exists
-    try:
-        from budget_tracker import seed_budget_tracker_defaults, get_current_fortnight
-        seed_budget_tracker_defaults(db)
-        get_current_fortnight(db)
-        print("✓ Budget Tracker defaults seeded")
-    except Exception as e:
-        print(f"Budget Tracker seed check: {e}")
-
-    # Create default admin if doesn't exist
-    admin = User.query.filter_by(username='admin').first()
-    if not admin:
-        admin = User(
-            username='admin',
-            email='admin@theformanalyst.com',
-            is_admin=True
-        )
-        admin.set_password(os.environ.get('ADMIN_PASSWORD', 'changeme123'))
-        db.session.add(admin)
-        db.session.commit()
-
-# ----- Analyzer Integration -----
 def run_analyzer(csv_data, track_condition, is_advanced=False, strike_rate_data=None):
     input_data = {
         'csv_data': csv_data,
@@ -820,6 +925,7 @@ def post_best_bets_to_twitter(best_bets, meeting_name):
     logger.info("TWITTER POSTING ATTEMPT STARTING")
     logger.info(f"Number of bets: {len(best_bets) if best_bets else 0}")
     logger.info(f"Meeting: {meeting_name}")
+    twitter_client = get_twitter_client()
     logger.info(f"Twitter client exists: {twitter_client is not None}")
     
     if not best_bets:
@@ -1484,7 +1590,7 @@ def process_and_store_results(csv_data, filename, track_condition, user_id,
 
     # Run the analyzer
     analysis_results = run_analyzer(csv_data, track_condition, is_advanced,
-                                    strike_rate_data=strike_rate_data)
+                                    strike_rate_data=analyzer_strike_rate_data(parsed_csv, strike_rate_data))
     
     if not analysis_results:
         raise Exception("No results returned from analyzer")
@@ -1627,6 +1733,8 @@ def process_and_store_results(csv_data, filename, track_condition, user_id,
         len(scratched_rows),
     )
 
+    store_meeting_runners(meeting)
+    refresh_best_bet_candidates([meeting.id])
     db.session.commit()
 
     # CLEANUP
@@ -1638,12 +1746,52 @@ def process_and_store_results(csv_data, filename, track_condition, user_id,
 
     return meeting
 
-def get_meeting_results(meeting_id):
+def meeting_view_query(include_results=False):
+    """Meeting query that loads races, runners and predictions (and results)
+    in one statement per level, for pages that render a whole meeting."""
+    from sqlalchemy.orm import selectinload
+
+    runner_options = [selectinload(Horse.prediction)]
+    if include_results:
+        runner_options.append(selectinload(Horse.result))
+    return Meeting.query.options(
+        selectinload(Meeting.races).selectinload(Race.horses).options(*runner_options),
+    )
+
+
+def _unique_runner_names(horses):
+    """First row (by id) per horse name, as the view has always shown one row
+    per name even when an import duplicated a runner."""
+    seen = set()
+    unique = []
+    for horse in sorted(horses, key=lambda h: h.id):
+        if horse.horse_name in seen:
+            continue
+        seen.add(horse.horse_name)
+        unique.append(horse)
+    return unique
+
+
+@lru_cache(maxsize=8192)
+def notes_component_keys(notes):
+    """Stable component keys found in a prediction's notes, in notes order.
+
+    Cached on the notes text: predictions are rewritten rather than edited in
+    place, so repeat page views of a meeting skip re-parsing every runner.
+    """
+    return tuple(match['key'] for match in parse_notes_component_matches(notes).values())
+
+
+def get_meeting_results(meeting_id, include_results=False):
     """
     Retrieve meeting results formatted for display
+
+    Races, runners and predictions come from meeting_view_query, so a meeting
+    costs a fixed handful of queries whatever its size. include_results adds
+    each runner's stored result as result_finish / result_sp.
     """
-    meeting = Meeting.query.get_or_404(meeting_id)
-    races = Race.query.filter_by(meeting_id=meeting_id).order_by(Race.race_number).all()
+    meeting = meeting_view_query(include_results).filter(Meeting.id == meeting_id).first_or_404()
+    races = sorted(meeting.races, key=lambda race: race.race_number or 0)
     
     active_components = Component.query.filter_by(is_active=True).all()
     results = {
@@ -1664,15 +1812,16 @@ def get_meeting_results(meeting_id):
     
     components_by_key = build_active_component_lookup(active_components)
     component_keys = set(components_by_key)
-    jockey_ride_counts = {}
-    meeting_horses = Horse.query.join(Race).filter(Race.meeting_id == meeting_id).all()
-    for horse in meeting_horses:
-        jockey = horse.jockey or ''
-        if jockey:
-            jockey_ride_counts[jockey] = jockey_ride_counts.get(jockey, 0) + 1
+    # Best-bet flags come from the same best_bet_candidates rows the Best Bets
+    # page reads, rather than being re-derived here.
+    reason_masks = dict(
+        db.session.query(BestBetCandidate.horse_id, BestBetCandidate.reason_mask)
+        .filter(BestBetCandidate.meeting_id == meeting.id)
+        .all()
+    )
 
     for race in races:
-        horses = Horse.query.filter_by(race_id=race.id).distinct(Horse.horse_name).all()
+        horses = _unique_runner_names(race.horses)
         
         race_data = {
             'race_number': race.race_number,
@@ -1683,19 +1832,12 @@ def get_meeting_results(meeting_id):
             'ratings_json': race.ratings_json,
             'horses': []
         }
-        
-        signal_top_ids = top_signal_horse_ids(horses)
 
         for horse in horses:
             pred = horse.prediction
+            reason_mask = reason_masks.get(horse.id, 0)
             best_bet_reasons = []
             if pred:
-                try:
-                    win_probability_value = float(str(pred.win_probability or '0').replace('%', '').strip())
-                except (ValueError, TypeError):
-                    win_probability_value = 0.0
-
-                components = parse_notes_component_matches(pred.notes)
                 matched_components = [
                     {
                         'name': component_display_name_for_key(component_key, components_by_key[component_key].component_name),
@@ -1704,24 +1846,26 @@ def get_meeting_results(meeting_id):
                         'sr': components_by_key[component_key].strike_rate,
                         'appearances': components_by_key[component_key].appearances,
                     }
-                    for component_key in (match['key'] for match in components.values())
+                    for component_key in notes_component_keys(pred.notes)
                     if component_key in component_keys
                 ]
                 matched_components.sort(key=lambda x: x['roi'], reverse=True)
                 matched_component_keys = [component['key'] for component in matched_components]
 
-                if matched_components:
+                if reason_mask & BEST_BET_REASON_COMPONENTS and matched_components:
                     best_bet_reasons.append(
                         'Component: ' + ', '.join(component['name'] for component in matched_components[:2])
                     )
                     if len(matched_components) > 2:
                         best_bet_reasons[-1] += f" +{len(matched_components) - 2} more"
-                if win_probability_value >= 80:
-                    best_bet_reasons.append(f"High confidence: {win_probability_value:.0f}% win probability")
-                if jockey_ride_counts.get(horse.jockey or '', 0) == 1:
+                if reason_mask & BEST_BET_REASON_HIGH_CONFIDENCE:
+                    best_bet_reasons.append(
+                        f"High confidence: {_parse_win_probability_pct(pred.win_probability):.0f}% win probability"
+                    )
+                if reason_mask & BEST_BET_REASON_JOCKEY_SOLE_RIDE:
                     best_bet_reasons.append('Jockey sole ride at meeting')
 
-            is_best_bet = bool(best_bet_reasons) and signals_all_agree_top(horse.id, signal_top_ids)
+            is_best_bet = bool(best_bet_reasons) and bool(reason_mask & BEST_BET_REASON_SIGNAL_AGREEMENT)
             if is_best_bet:
                 best_bet_reasons.append('Analyzer, PFAI and ML all agree top selection')
             horse_data = {
@@ -1751,6 +1895,9 @@ def get_meeting_results(meeting_id):
                     'notes': pred.notes if pred else '',
                 })() if pred else None
             }
+            if include_results:
+                horse_data['result_finish'] = horse.result.finish_position if horse.result else None
+                horse_data['result_sp'] = horse.result.sp if horse.result else None
             race_data['horses'].append(horse_data)
         
         # Sort horses by score descending
@@ -3111,25 +3258,40 @@ def _staking_stake(strategy, pre_race_bankroll, selection, minimum_stake=0.0, ma
     """
     sp = float(selection.get('sp') or 0)
     bankroll = max(0.0, float(pre_race_bankroll or 0.0))
+    full_kelly_fraction = (
+        max(0.0, calculate_kelly_fraction(selection.get('kelly_probability', selection.get('probability')), sp))
+        if sp > 1 else None
+    )
+    return _staking_stake_for(strategy, bankroll, sp, full_kelly_fraction, minimum_stake, maximum_stake)
+
+
+def _staking_stake_for(strategy, bankroll, sp, full_kelly_fraction, minimum_stake=0.0, maximum_stake=None):
+    """Stake arithmetic behind ``_staking_stake``, mirrored by ``_replay_staking_paths``.
+
+    ``bankroll`` is the non-negative pre-race bankroll and
+    ``full_kelly_fraction`` the selection's full Kelly fraction, clamped at
+    zero (None when the SP cannot carry a Kelly bet). Returns (stake, the
+    full Kelly fraction a Kelly strategy used, else None).
+    """
     if bankroll <= 0:
         return 0.0, None
 
-    full_kelly_fraction = None
+    kelly_used = None
     if strategy['type'] == 'flat':
         stake = min(10.0, bankroll)
     elif strategy['type'] == 'target_profit':
         if sp <= 1:
-            return 0.0, full_kelly_fraction
+            return 0.0, kelly_used
         stake = min(10.0 / (sp - 1.0), bankroll)
     elif strategy['type'] == 'bankroll_pct':
         stake = bankroll * strategy['pct']
     else:
-        if sp <= 1:
-            return 0.0, full_kelly_fraction
-        full_kelly_fraction = max(0.0, calculate_kelly_fraction(selection.get('kelly_probability', selection.get('probability')), sp))
-        if full_kelly_fraction == 0:
-            return 0.0, full_kelly_fraction
-        fraction = full_kelly_fraction * strategy.get('fraction', 1.0)
+        if sp <= 1 or full_kelly_fraction is None:
+            return 0.0, kelly_used
+        kelly_used = full_kelly_fraction
+        if kelly_used == 0:
+            return 0.0, kelly_used
+        fraction = kelly_used * strategy.get('fraction', 1.0)
         if strategy.get('cap_pct') is not None:
             fraction = min(fraction, strategy['cap_pct'])
         stake = bankroll * fraction
@@ -3137,21 +3299,35 @@ def _staking_stake(strategy, pre_race_bankroll, selection, minimum_stake=0.0, ma
     if maximum_stake is not None:
         stake = min(stake, float(maximum_stake))
     if stake < minimum_stake:
-        return 0.0, full_kelly_fraction
+        return 0.0, kelly_used
     stake = max(0.0, min(stake, bankroll))
-    return stake, full_kelly_fraction
+    return stake, kelly_used
 
 
 def _assert_staking_replay_invariants(result, starting_bankroll):
     """Fail fast rather than return impossible staking summaries."""
+    import numpy as np
+
     for strategy in result.get('strategies', []):
         key = strategy.get('key')
         curve = strategy.get('curve') or []
-        max_pre_race_bankroll = float(starting_bankroll or 0.0)
-        for point in curve:
+        pres = np.array([float(point.get('bankroll_before') or 0.0) for point in curve], dtype=float)
+        stakes = np.array([float(point.get('stake') or 0.0) for point in curve], dtype=float)
+        bankrolls = np.array([float(point.get('bankroll') or 0.0) for point in curve], dtype=float)
+        max_pre_race_bankroll = max([float(starting_bankroll or 0.0)] + pres.tolist())
+        # Screen every point at once, then replay the checks below in order
+        # from the first suspect point so the error names the same failure.
+        suspect = (stakes < -0.005) | (stakes - pres > 0.005) | (bankrolls < -0.005)
+        pct = {'flat_1_pct': 0.01, 'flat_2_pct': 0.02}.get(key)
+        if pct is not None:
+            suspect |= np.abs(stakes - (pres * pct)) > 0.015
+        cap = {'quarter_kelly_cap_2': 0.02, 'half_kelly_cap_2': 0.02, 'full_kelly_cap_5': 0.05}.get(key)
+        if cap is not None:
+            suspect |= (pres > 0) & (stakes - (pres * cap) > 0.015)
+        first_suspect = int(np.argmax(suspect)) if suspect.any() else len(curve)
+        for point in curve[first_suspect:]:
             pre = float(point.get('bankroll_before') or 0.0)
             stake = float(point.get('stake') or 0.0)
-            max_pre_race_bankroll = max(max_pre_race_bankroll, pre)
             if stake < -0.005 or stake - pre > 0.005:
                 raise ValueError(f"Staking invariant failed for {key}: stake {stake} outside 0..{pre}")
             if float(point.get('bankroll') or 0.0) < -0.005:
@@ -3196,6 +3372,278 @@ def _assert_staking_replay_invariants(result, starting_bankroll):
         if abs(float(strategy.get('total_profit') or 0.0) - expected_profit) > 0.015:
             raise ValueError(f"Staking invariant failed for {key}: total profit does not reconcile to bankroll")
 
+def _staking_replay_columns(ordered):
+    """Per-selection inputs every strategy reads, converted once into arrays.
+
+    Returns parallel arrays: decimal SP, whether the selection won, and the
+    full Kelly fraction exactly as ``_staking_stake`` derives it (NaN when
+    the SP cannot carry a Kelly bet).
+    """
+    import numpy as np
+
+    sps, won, kelly = [], [], []
+    for sel in ordered:
+        sp = float(sel.get('sp') or 0)
+        sps.append(sp)
+        won.append(sel.get('finish_position') == 1)
+        kelly.append(
+            max(0.0, calculate_kelly_fraction(sel.get('kelly_probability', sel.get('probability')), sp))
+            if sp > 1 else math.nan
+        )
+    return {
+        'sp': np.array(sps, dtype=float),
+        'won': np.array(won, dtype=bool),
+        'kelly_fraction': np.array(kelly, dtype=float),
+    }
+
+
+def _staking_strategy_inputs(strat, columns):
+    """One strategy's per-selection stake input as ``(kind, values)``.
+
+    ``'amount'`` strategies stake ``min(values[i], bankroll)`` and
+    ``'fraction'`` strategies ``bankroll * values[i]``, before the stake
+    limits; both match ``_staking_stake_for``, with a zero input wherever
+    it places no bet.
+    """
+    import numpy as np
+
+    sp = columns['sp']
+    if strat['type'] == 'flat':
+        return 'amount', np.full(sp.shape, 10.0)
+    if strat['type'] == 'target_profit':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 'amount', np.where(sp > 1, 10.0 / (sp - 1.0), 0.0)
+    if strat['type'] == 'bankroll_pct':
+        return 'fraction', np.full(sp.shape, strat['pct'])
+    kelly = columns['kelly_fraction']
+    fraction = kelly * strat.get('fraction', 1.0)
+    if strat.get('cap_pct') is not None:
+        fraction = np.minimum(fraction, strat['cap_pct'])
+    return 'fraction', np.where((sp > 1) & (kelly > 0), fraction, 0.0)
+
+
+def _replay_amount_prefix(amounts, columns, bankroll, minimum_stake=0.0, maximum_stake=None):
+    """Vectorised replay of a fixed-amount strategy until a bet is bankroll-limited.
+
+    While every pre-race bankroll covers the amount the stakes do not depend
+    on the bankroll, so the path is one running sum of ``-stake`` and
+    ``stake * sp`` steps, added in the same order as the per-bet loop.
+    Returns (stakes, post-race bankrolls, number of leading selections for
+    which both are exact).
+    """
+    import numpy as np
+
+    stakes = amounts
+    if maximum_stake is not None:
+        stakes = np.minimum(stakes, maximum_stake)
+    stakes = np.where(stakes < minimum_stake, 0.0, np.maximum(stakes, 0.0))
+    steps = np.empty(2 * len(stakes) + 1)
+    steps[0] = bankroll
+    steps[1::2] = -stakes
+    steps[2::2] = np.where(columns['won'], stakes * columns['sp'], 0.0)
+    path = np.cumsum(steps)
+    before, after = path[:-1:2], path[2::2]
+    exact = (amounts <= before) & (after >= 0.0)
+    count = len(stakes) if exact.all() else int(np.argmin(exact))
+    return stakes, after, count
+
+
+def _replay_staking_paths(strategies, columns, starting_bankroll, minimum_stake=0.0, maximum_stake=None):
+    """Stake and post-race bankroll per selection for every strategy.
+
+    Fixed-amount strategies run on arrays for as long as no stake is limited
+    by the bankroll. Everything else steps through one shared loop over the
+    precomputed columns, with the arithmetic of ``_staking_stake_for``.
+    """
+    n = len(columns['sp'])
+    bankroll = float(starting_bankroll)
+    bankroll = bankroll if bankroll > 0.0 else 0.0
+    max_stake = float(maximum_stake) if maximum_stake is not None else None
+
+    paths = []
+    looped = []
+    for strat in strategies:
+        kind, values = _staking_strategy_inputs(strat, columns)
+        stakes, afters = [0.0] * n, [0.0] * n
+        start, b = 0, bankroll
+        if kind == 'amount':
+            prefix_stakes, prefix_afters, start = _replay_amount_prefix(values, columns, bankroll, minimum_stake, max_stake)
+            stakes[:start] = prefix_stakes[:start].tolist()
+            afters[:start] = prefix_afters[:start].tolist()
+            if start:
+                b = afters[start - 1]
+        paths.append((stakes, afters))
+        if start < n:
+            looped.append([start, b, kind == 'amount', values.tolist(), stakes, afters])
+
+    if looped:
+        sps = columns['sp'].tolist()
+        wons = columns['won'].tolist()
+        for i in range(min(state[0] for state in looped), n):
+            sp = sps[i]
+            won = wons[i]
+            for state in looped:
+                if i < state[0]:
+                    continue
+                # Conditional expressions keep min()/max()'s first-argument
+                # tie-breaking without a call per bet.
+                b = state[1]
+                if b <= 0:
+                    stake = 0.0
+                else:
+                    value = state[3][i]
+                    stake = (b if b < value else value) if state[2] else b * value
+                    if max_stake is not None and max_stake < stake:
+                        stake = max_stake
+                    if stake < minimum_stake:
+                        stake = 0.0
+                    else:
+                        stake = b if b < stake else stake
+                        stake = stake if stake > 0.0 else 0.0
+                post = (b - stake + stake * sp) if won else (b - stake)
+                b = post if post > 0.0 else 0.0
+                state[1] = b
+                state[4][i] = stake
+                state[5][i] = b
+    return paths
+
+
+def _round_to_cents(values):
+    """``[round(v, 2) for v in values]`` over a float array, in bulk.
+
+    ``rint(v * 100) / 100`` agrees with ``round`` except where ``v * 100``
+    is within rounding error of a half cent (the relative margin also covers
+    values too large to scale exactly); those entries are rounded one by
+    one. Floats of 2**52 and above are whole numbers, which ``round``
+    returns unchanged; full Kelly bankrolls reach them on long samples.
+    """
+    import numpy as np
+
+    with np.errstate(invalid='ignore', over='ignore'):
+        scaled = values * 100.0
+        whole = np.abs(values) >= 2.0 ** 52
+        rounded = np.where(whole, values, np.rint(scaled) / 100.0).tolist()
+        clear_of_half = np.abs(scaled - np.floor(scaled) - 0.5) > np.abs(scaled) * 1e-15
+        exact = whole | clear_of_half
+    for i in np.flatnonzero(~exact).tolist():
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
+
+def _longest_run(flags):
+    """Length of the longest run of True in a boolean array."""
+    import numpy as np
+
+    if not flags.any():
+        return 0
+    edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+    return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+
+def _largest_stake_row(bet, stake, bankroll_before, kelly_fraction, sel):
+    return {
+        'bet': bet,
+        'stake': round(stake, 2),
+        'bankroll': round(bankroll_before, 2),
+        'stake_bankroll_pct': round((stake / bankroll_before * 100.0) if bankroll_before else 0.0, 4),
+        'kelly_fraction': round(kelly_fraction, 6) if kelly_fraction is not None else None,
+        'race_id': sel.get('race_id'),
+        'race_number': sel.get('race_number'),
+        'sort_key': sel.get('sort_key'),
+        'sp': round(float(sel.get('sp') or 0), 4),
+        'probability': round(_normalise_probability_fraction(sel.get('probability')) or 0.0, 6),
+        'kelly_probability': round(_normalise_probability_fraction(sel.get('kelly_probability', sel.get('probability'))) or 0.0, 6),
+        'finish_position': sel.get('finish_position'),
+    }
+
+
+def _staking_strategy_result(strat, ordered, columns, stakes, afters, starting_bankroll, days):
+    """One strategy's replay summary from its stake and bankroll paths.
+
+    Produces the same payload as replaying the strategy bet by bet through
+    ``_staking_stake``; only the five largest bets are expanded into
+    ``largest_stakes`` rows.
+    """
+    import numpy as np
+
+    stake = np.array(stakes, dtype=float)
+    after = np.array(afters, dtype=float)
+    count = len(stake)
+    start = float(starting_bankroll)
+    first_before = start if start > 0.0 else 0.0
+    before = np.empty_like(after)
+    if count:
+        before[0] = first_before
+        before[1:] = after[:-1]
+    profit = after - before
+    placed = stake > 0
+    bets = np.flatnonzero(placed)
+    won = columns['won'][bets]
+
+    stake_values = stake[bets].tolist()
+    profit_values = profit[bets].tolist()
+    stake_history = [
+        {'stake': s, 'profit_loss': p, 'bankroll_before': b0, 'bankroll_after': b1}
+        for s, p, b0, b1 in zip(stake_values, profit_values, before[bets].tolist(), after[bets].tolist())
+    ]
+
+    # The curve's bankroll only moves when a bet is placed.
+    last_bet = np.maximum.accumulate(np.where(placed, np.arange(count), -1))
+    point_bankrolls = _round_to_cents(np.where(last_bet >= 0, after[last_bet], first_before))
+    point_befores = [round(first_before, 2)] + point_bankrolls[:-1] if count else []
+    point_stakes = _round_to_cents(stake)
+    point_profits = _round_to_cents(np.where(placed, profit, 0.0))
+    curve = [
+        {'bet': i, 'bankroll': b1, 'bankroll_before': b0, 'stake': s, 'profit': p}
+        for i, b1, b0, s, p in zip(range(1, count + 1), point_bankrolls, point_befores, point_stakes, point_profits)
+    ]
+
+    peak, max_dd = start, 0.0
+    if count:
+        peaks = np.maximum(np.maximum.accumulate(after), start)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(peaks != 0, (peaks - after) / peaks * 100, 0.0)
+        peak = float(peaks[-1])
+        max_dd = max(0.0, float(drawdowns.max()))
+
+    n = len(stake_values)
+    wins = int(np.count_nonzero(won))
+    final = float(after[-1]) if count else start
+    total_profit = final - start
+    total_staked = sum(stake_values)
+    largest_individual_stake = max(stake_values) if stake_values else 0.0
+    average_stake = (total_staked / len(stake_values)) if stake_values else 0.0
+    # A stable sort on the negated rounded stake is sorted(..., reverse=True)[:5].
+    top = bets[np.argsort(-np.array(point_stakes)[bets], kind='stable')[:5]]
+    kelly = columns['kelly_fraction'] if strat['type'] == 'kelly' else None
+    largest_stakes = [
+        _largest_stake_row(i + 1, float(stake[i]), float(before[i]), float(kelly[i]) if kelly is not None else None, ordered[i])
+        for i in top.tolist()
+    ]
+    avg_profit = sum(profit_values) / len(profit_values) if profit_values else 0.0
+    variance = sum((x - avg_profit) ** 2 for x in profit_values) / len(profit_values) if profit_values else 0.0
+    volatility = math.sqrt(variance)
+    cagr = 0.0
+    if days > 0 and final > 0 and starting_bankroll > 0:
+        # Annualising a short-window return can raise the growth multiple to an
+        # enormous exponent (e.g. an 80x return over 2 days -> exponent ~183),
+        # which overflows a float via **.  Compute via log/exp instead and clamp
+        # the exponent so extreme short backtests degrade to a large finite
+        # percentage rather than crashing.
+        scaled_log_growth = math.log(final / starting_bankroll) * (365.25 / days)
+        cagr = (math.exp(min(scaled_log_growth, 700.0)) - 1) * 100
+    risk_adjusted = (total_profit / max_dd) if max_dd > 0 else (total_profit if total_profit > 0 else 0.0)
+    return {
+        'key': strat['key'], 'name': strat['name'], 'final_bankroll': round(final,2), 'peak_bankroll': round(peak,2), 'total_profit': round(total_profit,2),
+        'roi': round((total_profit/total_staked*100) if total_staked else 0.0,2), 'cagr': round(cagr,2), 'maximum_drawdown': round(max_dd,2),
+        'largest_losing_streak': _longest_run(~won), 'largest_winning_streak': _longest_run(won), 'largest_individual_stake': round(largest_individual_stake,2),
+        'average_stake': round(average_stake,2), 'number_of_bets': n, 'number_of_winning_bets': wins,
+        'strike_rate': round((wins/n*100) if n else 0.0,2), 'return_on_turnover': round((total_profit/total_staked*100) if total_staked else 0.0,2),
+        'volatility': round(volatility,2), 'bankroll_growth_multiple': round((final/starting_bankroll) if starting_bankroll else 0.0,4),
+        'total_staked': round(total_staked,2), 'risk_adjusted_return': round(risk_adjusted,4), 'largest_stakes': largest_stakes, 'stake_history': stake_history, 'curve': curve,
+    }
+
+
 def replay_staking_strategies(selections, starting_bankroll=10000.0, minimum_stake=0.0, maximum_stake=None, probability_source='Assessed win probability', probability_source_field=None, probability_input='Original assessed probability'):
     """Replay chronological selections through every canonical staking strategy."""
     ordered = sorted(selections, key=lambda s: (s.get('sort_key') or '', s.get('race_number') or 0, s.get('race_id') or 0))
@@ -3208,83 +3656,12 @@ def replay_staking_strategies(selections, starting_bankroll=10000.0, minimum_sta
             days = max((d1 - d0).days, 0)
         except Exception:
             days = 0
-    results = []
-    for strat in strategies:
-        bankroll = float(starting_bankroll)
-        peak = bankroll
-        max_dd = 0.0
-        stake_history=[]; curve=[]; wins=0; bets=0; losing=winning=max_losing=max_winning=0; largest_stakes=[]
-        for i, sel in enumerate(ordered, start=1):
-            bankroll_before = max(0.0, bankroll)
-            stake, kelly_fraction = _staking_stake(strat, bankroll_before, sel, minimum_stake, maximum_stake)
-            won = sel.get('finish_position') == 1
-            sp = float(sel.get('sp') or 0)
-            if won:
-                post_race_bankroll = bankroll_before - stake + stake * sp
-            else:
-                post_race_bankroll = bankroll_before - stake
-            bankroll = max(0.0, post_race_bankroll)
-            profit = bankroll - bankroll_before
-            if stake > 0:
-                stake_history.append({
-                    'stake': stake,
-                    'profit_loss': profit,
-                    'bankroll_before': bankroll_before,
-                    'bankroll_after': bankroll,
-                })
-                bets += 1
-                largest_stakes.append({
-                    'bet': i,
-                    'stake': round(stake, 2),
-                    'bankroll': round(bankroll_before, 2),
-                    'stake_bankroll_pct': round((stake / bankroll_before * 100.0) if bankroll_before else 0.0, 4),
-                    'kelly_fraction': round(kelly_fraction, 6) if kelly_fraction is not None else None,
-                    'race_id': sel.get('race_id'),
-                    'race_number': sel.get('race_number'),
-                    'sort_key': sel.get('sort_key'),
-                    'sp': round(float(sel.get('sp') or 0), 4),
-                    'probability': round(_normalise_probability_fraction(sel.get('probability')) or 0.0, 6),
-                    'kelly_probability': round(_normalise_probability_fraction(sel.get('kelly_probability', sel.get('probability'))) or 0.0, 6),
-                    'finish_position': sel.get('finish_position'),
-                })
-            if stake > 0 and won:
-                wins += 1; winning += 1; losing = 0
-            elif stake > 0:
-                losing += 1; winning = 0
-            max_losing=max(max_losing, losing); max_winning=max(max_winning, winning)
-            peak=max(peak, bankroll)
-            dd = ((peak-bankroll)/peak*100) if peak else 0.0
-            max_dd=max(max_dd, dd)
-            curve.append({'bet': i, 'bankroll': round(bankroll, 2), 'bankroll_before': round(bankroll_before, 2), 'stake': round(stake, 2), 'profit': round(profit, 2)})
-        n=bets; final=bankroll; total_profit=final-float(starting_bankroll)
-        stake_values = [row['stake'] for row in stake_history]
-        profit_values = [row['profit_loss'] for row in stake_history]
-        total_staked = sum(stake_values)
-        largest_individual_stake = max(stake_values) if stake_values else 0.0
-        average_stake = (total_staked / len(stake_values)) if stake_values else 0.0
-        largest_stakes = sorted(largest_stakes, key=lambda r: r['stake'], reverse=True)[:5]
-        avg_profit = sum(profit_values)/len(profit_values) if profit_values else 0.0
-        variance = sum((x-avg_profit)**2 for x in profit_values)/len(profit_values) if profit_values else 0.0
-        volatility = math.sqrt(variance)
-        cagr = 0.0
-        if days > 0 and final > 0 and starting_bankroll > 0:
-            # Annualising a short-window return can raise the growth multiple to an
-            # enormous exponent (e.g. an 80x return over 2 days -> exponent ~183),
-            # which overflows a float via **.  Compute via log/exp instead and clamp
-            # the exponent so extreme short backtests degrade to a large finite
-            # percentage rather than crashing.
-            scaled_log_growth = math.log(final / starting_bankroll) * (365.25 / days)
-            cagr = (math.exp(min(scaled_log_growth, 700.0)) - 1) * 100
-        risk_adjusted = (total_profit / max_dd) if max_dd > 0 else (total_profit if total_profit > 0 else 0.0)
-        results.append({
-            'key': strat['key'], 'name': strat['name'], 'final_bankroll': round(final,2), 'peak_bankroll': round(peak,2), 'total_profit': round(total_profit,2),
-            'roi': round((total_profit/total_staked*100) if total_staked else 0.0,2), 'cagr': round(cagr,2), 'maximum_drawdown': round(max_dd,2),
-            'largest_losing_streak': max_losing, 'largest_winning_streak': max_winning, 'largest_individual_stake': round(largest_individual_stake,2),
-            'average_stake': round(average_stake,2), 'number_of_bets': n, 'number_of_winning_bets': wins,
-            'strike_rate': round((wins/n*100) if n else 0.0,2), 'return_on_turnover': round((total_profit/total_staked*100) if total_staked else 0.0,2),
-            'volatility': round(volatility,2), 'bankroll_growth_multiple': round((final/starting_bankroll) if starting_bankroll else 0.0,4),
-            'total_staked': round(total_staked,2), 'risk_adjusted_return': round(risk_adjusted,4), 'largest_stakes': largest_stakes, 'stake_history': stake_history, 'curve': curve,
-        })
+    columns = _staking_replay_columns(ordered)
+    paths = _replay_staking_paths(strategies, columns, starting_bankroll, minimum_stake, maximum_stake)
+    results = [
+        _staking_strategy_result(strat, ordered, columns, stakes, afters, starting_bankroll, days)
+        for strat, (stakes, afters) in zip(strategies, paths)
+    ]
     winners = {
         'highest_final_bankroll': max(results, key=lambda r: r['final_bankroll']) if results else None,
         'highest_profit': max(results, key=lambda r: r['total_profit']) if results else None,
@@ -3607,20 +3984,10 @@ def api_get_meetings_by_date(date_str):
 def api_get_speedmaps(meeting_id, race_number):
     """Get speed maps for a specific race"""
     try:
-        url = f"https://api.puntingform.com.au/v2/User/Speedmaps?meetingId={meeting_id}&raceNo={race_number}&apiKey={pf_service.api_key}"
-        
-        headers = {
-            'accept': 'application/json'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        
-        if not response.ok:
-            return jsonify({'success': False, 'error': f'API error {response.status_code}'}), response.status_code
-        
-        return jsonify(response.json())
-        
+        return jsonify(pf_service.get_speedmap(meeting_id, race_number))
     except Exception as e:
+        if isinstance(e, PuntingFormAPIError) and e.status_code:
+            return jsonify({'success': False, 'error': f'API error {e.status_code}'}), e.status_code
         logger.error(f"Speed maps fetch failed: {str(e)}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -3700,20 +4067,10 @@ def api_get_pfai_sectionals(race_id):
 def api_get_ratings(meeting_id):
     """Get ratings for a meeting"""
     try:
-        url = f"https://api.puntingform.com.au/v2/Ratings/MeetingRatings?meetingId={meeting_id}&apiKey={pf_service.api_key}"
-        
-        headers = {
-            'accept': 'application/json'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        
-        if not response.ok:
-            return jsonify({'success': False, 'error': f'API error {response.status_code}'}), response.status_code
-        
-        return jsonify(response.json())
-        
+        return jsonify(pf_service.get_meeting_ratings(meeting_id))
     except Exception as e:
+        if isinstance(e, PuntingFormAPIError) and e.status_code:
+            return jsonify({'success': False, 'error': f'API error {e.status_code}'}), e.status_code
         logger.error(f"Ratings fetch failed: {str(e)}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -3854,13 +4211,12 @@ def get_ladbrokes_odds(race_uuid):
 @login_required
 def api_get_scratchings(meeting_id):
     try:
-        url = f"https://api.puntingform.com.au/v2/Updates/Scratchings?apiKey={pf_service.api_key}"
-        response = requests.get(url, headers={'accept': 'application/json'}, timeout=30)
-
-        if not response.ok:
-            return jsonify({'success': False, 'error': f'API error {response.status_code}'}), response.status_code
-
-        data = response.json()
+        try:
+            data = pf_service.get_v2_scratchings()
+        except PuntingFormAPIError as e:
+            if e.status_code:
+                return jsonify({'success': False, 'error': f'API error {e.status_code}'}), e.status_code
+            raise
         items = data.get('payLoad') or [] if isinstance(data, dict) else data if isinstance(data, list) else []
 
         # Build a tab->horseName lookup from stored speedmap data
@@ -3905,253 +4261,287 @@ def api_get_scratchings(meeting_id):
     except Exception as e:
         logger.error(f"Scratchings fetch failed: {str(e)}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
-@app.route("/api/meetings/<meeting_id>/import", methods=["POST"])
-@login_required
-def api_import_meeting(meeting_id):
-    """Import meeting from PuntingForm API with speed maps, ratings, AND sectionals"""
-    try:
-        # Get date from request
-        date_str = request.form.get('date')
-        if not date_str:
-            date_str = datetime.now().strftime('%Y-%m-%d')
-        
-        # Get meetings for the specified date
-        meetings_response = pf_service.get_meetings_list(date=date_str)
-        meetings = meetings_response.get('meetings', [])
-        
-        # Find the meeting by ID
-        meeting_info = next((m for m in meetings if m['meeting_id'] == meeting_id), None)
-        
-        if not meeting_info:
-            return jsonify({'success': False, 'error': 'Meeting not found'}), 404
-        
-        track_name = meeting_info['track_name']
-        
-        # Track condition
-        track_condition = request.form.get('track_condition', 'good')
-        rail_position = int(request.form.get('rail_position', 0))
-        
-        # Generate meeting name
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        meeting_name = f"{date_obj.strftime('%y%m%d')}_{track_name}"
-        
-        # ==========================================
-        # FETCH V2 API DATA BEFORE PROCESSING
-        # ==========================================
-        headers = {
-            'Authorization': f'Bearer {pf_service.api_key}',
-            'Content-Type': 'application/json'
-        }
-        
-        # Fetch sectionals/ratings (meeting-level)
-        sectionals_data = None
-        try:
-            sectionals_url = f"https://api.puntingform.com.au/v2/Ratings/MeetingRatings?meetingId={meeting_id}&apiKey={pf_service.api_key}"
-            logger.info(f"📡 Fetching sectionals/ratings for meeting {meeting_id}")
-            
-            sectionals_response = requests.get(sectionals_url, headers=headers, timeout=30)
-            
-            if sectionals_response.ok:
-                sectionals_data = sectionals_response.json()
-                logger.info(f"✅ Fetched sectionals data with {len(sectionals_data.get('payLoad', []))} runners")
-            else:
-                logger.warning(f"⚠️  Sectionals fetch failed: {sectionals_response.status_code}")
-        except Exception as e:
-            logger.warning(f"Could not fetch sectionals: {str(e)}")
-        
-        # ==========================================
-        # FETCH CSV DATA
-        # ==========================================
-        csv_data = pf_service.get_fields_csv(track_name, date_str)
-        if not csv_data:
-            return jsonify({'success': False, 'error': 'No data available for this meeting'}), 400
 
-        # ==========================================
-        # PRE-FETCH STRIKE RATES
-        # ==========================================
-        strike_rate_data = {'jockeys': {}, 'trainers': {}}
-        try:
-            strike_rate_data['jockeys']  = pf_service.get_strike_rates(date_str, 'jockey')
-            strike_rate_data['trainers'] = pf_service.get_strike_rates(date_str, 'trainer')
-            logger.info(f"✅ Strike rates: {len(strike_rate_data['jockeys'])} jockeys, {len(strike_rate_data['trainers'])} trainers")
-            logger.info(f"Sample jockey keys: {list(strike_rate_data['jockeys'].keys())[:5]}")
-            logger.info(f"Sample trainer keys: {list(strike_rate_data['trainers'].keys())[:5]}")
-        except Exception as e:
-            logger.warning(f"Strike rate pre-fetch failed (non-fatal): {str(e)}", exc_info=True)
-        # ==========================================
 
-        # ==========================================
-        # FETCH SCRATCHINGS BEFORE ANALYSIS
-        # ==========================================
+def run_meeting_import(params, user_id, progress, previous_meeting_id=None):
+    """Import a meeting from PuntingForm API with speed maps, ratings, AND sectionals.
+
+    Runs on an import job thread (import_jobs.ImportJobQueue) and returns the
+    new meeting id. A retry passes the meeting an earlier attempt stored as
+    previous_meeting_id; it is deleted first so retries never duplicate it.
+    """
+    meeting_id = params['pf_meeting_id']
+    date_str = params['date']
+    track_condition = params.get('track_condition') or 'good'
+    rail_position = int(params.get('rail_position') or 0)
+
+    if previous_meeting_id:
+        partial = db.session.get(Meeting, previous_meeting_id)
+        if partial is not None:
+            logger.warning("Removing meeting %s left by an earlier import attempt", previous_meeting_id)
+            db.session.delete(partial)
+            db.session.commit()
+
+    progress('resolving meeting', 5)
+    # Get meetings for the specified date
+    meetings_response = pf_service.get_meetings_list(date=date_str)
+    meetings = meetings_response.get('meetings', [])
+
+    # Find the meeting by ID
+    meeting_info = next((m for m in meetings if m['meeting_id'] == meeting_id), None)
+
+    if not meeting_info:
+        raise ImportJobError('Meeting not found')
+
+    track_name = meeting_info['track_name']
+
+    # Generate meeting name
+    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+    meeting_name = f"{date_obj.strftime('%y%m%d')}_{track_name}"
+
+    # ==========================================
+    # FETCH FIELDS, RATINGS, SCRATCHINGS AND SPEED MAPS CONCURRENTLY
+    # ==========================================
+    progress('fetching meeting data', 10)
+    payloads = pf_service.fetch_meeting_payloads(
+        meeting_id, track_name, date_str, race_numbers=meeting_info.get('race_numbers') or [],
+    )
+    fetch_errors = payloads['errors']
+
+    # Sectionals/ratings (meeting-level)
+    sectionals_data = payloads['ratings']
+    if sectionals_data is not None:
+        logger.info(f"✅ Fetched sectionals data with {len(sectionals_data.get('payLoad', []))} runners")
+    else:
+        logger.warning(f"Could not fetch sectionals: {fetch_errors.get('ratings')}")
+
+    # ==========================================
+    # FIELDS CSV
+    # ==========================================
+    if 'fields' in fetch_errors:
+        raise fetch_errors['fields']
+    csv_data = payloads['fields']
+    if not csv_data:
+        raise ImportJobError('No data available for this meeting')
+
+    # ==========================================
+    # PRE-FETCH STRIKE RATES
+    # ==========================================
+    progress('fetching strike rates', 30)
+    strike_rate_data = {'jockeys': {}, 'trainers': {}}
+    try:
+        strike_rate_data['jockeys']  = pf_service.get_strike_rates(date_str, 'jockey')
+        strike_rate_data['trainers'] = pf_service.get_strike_rates(date_str, 'trainer')
+        logger.info(f"✅ Strike rates: {len(strike_rate_data['jockeys'])} jockeys, {len(strike_rate_data['trainers'])} trainers")
+        logger.info(f"Sample jockey keys: {list(strike_rate_data['jockeys'].keys())[:5]}")
+        logger.info(f"Sample trainer keys: {list(strike_rate_data['trainers'].keys())[:5]}")
+    except Exception as e:
+        logger.warning(f"Strike rate pre-fetch failed (non-fatal): {str(e)}", exc_info=True)
+    # ==========================================
+
+    # ==========================================
+    # SCRATCHINGS BEFORE ANALYSIS
+    # ==========================================
+    progress('reading scratchings', 35)
+    scratched_set = set()
+    v1_scratchings_available = False
+    v2_scratched_set = set()
+    v2_scratchings_available = False
+    try:
+        if 'scratchings' in fetch_errors:
+            raise fetch_errors['scratchings']
+        scratched_set, scratch_debug_rows, v1_scratchings_available = _extract_v1_scratchings_for_track(payloads['scratchings'], track_name)
+        logger.info(
+            "✅ Found %s explicit V1 scratchings for %s (available=%s): %s",
+            len(scratched_set),
+            track_name,
+            v1_scratchings_available,
+            scratch_debug_rows[:20],
+        )
+    except Exception as e:
+        logger.warning(f"Could not fetch V1 scratchings: {e}")
         scratched_set = set()
         v1_scratchings_available = False
+
+    try:
+        if 'v2_scratchings' in fetch_errors:
+            raise fetch_errors['v2_scratchings']
+        v2_data = payloads['v2_scratchings']
+        v2_scratchings_available = True
+        v2_items = v2_data.get('payLoad') if isinstance(v2_data, dict) else v2_data
+        v2_scratched_set, v2_debug_rows = _extract_v2_scratched_set(v2_items or [], track_name)
+        logger.info(
+            "✅ Found %s explicit V2 update scratchings for %s: %s",
+            len(v2_scratched_set),
+            track_name,
+            v2_debug_rows[:20],
+        )
+    except Exception as e:
+        logger.warning(f"Could not fetch V2 scratchings: {e}")
         v2_scratched_set = set()
         v2_scratchings_available = False
-        try:
-            scratch_data = pf_service.get_scratchings()
-            scratched_set, scratch_debug_rows, v1_scratchings_available = _extract_v1_scratchings_for_track(scratch_data, track_name)
-            logger.info(
-                "✅ Found %s explicit V1 scratchings for %s (available=%s): %s",
-                len(scratched_set),
-                track_name,
-                v1_scratchings_available,
-                scratch_debug_rows[:20],
-            )
-        except Exception as e:
-            logger.warning(f"Could not fetch V1 scratchings: {e}")
-            scratched_set = set()
-            v1_scratchings_available = False
 
+    # ==========================================
+    # SPEED MAPS (needed before analysis for running position injection)
+    # ==========================================
+    progress('reading speed maps', 45)
+    import io as _io
+    import csv as _csv
+
+    csv_reader = _csv.DictReader(_io.StringIO(csv_data))
+    race_numbers = set()
+    for csv_row in csv_reader:
+        rn = csv_row.get('race number', '').strip()
+        if rn and rn.isdigit():
+            race_numbers.add(int(rn))
+
+    speedmaps = payloads['speedmaps']
+    missing = sorted(rn for rn in race_numbers if rn not in speedmaps and f'speedmap:{rn}' not in fetch_errors)
+    if missing:
+        # The meeting list did not name these races; fetch them now.
+        fetched, errors = fetch_concurrently({
+            rn: (pf_service.get_speedmap, meeting_id, rn, date_str) for rn in missing
+        })
+        speedmaps.update(fetched)
+        fetch_errors.update({f'speedmap:{rn}': e for rn, e in errors.items()})
+
+    combined_speedmap = {'payLoad': []}
+    all_speedmap_data = {}  # race_number (int) -> raw speed data for DB storage
+
+    for rn in sorted(race_numbers):
+        speed_data = speedmaps.get(rn)
+        if isinstance(speed_data, dict) and speed_data.get('payLoad'):
+            all_speedmap_data[rn] = speed_data
+            for item in speed_data.get('payLoad', []):
+                combined_speedmap['payLoad'].append(item)
+            logger.info(f"   ✅ Pre-fetched speed map for race {rn}")
+        elif f'speedmap:{rn}' in fetch_errors:
+            logger.warning(f"   ⚠️  Could not pre-fetch speedmap for race {rn}: {fetch_errors[f'speedmap:{rn}']}")
+        else:
+            logger.warning(f"   ⚠️  Empty speedmap payload for race {rn}")
+
+    # ==========================================
+    # PROCESS AND STORE (with all V2 data including speedmaps)
+    # ==========================================
+    progress('analysing', 60)
+    meeting = process_and_store_results(
+        csv_data=csv_data,
+        filename=meeting_name,
+        track_condition=track_condition,
+        user_id=user_id,
+        is_advanced=False,
+        puntingform_id=track_name,
+        speed_maps_data=combined_speedmap if combined_speedmap['payLoad'] else None,
+        ratings_data=sectionals_data,
+        sectionals_data=sectionals_data,
+        rail_position=rail_position,
+        scratched_set=scratched_set,
+        strike_rate_data=strike_rate_data,
+        v1_scratchings_available=v1_scratchings_available,
+        v2_scratched_set=v2_scratched_set,
+        v2_scratchings_available=v2_scratchings_available
+    )
+
+    meeting.date = date_obj.date()
+    meeting.rail_position = rail_position
+    meeting.pace_bias = 0  # Always starts neutral
+    db.session.commit()
+    progress('storing race data', 85, meeting_id=meeting.id)
+
+    # ==========================================
+    # STORE SPEED MAPS ON RACE RECORDS
+    # ==========================================
+    races = Race.query.filter_by(meeting_id=meeting.id).order_by(Race.race_number).all()
+
+    for race in races:
+        if race.race_number in all_speedmap_data:
+            race.speed_maps_json = json.dumps(all_speedmap_data[race.race_number])
+            logger.info(f"   ✅ Stored speed map for race {race.race_number}")
+            continue
+        # The pre-fetch above missed this race; try it once more.
         try:
-            v2_url = f"https://api.puntingform.com.au/v2/Updates/Scratchings?apiKey={pf_service.api_key}"
-            v2_response = requests.get(v2_url, headers={'accept': 'application/json'}, timeout=30)
-            if v2_response.ok:
-                v2_scratchings_available = True
-                v2_data = v2_response.json()
-                v2_items = v2_data.get('payLoad') if isinstance(v2_data, dict) else v2_data
-                v2_scratched_set, v2_debug_rows = _extract_v2_scratched_set(v2_items or [], track_name)
-                logger.info(
-                    "✅ Found %s explicit V2 update scratchings for %s: %s",
-                    len(v2_scratched_set),
-                    track_name,
-                    v2_debug_rows[:20],
-                )
-            else:
-                logger.warning(f"Could not fetch V2 scratchings: HTTP {v2_response.status_code}")
+            logger.info(f"📡 Fetching speed map for Race {race.race_number}")
+            speed_data = pf_service.get_speedmap(meeting_id, race.race_number, date_str)
+            if isinstance(speed_data, dict) and speed_data.get('payLoad'):
+                race.speed_maps_json = json.dumps(speed_data)
+                logger.info(f"   ✅ Stored speed map for race {race.race_number}")
         except Exception as e:
-            logger.warning(f"Could not fetch V2 scratchings: {e}")
-            v2_scratched_set = set()
-            v2_scratchings_available = False
-    
-        # ==========================================
-        # PRE-FETCH SPEED MAPS (needed before analysis for running position injection)
-        # ==========================================
-        import io as _io
-        import csv as _csv
-
-        csv_reader = _csv.DictReader(_io.StringIO(csv_data))
-        race_numbers = set()
-        for csv_row in csv_reader:
-            rn = csv_row.get('race number', '').strip()
-            if rn and rn.isdigit():
-                race_numbers.add(int(rn))
+            logger.error(f"   ❌ Error for race {race.race_number}: {str(e)}")
 
-        combined_speedmap = {'payLoad': []}
-        all_speedmap_data = {}  # race_number (int) -> raw speed data for DB storage
+    # Store sectionals data on ALL races
+    if sectionals_data and races:
+        for race in races:
+            race.sectionals_json = json.dumps(sectionals_data)
+            race.ratings_json = json.dumps(sectionals_data)
+        logger.info("✅ Stored sectionals/ratings data on all races")
 
-        for rn in sorted(race_numbers):
-            try:
-                speed_url = f"https://api.puntingform.com.au/v2/User/Speedmaps?meetingId={meeting_id}&raceNo={rn}&apiKey={pf_service.api_key}"
-                logger.info(f"📡 Pre-fetching speed map for Race {rn}")
-                speed_response = requests.get(speed_url, headers=headers, timeout=30)
-                if speed_response.ok:
-                    speed_data = speed_response.json()
-                    if isinstance(speed_data, dict) and speed_data.get('payLoad'):
-                        all_speedmap_data[rn] = speed_data
-                        for item in speed_data.get('payLoad', []):
-                            combined_speedmap['payLoad'].append(item)
-                        logger.info(f"   ✅ Pre-fetched speed map for race {rn}")
-                    else:
-                        logger.warning(f"   ⚠️  Empty speedmap payload for race {rn}")
-                else:
-                    logger.error(f"   ❌ HTTP {speed_response.status_code} for race {rn}")
-            except Exception as e:
-                logger.warning(f"   ⚠️  Could not pre-fetch speedmap for race {rn}: {e}")
+    db.session.commit()
 
-        # ==========================================
-        # PROCESS AND STORE (with all V2 data including speedmaps)
-        # ==========================================
-        meeting = process_and_store_results(
-            csv_data=csv_data,
-            filename=meeting_name,
-            track_condition=track_condition,
-            user_id=current_user.id,
-            is_advanced=False,
-            puntingform_id=track_name,
-            speed_maps_data=combined_speedmap if combined_speedmap['payLoad'] else None,
-            ratings_data=sectionals_data,
-            sectionals_data=sectionals_data,
-            rail_position=rail_position,
-            scratched_set=scratched_set,
-            strike_rate_data=strike_rate_data,
-            v1_scratchings_available=v1_scratchings_available,
-            v2_scratched_set=v2_scratched_set,
-            v2_scratchings_available=v2_scratchings_available
-        )
+    logger.info(f"✓ Imported {meeting_name} with V2 API data (speed maps, ratings, sectionals)")
+    # Scratch state has already been resolved and saved inside
+    # process_and_store_results using the final V1-over-V2 official set.
+    # Do not run a second V2-only zeroing pass here, because it can
+    # re-introduce stale scratched state for runners cleared by V1.
+    return meeting.id
 
-        meeting.date = date_obj.date()
-        meeting.rail_position = rail_position
-        meeting.pace_bias = 0  # Always starts neutral
-        db.session.commit()
 
-        # ==========================================
-        # STORE SPEED MAPS ON RACE RECORDS
-        # ==========================================
-        races = Race.query.filter_by(meeting_id=meeting.id).order_by(Race.race_number).all()
+import_job_queue = ImportJobQueue(app, run_meeting_import)
 
-        for race in races:
-            if race.race_number in all_speedmap_data:
-                race.speed_maps_json = json.dumps(all_speedmap_data[race.race_number])
-                logger.info(f"   ✅ Stored speed map for race {race.race_number}")
 
-        # Store sectionals data on ALL races
-        if sectionals_data and races:
-            for race in races:
-                race.sectionals_json = json.dumps(sectionals_data)
-                race.ratings_json = json.dumps(sectionals_data)
-            logger.info("✅ Stored sectionals/ratings data on all races")
+@app.route("/api/meetings/<meeting_id>/import", methods=["POST"])
+@login_required
+def api_import_meeting(meeting_id):
+    """Queue a PuntingForm meeting import and return its job id straight away.
 
-        db.session.commit()
-        
-        # ==========================================
-        # FETCH AND STORE SPEED MAPS PER RACE
-        # ==========================================
-        races = Race.query.filter_by(meeting_id=meeting.id).order_by(Race.race_number).all()
-        
-        for race in races:
-            try:
-                speed_url = f"https://api.puntingform.com.au/v2/User/Speedmaps?meetingId={meeting_id}&raceNo={race.race_number}&apiKey={pf_service.api_key}"
-                
-                logger.info(f"📡 Fetching speed map for Race {race.race_number}")
-                
-                speed_response = requests.get(speed_url, headers=headers, timeout=30)
-                
-                if speed_response.ok:
-                    speed_data = speed_response.json()
-                    
-                    if isinstance(speed_data, dict) and speed_data.get('payLoad'):
-                        race.speed_maps_json = json.dumps(speed_data)
-                        logger.info(f"   ✅ Stored speed map for race {race.race_number}")
-                else:
-                    logger.error(f"   ❌ HTTP {speed_response.status_code} for race {race.race_number}")
-                    
-            except Exception as e:
-                logger.error(f"   ❌ Error for race {race.race_number}: {str(e)}")
-        
-        # Store sectionals data on ALL races
-        if sectionals_data and races:
-            for race in races:
-                race.sectionals_json = json.dumps(sectionals_data)
-                race.ratings_json = json.dumps(sectionals_data)
-            logger.info("✅ Stored sectionals/ratings data on all races")
-        
-        db.session.commit()
-        
-        logger.info(f"✓ Imported {meeting_name} with V2 API data (speed maps, ratings, sectionals)")
-        # Scratch state has already been resolved and saved inside
-        # process_and_store_results using the final V1-over-V2 official set.
-        # Do not run a second V2-only zeroing pass here, because it can
-        # re-introduce stale scratched state for runners cleared by V1.
-        return jsonify({
-            'success': True,
-            'meeting_id': meeting.id,
-            'redirect_url': url_for('view_meeting', meeting_id=meeting.id)
-        })
-        
+    The import runs on an import job thread; the page polls
+    api_import_job_status for progress and the meeting link.
+    """
+    date_str = request.form.get('date') or datetime.now().strftime('%Y-%m-%d')
+    try:
+        datetime.strptime(date_str, '%Y-%m-%d')
+        rail_position = int(request.form.get('rail_position', 0))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        job, created = import_job_queue.enqueue({
+            'pf_meeting_id': meeting_id,
+            'date': date_str,
+            'track_condition': request.form.get('track_condition', 'good'),
+            'rail_position': rail_position,
+        }, current_user.id)
     except Exception as e:
-        logger.error(f"Import failed: {str(e)}", exc_info=True)
+        db.session.rollback()
+        logger.error(f"Import could not be queued: {str(e)}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+    payload = import_job_payload(job)
+    payload.update({
+        'success': True,
+        'deduplicated': not created,
+        'status_url': url_for('api_import_job_status', job_id=job.id),
+    })
+    return jsonify(payload), 202
+
+
+@app.route("/api/import-jobs/<job_id>")
+@login_required
+def api_import_job_status(job_id):
+    """Progress of a queued meeting import."""
+    job = db.session.get(ImportJob, job_id)
+    if job is None or (job.user_id != current_user.id and not current_user.is_admin):
+        return jsonify({'success': False, 'error': 'Import job not found'}), 404
+    if job.status == 'queued' or import_job_queue.is_stale(job):
+        # Picks up jobs left queued by a restarted process or a backoff timer,
+        # and requeues this one if the worker running it stopped responding.
+        import_job_queue.kick()
+    payload = import_job_payload(job)
+    payload['success'] = job.status != 'failed'
+    if job.status == 'succeeded' and job.meeting_id:
+        payload['redirect_url'] = url_for('view_meeting', meeting_id=job.meeting_id)
+    return jsonify(payload)
+
+
 @app.route("/import-from-api")
 @login_required
 def import_from_api():
@@ -4175,16 +4565,74 @@ def meeting_scratch_debug(meeting_id):
         logger.error(f"Scratch debug failed: {e}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+SCRATCHED_PREDICTION_FIELDS = {
+    'score': 0.0,
+    'predicted_odds': '',
+    'win_probability': '',
+    'performance_component': '',
+    'base_probability': '',
+    'notes': 'Scratched',
+    'ml_score': None,
+}
+
+
+def scratchings_changed_race_ids(races, scratched_names):
+    """Ids of races whose priced field no longer matches ``scratched_names``.
+
+    A race needs rescoring when a runner's scratch state flips, or when its
+    stored predictions disagree with the state it should have: an active
+    runner with no prediction (or the zero 'Scratched' one), or a scratched
+    runner still carrying a live price. Everything else keeps its
+    predictions, since the analyzer prices each race on its own.
+    """
+    changed = set()
+    for race in races:
+        for horse in race.horses:
+            scratched = normalize_runner_name(horse.horse_name) in scratched_names
+            prediction = horse.prediction
+            priced_as_scratched = prediction is not None and prediction.notes == 'Scratched'
+            if (
+                bool(horse.is_scratched) != scratched
+                or (not scratched and (prediction is None or priced_as_scratched))
+                or (scratched and prediction is not None and not priced_as_scratched)
+            ):
+                changed.add(race.id)
+                break
+    return changed
+
+
+def upsert_prediction(horse, fields):
+    """Write ``fields`` onto the runner's prediction, creating it if needed.
+
+    Returns True when a row was created or any value actually changed, so
+    unchanged runners in a rescored race cost no UPDATE.
+    """
+    prediction = horse.prediction
+    if prediction is None:
+        horse.prediction = Prediction(horse_id=horse.id, **fields)
+        db.session.add(horse.prediction)
+        return True
+    changed = False
+    for name, value in fields.items():
+        if getattr(prediction, name) != value:
+            setattr(prediction, name, value)
+            changed = True
+    return changed
+
+
 @app.route("/api/meetings/<int:meeting_id>/update-scratchings", methods=["POST"])
 @login_required
 def update_scratchings(meeting_id):
-    """Re-fetch fresh CSV + V2 data, exclude scratched horses, re-run analyzer, upsert predictions."""
+    """Apply the latest scratchings and reprice the races whose field changed.
+
+    Only races whose active field changed (see scratchings_changed_race_ids)
+    are re-run through the analyzer and ML model, and only predictions whose
+    values changed are written. ``?full=1`` reprices every race and refreshes
+    every active runner's CSV data, as a fresh import would.
+    """
+    full_refresh = request.args.get('full', '').strip().lower() in ('1', 'true', 'yes')
     try:
         meeting = Meeting.query.get_or_404(meeting_id)
-        headers = {
-            'Authorization': f'Bearer {pf_service.api_key}',
-            'Content-Type': 'application/json'
-        }
 
         # ── 1. Parse date and track from meeting name (format: YYMMDD_TrackName) ──
         if not meeting.meeting_name or '_' not in meeting.meeting_name:
@@ -4208,39 +4656,41 @@ def update_scratchings(meeting_id):
         if not pf_meeting_id:
             return jsonify({'success': False, 'error': f'Could not find meeting ID for {track_name} on {date_str}'}), 400
 
-        # ── 3. Fetch scratchings ──
+        # ── 3. Fetch both scratchings snapshots at once ──
+        snapshots, snapshot_errors = fetch_concurrently({
+            'v2': (pf_service.get_v2_scratchings,),
+            'v1': (pf_service.get_scratchings,),
+        })
         scratched_names = set()
         scratchings_snapshot_loaded = False
         try:
-            url = f"https://api.puntingform.com.au/v2/Updates/Scratchings?apiKey={pf_service.api_key}"
-            response = requests.get(url, headers={'accept': 'application/json'}, timeout=30)
-
-            if response.ok:
-                scratchings_snapshot_loaded = True
-                data = response.json()
-                items = data.get('payLoad') if isinstance(data, dict) else data
-                items = items or []
+            if 'v2' in snapshot_errors:
+                raise snapshot_errors['v2']
+            scratchings_snapshot_loaded = True
+            data = snapshots['v2']
+            items = data.get('payLoad') if isinstance(data, dict) else data
+            items = items or []
+
+            # build tab->horseName lookup from DB speedmaps
+            tab_name_lookup = {}
+            for race in meeting.races:
+                if race.speed_maps_json:
+                    sm = race.speed_maps_json if isinstance(race.speed_maps_json, dict) else json.loads(race.speed_maps_json)
+                    for it in sm.get('payLoad', [{}])[0].get('items', []):
+                        tab_no = it.get('tabNo', 0)
+                        try:
+                            tab_no = int(tab_no)
+                        except Exception:
+                            tab_no = 0
+                        tab_name_lookup[(race.race_number, tab_no)] = it.get('runnerName', '') or ''
 
-                # build tab->horseName lookup from DB speedmaps
-                tab_name_lookup = {}
-                for race in meeting.races:
-                    if race.speed_maps_json:
-                        sm = race.speed_maps_json if isinstance(race.speed_maps_json, dict) else json.loads(race.speed_maps_json)
-                        for it in sm.get('payLoad', [{}])[0].get('items', []):
-                            tab_no = it.get('tabNo', 0)
-                            try:
-                                tab_no = int(tab_no)
-                            except Exception:
-                                tab_no = 0
-                            tab_name_lookup[(race.race_number, tab_no)] = it.get('runnerName', '') or ''
-
-                scratched_names, scratch_debug_rows = _extract_v2_scratched_names(items, track_name, tab_name_lookup)
-                logger.info(
-                    "✅ Loaded %s explicit V2 scratchings for %s during update; sample=%s",
-                    len(scratched_names),
-                    track_name,
-                    scratch_debug_rows[:20],
-                )
+            scratched_names, scratch_debug_rows = _extract_v2_scratched_names(items, track_name, tab_name_lookup)
+            logger.info(
+                "✅ Loaded %s explicit V2 scratchings for %s during update; sample=%s",
+                len(scratched_names),
+                track_name,
+                scratch_debug_rows[:20],
+            )
 
         except Exception as e:
             logger.warning(f"Could not fetch scratchings: {e}")
@@ -4253,8 +4703,9 @@ def update_scratchings(meeting_id):
         # This makes the snapshot authoritative and clears stale DB scratches
         # for runners missing from the current official list.
         try:
-            scratch_data = pf_service.get_scratchings()
-            v1_scratched_set, v1_scratch_debug_rows = _extract_v1_scratched_set(scratch_data, track_name)
+            if 'v1' in snapshot_errors:
+                raise snapshot_errors['v1']
+            v1_scratched_set, v1_scratch_debug_rows = _extract_v1_scratched_set(snapshots['v1'], track_name)
             v1_scratched_names = set()
             for race in all_races:
                 for horse in race.horses:
@@ -4283,6 +4734,20 @@ def update_scratchings(meeting_id):
         # snapshot fetches failed, preserve current DB scratch state.
         all_scratched_names = scratched_names.copy() if scratchings_snapshot_loaded else existing_scratched_names
 
+        if full_refresh:
+            rescore_race_ids = {race.id for race in all_races}
+        else:
+            rescore_race_ids = scratchings_changed_race_ids(all_races, all_scratched_names)
+        rescore_races = sorted(
+            (race for race in all_races if race.id in rescore_race_ids),
+            key=lambda race: race.race_number,
+        )
+        rescore_race_numbers = [race.race_number for race in rescore_races]
+        logger.info(
+            "SCRATCHINGS_RESCORE meeting=%s mode=%s races=%s of=%s",
+            meeting_id, 'full' if full_refresh else 'delta', rescore_race_numbers, len(all_races),
+        )
+
         # ── 5. Mark ALL scratched horses in DB ──
         scratched_count = 0
         unscratched_count = 0
@@ -4297,56 +4762,58 @@ def update_scratchings(meeting_id):
                     unscratched_count += 1
         db.session.flush()
 
-        # ── 6. Fetch fresh CSV from PuntingForm ──
-        csv_data = pf_service.get_fields_csv(track_name, date_str)
+        if not rescore_races:
+            db.session.commit()
+            return jsonify({
+                'success': True,
+                'mode': 'delta',
+                'scratched_count': scratched_count,
+                'unscratched_count': unscratched_count,
+                'races_updated': 0,
+                'races_recomputed': [],
+                'predictions_upserted': 0,
+                'ml_rescored': 0,
+                'total_scratched': len(all_scratched_names),
+                'message': f'No field changes; nothing repriced. Total scratched: {len(all_scratched_names)}'
+            })
+
+        # ── 6-8. Fetch fresh CSV, sectionals/ratings and the repriced races' speedmaps concurrently ──
+        payloads = pf_service.fetch_meeting_payloads(
+            pf_meeting_id, track_name, date_str, race_numbers=rescore_race_numbers,
+            include=('fields', 'ratings', 'speedmaps'),
+        )
+        if 'fields' in payloads['errors']:
+            raise payloads['errors']['fields']
+        csv_data = payloads['fields']
         if not csv_data:
             return jsonify({'success': False, 'error': 'No CSV data returned from PuntingForm'}), 400
 
-        # ── 7. Fetch sectionals/ratings ──
-        sectionals_data = None
-        try:
-            sec_url = f"https://api.puntingform.com.au/v2/Ratings/MeetingRatings?meetingId={pf_meeting_id}&apiKey={pf_service.api_key}"
-            sec_response = requests.get(sec_url, headers=headers, timeout=30)
-            if sec_response.ok:
-                sectionals_data = sec_response.json()
-                logger.info(f"✅ Fetched sectionals/ratings for meeting {pf_meeting_id}")
-        except Exception as e:
-            logger.warning(f"Could not fetch sectionals: {e}")
-
-        # ── 8. Fetch speedmaps per race ──
-        import io as _io
-        import csv as _csv
-        csv_reader = _csv.DictReader(_io.StringIO(csv_data))
-        race_numbers = set()
-        for csv_row in csv_reader:
-            rn = csv_row.get('race number', '').strip()
-            if rn and rn.isdigit():
-                race_numbers.add(int(rn))
+        sectionals_data = payloads['ratings']
+        if sectionals_data is not None:
+            logger.info(f"✅ Fetched sectionals/ratings for meeting {pf_meeting_id}")
+        else:
+            logger.warning(f"Could not fetch sectionals: {payloads['errors'].get('ratings')}")
 
         combined_speedmap = {'payLoad': []}
         all_speedmap_data = {}
 
-        for rn in sorted(race_numbers):
-            try:
-                speed_url = f"https://api.puntingform.com.au/v2/User/Speedmaps?meetingId={pf_meeting_id}&raceNo={rn}&apiKey={pf_service.api_key}"
-                speed_response = requests.get(speed_url, headers=headers, timeout=30)
-                if speed_response.ok:
-                    speed_data = speed_response.json()
-                    if isinstance(speed_data, dict) and speed_data.get('payLoad'):
-                        all_speedmap_data[rn] = speed_data
-                        for item in speed_data.get('payLoad', []):
-                            combined_speedmap['payLoad'].append(item)
-                        logger.info(f"   ✅ Fetched speedmap for race {rn}")
-            except Exception as e:
-                logger.warning(f"Could not fetch speedmap for race {rn}: {e}")
+        for rn, speed_data in sorted(payloads['speedmaps'].items()):
+            if isinstance(speed_data, dict) and speed_data.get('payLoad'):
+                all_speedmap_data[rn] = speed_data
+                for item in speed_data.get('payLoad', []):
+                    combined_speedmap['payLoad'].append(item)
+                logger.info(f"   ✅ Fetched speedmap for race {rn}")
 
-        # ── 9. Parse CSV and remove scratched horses for analysis ──
+        # ── 9. Parse CSV and keep the active runners of the races being repriced ──
         parsed_csv = parseCSV(csv_data)
         active_csv = []
         fresh_csv_lookup = {}
+        rescore_race_keys = {str(race_number) for race_number in rescore_race_numbers}
         for row in parsed_csv:
             norm = normalize_runner_name(row.get('horse name', ''))
             race_num = str(row.get('race number', '')).strip()
+            if race_num not in rescore_race_keys:
+                continue
             if race_num and norm:
                 fresh_csv_lookup[(race_num, norm)] = row
 
@@ -4451,19 +4918,13 @@ def update_scratchings(meeting_id):
                 races_data[race_num] = []
             races_data[race_num].append(result)
 
-        # ── 15. DELETE ALL existing predictions first ──
-        for race in all_races:
-            for horse in race.horses:
-                if horse.prediction:
-                    db.session.delete(horse.prediction)
-        db.session.flush()
-
-        # ── 16. Create predictions for ALL horses ──
+        # ── 15. Upsert predictions for the repriced races ──
         rail_pos = meeting.rail_position or 0
         pace_bias = meeting.pace_bias or 0
         races_updated = 0
+        predictions_upserted = 0
 
-        for race in all_races:
+        for race in rescore_races:
             race_num_str = str(race.race_number)
             horses_results = races_data.get(race_num_str, [])
             result_lookup = {}
@@ -4485,18 +4946,10 @@ def update_scratchings(meeting_id):
                 horse.is_scratched = final_is_scratched
 
                 if final_is_scratched:
-                    # Create zero prediction for scratched horses
-                    pred = Prediction(
-                        horse_id=horse.id,
-                        score=0.0,
-                        predicted_odds='',
-                        win_probability='',
-                        performance_component='',
-                        base_probability='',
-                        notes='Scratched'
-                    )
-                    db.session.add(pred)
-                    updated_any = True
+                    # Zero prediction for scratched horses
+                    if upsert_prediction(horse, SCRATCHED_PREDICTION_FIELDS):
+                        predictions_upserted += 1
+                        updated_any = True
                 else:
                     # Create normal prediction for active horses
                     r = result_lookup.get(horse_norm)
@@ -4535,21 +4988,43 @@ def update_scratchings(meeting_id):
                     if running_position and pace_bias:
                         base_score = round(base_score + _bias_adjustment(running_position, rail_pos, pace_bias), 1)
 
-                    pred = Prediction(
-                        horse_id=horse.id,
-                        score=base_score,
-                        predicted_odds=r.get('trueOdds', ''),
-                        win_probability=r.get('winProbability', ''),
-                        performance_component=r.get('performanceComponent', ''),
-                        base_probability=r.get('baseProbability', ''),
-                        notes=r.get('notes', '')
-                    )
-                    db.session.add(pred)
-                    updated_any = True
+                    if upsert_prediction(horse, {
+                        'score': base_score,
+                        'predicted_odds': r.get('trueOdds', ''),
+                        'win_probability': r.get('winProbability', ''),
+                        'performance_component': r.get('performanceComponent', ''),
+                        'base_probability': r.get('baseProbability', ''),
+                        'notes': r.get('notes', ''),
+                    }):
+                        predictions_upserted += 1
+                        updated_any = True
 
             if updated_any:
                 races_updated += 1
+        db.session.flush()
+
+        # ── 16. Re-score the repriced races with the ML model ──
+        # ML scores are min-max normalised within each race, so only the
+        # repriced races move; other races keep their stored ml_score.
+        ml_rescored = 0
+        ml_error = None
+        try:
+            from ml_predict import predict_meeting
+
+            ml_scores, _ml_by_race = predict_meeting(meeting_id, db.session, race_ids=rescore_race_ids)
+            for race in rescore_races:
+                for horse in race.horses:
+                    if horse.is_scratched or not horse.prediction or horse.id not in ml_scores:
+                        continue
+                    if horse.prediction.ml_score != ml_scores[horse.id]:
+                        horse.prediction.ml_score = ml_scores[horse.id]
+                        ml_rescored += 1
+        except Exception as e:
+            ml_error = str(e)
+            logger.warning("ML rescoring skipped for meeting %s races %s: %s", meeting_id, rescore_race_numbers, e)
 
+        store_meeting_runners(meeting)
+        refresh_best_bet_candidates([meeting.id])
         db.session.commit()
 
         import gc
@@ -4557,11 +5032,20 @@ def update_scratchings(meeting_id):
 
         return jsonify({
             'success': True,
+            'mode': 'full' if full_refresh else 'delta',
             'scratched_count': scratched_count,
             'unscratched_count': unscratched_count,
             'races_updated': races_updated,
+            'races_recomputed': rescore_race_numbers,
+            'predictions_upserted': predictions_upserted,
+            'ml_rescored': ml_rescored,
+            'ml_error': ml_error,
             'total_scratched': len(all_scratched_names),
-            'message': f'Updated {scratched_count} new scratching(s), {unscratched_count} unscratched, repriced {races_updated} race(s). Total scratched: {len(all_scratched_names)}'
+            'message': (
+                f'Updated {scratched_count} new scratching(s), {unscratched_count} unscratched, '
+                f'repriced race(s) {", ".join(f"R{n}" for n in rescore_race_numbers)}. '
+                f'Total scratched: {len(all_scratched_names)}'
+            )
         })
 
     except Exception as e:
@@ -4580,96 +5064,22 @@ def fetch_automatic_results(meeting_id):
         return redirect(url_for('results_entry', meeting_id=meeting_id))
     
     try:
-        track_name = meeting.puntingform_id
-        
-        # Get date from meeting name (format: YYMMDD_Track)
-        if meeting.meeting_name and '_' in meeting.meeting_name:
-            date_part = meeting.meeting_name.split('_')[0]
-            # Convert YYMMDD to YYYY-MM-DD
-            year = '20' + date_part[:2]
-            month = date_part[2:4]
-            day = date_part[4:6]
-            date_str = f"{year}-{month}-{day}"
-        else:
+        settled = settle_meetings(db, [meeting], current_user.id, pf_service=pf_service)[0]
+        db.session.commit()
+
+        if settled['status'] == 'skipped':
             flash("⚠️ Could not determine meeting date", "warning")
-            return redirect(url_for('results_entry', meeting_id=meeting_id))
-        
-        # Fetch results using V1 method (track_name + date)
-        results_response = pf_service.get_results(track_name, date_str)
-        
-        # Check for errors
-        if results_response.get('IsError'):
+        elif settled['status'] == 'error':
+            flash(f"✗ Failed to fetch results: {settled['reason']}", "danger")
+        elif settled.get('reason') == 'results not available':
             flash("⚠️ Results not yet available for this meeting", "warning")
-            return redirect(url_for('results_entry', meeting_id=meeting_id))
-        
-        # V1 API returns format: {"Result": [{"RaceNumber": 1, "Runners": [...]}]}
-        races_results = results_response.get('RaceDetails', [])
-        
-        if not races_results:
+        elif 'matched' not in settled:
             flash("⚠️ No results available yet", "warning")
-            return redirect(url_for('results_entry', meeting_id=meeting_id))
-        
-        horses_updated = 0
-        
-        # Process each race's results
-        for race_result in races_results:
-            race_num = race_result.get('RaceNumber')
-            runners = race_result.get('Runners', [])
-            
-            # Find the race in our database
-            race = Race.query.filter_by(
-                meeting_id=meeting_id,
-                race_number=race_num
-            ).first()
-            
-            if not race:
-                continue
-            
-            # Process each runner
-            for runner in runners:
-                horse_name = runner.get('Name', '').strip()
-                finish_pos = runner.get('Position', 0)
-                sp = runner.get('Price_SP', 0)
-                
-                if not horse_name:
-                    continue
-                
-                # Handle unplaced horses (5th or worse)
-                if finish_pos > 4:
-                    finish_pos = 5
-                elif finish_pos == 0:
-                    finish_pos = 0
-                
-                # Find horse by name (case-insensitive)
-                horse = Horse.query.filter(
-                    Horse.race_id == race.id,
-                    db.func.lower(Horse.horse_name) == horse_name.lower()
-                ).first()
-                
-                if not horse:
-                    continue
-                
-                # Create or update result
-                if horse.result:
-                    horse.result.finish_position = finish_pos
-                    horse.result.sp = sp
-                    horse.result.recorded_at = datetime.utcnow()
-                    horse.result.recorded_by = current_user.id
-                else:
-                    result = Result(
-                        horse_id=horse.id,
-                        finish_position=finish_pos,
-                        sp=sp,
-                        recorded_by=current_user.id
-                    )
-                    db.session.add(result)
-                
-                horses_updated += 1
-        
-        db.session.commit()
-        flash(f"✓ Auto-fetched results for {horses_updated} horses from PuntingForm", "success")
+        else:
+            flash(f"✓ Auto-fetched results for {settled['matched']} horses from PuntingForm", "success")
         
     except Exception as e:
+        db.session.rollback()
         logger.error(f"Auto-fetch error: {str(e)}", exc_info=True)
         flash(f"✗ Failed to fetch results: {str(e)}", "danger")
     
@@ -4772,10 +5182,10 @@ def history():
 @login_required
 def view_meeting(meeting_id):
     """View analysis results for a meeting"""
-    meeting = Meeting.query.get_or_404(meeting_id)
-    
     # All logged-in users can view all meetings
     results = get_meeting_results(meeting_id)
+    # Already in the session from get_meeting_results; no further query.
+    meeting = Meeting.query.get_or_404(meeting_id)
     return render_template(
         "view_meeting.html",
         meeting=meeting,
@@ -4810,7 +5220,8 @@ def toggle_horse_scratch(horse_id):
                 h.prediction.win_probability = f"{new_prob:.1f}%"
                 h.prediction.predicted_odds = f"${new_odds:.2f}"
 
-        db.session.commit()
+    refresh_best_bet_candidates([horse.race.meeting_id])
+    db.session.commit()
 
     return jsonify({
         'success': True,
@@ -4886,6 +5297,7 @@ def update_meeting_bias(meeting_id):
                 h.prediction.win_probability = f"{new_prob:.1f}%"
                 h.prediction.predicted_odds = f"${new_odds:.2f}"
 
+    refresh_best_bet_candidates([meeting_id])
     db.session.commit()
     logger.info(f"✅ Updated pace_bias to {new_bias} for meeting {meeting_id}, adjusted {updated_count} horses")
 
@@ -5058,29 +5470,8 @@ def api_results_complete():
 @login_required
 def results_entry(meeting_id):
     """Form to enter results for a meeting"""
+    results = get_meeting_results(meeting_id, include_results=True)
     meeting = Meeting.query.get_or_404(meeting_id)
-    results = get_meeting_results(meeting_id)
-    
-    # Add result data to each horse
-    for race in results['races']:
-        for horse in race['horses']:
-            # Find the horse record to get any existing result
-            horse_record = Horse.query.filter_by(
-                race_id=Race.query.filter_by(
-                    meeting_id=meeting_id, 
-                    race_number=race['race_number']
-                ).first().id,
-                horse_name=horse['horse_name']
-            ).first()
-            
-            if horse_record and horse_record.result:
-                horse['result_finish'] = horse_record.result.finish_position
-                horse['result_sp'] = horse_record.result.sp
-            else:
-                horse['result_finish'] = None
-                horse['result_sp'] = None
-            
-            horse['horse_id'] = horse_record.id if horse_record else None
     
     return render_template("results_entry.html", meeting=meeting, results=results)
 
@@ -5309,7 +5700,7 @@ def admin_panel():
                     notes=notes
                 )
                 db.session.add(new_component)
-                db.session.commit()
+                recompute_best_bet_candidates_for_components()
                 flash(f"Component '{comp_name}' created successfully", "success")
         
         elif action == "edit_component":
@@ -5333,7 +5724,7 @@ def admin_panel():
                     component.strike_rate = 0.0
                 
                 component.last_updated = datetime.utcnow()
-                db.session.commit()
+                recompute_best_bet_candidates_for_components()
                 flash(f"Component '{component.component_name}' updated successfully", "success")
         
         elif action == "toggle_component":
@@ -5345,7 +5736,7 @@ def admin_panel():
             else:
                 component.is_active = not component.is_active
                 component.last_updated = datetime.utcnow()
-                db.session.commit()
+                recompute_best_bet_candidates_for_components()
                 status = "activated" if component.is_active else "deactivated"
                 flash(f"Component '{component.component_name}' has been {status}", "success")
         
@@ -5358,7 +5749,7 @@ def admin_panel():
             else:
                 comp_name = component.component_name
                 db.session.delete(component)
-                db.session.commit()
+                recompute_best_bet_candidates_for_components()
                 flash(f"Component '{comp_name}' deleted", "success")
         # NEW COMPONENT ACTIONS END HERE
         
@@ -5888,8 +6279,8 @@ def _apply_joint_kelly_stakes(race, meeting, track_name, date_str):
 @login_required
 def ml_view_meeting(meeting_id):
     """View a meeting ranked by ML scores."""
-    meeting = Meeting.query.get_or_404(meeting_id)
     results = get_meeting_results(meeting_id)
+    meeting = Meeting.query.get_or_404(meeting_id)
     track_name = _track_from_meeting(meeting)
     date_str = meeting.date.strftime('%Y-%m-%d') if meeting.date else None
 
@@ -6201,6 +6592,156 @@ def _parse_finish_position(value):
     except ValueError:
         return None
 
+MEETING_PREVIOUS_TRACK_CANDIDATES = [
+    'previous-run track', 'previous run track', 'previous track', 'prev track',
+    'last-start track', 'last start track', 'last run track', 'last race track',
+    'form track'
+]
+
+
+def _resolve_meeting_csv_columns(csv_data):
+    """Detect the jurisdiction columns of a meeting's uploaded CSV.
+
+    Stored on Meeting.csv_columns by store_meeting_runners so header
+    discovery runs once per meeting rather than on every analytics request.
+    Returns None for a blank or unreadable CSV. 'headers' is only kept when no
+    previous-run track column was found, for the jurisdiction debug payload.
+    """
+    if not csv_data or not str(csv_data).strip():
+        return None
+    try:
+        reader = csv.DictReader(io.StringIO(csv_data))
+        headers = reader.fieldnames or []
+        first_row = next(reader, None) or {}
+    except Exception as exc:
+        logger.warning("MEETING_CSV_COLUMNS unreadable_csv error=%s", exc)
+        return None
+
+    current_track_column = _find_csv_column(headers, candidates=['track'])
+    previous_track_column = _find_csv_column(
+        headers,
+        candidates=MEETING_PREVIOUS_TRACK_CANDIDATES,
+        required_terms=['track'],
+        excluded_terms=['condition']
+    )
+    if previous_track_column == current_track_column:
+        previous_track_column = _find_csv_column(headers, candidates=['form track'])
+    has_previous_track = bool(previous_track_column) and previous_track_column != current_track_column
+
+    return {
+        'current_track_column': current_track_column,
+        'previous_track_column': previous_track_column if has_previous_track else None,
+        'finish_column': _find_current_race_finish_column(headers),
+        'price_column': _find_jurisdiction_price_column(headers),
+        'result_headers': _collect_csv_headers_with_terms(headers, JURISDICTION_RESULT_DEBUG_TERMS),
+        'headers': None if has_previous_track else headers,
+        'first_track': _normalise_track_name(first_row.get(current_track_column, '')) if current_track_column else '',
+    }
+
+
+def _meeting_jurisdiction_state(csv_columns, meeting_name, track_to_state):
+    """Australian state of a meeting: its first CSV runner's track, else the
+    track segment of meeting_name. None outside AUSTRALIAN_JURISDICTION_STATES."""
+    state = track_to_state.get(_track_lookup_key((csv_columns or {}).get('first_track') or ''))
+    if state not in AUSTRALIAN_JURISDICTION_STATES:
+        fallback_track = meeting_name.split('_')[1] if meeting_name and '_' in meeting_name else (meeting_name or '')
+        state = track_to_state.get(_track_lookup_key(_normalise_track_name(fallback_track)))
+    return state if state in AUSTRALIAN_JURISDICTION_STATES else None
+
+
+def _meeting_runner_row(meeting_id, horse_id, horse_name, horse_csv_data, csv_columns, track_to_state):
+    """meeting_runners mapping for one stored Horse, or None for a repeated header row."""
+    row = horse_csv_data if isinstance(horse_csv_data, dict) else {}
+    current_track_column = csv_columns['current_track_column']
+    previous_track_column = csv_columns['previous_track_column']
+    if _is_repeated_csv_header_row(row, current_track_column, previous_track_column):
+        return None
+
+    current_track = _normalise_track_name(row.get(current_track_column, ''))[:100]
+    previous_track = _normalise_track_name(row.get(previous_track_column, ''))[:100]
+    horse_name = (horse_name or row.get('horse name') or row.get('Horse Name') or row.get('horse') or '').strip()
+    finish_column = csv_columns.get('finish_column')
+    price_column = csv_columns.get('price_column')
+    return {
+        'meeting_id': meeting_id,
+        'horse_id': horse_id,
+        'horse_key': horse_name.upper()[:100] or None,
+        'current_track': current_track,
+        'current_state': track_to_state.get(_track_lookup_key(current_track)),
+        'previous_track': previous_track,
+        'previous_state': track_to_state.get(_track_lookup_key(previous_track)),
+        'csv_finish_position': _parse_finish_position(row.get(finish_column)) if finish_column else None,
+        'csv_price': _parse_decimal_price(row.get(price_column)) if price_column else None,
+    }
+
+
+def store_meeting_runners(meeting, track_to_state=None):
+    """Rebuild a meeting's meeting_runners rows, csv_columns and jurisdiction_state.
+
+    Called at import (process_and_store_results), after a scratchings refresh
+    rewrites Horse.csv_data, and by backfill_meeting_runners for meetings
+    imported before the table existed. Runs in the caller's transaction;
+    the caller commits. Returns the number of runner rows written.
+    """
+    track_to_state = track_to_state or _build_track_to_state()
+    csv_columns = _resolve_meeting_csv_columns(meeting.csv_data) or {}
+    meeting.csv_columns = csv_columns
+    meeting.jurisdiction_state = _meeting_jurisdiction_state(csv_columns, meeting.meeting_name, track_to_state)
+
+    MeetingRunner.query.filter_by(meeting_id=meeting.id).delete(synchronize_session=False)
+    if not (csv_columns.get('current_track_column') and csv_columns.get('previous_track_column')):
+        return 0
+
+    horses = db.session.query(Horse.id, Horse.horse_name, Horse.csv_data).join(
+        Race, Race.id == Horse.race_id
+    ).filter(Race.meeting_id == meeting.id).all()
+    rows = []
+    for horse_id, horse_name, horse_csv_data in horses:
+        row = _meeting_runner_row(meeting.id, horse_id, horse_name, horse_csv_data, csv_columns, track_to_state)
+        if row:
+            rows.append(row)
+    if rows:
+        db.session.bulk_insert_mappings(MeetingRunner, rows)
+    return len(rows)
+
+
+def backfill_meeting_runners(batch_size=100, rebuild=False):
+    """Parse every meeting whose csv_columns is still NULL (all with rebuild).
+
+    Runs from the release step (release_tasks.backfill_derived_tables) and
+    scripts/backfill_meeting_runners.py, never from a request: the
+    jurisdiction and state analytics only read meeting_runners and report
+    how many meetings are still unparsed.
+    Commits once per batch and returns the number of meetings parsed.
+    """
+    query = db.session.query(Meeting.id).order_by(Meeting.id)
+    if not rebuild:
+        query = query.filter(Meeting.csv_columns.is_(None))
+    meeting_ids = [meeting_id for (meeting_id,) in query.all()]
+    if not meeting_ids:
+        return 0
+
+    track_to_state = _build_track_to_state()
+    runners = 0
+    for start in range(0, len(meeting_ids), batch_size):
+        batch = meeting_ids[start:start + batch_size]
+        for meeting in Meeting.query.filter(Meeting.id.in_(batch)).all():
+            runners += store_meeting_runners(meeting, track_to_state)
+        db.session.commit()
+        db.session.expunge_all()
+        logger.info(
+            "MEETING_RUNNERS_BACKFILL meetings=%s/%s runners=%s",
+            min(start + batch_size, len(meeting_ids)), len(meeting_ids), runners
+        )
+    return len(meeting_ids)
+
+
+def unparsed_meeting_count():
+    """Meetings the analytics skip because backfill_meeting_runners has not parsed them yet."""
+    from sqlalchemy import func
+
+    return db.session.query(func.count(Meeting.id)).filter(Meeting.csv_columns.is_(None)).scalar() or 0
+
 
 @app.route("/api/data/jurisdiction-strength")
 @login_required
@@ -6212,190 +6753,134 @@ def api_jurisdiction_strength():
 
     try:
         from collections import Counter, defaultdict
+        from sqlalchemy import and_, case, distinct, func
 
-        track_to_state = _build_track_to_state()
-        def _jurisdiction_bucket():
-            return {
-                'interstate_runs': 0,
-                'horses': set(),
-                'result_runs': 0,
-                'wins': 0,
-                'places': 0,
-                'destination_state_breakdown': Counter(),
-                'sp_total': 0.0,
-                'total_staked': 0,
-                'total_return': 0.0
-            }
+        meetings_query = db.session.query(Meeting.id, Meeting.csv_columns).filter(Meeting.csv_columns.isnot(None))
+        ml_meeting_ids = None
+        if use_ml:
+            ml_meeting_ids = db.session.query(Meeting.id).join(Race, Race.meeting_id == Meeting.id)
+            ml_meeting_ids = ml_meeting_ids.join(Horse, Horse.race_id == Race.id)
+            ml_meeting_ids = ml_meeting_ids.join(Prediction, Prediction.horse_id == Horse.id)
+            ml_meeting_ids = _filter_ml_predictions(ml_meeting_ids).distinct()
+            meetings_query = meetings_query.filter(Meeting.id.in_(ml_meeting_ids))
 
-        stats = defaultdict(_jurisdiction_bucket)
-        matrix_stats = defaultdict(_jurisdiction_bucket)
-        unmapped_tracks = Counter()
         meetings_processed = 0
-        rows_processed = 0
-        interstate_rows = 0
         previous_track_column = None
         finish_position_column = None
         price_column = None
-        results_source = None
         result_related_headers = []
         result_related_header_set = set()
         sample_headers_without_previous_track = []
-        meeting_column_map = {}
-
-        meetings_query = db.session.query(Meeting.id, Meeting.csv_data).filter(Meeting.csv_data.isnot(None))
-        if use_ml:
-            meetings_query = meetings_query.join(Race, Race.meeting_id == Meeting.id)
-            meetings_query = meetings_query.join(Horse, Horse.race_id == Race.id)
-            meetings_query = meetings_query.join(Prediction, Prediction.horse_id == Horse.id)
-            meetings_query = _filter_ml_predictions(meetings_query).distinct()
-        meetings = meetings_query.all()
-
-        for meeting_id, csv_data in meetings:
-            if not csv_data or not str(csv_data).strip():
+        for meeting_id, csv_columns in meetings_query.order_by(Meeting.id).all():
+            if not csv_columns:
                 continue
-
             meetings_processed += 1
-            try:
-                reader = csv.DictReader(io.StringIO(csv_data))
-            except Exception as exc:
-                logger.warning(f"Jurisdiction strength CSV reader failed for meeting {meeting_id}: {exc}")
-                continue
-
-            headers = reader.fieldnames or []
-            current_track_column = _find_csv_column(headers, candidates=['track'])
-            meeting_previous_track_column = _find_csv_column(
-                headers,
-                candidates=[
-                    'previous-run track', 'previous run track', 'previous track', 'prev track',
-                    'last-start track', 'last start track', 'last run track', 'last race track',
-                    'form track'
-                ],
-                required_terms=['track'],
-                excluded_terms=['condition']
-            )
-            meeting_finish_column = _find_current_race_finish_column(headers)
-            meeting_price_column = _find_jurisdiction_price_column(headers)
-            for header in _collect_csv_headers_with_terms(headers, JURISDICTION_RESULT_DEBUG_TERMS):
+            for header in csv_columns.get('result_headers') or []:
                 if header not in result_related_header_set:
                     result_related_headers.append(header)
                     result_related_header_set.add(header)
-
-            if meeting_previous_track_column == current_track_column:
-                meeting_previous_track_column = _find_csv_column(headers, candidates=['form track'])
-
-            if meeting_previous_track_column and meeting_previous_track_column != current_track_column:
-                previous_track_column = previous_track_column or meeting_previous_track_column
+            if csv_columns.get('previous_track_column'):
+                previous_track_column = previous_track_column or csv_columns['previous_track_column']
             elif len(sample_headers_without_previous_track) < 5:
-                sample_headers_without_previous_track.append({'meeting_id': meeting_id, 'headers': headers})
-                logger.debug(
-                    "Jurisdiction strength could not find previous-run track column for meeting %s. Headers: %s",
-                    meeting_id,
-                    headers
-                )
-
-            if meeting_finish_column:
-                finish_position_column = finish_position_column or meeting_finish_column
-            if meeting_price_column:
-                price_column = price_column or meeting_price_column
-
-            if not current_track_column or not meeting_previous_track_column or meeting_previous_track_column == current_track_column:
-                continue
-
-            meeting_column_map[meeting_id] = {
-                'current_track_column': current_track_column,
-                'previous_track_column': meeting_previous_track_column,
-                'finish_column': meeting_finish_column,
-                'price_column': meeting_price_column
-            }
-
-        horse_rows = db.session.query(
-            Meeting.id,
-            Horse.horse_name,
-            Horse.csv_data,
-            Horse.is_scratched,
-            Result.finish_position,
-            Result.sp
-        ).join(
-            Race, Race.meeting_id == Meeting.id
-        ).join(
-            Horse, Horse.race_id == Race.id
+                sample_headers_without_previous_track.append({'meeting_id': meeting_id, 'headers': csv_columns.get('headers') or []})
+            finish_position_column = finish_position_column or csv_columns.get('finish_column')
+            price_column = price_column or csv_columns.get('price_column')
+
+        # Runners that ran: not scratched on the Horse row nor in Result.
+        # Result wins over the CSV for both finish position and price.
+        runners = db.session.query(MeetingRunner).join(
+            Horse, Horse.id == MeetingRunner.horse_id
         ).outerjoin(
             Result, Result.horse_id == Horse.id
-        ).all()
-
-        for meeting_id, horse_name, horse_csv_data, is_scratched, recorded_finish_position, sp in horse_rows:
-            column_map = meeting_column_map.get(meeting_id)
-            if not column_map or is_scratched:
-                continue
-
-            row = horse_csv_data or {}
-            current_track_column = column_map['current_track_column']
-            meeting_previous_track_column = column_map['previous_track_column']
-            meeting_finish_column = column_map['finish_column']
-            meeting_price_column = column_map.get('price_column')
-
-            if _is_repeated_csv_header_row(row, current_track_column, meeting_previous_track_column):
-                continue
-            if recorded_finish_position == SCRATCHED_FINISH_POSITION:
-                # Some scratches are only recorded in Result, so keep this separate from Horse.is_scratched.
-                continue
-
-            rows_processed += 1
-            current_track = _normalise_track_name(row.get(current_track_column, ''))
-            previous_track = _normalise_track_name(row.get(meeting_previous_track_column, ''))
-            horse_name = (horse_name or row.get('horse name') or row.get('Horse Name') or row.get('horse') or '').strip()
-
-            raw_current_state = track_to_state.get(_track_lookup_key(current_track))
-            raw_previous_state = track_to_state.get(_track_lookup_key(previous_track))
-
-            if current_track and not raw_current_state:
-                unmapped_tracks[current_track] += 1
-            if previous_track and not raw_previous_state:
-                unmapped_tracks[previous_track] += 1
+        ).filter(
+            Horse.is_scratched.isnot(True),
+            (Result.finish_position.is_(None)) | (Result.finish_position != SCRATCHED_FINISH_POSITION),
+        )
+        if ml_meeting_ids is not None:
+            runners = runners.filter(MeetingRunner.meeting_id.in_(ml_meeting_ids))
 
-            current_state = raw_current_state if raw_current_state in AUSTRALIAN_JURISDICTION_STATES else None
-            previous_state = raw_previous_state if raw_previous_state in AUSTRALIAN_JURISDICTION_STATES else None
+        finish_position = func.coalesce(Result.finish_position, MeetingRunner.csv_finish_position)
+        price = case((Result.sp > 0, Result.sp), else_=MeetingRunner.csv_price)
+        has_result = finish_position.isnot(None)
+        priced_result = and_(has_result, price.isnot(None))
 
-            if not current_state or not previous_state or current_state == previous_state:
-                continue
+        def _count_where(condition):
+            return func.sum(case((condition, 1), else_=0))
 
-            interstate_rows += 1
-            bucket = stats[previous_state]
-            matrix_bucket = matrix_stats[(previous_state, current_state)]
-            bucket['interstate_runs'] += 1
-            matrix_bucket['interstate_runs'] += 1
-            if horse_name:
-                bucket['horses'].add(horse_name.upper())
-                matrix_bucket['horses'].add(horse_name.upper())
-            bucket['destination_state_breakdown'][current_state] += 1
-
-            finish_position = None
-            if recorded_finish_position is not None:
-                finish_position = recorded_finish_position
-                results_source = results_source or 'results_table'
-            elif meeting_finish_column:
-                finish_position = _parse_finish_position(row.get(meeting_finish_column))
-                if finish_position is not None:
-                    results_source = results_source or 'csv'
-
-            price = _parse_decimal_price(sp)
-            if price is None and meeting_price_column:
-                price = _parse_decimal_price(row.get(meeting_price_column))
-
-            if finish_position is None:
-                continue
+        interstate = runners.filter(
+            MeetingRunner.previous_state.in_(AUSTRALIAN_JURISDICTION_STATES),
+            MeetingRunner.current_state.in_(AUSTRALIAN_JURISDICTION_STATES),
+            MeetingRunner.previous_state != MeetingRunner.current_state,
+        )
+        pair_rows = interstate.with_entities(
+            MeetingRunner.previous_state,
+            MeetingRunner.current_state,
+            func.count(MeetingRunner.id),
+            func.count(distinct(MeetingRunner.horse_key)),
+            _count_where(has_result),
+            _count_where(finish_position == 1),
+            _count_where(finish_position.in_([1, 2, 3])),
+            func.sum(case((priced_result, price), else_=0.0)),
+            _count_where(priced_result),
+            func.sum(case((and_(priced_result, finish_position == 1), price), else_=0.0)),
+            _count_where(Result.finish_position.isnot(None)),
+            _count_where(and_(Result.finish_position.is_(None), MeetingRunner.csv_finish_position.isnot(None))),
+        ).group_by(MeetingRunner.previous_state, MeetingRunner.current_state).all()
+        origin_horses = dict(interstate.with_entities(
+            MeetingRunner.previous_state, func.count(distinct(MeetingRunner.horse_key))
+        ).group_by(MeetingRunner.previous_state).all())
 
-            bucket['result_runs'] += 1
-            matrix_bucket['result_runs'] += 1
-            if finish_position == 1:
-                bucket['wins'] += 1
-                matrix_bucket['wins'] += 1
-            if finish_position in {1, 2, 3}:
-                bucket['places'] += 1
-                matrix_bucket['places'] += 1
+        def _jurisdiction_bucket():
+            return {
+                'interstate_runs': 0,
+                'unique_horses': 0,
+                'result_runs': 0,
+                'wins': 0,
+                'places': 0,
+                'destination_state_breakdown': Counter(),
+                'sp_total': 0.0,
+                'total_staked': 0,
+                'total_return': 0.0
+            }
 
-            _add_jurisdiction_roi(bucket, price, finish_position)
-            _add_jurisdiction_roi(matrix_bucket, price, finish_position)
+        stats = defaultdict(_jurisdiction_bucket)
+        matrix_stats = {}
+        interstate_rows = 0
+        recorded_results = csv_results = 0
+        for (origin_state, destination_state, runs, horses, result_runs, wins, places,
+             sp_total, total_staked, total_return, recorded, from_csv) in pair_rows:
+            matrix_bucket = matrix_stats[(origin_state, destination_state)] = _jurisdiction_bucket()
+            matrix_bucket.update({
+                'interstate_runs': int(runs),
+                'unique_horses': int(horses),
+                'result_runs': int(result_runs or 0),
+                'wins': int(wins or 0),
+                'places': int(places or 0),
+                'sp_total': float(sp_total or 0.0),
+                'total_staked': int(total_staked or 0),
+                'total_return': float(total_return or 0.0),
+            })
+            bucket = stats[origin_state]
+            for field in ('interstate_runs', 'result_runs', 'wins', 'places', 'sp_total', 'total_staked', 'total_return'):
+                bucket[field] += matrix_bucket[field]
+            bucket['destination_state_breakdown'][destination_state] += int(runs)
+            interstate_rows += int(runs)
+            recorded_results += int(recorded or 0)
+            csv_results += int(from_csv or 0)
+        for origin_state, bucket in stats.items():
+            bucket['unique_horses'] = int(origin_horses.get(origin_state) or 0)
+        results_source = 'results_table' if recorded_results else ('csv' if csv_results else None)
+
+        rows_processed = runners.with_entities(func.count(MeetingRunner.id)).scalar() or 0
+        unmapped_tracks = Counter()
+        for track_column, state_column in (
+            (MeetingRunner.current_track, MeetingRunner.current_state),
+            (MeetingRunner.previous_track, MeetingRunner.previous_state),
+        ):
+            for track, count in runners.filter(
+                state_column.is_(None), track_column.isnot(None), track_column != ''
+            ).with_entities(track_column, func.count(MeetingRunner.id)).group_by(track_column).order_by(track_column).all():
+                unmapped_tracks[track] += int(count)
 
         def _roi_fields(values):
             total_staked = values['total_staked']
@@ -6422,7 +6907,7 @@ def api_jurisdiction_strength():
             result_rows.append({
                 'origin_state': origin_state,
                 'interstate_runs': interstate_runs,
-                'unique_horses': len(values['horses']),
+                'unique_horses': values['unique_horses'],
                 'result_runs': result_runs if has_results else None,
                 'wins': values['wins'] if result_runs else None,
                 'win_percentage': round((values['wins'] / result_runs * 100), 1) if result_runs > 0 else None,
@@ -6443,7 +6928,7 @@ def api_jurisdiction_strength():
                 'origin_state': origin_state,
                 'destination_state': destination_state,
                 'interstate_runs': values['interstate_runs'],
-                'unique_horses': len(values['horses']),
+                'unique_horses': values['unique_horses'],
                 'wins': values['wins'] if result_runs else None,
                 'win_percentage': round((values['wins'] / result_runs * 100), 1) if result_runs > 0 else None,
                 'places': values['places'] if result_runs else None,
@@ -6456,6 +6941,7 @@ def api_jurisdiction_strength():
 
         debug = {
             'meetings_processed': meetings_processed,
+            'meetings_unparsed': unparsed_meeting_count(),
             'rows_processed': rows_processed,
             'interstate_rows': interstate_rows,
             'previous_track_column_detected': previous_track_column,
@@ -6504,42 +6990,24 @@ def api_state_performance():
     use_ml = request.args.get('source', '') == 'ml'
 
     try:
-        from collections import defaultdict
+        from sqlalchemy import case, func
 
-        track_to_state = _build_track_to_state()
         stake = 10.0
 
-        meeting_state_by_id = {}
-        meeting_rows = db.session.query(Meeting.id, Meeting.meeting_name, Meeting.csv_data).all()
-        for meeting_id, meeting_name, csv_data in meeting_rows:
-            state = None
-            if csv_data and str(csv_data).strip():
-                try:
-                    reader = csv.DictReader(io.StringIO(csv_data))
-                    headers = reader.fieldnames or []
-                    track_column = _find_csv_column(headers, candidates=['track'])
-                    if track_column:
-                        first_row = next(reader, None)
-                        if first_row:
-                            csv_track = _normalise_track_name(first_row.get(track_column, ''))
-                            state = track_to_state.get(_track_lookup_key(csv_track))
-                except Exception:
-                    state = None
-
-            if state not in AUSTRALIAN_JURISDICTION_STATES:
-                fallback_track = meeting_name.split('_')[1] if meeting_name and '_' in meeting_name else (meeting_name or '')
-                state = track_to_state.get(_track_lookup_key(_normalise_track_name(fallback_track)))
-
-            if state in AUSTRALIAN_JURISDICTION_STATES:
-                meeting_state_by_id[meeting_id] = state
-
+        # Top pick per race (ties to the lower horse id), ranked in SQL over
+        # the settled runners of races whose meeting maps to an Australian
+        # state, then summed per state.
+        sort_score = func.coalesce(Prediction.ml_score, 0) if use_ml else Prediction.score
         q = db.session.query(
-            Meeting.id,
-            Race.race_number,
-            Prediction.score,
-            Prediction.ml_score,
-            Result.finish_position,
-            Result.sp
+            Meeting.jurisdiction_state.label('state'),
+            Meeting.uploaded_at.label('uploaded_at'),
+            Race.id.label('race_id'),
+            sort_score.label('top_score'),
+            Result.finish_position.label('finish_pos'),
+            Result.sp.label('sp'),
+            func.row_number().over(
+                partition_by=Race.id, order_by=(sort_score.desc(), Horse.id)
+            ).label('pick_rank')
         ).join(
             Race, Race.meeting_id == Meeting.id
         ).join(
@@ -6559,54 +7027,37 @@ def api_state_performance():
         if date_to:
             q = q.filter(Meeting.uploaded_at <= date_to)
 
-        q = q.order_by(Meeting.uploaded_at.desc(), Race.id.desc())
-        rows = q.all()
-
-        races = defaultdict(list)
-        race_keys_ordered = []
-        for meeting_id, race_num, score, ml_score, finish_pos, sp in rows:
-            key = (meeting_id, race_num)
-            if key not in races:
-                race_keys_ordered.append(key)
-            races[key].append({'score': score, 'ml_score': ml_score or 0, 'finish_pos': finish_pos, 'sp': sp or 0})
-
+        ranked = q.subquery()
+        top_picks = db.session.query(ranked).filter(ranked.c.pick_rank == 1).order_by(
+            ranked.c.uploaded_at.desc(), ranked.c.race_id.desc()
+        )
         if limit_param != 'all':
             limit = int(limit_param) if str(limit_param).isdigit() else 200
-            race_keys_ordered = race_keys_ordered[:limit]
-
-        state_stats = defaultdict(lambda: {'races': 0, 'wins': 0, 'staked': 0.0, 'returns': 0.0})
-        sort_key = 'ml_score' if use_ml else 'score'
-
-        for key in race_keys_ordered:
-            horses = races[key]
-            top = max(horses, key=lambda x: x[sort_key])
-            if min_score_filter and top[sort_key] < min_score_filter:
-                continue
-
-            state = meeting_state_by_id.get(key[0])
-            if not state:
-                continue
-
-            bucket = state_stats[state]
-            bucket['races'] += 1
-            bucket['staked'] += stake
-
-            if top['finish_pos'] == 1:
-                bucket['wins'] += 1
-                if top['sp'] and top['sp'] > 0:
-                    bucket['returns'] += float(top['sp']) * stake
+            top_picks = top_picks.limit(limit)
+        top_picks = top_picks.subquery()
+
+        won = top_picks.c.finish_pos == 1
+        state_rows = db.session.query(
+            top_picks.c.state,
+            func.count(),
+            func.sum(case((won, 1), else_=0)),
+            func.sum(case((won & (top_picks.c.sp > 0), top_picks.c.sp), else_=0.0)),
+        ).filter(top_picks.c.state.isnot(None))
+        if min_score_filter:
+            state_rows = state_rows.filter(top_picks.c.top_score >= min_score_filter)
+        state_rows = state_rows.group_by(top_picks.c.state).all()
 
         result_rows = []
-        for state, values in state_stats.items():
-            races_count = values['races']
-            staked = values['staked']
-            returns = values['returns']
+        for state, races_count, wins, sp_total in state_rows:
+            staked = races_count * stake
+            returns = float(sp_total or 0.0) * stake
+            wins = int(wins or 0)
             profit_loss = returns - staked
             result_rows.append({
                 'state': state,
                 'races': races_count,
-                'wins': values['wins'],
-                'strike_rate': round((values['wins'] / races_count * 100), 1) if races_count > 0 else 0.0,
+                'wins': wins,
+                'strike_rate': round((wins / races_count * 100), 1) if races_count > 0 else 0.0,
                 'staked': round(staked, 2),
                 'returns': round(returns, 2),
                 'profit_loss': round(profit_loss, 2),
@@ -6614,7 +7065,8 @@ def api_state_performance():
             })
 
         result_rows.sort(key=lambda item: item['roi'], reverse=True)
-        return jsonify({'states': result_rows})
+        # Meetings not parsed yet have no jurisdiction_state and are left out.
+        return jsonify({'states': result_rows, 'meetings_unparsed': unparsed_meeting_count()})
     except Exception as exc:
         logger.exception("State performance API failed")
         return jsonify({'error': 'Failed to calculate state performance', 'details': str(exc)}), 500
@@ -8996,7 +9448,6 @@ def api_combination_analysis():
     rows = q.all()
 
     from collections import defaultdict
-    import itertools
     import re as _re
 
     # Group by race so we can apply the race limit
@@ -9464,9 +9915,14 @@ def api_combination_analysis():
                 'horse':   row.horse_name,
             })
 
-    # ── 6. Count all 2, 3, 4 and 5 factor combinations ────────────────────────
-    combo_stats = defaultdict(lambda: {'races': 0, 'wins': 0, 'profit': 0.0})
+    # ── 6. Count all 2, 3 and 4 factor combinations ───────────────────────────
+    # Factor bitmaps over the tagged horses (combination_engine): support,
+    # wins and profit per combination come from ANDed bitmaps, and only
+    # combinations whose sub-combinations met the tiered minimum are counted.
+    from combination_engine import FactorBitmaps
 
+    combo_min_races = {2: 10, 3: 10, 4: 15}
+    capped_factor_sets = []
     for horse in tagged_horses:
         factors = sorted(horse['factors'])
         # Cap to 12 most specific factors to avoid combinatorial explosion
@@ -9476,46 +9932,32 @@ def api_combination_analysis():
             ))]
             generic  = [f for f in factors if f not in priority]
             factors  = (priority + generic)[:12]
+        capped_factor_sets.append(factors)
 
-        won    = horse['won']
-        sp     = horse['sp']
-        profit = (sp * stake - stake) if won else -stake
-
-        for pair in itertools.combinations(factors, 2):
-            combo_stats[pair]['races']  += 1
-            combo_stats[pair]['wins']   += (1 if won else 0)
-            combo_stats[pair]['profit'] += profit
-
-        for triple in itertools.combinations(factors, 3):
-            combo_stats[triple]['races']  += 1
-            combo_stats[triple]['wins']   += (1 if won else 0)
-            combo_stats[triple]['profit'] += profit
-
-        for quad in itertools.combinations(factors, 4):
-            combo_stats[quad]['races']  += 1
-            combo_stats[quad]['wins']   += (1 if won else 0)
-            combo_stats[quad]['profit'] += profit
+    combo_engine = FactorBitmaps(
+        capped_factor_sets,
+        [horse['won'] for horse in tagged_horses],
+        [(horse['sp'] * stake - stake) if horse['won'] else -stake for horse in tagged_horses],
+        min_support=combo_min_races[2],
+    )
 
     # ── 7. Filter: positive ROI, tiered minimum appearances, sort by ROI ───────
     results_list = []
-    for combo, stats in combo_stats.items():
-        n            = stats['races']
-        factor_count = len(combo)
-        min_n        = {2: 10, 3: 10, 4: 15, 5: 20}.get(factor_count, 10)
-        if n < min_n:
-            continue
-        roi = stats['profit'] / (n * stake) * 100
+    for combo in combo_engine.frequent_combinations(combo_min_races):
+        n            = combo.races
+        factor_count = len(combo.factors)
+        roi = combo.profit / (n * stake) * 100
         if roi <= 0:
             continue
-        sr = stats['wins'] / n * 100
+        sr = combo.wins / n * 100
         results_list.append({
-            'factors':      list(combo),
+            'factors':      list(combo.factors),
             'factor_count': factor_count,
             'races':        n,
-            'wins':         stats['wins'],
+            'wins':         combo.wins,
             'strike_rate':  round(sr, 1),
             'roi':          round(roi, 1),
-            'profit':       round(stats['profit'], 2),
+            'profit':       round(combo.profit, 2),
         })
 
     # Sort: highest factor count first, then by ROI descending
@@ -9632,6 +10074,7 @@ def api_combination_analysis():
 
         # Cap to 15 factors to avoid explosion
         if len(factors) > 15:
+            factors  = sorted(factors)
             priority = [f for f in factors if any(f.startswith(p) for p in (
                 'Component:', 'Jockey:', 'Trainer:', 'Sire:', 'AgeSex:', 'FormPrice:'
             ))]
@@ -9663,40 +10106,30 @@ def api_combination_analysis():
         roi = b['profit'] / (b['races'] * stake) * 100
         return roi <= 0
 
-    # Count all pairs and triples across all_neg_tagged
-    hidden_combo_stats = defaultdict(lambda: {'races': 0, 'wins': 0, 'profit': 0.0})
-
-    for horse in all_neg_tagged:
-        factors = sorted(horse['factors'])
-        won     = horse['won']
-        sp      = horse['sp']
-        profit  = (sp * stake - stake) if won else -stake
-
-        for pair in itertools.combinations(factors, 2):
-            # Only count if BOTH factors are individually non-positive
-            if _is_not_positive(pair[0]) and _is_not_positive(pair[1]):
-                hidden_combo_stats[pair]['races']  += 1
-                hidden_combo_stats[pair]['wins']   += 1 if won else 0
-                hidden_combo_stats[pair]['profit'] += profit
+    # Count pairs of individually non-positive factors across all_neg_tagged
+    hidden_engine = FactorBitmaps(
+        [[f for f in horse['factors'] if _is_not_positive(f)] for horse in all_neg_tagged],
+        [horse['won'] for horse in all_neg_tagged],
+        [(horse['sp'] * stake - stake) if horse['won'] else -stake for horse in all_neg_tagged],
+        min_support=50,
+    )
 
     # Filter: 50+ races, positive ROI, sort by ROI
     hidden_list = []
-    for combo, stats in hidden_combo_stats.items():
-        n = stats['races']
-        if n < 50:
-            continue
-        roi = stats['profit'] / (n * stake) * 100
+    for combo in hidden_engine.frequent_combinations({2: 50}):
+        n = combo.races
+        roi = combo.profit / (n * stake) * 100
         if roi <= 0:
             continue
-        sr = stats['wins'] / n * 100
+        sr = combo.wins / n * 100
         hidden_list.append({
-            'factors':      list(combo),
-            'factor_count': len(combo),
+            'factors':      list(combo.factors),
+            'factor_count': len(combo.factors),
             'races':        n,
-            'wins':         stats['wins'],
+            'wins':         combo.wins,
             'strike_rate':  round(sr, 1),
             'roi':          round(roi, 1),
-            'profit':       round(stats['profit'], 2),
+            'profit':       round(combo.profit, 2),
         })
 
     hidden_list.sort(key=lambda x: (-x['factor_count'], -x['roi']))
@@ -10674,6 +11107,7 @@ def best_bets():
         return redirect(url_for("history"))
     from models import Component
     from datetime import datetime, timedelta
+    from sqlalchemy import func
     from sqlalchemy.orm import load_only, selectinload
 
     hours_back = request.args.get('hours', default=12, type=int)
@@ -10686,86 +11120,79 @@ def best_bets():
     component_keys = set(components_by_key)
 
     cutoff = datetime.utcnow() - timedelta(hours=hours_back)
+    # Candidates are written when a meeting is imported, scored or repriced;
+    # meetings not computed yet are only counted, never rebuilt on view.
+    meetings_pending = pending_best_bet_meeting_count(since=cutoff)
+
     recent_meetings = (
         Meeting.query
-        .options(
-            load_only(Meeting.id, Meeting.meeting_name, Meeting.uploaded_at, Meeting.track, Meeting.date, Meeting.puntingform_id),
-            selectinload(Meeting.races)
-            .load_only(
-                Race.id,
-                Race.meeting_id,
-                Race.race_number,
-                Race.distance,
-                Race.race_class,
-                Race.track_condition,
-            )
-            .selectinload(Race.horses)
-            .load_only(
-                Horse.id,
-                Horse.race_id,
-                Horse.horse_name,
-                Horse.barrier,
-                Horse.weight,
-                Horse.jockey,
-                Horse.trainer,
-                Horse.form,
-                Horse.csv_data,
-                Horse.is_scratched,
-            )
-            .selectinload(Horse.prediction)
-            .load_only(
-                Prediction.id,
-                Prediction.horse_id,
-                Prediction.score,
-                Prediction.predicted_odds,
-                Prediction.win_probability,
-                Prediction.notes,
-                Prediction.ml_score,
-            ),
-        )
+        .options(load_only(Meeting.id, Meeting.meeting_name, Meeting.uploaded_at, Meeting.track, Meeting.date, Meeting.puntingform_id))
         .filter(Meeting.uploaded_at >= cutoff)
         .order_by(Meeting.meeting_name.asc())
         .all()
     )
+    meeting_ids = [meeting.id for meeting in recent_meetings]
+    total_horses_scanned = (
+        db.session.query(func.count(Horse.id))
+        .join(Race, Race.id == Horse.race_id)
+        .filter(Race.meeting_id.in_(meeting_ids))
+        .scalar()
+    ) if meeting_ids else 0
+
+    candidates = (
+        BestBetCandidate.query
+        .options(
+            selectinload(BestBetCandidate.race).load_only(
+                Race.id, Race.race_number, Race.distance, Race.race_class, Race.track_condition,
+            ),
+            selectinload(BestBetCandidate.horse).load_only(
+                Horse.id, Horse.horse_name, Horse.barrier, Horse.weight, Horse.jockey,
+                Horse.trainer, Horse.form, Horse.is_scratched,
+            ).selectinload(Horse.prediction),
+        )
+        .filter(BestBetCandidate.meeting_id.in_(meeting_ids))
+        .order_by(BestBetCandidate.race_id, BestBetCandidate.rank_in_race)
+        .all()
+    ) if meeting_ids else []
+    candidates_by_meeting = {}
+    for candidate in candidates:
+        candidates_by_meeting.setdefault(candidate.meeting_id, {}).setdefault(candidate.race_id, []).append(candidate)
+
+    # Live odds are matched against each candidate race's whole field.
+    race_fields = {}
+    if candidates:
+        for horse_id, race_id, horse_name, is_scratched in (
+            db.session.query(Horse.id, Horse.race_id, Horse.horse_name, Horse.is_scratched)
+            .filter(Horse.race_id.in_({candidate.race_id for candidate in candidates}))
+        ):
+            race_fields.setdefault(race_id, []).append(
+                SimpleNamespace(id=horse_id, horse_name=horse_name, is_scratched=bool(is_scratched))
+            )
 
     best_bets = []
     value_edge_bets = []
-    total_horses_scanned = 0
 
     for meeting in recent_meetings:
-
-        # Build jockey ride count across all races in this meeting
-        jockey_ride_counts = {}
-        for r in meeting.races:
-            for h in r.horses:
-                j = h.jockey or ''
-                if j:
-                    jockey_ride_counts[j] = jockey_ride_counts.get(j, 0) + 1
-
         track_name = _track_from_meeting(meeting)
         date_str = meeting.date.strftime('%Y-%m-%d') if meeting.date else None
-        for race in meeting.races:
-            signal_top_ids = top_signal_horse_ids(race.horses)
+        for race_id, race_candidates in candidates_by_meeting.get(meeting.id, {}).items():
+            race = race_candidates[0].race
+            ranks = {c.horse_id: {field: getattr(c, field) for field in BEST_BET_RANK_FIELDS} for c in race_candidates}
             ladbrokes_signal_fields = {}
             if track_name and date_str:
                 race_info = match_race_info(track_name, date_str, race.race_number)
                 if race_info and race_info.get('uuid'):
-                    ladbrokes_signal_fields = evaluate_ladbrokes_best_bet_signals(
-                        race, meeting, fetch_race_odds(race_info['uuid']), race_info
+                    ladbrokes_signal_fields = apply_ladbrokes_signals(
+                        ranks, race_fields.get(race_id, []), fetch_race_odds(race_info['uuid'])
                     )
                 else:
-                    ladbrokes_signal_fields = {h.id: {'best_bet_reasons': ['odds-unavailable'], 'best_bet_signal_count': 0} for h in race.horses}
+                    ladbrokes_signal_fields = {horse_id: {'best_bet_reasons': ['odds-unavailable'], 'best_bet_signal_count': 0} for horse_id in ranks}
             else:
-                ladbrokes_signal_fields = {h.id: {'best_bet_reasons': ['odds-unavailable'], 'best_bet_signal_count': 0} for h in race.horses}
-            horses_in_race = []
-            for horse in race.horses:
-                total_horses_scanned += 1
-                if horse.prediction and not horse.is_scratched:
-                    horses_in_race.append({
-                        'horse': horse,
-                        'score': horse.prediction.score
-                    })
+                ladbrokes_signal_fields = {horse_id: {'best_bet_reasons': ['odds-unavailable'], 'best_bet_signal_count': 0} for horse_id in ranks}
 
+            for candidate in race_candidates:
+                horse = candidate.horse
+                if horse.prediction and not horse.is_scratched:
                     # ── ML Value Edge Bets: independent of mode/min_score/min_gap so
                     # every qualifying horse gets tracked, not just whichever ones this
                     # admin visit's filters happen to keep. All horses at/above
@@ -10799,32 +11226,23 @@ def best_bets():
                             'market_implied_probability_pct': edge_fields.get('market_implied_probability_pct'),
                             'value_edge_pct': edge_fields.get('value_edge_pct'),
                         })
-            horses_in_race.sort(key=lambda x: x['score'], reverse=True)
-            if not horses_in_race:
-                continue
-
-            top_score = horses_in_race[0]['score']
-            second_score = horses_in_race[1]['score'] if len(horses_in_race) > 1 else 0
-            score_gap = top_score - second_score
 
-            for rank_idx, horse_data in enumerate(horses_in_race):
-                horse = horse_data['horse']
-                if not horse.prediction:
+            for candidate in race_candidates:
+                horse = candidate.horse
+                if not horse.prediction or horse.is_scratched:
                     continue
 
-                is_top_pick = (rank_idx == 0)
-                rank_in_race = rank_idx + 1
-
-                if min_gap and is_top_pick and score_gap < min_gap:
+                is_top_pick = candidate.is_top_pick
+                if min_gap and is_top_pick and candidate.score_gap < min_gap:
                     continue
-                if min_score and horse.prediction.score < min_score:
+                if min_score and candidate.score < min_score:
                     continue
                 if mode == 'top_pick' and not is_top_pick:
                     continue
                 if mode == 'non_top_pick' and is_top_pick:
                     continue
 
-                signal_agreement = signals_all_agree_top(horse.id, signal_top_ids)
+                signal_agreement = bool(candidate.reason_mask & BEST_BET_REASON_SIGNAL_AGREEMENT)
                 lb_fields = ladbrokes_signal_fields.get(horse.id, {})
                 ladbrokes_signal_count = int(lb_fields.get('best_bet_signal_count') or 0)
                 signal_mask = (
@@ -10840,16 +11258,8 @@ def best_bets():
                     horse.prediction.ladbrokes_signal_price = lb_fields.get('ladbrokes_fixed_win_price')
                     horse.prediction.ladbrokes_signals_captured_at = datetime.utcnow()
 
-                # Parse win probability for high confidence flag
-                try:
-                    wp = float(str(horse.prediction.win_probability or '0').replace('%', '').strip())
-                except (ValueError, TypeError):
-                    wp = 0.0
-
-                components = parse_notes_component_matches(horse.prediction.notes)
                 matched_components = []
-                for match in components.values():
-                    comp_key = match['key']
+                for comp_key in candidate.component_keys or []:
                     if comp_key in component_keys:
                         comp_obj = components_by_key[comp_key]
                         matched_components.append({
@@ -10866,23 +11276,19 @@ def best_bets():
                         "active_strategy_names=%s active_strategy_keys=%s final_matched_components=%s",
                         horse.horse_name,
                         horse.prediction.notes,
-                        [match['key'] for match in components.values()],
+                        [match['key'] for match in parse_notes_component_matches(horse.prediction.notes).values()],
                         [component.component_name for component in active_components],
                         [component.component_key or normalize_component_key(component.component_name) for component in active_components],
                         matched_components,
                     )
 
-                horse_score_gap = score_gap if is_top_pick else (
-                    horses_in_race[rank_idx - 1]['score'] - horse.prediction.score
-                    if rank_idx > 0 else 0
-                )
-
                 # Include if matched components, ≥80% win probability, jockey sole ride,
                 # Analyzer/PFAI/ML all agree on the top selection, or the horse is an
                 # ML Value Edge bet of at least VALUE_EDGE_PROMOTE_TO_NORMAL_THRESHOLD_PCT.
-                jockey_sole = jockey_ride_counts.get(horse.jockey or '', 0) == 1
+                high_confidence = bool(candidate.reason_mask & BEST_BET_REASON_HIGH_CONFIDENCE)
+                jockey_sole = bool(candidate.reason_mask & BEST_BET_REASON_JOCKEY_SOLE_RIDE)
                 value_edge_promoted = bool(lb_fields.get('is_value_edge_promoted'))
-                if matched_components or wp >= 80 or jockey_sole or signal_agreement or ladbrokes_signal_count or value_edge_promoted:
+                if matched_components or high_confidence or jockey_sole or signal_agreement or ladbrokes_signal_count or value_edge_promoted:
                     matched_components.sort(key=lambda x: x['roi'], reverse=True)
                     best_bets.append({
                         'meeting_id': meeting.id,
@@ -10895,8 +11301,8 @@ def best_bets():
                         'track_condition': race.track_condition,
                         'horse_id': horse.id,
                         'horse_name': horse.horse_name,
-                        'score': horse.prediction.score,
-                        'score_gap': horse_score_gap,
+                        'score': candidate.score,
+                        'score_gap': candidate.score_gap,
                         'predicted_odds': horse.prediction.predicted_odds,
                         'win_probability': horse.prediction.win_probability,
                         'components': matched_components,
@@ -10908,8 +11314,8 @@ def best_bets():
                         'weight': horse.weight,
                         'form': horse.form,
                         'is_top_pick': is_top_pick,
-                        'rank_in_race': rank_in_race,
-                        'high_confidence': wp >= 80,
+                        'rank_in_race': candidate.rank_in_race,
+                        'high_confidence': high_confidence,
                         'signal_agreement': signal_agreement,
                         **lb_fields,
                     })
@@ -10946,6 +11352,7 @@ def best_bets():
         meetings_with_bets=meetings_with_bets,
         total_bets=len(best_bets),
         total_horses_scanned=total_horses_scanned,
+        meetings_pending=meetings_pending,
         active_components=active_components,
         hours_back=hours_back,
         min_score=min_score,
@@ -11943,7 +12350,10 @@ def download_best_model():
                 LIMIT 1
             """)).fetchone()
         if row and row[0]:
-            buf = io.BytesIO(bytes(row[0]))
+            # Strip the artifact manifest: the compressed payload underneath
+            # is a file joblib.load() opens as-is, like the old bare pickles.
+            from model_artifacts import artifact_payload
+            buf = io.BytesIO(artifact_payload(row[0]))
             buf.seek(0)
             return send_file(buf, as_attachment=True,
                              download_name='form_analyst_active_champion.pkl',
@@ -51,18 +51,24 @@ CHANGELOG - 2026-07-21 (data audit + holdout-validated improvements):
 
 import os
 import sys
-import io
 import json
+import hashlib
 import re
 import logging
 import pickle
+import shutil
+import time
+import tempfile
+import weakref
 from datetime import date, datetime, timedelta
 from itertools import product
 from strike_rate_matching import (
     build_strike_rate_lookup, build_strike_rate_history_lookup,
     get_sr_win_pct, get_sr_win_pct_asof, log_match_stats, normalize_name,
+    strike_rate_resolver,
 )
-from model_classes import ConsensusRegressor, solve_joint_kelly
+from model_classes import ConsensusRegressor, solve_joint_kelly, solve_joint_kelly_batch
+from model_artifacts import load_model_bytes, pack_model_bytes
 from notes_parsing import (
     parse_notes_components, parse_analyzer_score,
     is_scoring_component, NEGATIVE_COMPONENTS,
@@ -299,6 +305,7 @@ def ensure_tables():
             "ALTER TABLE backtest_model_competition ADD COLUMN IF NOT EXISTS walk_forward TEXT",
             "ALTER TABLE backtest_model_competition ADD COLUMN IF NOT EXISTS selection_score FLOAT",
             "ALTER TABLE backtest_model_competition ADD COLUMN IF NOT EXISTS kelly_staking TEXT",
+            "ALTER TABLE backtest_model_competition ADD COLUMN IF NOT EXISTS training_profile TEXT",
         ]:
             conn.execute(text(ddl))
 
@@ -1744,6 +1751,10 @@ def build_training_set(df, strike_rate_data=None):
     # raise a regression alert if unmatched-row percentage increases run over
     # run — see check_match_rate_regression() below.
     build_training_set.last_match_stats = log_match_stats(log, jockey_sr, trainer_sr)
+    for label, lookup in (('jockey', jockey_sr), ('trainer', trainer_sr),
+                          ('jockey history', jockey_sr_history), ('trainer history', trainer_sr_history)):
+        if lookup:
+            log.info(f"Strike-rate name resolver ({label}): {strike_rate_resolver(lookup).cache_info()}")
 
     # strike_rate_snapshots only started accumulating on 2026-07-21 (see
     # load_strike_rate_data's jockeys_history/trainers_history docstring), so
@@ -2659,6 +2670,9 @@ MIN_WALK_FORWARD_FOLDS = int(os.environ.get('ML_MIN_WALK_FORWARD_FOLDS', '2'))
 # statistically indistinguishable from noise, layered on top of (not instead
 # of) the fixed Champion Score edge above.
 PROMOTION_MAX_BOOTSTRAP_P_VALUE = float(os.environ.get('ML_PROMOTION_MAX_P_VALUE', '0.25'))
+# Memory cap for one chunk of bootstrap resample indices (and the values
+# gathered through them) in _paired_bootstrap_p_value.
+BOOTSTRAP_CHUNK_BYTES = int(os.environ.get('ML_BOOTSTRAP_CHUNK_BYTES', str(64 * 1024 * 1024)))
 MODEL_VERSION = os.environ.get('ML_MODEL_VERSION', datetime.utcnow().strftime('%Y%m%d'))
 SCORING_FORMULA_VERSION = 'champion_score_v6_joint_kelly'
 # Sanity bound for a recomputed Champion Score, used only by the fallback
@@ -2908,7 +2922,29 @@ def _snapshot_coverage_gap_note(challenger_metrics, champion_metrics):
     )
 
 
-def _paired_bootstrap_p_value(challenger_fold_rois, champion_fold_rois, n_resamples=2000, seed=42):
+def _bootstrap_units(diff, blocks):
+    """Collapse paired differences into the resampling units for the bootstrap.
+
+    Without blocks every difference is its own unit. With blocks (e.g. the
+    meeting date of each paired observation) differences sharing a label are
+    summed into one unit so a resample draws whole meetings, keeping the
+    within-meeting correlation intact. Units keep first-appearance order, so
+    all-distinct labels reproduce the unblocked draw exactly.
+    """
+    if blocks is None:
+        return diff, None
+    labels = np.asarray(list(blocks), dtype=object)
+    if len(labels) != len(diff):
+        raise ValueError(f"blocks has {len(labels)} labels for {len(diff)} paired observations")
+    _, first_seen, inverse = np.unique(labels.astype(str), return_index=True, return_inverse=True)
+    rank = np.empty(len(first_seen), dtype=np.intp)
+    rank[np.argsort(first_seen, kind='stable')] = np.arange(len(first_seen))
+    unit = rank[inverse]
+    return np.bincount(unit, weights=diff), np.bincount(unit).astype(float)
+
+
+def _paired_bootstrap_p_value(challenger_fold_rois, champion_fold_rois, n_resamples=2000, seed=42,
+                              blocks=None, chunk_bytes=None):
     """One-sided paired bootstrap p-value for "challenger's per-fold ROI is
     really higher than champion's", used as a statistical-significance gate
     alongside the fixed Champion Score margin (PROMOTION_SELECTION_SCORE_EDGE).
@@ -2919,21 +2955,43 @@ def _paired_bootstrap_p_value(challenger_fold_rois, champion_fold_rois, n_resamp
     at least 2 paired folds; returns None otherwise, meaning "can't be
     computed" rather than "definitely not significant" — callers should treat
     None as "skip this gate", not as a rejection.
+
+    blocks: optional label per paired observation (meeting date) for a block
+    bootstrap — whole blocks are resampled and each resample's statistic is
+    the pooled mean difference. Needs at least 2 distinct blocks.
+
+    Resample indices are drawn as (rows, units) matrices in chunks capped at
+    chunk_bytes (BOOTSTRAP_CHUNK_BYTES by default). The generator stream is
+    consumed identically whatever the chunking, so a fixed seed gives the
+    same p-value for any chunk size.
     """
-    n = min(len(challenger_fold_rois or []), len(champion_fold_rois or []))
+    a = np.asarray(challenger_fold_rois if challenger_fold_rois is not None else [], dtype=float)
+    b = np.asarray(champion_fold_rois if champion_fold_rois is not None else [], dtype=float)
+    n = min(len(a), len(b))
     if n < 2:
         return None
-    a = np.asarray(challenger_fold_rois, dtype=float)
-    b = np.asarray(champion_fold_rois, dtype=float)
     diff = a[:n] - b[:n]
+    unit_sums, unit_counts = _bootstrap_units(diff, blocks)
+    n_units = len(unit_sums)
+    if n_units < 2:
+        return None
+
+    # Index matrix plus the gathered values, both 8 bytes per cell.
+    chunk_rows = max(1, int(chunk_bytes or BOOTSTRAP_CHUNK_BYTES) // (16 * n_units))
     rng = np.random.default_rng(seed)
-    resample_idx = rng.integers(0, n, size=(n_resamples, n))
-    resampled_means = diff[resample_idx].mean(axis=1)
-    # Fraction of bootstrap resamples where the mean improvement is <= 0 —
-    # i.e. how often resampling the observed fold-level differences fails to
-    # show any real improvement at all. Lower = more confident the challenger
-    # genuinely beats the champion rather than winning on 1-2 lucky folds.
-    return float(np.mean(resampled_means <= 0.0))
+    failures = 0
+    for start in range(0, n_resamples, chunk_rows):
+        resample_idx = rng.integers(0, n_units, size=(min(chunk_rows, n_resamples - start), n_units))
+        if unit_counts is None:
+            resampled_means = unit_sums[resample_idx].mean(axis=1)
+        else:
+            resampled_means = unit_sums[resample_idx].sum(axis=1) / unit_counts[resample_idx].sum(axis=1)
+        # Resamples where the mean improvement is <= 0 — i.e. how often
+        # resampling the observed differences fails to show any real
+        # improvement at all. Lower = more confident the challenger genuinely
+        # beats the champion rather than winning on 1-2 lucky folds.
+        failures += int(np.count_nonzero(resampled_means <= 0.0))
+    return float(failures / n_resamples)
 
 
 def _selection_score_from_metrics(metrics, force_recompute=False):
@@ -3236,52 +3294,62 @@ def _simulate_joint_kelly_staking(eval_df, kelly_fraction_multiplier=KELLY_FRACT
     eval_df needs race_id, row_id, pred (win probability), sp (decimal odds)
     and won for EVERY runner, not just the per-race top pick.
     """
-    bankroll = 1.0
-    peak = 1.0
-    max_drawdown_pct = 0.0
-    ruined = False
-    per_race_bet_counts = []
-
+    no_races = {
+        'bankroll_growth': 0.0, 'final_bankroll': 1.0, 'max_drawdown_pct': 0.0,
+        'ruined': False, 'avg_horses_backed_per_race': 0.0, 'races_with_zero_bets': 0,
+    }
     if eval_df.empty:
-        return {
-            'bankroll_growth': 0.0, 'final_bankroll': 1.0, 'max_drawdown_pct': 0.0,
-            'ruined': False, 'avg_horses_backed_per_race': 0.0, 'races_with_zero_bets': 0,
-        }
-
-    for _race_id, race_df in eval_df.groupby('race_id'):
-        if bankroll <= 0.0:
-            ruined = True
-            break
-        keyed = race_df.set_index('row_id')
-        stakes = _solve_joint_kelly(
-            list(zip(keyed.index, keyed['pred'], keyed['sp'])),
-            kelly_fraction_multiplier, max_total_stake_pct,
-        )
-        per_race_bet_counts.append(len(stakes))
-        if not stakes:
-            continue
-        race_profit = 0.0
-        for row_id, stake_pct in stakes.items():
-            row = keyed.loc[row_id]
-            stake = bankroll * stake_pct
-            race_profit += (stake * (row['sp'] - 1.0)) if row['won'] == 1 else -stake
-        bankroll += race_profit
-        peak = max(peak, bankroll)
-        if peak > 0:
-            max_drawdown_pct = max(max_drawdown_pct, (peak - bankroll) / peak)
+        return no_races
+
+    # Races in groupby('race_id') order, runners in frame order within each,
+    # solved in one batch rather than one solver call per race.
+    codes, _ = pd.factorize(eval_df['race_id'], sort=True)
+    order = np.argsort(codes, kind='stable')
+    order = order[codes[order] >= 0]
+    if not len(order):
+        return no_races
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(codes[order]))))
+    pred = eval_df['pred'].to_numpy(dtype=float)[order]
+    sp = eval_df['sp'].to_numpy(dtype=float)[order]
+    won = eval_df['won'].to_numpy()[order] == 1
+    stakes, backed = solve_joint_kelly_batch(pred, sp, offsets, kelly_fraction_multiplier, max_total_stake_pct)
+
+    race_starts = offsets[:-1]
+    per_race_bet_counts = np.add.reduceat(backed.astype(int), race_starts)
+    with np.errstate(invalid='ignore'):
+        runner_returns = np.where(backed, np.where(won, stakes * (sp - 1.0), -stakes), 0.0)
+    race_returns = np.add.reduceat(runner_returns, race_starts)
+    bankroll_path = np.cumprod(1.0 + race_returns)
+
+    # A bankroll at or below zero stops the simulation before the next race.
+    ruined = False
+    broke = np.flatnonzero(bankroll_path[:-1] <= 0.0)
+    if len(broke):
+        ruined = True
+        bankroll_path = bankroll_path[:broke[0] + 1]
+        per_race_bet_counts = per_race_bet_counts[:broke[0] + 1]
+    bankroll = float(bankroll_path[-1])
+    peak = np.maximum.accumulate(np.concatenate(([1.0], bankroll_path)))[1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdowns = np.where(peak > 0, (peak - bankroll_path) / peak, 0.0)
+    max_drawdown_pct = max(0.0, float(np.max(drawdowns)))
 
     return {
         'bankroll_growth': float(bankroll - 1.0),
         'final_bankroll': float(bankroll),
         'max_drawdown_pct': float(max_drawdown_pct * 100.0),
         'ruined': bool(ruined),
-        'avg_horses_backed_per_race': float(np.mean(per_race_bet_counts)) if per_race_bet_counts else 0.0,
-        'races_with_zero_bets': int(sum(1 for count in per_race_bet_counts if count == 0)),
+        'avg_horses_backed_per_race': float(np.mean(per_race_bet_counts)) if len(per_race_bet_counts) else 0.0,
+        'races_with_zero_bets': int(np.count_nonzero(per_race_bet_counts == 0)),
     }
 
 
-def evaluate_model_on_validation(model, X_val, y_won_val, race_ids_val, sp_val):
-    """Evaluate top model selection in every validation race with betting metrics."""
+def evaluate_model_on_validation(model, X_val, y_won_val, race_ids_val, sp_val, race_segments=None):
+    """Evaluate top model selection in every validation race with betting metrics.
+
+    race_segments: optional precomputed _race_segments(race_ids_val), used to
+    pick each race's top row without a pandas groupby.
+    """
     pred = np.clip(_predict_win_scores(model, X_val), 1e-6, 1 - 1e-6)
     eval_df = pd.DataFrame({
         'race_id': list(race_ids_val),
@@ -3292,7 +3360,10 @@ def evaluate_model_on_validation(model, X_val, y_won_val, race_ids_val, sp_val):
     # Stable per-runner key for the joint Kelly simulation, which allocates
     # across a whole race rather than picking a single row out of it.
     eval_df['row_id'] = range(len(eval_df))
-    selections = eval_df.loc[eval_df.groupby('race_id')['pred'].idxmax()].copy()
+    if race_segments is not None:
+        selections = eval_df.iloc[_segment_argmax(pred, race_segments)].copy()
+    else:
+        selections = eval_df.loc[eval_df.groupby('race_id')['pred'].idxmax()].copy()
     profits = np.where(selections['won'] == 1, selections['sp'] - 1.0, -1.0)
     bets = int(len(selections))
     wins = int(selections['won'].sum())
@@ -3407,8 +3478,165 @@ def _safe_time_series_splits(n_rows, n_splits, gap):
             return []
 
 
+def _race_segments(race_ids):
+    """(order, starts) grouping rows by race, races in sorted race_id order.
+
+    `order` is a stable sort of row positions by race, so rows inside a race
+    keep their original order; `starts` are the segment offsets into it.
+    Matches the group order and first-max tie-break of
+    groupby('race_id')['pred'].idxmax().
+    """
+    codes, _ = pd.factorize(pd.Series(list(race_ids)), sort=True)
+    order = np.argsort(codes, kind='stable')
+    if not len(order):
+        return order, np.zeros(0, dtype=np.int64)
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    return order, starts
+
+
+def _segment_argmax(values, race_segments):
+    """Row position of the first maximum of `values` within each race segment."""
+    order, starts = race_segments
+    if not len(order):
+        return np.zeros(0, dtype=np.int64)
+    ordered = np.asarray(values, dtype=float)[order]
+    seg_max = np.maximum.reduceat(ordered, starts)
+    lengths = np.diff(np.r_[starts, len(ordered)])
+    hits = np.flatnonzero(ordered == np.repeat(seg_max, lengths))
+    seg_of_hit = np.searchsorted(starts, hits, side='right') - 1
+    _, first = np.unique(seg_of_hit, return_index=True)
+    return order[hits[first]]
+
+
+class _CachedFold:
+    """One walk-forward fold: index arrays plus read-only imputed matrices."""
+
+    __slots__ = ('fold_idx', 'train_idx', 'test_idx', 'X_train', 'X_test', 'y_train', 'y_test',
+                 'sp_test', 'race_ids_test', 'race_segments', 'npy_paths')
+
+    def __getstate__(self):
+        # Memmapped folds travel to spawned workers as file paths and are
+        # re-mapped there, rather than being pickled as full copies.
+        state = {slot: getattr(self, slot, None) for slot in self.__slots__}
+        if state['npy_paths']:
+            state['X_train'] = list(self.X_train.columns)
+            state['X_test'] = None
+        return state
+
+    def __setstate__(self, state):
+        paths = state.get('npy_paths')
+        if paths:
+            columns = state['X_train']
+            state = dict(state,
+                         X_train=pd.DataFrame(np.load(paths[0], mmap_mode='r'), columns=columns, copy=False),
+                         X_test=pd.DataFrame(np.load(paths[1], mmap_mode='r'), columns=columns, copy=False))
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+
+class WalkForwardFoldCache:
+    """Per-run cache of walk-forward folds shared by every Track E candidate.
+
+    Fold boundaries are identical for every candidate (and every Optuna
+    trial), so the splits, the fold-median-imputed float32 train/test
+    matrices and each test slice's race segments are built once here instead
+    of once per model. With memmap=True (ML_FOLD_CACHE_MEMMAP, default on)
+    the matrices are written to .npy files under ML_FOLD_CACHE_DIR (a temp dir
+    by default) and reopened read-only, so trial worker processes map the same
+    pages instead of copying them. Call close() when the run is done.
+    """
+
+    def __init__(self, X_all, y_won_all, sp_all=None, race_ids_all=None, splits=None,
+                 n_splits=WALK_FORWARD_N_SPLITS, embargo_rows=WALK_FORWARD_EMBARGO_ROWS, memmap=None):
+        X_all = X_all.reset_index(drop=True)
+        self.columns = list(X_all.columns)
+        self.n_rows = len(X_all)
+        self.n_splits = n_splits
+        self.embargo_rows = embargo_rows
+        self.splits = list(splits) if splits is not None else _safe_time_series_splits(self.n_rows, n_splits, embargo_rows)
+        if memmap is None:
+            memmap = os.environ.get('ML_FOLD_CACHE_MEMMAP', '1') != '0'
+        self._dir = tempfile.mkdtemp(prefix='track_e_folds_', dir=os.environ.get('ML_FOLD_CACHE_DIR') or None) if memmap and self.splits else None
+        # Removes the memmap files even if the run raises before close().
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self._dir, True) if self._dir else None
+
+        values = X_all.to_numpy(dtype=np.float64, na_value=np.nan)
+        y_all = pd.Series(y_won_all).reset_index(drop=True)
+        sp_array = np.asarray(sp_all, dtype=float) if sp_all is not None else np.full(self.n_rows, np.nan)
+        race_ids_list = list(race_ids_all) if race_ids_all is not None else list(range(self.n_rows))
+
+        self.folds = []
+        for fold_idx, (train_idx, test_idx) in enumerate(self.splits):
+            train_idx = np.asarray(train_idx, dtype=np.int64)
+            test_idx = np.asarray(test_idx, dtype=np.int64)
+            # Same never-use-future-rows rule as the main split: each fold is
+            # imputed with its own training-prefix median only.
+            train_values = values[train_idx]
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                median = np.nanmedian(train_values, axis=0) if len(train_values) else np.full(values.shape[1], np.nan)
+            fold = _CachedFold()
+            fold.fold_idx = fold_idx
+            fold.train_idx = train_idx
+            fold.test_idx = test_idx
+            fold.X_train, train_path = self._frame(f'fold{fold_idx}_train', self._impute(train_values, median))
+            fold.X_test, test_path = self._frame(f'fold{fold_idx}_test', self._impute(values[test_idx], median))
+            fold.npy_paths = (train_path, test_path) if train_path else None
+            fold.y_train = y_all.iloc[train_idx]
+            fold.y_test = y_all.iloc[test_idx]
+            fold.sp_test = sp_array[test_idx]
+            fold.race_ids_test = [race_ids_list[i] for i in test_idx]
+            fold.race_segments = _race_segments(fold.race_ids_test)
+            self.folds.append(fold)
+        log.info(
+            "FOLD_CACHE folds=%s rows=%s features=%s memmap=%s bytes=%s",
+            len(self.folds), self.n_rows, len(self.columns), self._dir is not None, self.nbytes,
+        )
+
+    @staticmethod
+    def _impute(block, median):
+        # All-NaN columns keep NaN, like DataFrame.fillna(DataFrame.median()).
+        block = block.copy()
+        missing = np.isnan(block)
+        if missing.any():
+            block[missing] = np.broadcast_to(median, block.shape)[missing]
+        return block.astype(np.float32)
+
+    def _frame(self, name, block):
+        path = None
+        if self._dir is not None:
+            path = os.path.join(self._dir, f'{name}.npy')
+            np.save(path, block)
+            block = np.load(path, mmap_mode='r')
+        return pd.DataFrame(block, columns=self.columns, copy=False), path
+
+    @property
+    def nbytes(self):
+        return int(sum(f.X_train.shape[0] * f.X_train.shape[1] * 4 + f.X_test.shape[0] * f.X_test.shape[1] * 4
+                       for f in self.folds))
+
+    def __getstate__(self):
+        # A copy in a worker process never owns (or deletes) the files.
+        return dict(self.__dict__, _cleanup=None)
+
+    def close(self):
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = None
+        self._dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
 def _walk_forward_metrics_for_model(model, X_all, y_won_all, sp_all, race_ids_all,
-                                     n_splits=WALK_FORWARD_N_SPLITS, embargo_rows=WALK_FORWARD_EMBARGO_ROWS):
+                                     n_splits=WALK_FORWARD_N_SPLITS, embargo_rows=WALK_FORWARD_EMBARGO_ROWS,
+                                     fold_cache=None):
     """Score ROI/strike-rate stability across chronological expanding-window folds.
 
     The headline validation metrics above come from a single 80/20 time-ordered
@@ -3425,6 +3653,10 @@ def _walk_forward_metrics_for_model(model, X_all, y_won_all, sp_all, race_ids_al
     run compared against another — uses identical fold boundaries. Both are
     also stored on the returned dict so it travels with each model's
     persisted metadata for cross-run auditing.
+
+    fold_cache: a WalkForwardFoldCache over the same rows, shared across
+    candidates so the folds are sliced and imputed once per run; one is
+    built (in memory) for this call when omitted.
     """
     n = len(X_all)
     empty_result = {
@@ -3434,20 +3666,19 @@ def _walk_forward_metrics_for_model(model, X_all, y_won_all, sp_all, race_ids_al
     if n < (n_splits + 1) * 20:
         return empty_result
 
-    X_all = X_all.reset_index(drop=True)
-    y_won_all = pd.Series(y_won_all).reset_index(drop=True)
-    sp_array = np.asarray(sp_all, dtype=float)
-    race_ids_list = list(race_ids_all)
-
-    splits = _safe_time_series_splits(n, n_splits, embargo_rows)
-    if not splits:
+    if fold_cache is None:
+        fold_cache = WalkForwardFoldCache(
+            X_all, y_won_all, sp_all, race_ids_all, n_splits=n_splits, embargo_rows=embargo_rows, memmap=False,
+        )
+    if not fold_cache.folds:
         return empty_result
     folds = []
-    for fold_idx, (train_idx, test_idx) in enumerate(splits):
-        if len(test_idx) < 10 or len(train_idx) < 20:
+    for fold in fold_cache.folds:
+        fold_idx = fold.fold_idx
+        if len(fold.test_idx) < 10 or len(fold.train_idx) < 20:
             continue
 
-        fold_y_train = y_won_all.iloc[train_idx]
+        fold_y_train = fold.y_train
         class_counts = fold_y_train.value_counts()
         if len(class_counts) < 2 or class_counts.min() < MIN_PER_CLASS_FOR_FOLD:
             log.warning(
@@ -3458,19 +3689,14 @@ def _walk_forward_metrics_for_model(model, X_all, y_won_all, sp_all, race_ids_al
             continue
 
         try:
-            # Impute with this fold's own training-prefix median only, matching
-            # the same never-use-future-rows rule as the main train/val split.
-            fold_X_train = X_all.iloc[train_idx]
-            fold_median = fold_X_train.median()
-            fold_X_train = fold_X_train.fillna(fold_median)
-            fold_X_test = X_all.iloc[test_idx].fillna(fold_median)
-
+            # Fold matrices are already imputed with this fold's own
+            # training-prefix median (WalkForwardFoldCache).
             fold_model = _clone_for_fold_fit(model, fold_y_train)
-            fold_model.fit(fold_X_train, fold_y_train)
-            fold_race_ids = [race_ids_list[i] for i in test_idx]
-            fold_sp = sp_array[test_idx]
-            fold_y = y_won_all.iloc[test_idx]
-            fold_metrics = evaluate_model_on_validation(fold_model, fold_X_test, fold_y, fold_race_ids, fold_sp)
+            fold_model.fit(fold.X_train, fold_y_train)
+            fold_metrics = evaluate_model_on_validation(
+                fold_model, fold.X_test, fold.y_test, fold.race_ids_test, fold.sp_test,
+                race_segments=fold.race_segments,
+            )
             folds.append({
                 'bets': fold_metrics['number_of_bets'],
                 'roi': fold_metrics['roi'],
@@ -3495,7 +3721,7 @@ def _walk_forward_metrics_for_model(model, X_all, y_won_all, sp_all, race_ids_al
 
 
 def _log_walk_forward_fold_composition(dates_all, tracks_all, n_splits=WALK_FORWARD_N_SPLITS,
-                                        embargo_rows=WALK_FORWARD_EMBARGO_ROWS):
+                                        embargo_rows=WALK_FORWARD_EMBARGO_ROWS, splits=None):
     """Log one compact line describing what each walk-forward test fold actually
     contains (date range + top tracks), so a fold that looks bad in the ROI/
     strike-rate numbers can be traced back to a specific period/venue mix
@@ -3513,7 +3739,8 @@ def _log_walk_forward_fold_composition(dates_all, tracks_all, n_splits=WALK_FORW
         return []
     dates_all = pd.to_datetime(pd.Series(dates_all).reset_index(drop=True), errors='coerce')
     tracks_all = pd.Series(tracks_all).reset_index(drop=True) if tracks_all is not None else pd.Series([None] * n)
-    splits = _safe_time_series_splits(n, n_splits, embargo_rows)
+    if splits is None:
+        splits = _safe_time_series_splits(n, n_splits, embargo_rows)
     summaries = []
     boundaries = []
     for fold_idx, (_, test_idx) in enumerate(splits):
@@ -3536,7 +3763,7 @@ def _log_walk_forward_fold_composition(dates_all, tracks_all, n_splits=WALK_FORW
     return boundaries
 
 
-def _optional_classifier(model_type, trial=None):
+def _optional_classifier(model_type, trial=None, n_threads=-1):
     if model_type == 'xgboost':
         from xgboost import XGBClassifier
         params = {
@@ -3546,7 +3773,7 @@ def _optional_classifier(model_type, trial=None):
             'subsample': trial.suggest_float('subsample', 0.7, 1.0) if trial else 0.9,
             'colsample_bytree': trial.suggest_float('colsample_bytree', 0.7, 1.0) if trial else 0.9,
             'random_state': 42,
-            'n_jobs': -1,
+            'n_jobs': n_threads,
             'objective': 'binary:logistic',
             'eval_metric': 'logloss',
         }
@@ -3561,7 +3788,7 @@ def _optional_classifier(model_type, trial=None):
             'subsample': trial.suggest_float('subsample', 0.7, 1.0) if trial else 0.9,
             'colsample_bytree': trial.suggest_float('colsample_bytree', 0.7, 1.0) if trial else 0.9,
             'random_state': 42,
-            'n_jobs': -1,
+            'n_jobs': n_threads,
             'verbosity': -1,
         }
         return LGBMClassifier(**params)
@@ -3582,11 +3809,230 @@ def _optional_classifier(model_type, trial=None):
             bagging_temperature=trial.suggest_float('bagging_temperature', 0.0, 1.0) if trial else 1.0,
             loss_function='Logloss',
             random_seed=42,
+            thread_count=n_threads,
             verbose=False,
+            # Otherwise every fit writes catboost_info/ into the working directory.
+            allow_writing_files=False,
         )
     raise ValueError(model_type)
 
 
+# ─────────────────────────────────────────────
+# TRACK E OPTUNA STUDIES
+# ─────────────────────────────────────────────
+# Studies are persisted so an interrupted run resumes where it stopped and a
+# new night warm-starts from the previous night's best trials. They live in
+# their own storage, never DATABASE_URL: Optuna versions its schema in an
+# `alembic_version` table, which would clash with the app's Flask-Migrate one.
+# ML_OPTUNA_STORAGE takes any SQLAlchemy URL (use a separate Postgres database
+# when several hosts run workers); '' or 'memory' restores in-memory studies.
+OPTUNA_STORAGE_URL = os.environ.get(
+    'ML_OPTUNA_STORAGE',
+    'sqlite:///' + os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'optuna', 'track_e_studies.db'),
+)
+# Part of every study name: bump it whenever _optional_classifier's search
+# space changes so out-of-range params are never resumed or enqueued.
+OPTUNA_SEARCH_SPACE_VERSION = 1
+OPTUNA_WARM_START_TRIALS = int(os.environ.get('ML_OPTUNA_WARM_START_TRIALS', '3'))
+OPTUNA_WORKER_PROCESSES = int(os.environ.get('ML_OPTUNA_WORKER_PROCESSES', '1'))
+OPTUNA_CV_FOLDS = int(os.environ.get('ML_OPTUNA_CV_FOLDS', '3'))
+OPTUNA_PRUNER_STARTUP_TRIALS = int(os.environ.get('ML_OPTUNA_PRUNER_STARTUP_TRIALS', '4'))
+
+def _feature_contract_hash(feature_names):
+    """Short hash of the ordered training columns plus the search-space version."""
+    payload = json.dumps([str(name) for name in feature_names] + [f'search_space_v{OPTUNA_SEARCH_SPACE_VERSION}'])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def _optuna_study_prefix(model_type, feature_names):
+    return f"track_e:{model_type}:{_feature_contract_hash(feature_names)}:"
+
+
+def _optuna_storage(optuna, url=None):
+    """RDBStorage for `url` (default OPTUNA_STORAGE_URL), or None for in-memory.
+
+    Heartbeats let optimize() mark trials orphaned by a killed process as
+    FAIL instead of leaving them RUNNING forever.
+    """
+    url = OPTUNA_STORAGE_URL if url is None else url
+    if not url or url == 'memory':
+        return None
+    engine_kwargs = {}
+    if url.startswith('sqlite:///'):
+        path = url[len('sqlite:///'):]
+        if path and path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        engine_kwargs = {'connect_args': {'timeout': 60}}
+    return optuna.storages.RDBStorage(url, engine_kwargs=engine_kwargs, heartbeat_interval=60, grace_period=180)
+
+
+def _optuna_pruner(optuna):
+    # n_warmup_steps=0: a trial can be stopped as soon as its first tuning
+    # fold is already worse than the median of earlier trials at that fold.
+    return optuna.pruners.MedianPruner(n_startup_trials=OPTUNA_PRUNER_STARTUP_TRIALS, n_warmup_steps=0)
+
+
+def _optuna_tuning_folds(n_rows, n_folds=None):
+    """Expanding-window folds over the time-ordered tuning window.
+
+    The newest rows are always the last fold's eval slice, like the single
+    80/20 split this replaced; earlier folds give the pruner a cheap first
+    read on a trial before the larger fits run.
+    """
+    n_folds = OPTUNA_CV_FOLDS if n_folds is None else n_folds
+    return [
+        (train_idx, eval_idx)
+        for train_idx, eval_idx in _safe_time_series_splits(n_rows, n_folds, 0)
+        if len(train_idx) >= 50 and len(eval_idx) >= 20
+    ]
+
+
+def _optuna_objective(trial, model_type, fold_cache, n_threads=-1):
+    """Mean held-out log-likelihood across the cached tuning folds, reported after each fold."""
+    import optuna
+
+    template = _optional_classifier(model_type, trial, n_threads=n_threads)
+    scores = []
+    for step, fold in enumerate(fold_cache.folds):
+        if fold.y_train.nunique() < 2:
+            continue
+        model = clone(template)
+        model.fit(fold.X_train, fold.y_train)
+        pred = np.clip(_predict_win_scores(model, fold.X_test), 1e-6, 1 - 1e-6)
+        scores.append(-float(log_loss(fold.y_test, pred, labels=[0, 1])))
+        trial.report(float(np.mean(scores)), step)
+        if trial.should_prune():
+            raise optuna.TrialPruned()
+    if not scores:
+        raise ValueError("no Optuna tuning fold had both classes in its training slice")
+    return float(np.mean(scores))
+
+
+def _warm_start_study(optuna, study, storage, prefix, top_k=None):
+    """Enqueue the best completed params of the newest earlier study with `prefix`."""
+    top_k = OPTUNA_WARM_START_TRIALS if top_k is None else top_k
+    if storage is None or top_k <= 0:
+        return 0
+    earlier = sorted(
+        name for name in optuna.study.get_all_study_names(storage)
+        if name.startswith(prefix) and name != study.study_name
+    )
+    if not earlier:
+        return 0
+    previous = optuna.load_study(study_name=earlier[-1], storage=storage)
+    completed = previous.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+    best = sorted(completed, key=lambda t: t.value, reverse=True)[:top_k]
+    for frozen in best:
+        study.enqueue_trial(frozen.params, skip_if_exists=True)
+    log.info("OPTUNA_WARM_START study=%s from=%s enqueued=%s", study.study_name, earlier[-1], len(best))
+    return len(best)
+
+
+def _optuna_worker(study_name, storage_url, model_type, fold_cache, n_trials, timeout, n_threads):
+    import optuna
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.load_study(
+        study_name=study_name, storage=_optuna_storage(optuna, storage_url), pruner=_optuna_pruner(optuna),
+    )
+    finished = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+    study.optimize(
+        lambda trial: _optuna_objective(trial, model_type, fold_cache, n_threads),
+        n_trials=n_trials,
+        timeout=timeout,
+        callbacks=[optuna.study.MaxTrialsCallback(n_trials, states=finished)],
+        show_progress_bar=False,
+    )
+
+
+def _run_optuna_search(model_type, X_tune, y_tune, feature_names, n_trials, timeout,
+                       storage_url=None, run_key=None, worker_processes=None):
+    """Run or resume the Track E study for `model_type`; returns the study.
+
+    The study name is track_e:<model_type>:<feature-contract hash>:<run_key>
+    (run_key defaults to today's date). Re-running with the same key resumes
+    it and only tops up to `n_trials` finished (complete or pruned) trials; a
+    new key is warm-started from the previous key's best trials. With
+    worker_processes > 1 and persistent storage the trials are shared out to
+    worker processes (see _pool_start_method), each with an equal slice of
+    the CPU threads.
+    """
+    import optuna
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    worker_processes = OPTUNA_WORKER_PROCESSES if worker_processes is None else worker_processes
+    storage_url = OPTUNA_STORAGE_URL if storage_url is None else storage_url
+    storage = _optuna_storage(optuna, storage_url)
+    prefix = _optuna_study_prefix(model_type, feature_names)
+    study = optuna.create_study(
+        direction='maximize',
+        study_name=prefix + (run_key or date.today().isoformat()),
+        storage=storage,
+        load_if_exists=storage is not None,
+        pruner=_optuna_pruner(optuna),
+    )
+    finished_states = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+    warm_started = 0 if study.trials else _warm_start_study(optuna, study, storage, prefix)
+    already_finished = len(study.get_trials(deepcopy=False, states=finished_states))
+    remaining = max(n_trials - already_finished, 0)
+    folds = _optuna_tuning_folds(len(X_tune))
+    if not folds:
+        raise ValueError("not enough rows for Optuna tuning folds")
+    log.info(
+        "OPTUNA_STUDY model=%s study=%s storage=%s resumed_trials=%s warm_start=%s remaining=%s workers=%s folds=%s",
+        model_type, study.study_name, 'memory' if storage is None else storage_url.split('://', 1)[0],
+        already_finished, warm_started, remaining, worker_processes, len(folds),
+    )
+
+    if remaining:
+        # Built once per search and shared read-only by every trial (and,
+        # through the memmap files, by the worker processes).
+        fold_cache = WalkForwardFoldCache(X_tune, y_tune, splits=folds)
+        if worker_processes > 1 and storage is not None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            n_threads = max(1, (os.cpu_count() or 1) // worker_processes)
+            context = multiprocessing.get_context(_pool_start_method())
+            with ProcessPoolExecutor(worker_processes, mp_context=context) as pool:
+                futures = [
+                    pool.submit(_optuna_worker, study.study_name, storage_url, model_type, fold_cache,
+                                n_trials, timeout, n_threads)
+                    for _ in range(worker_processes)
+                ]
+                for future in futures:
+                    future.result()
+            study = optuna.load_study(study_name=study.study_name, storage=storage, pruner=_optuna_pruner(optuna))
+        else:
+            study.optimize(
+                lambda trial: _optuna_objective(trial, model_type, fold_cache),
+                n_trials=remaining,
+                timeout=timeout,
+                show_progress_bar=False,
+            )
+        fold_cache.close()
+
+    states = Counter(t.state.name for t in study.get_trials(deepcopy=False))
+    log.info(
+        "OPTUNA_DONE model=%s study=%s complete=%s pruned=%s failed=%s best_value=%s",
+        model_type, study.study_name, states.get('COMPLETE', 0), states.get('PRUNED', 0), states.get('FAIL', 0),
+        round(study.best_value, 5) if states.get('COMPLETE') else None,
+    )
+    return study
+
+
+def _mp_start_methods():
+    import multiprocessing
+    return multiprocessing.get_all_start_methods()
+
+
+def _pool_start_method():
+    """forkserver where available, else spawn; never plain fork, because the
+    parent may already have OpenMP thread pools and libgomp does not survive
+    a fork."""
+    return 'forkserver' if 'forkserver' in _mp_start_methods() else 'spawn'
+
+
 
 def _top_selection_rows(model, X_val, y_won_val, race_ids_val, sp_val):
     frame = pd.DataFrame({
@@ -3718,6 +4164,164 @@ def _audit_validation_betting_pipeline(selection_frames, race_ids_val, sp_val):
             one_bet_per_race, len(selections), expected_race_count, len(missing), len(extra), duplicate_bets
         )
 
+
+# ─────────────────────────────────────────────
+# TRACK E CANDIDATE SCHEDULER
+# ─────────────────────────────────────────────
+# Candidates used to be fit one after another, each asking for every core
+# (n_jobs=-1 / thread_count=-1). That oversubscribed the parallel phases and
+# left cores idle during CatBoost's single-threaded stretches and the
+# Python-side evaluation. They now run side by side in worker processes, each
+# with an explicit thread budget.
+#   ML_CANDIDATE_WORKERS   concurrent candidates; 0 (default) = auto,
+#                          min(candidates, cpus // 2); 1 = in-process, serial
+#   ML_CANDIDATE_THREADS   per-candidate overrides, e.g. "catboost=4,mlp=1";
+#                          everything else gets cpus // workers
+CANDIDATE_WORKERS = int(os.environ.get('ML_CANDIDATE_WORKERS', '0'))
+# Longest fits first so the slowest candidate is never the one left queued.
+CANDIDATE_COST_ORDER = ('catboost', 'random_forest', 'xgboost', 'lightgbm', 'mlp')
+
+
+def _candidate_thread_overrides(raw=None):
+    raw = os.environ.get('ML_CANDIDATE_THREADS', '') if raw is None else raw
+    overrides = {}
+    for part in raw.split(','):
+        name, _, value = part.partition('=')
+        if name.strip() and value.strip().isdigit():
+            overrides[name.strip()] = max(1, int(value))
+    return overrides
+
+
+def _candidate_thread_budgets(model_types, workers, cpu_count=None, overrides=None):
+    cpu_count = cpu_count or os.cpu_count() or 1
+    overrides = _candidate_thread_overrides() if overrides is None else overrides
+    default = max(1, cpu_count // max(1, workers))
+    return {mt: overrides.get(mt, default) for mt in model_types}
+
+
+def _apply_thread_budget(model, n_threads):
+    """Swap every all-cores setting (-1) in `model`'s params for `n_threads`.
+
+    Covers RandomForest/XGBoost/LightGBM n_jobs and CatBoost thread_count,
+    including inside CalibratedClassifierCV/Pipeline. Params left at None
+    (e.g. CalibratedClassifierCV's own fold parallelism) stay serial.
+    """
+    updates = {
+        key: n_threads for key, value in model.get_params(deep=True).items()
+        if key.split('__')[-1] in ('n_jobs', 'thread_count') and value == -1
+    }
+    if updates:
+        model.set_params(**updates)
+    return model
+
+
+def _fit_candidate_job(model_type, model, n_threads, train, validation, walk_forward_args):
+    """Fit, validate and walk-forward one candidate; runs in a worker process.
+
+    Returns a dict with the fitted model, its validation metrics and
+    selection frame, the walk-forward result (or the exception text) and a
+    'profile' of wall/CPU time. Fit/validation errors are returned, not
+    raised, so the caller keeps deciding which candidates are fatal.
+    """
+    from threadpoolctl import threadpool_limits
+
+    started_wall = time.perf_counter()
+    started_cpu = time.process_time()
+    out = {'model_type': model_type, 'error': None, 'walk_forward': None, 'walk_forward_error': None}
+    X_train, y_train = train
+    X_val, y_won_val, race_ids_val, sp_val = validation
+    with threadpool_limits(limits=n_threads):
+        try:
+            _apply_thread_budget(model, n_threads)
+            model.fit(X_train, y_train)
+            fit_seconds = time.perf_counter() - started_wall
+            out['metrics'] = evaluate_model_on_validation(model, X_val, y_won_val, race_ids_val, sp_val)
+            out['selections'] = _top_selection_rows(model, X_val, y_won_val, race_ids_val, sp_val)
+            out['model'] = model
+        except Exception as e:
+            out['error'] = f"{type(e).__name__}: {e}"
+            fit_seconds = time.perf_counter() - started_wall
+        walk_forward_started = time.perf_counter()
+        if out['error'] is None and walk_forward_args is not None:
+            X_all, y_won_all, sp_all, race_ids_all, fold_cache = walk_forward_args
+            try:
+                out['walk_forward'] = _walk_forward_metrics_for_model(
+                    model, X_all, y_won_all, sp_all, race_ids_all, fold_cache=fold_cache
+                )
+            except Exception as e:
+                out['walk_forward_error'] = str(e)
+    wall = time.perf_counter() - started_wall
+    cpu = time.process_time() - started_cpu
+    out['profile'] = {
+        'wall_seconds': round(wall, 3),
+        'cpu_seconds': round(cpu, 3),
+        'fit_seconds': round(fit_seconds, 3),
+        'walk_forward_seconds': round(time.perf_counter() - walk_forward_started, 3),
+        'threads': n_threads,
+        # Share of the thread budget actually kept busy.
+        'cpu_utilisation': round(cpu / (wall * n_threads), 3) if wall > 0 else 0.0,
+        'pid': os.getpid(),
+    }
+    return out
+
+
+def _train_candidates(candidates, train, validation, walk_forward_args=None, workers=None, cpu_count=None):
+    """Run _fit_candidate_job for every candidate; returns {model_type: job result}.
+
+    workers == 1 runs in-process. Otherwise candidates run in a
+    forkserver/spawn pool (see _pool_start_method).
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    if workers is None:
+        workers = CANDIDATE_WORKERS
+    if workers <= 0:
+        workers = min(len(candidates), max(1, cpu_count // 2))
+    workers = max(1, min(workers, len(candidates)))
+    budgets = _candidate_thread_budgets(list(candidates), workers, cpu_count)
+    order = sorted(
+        candidates,
+        key=lambda mt: CANDIDATE_COST_ORDER.index(mt) if mt in CANDIDATE_COST_ORDER else len(CANDIDATE_COST_ORDER),
+    )
+    log.info(
+        "CANDIDATE_SCHEDULE workers=%s cpus=%s order=%s threads=%s",
+        workers, cpu_count, ','.join(order), ','.join(f"{mt}={budgets[mt]}" for mt in order),
+    )
+    started = time.perf_counter()
+    if workers == 1:
+        jobs = {mt: _fit_candidate_job(mt, candidates[mt], budgets[mt], train, validation, walk_forward_args) for mt in order}
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(_pool_start_method())) as pool:
+            futures = {
+                mt: pool.submit(_fit_candidate_job, mt, candidates[mt], budgets[mt], train, validation, walk_forward_args)
+                for mt in order
+            }
+            jobs = {}
+            for mt, future in futures.items():
+                try:
+                    jobs[mt] = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. OOM-killed); same handling
+                    # as a failed fit.
+                    jobs[mt] = {'model_type': mt, 'error': f"worker failed: {type(e).__name__}: {e}",
+                                'profile': {'threads': budgets[mt]}}
+    total_wall = time.perf_counter() - started
+    for mt in order:
+        profile = jobs[mt].get('profile', {})
+        log.info(
+            "CANDIDATE_TRAINED model=%s ok=%s wall=%.1fs cpu=%.1fs threads=%s cpu_utilisation=%.0f%%",
+            mt, jobs[mt].get('error') is None, profile.get('wall_seconds', 0.0), profile.get('cpu_seconds', 0.0),
+            profile.get('threads'), 100.0 * profile.get('cpu_utilisation', 0.0),
+        )
+    log.info(
+        "CANDIDATE_SCHEDULE_DONE workers=%s total_wall=%.1fs summed_candidate_wall=%.1fs",
+        workers, total_wall, sum(j.get('profile', {}).get('wall_seconds', 0.0) for j in jobs.values()),
+    )
+    return {mt: jobs[mt] for mt in candidates}
+
+
 def run_model_competition(X, y_roi, y_won, sp_values, race_ids, meeting_dates, df, grid_search_best_rf_params=None, baseline_roi=0.0):
     """Train RF, boosted candidates and consensus on one shared unseen validation set.
 
@@ -3872,23 +4476,17 @@ def run_model_competition(X, y_roi, y_won, sp_values, race_ids, meeting_dates, d
                 if len(X_tune_train) < 50 or len(X_tune_eval) < 20:
                     raise ValueError("not enough training rows for safe internal tuning split")
 
-                def objective(trial, model_type=mt):
-                    model = _optional_classifier(model_type, trial)
-                    model.fit(X_tune_train, y_tune_train)
-                    scores = np.clip(_predict_win_scores(model, X_tune_eval), 1e-6, 1 - 1e-6)
-                    return -float(log_loss(y_tune_eval, scores, labels=[0, 1]))
-
                 # CatBoost gets a bigger trial budget by default (see the wider
                 # search space in _optional_classifier above) — compute freed
                 # up by reducing Track D's RF grid search is spent here rather
                 # than split evenly across all three boosted candidates.
                 default_trials = {'catboost': '24'}.get(mt, '12')
-                study = optuna.create_study(direction='maximize')
-                study.optimize(
-                    objective,
+                # Persistent, resumable study over expanding folds of the
+                # Track E training window (see _run_optuna_search).
+                study = _run_optuna_search(
+                    mt, X_train_reset, y_train_reset, list(X.columns),
                     n_trials=int(os.environ.get(f'ML_OPTUNA_TRIALS_{mt.upper()}', os.environ.get('ML_OPTUNA_TRIALS', default_trials))),
                     timeout=int(os.environ.get('ML_OPTUNA_TIMEOUT_SECONDS', '180')),
-                    show_progress_bar=False
                 )
                 # Calibrate the tuned model itself, not just penalise its raw
                 # log loss/Brier/ECE after the fact in the Champion Score.
@@ -3930,45 +4528,64 @@ def run_model_competition(X, y_roi, y_won, sp_values, race_ids, meeting_dates, d
         len(X), len(X_train), len(X_val), 0, 0
     )
 
-    fitted = {}
-    results = []
-    selection_frames = {}
-    for mt, model in candidates.items():
-        try:
-            model.fit(X_train, y_won[train_mask])
-            metrics = evaluate_model_on_validation(model, X_val, y_won_val, race_ids_val, sp_val)
-            selection_frames[mt] = _top_selection_rows(model, X_val, y_won_val, race_ids_val, sp_val)
-            fitted[mt] = model
-            results.append({'model_type': mt, 'model_name': mt.replace('_', ' ').title(), 'model': model, 'metrics': metrics})
-        except Exception as e:
-            if mt == 'random_forest':
-                raise
-            log.warning(f"Skipping {mt} challenger; final fit/evaluation failed: {e}")
+    # Walk-forward stability for each base candidate is computed with its fit
+    # (before the ensemble is built) so it can both (a) inform ensemble member
+    # weights below and (b) avoid a second, redundant walk-forward pass over
+    # the same models later.
+    # One fold cache for every candidate (and the ensemble below): the splits
+    # and imputed fold matrices are identical across models.
+    fold_cache = None
+    try:
+        fold_cache = WalkForwardFoldCache(X, y_won, sp_values, race_ids)
+    except Exception as e:
+        log.warning(f"Walk-forward fold cache build failed (non-fatal; folds built per model): {e}")
 
-    # Walk-forward stability for each base candidate is computed here (before the
-    # ensemble is built) so it can both (a) inform ensemble member weights below
-    # and (b) avoid a second, redundant walk-forward pass over the same models later.
     fold_boundaries = []
     try:
-        fold_boundaries = _log_walk_forward_fold_composition(dates_ordered, tracks_ordered)
+        fold_boundaries = _log_walk_forward_fold_composition(
+            dates_ordered, tracks_ordered, splits=fold_cache.splits if fold_cache is not None else None,
+        )
     except Exception as e:
         log.warning(f"Walk-forward fold composition logging failed (non-fatal): {e}")
 
+    # Candidates train concurrently (see _train_candidates); results are
+    # gathered back in candidate order so every comparison below is unchanged.
+    jobs = _train_candidates(
+        candidates,
+        train=(X_train, y_won[train_mask]),
+        validation=(X_val, y_won_val, race_ids_val, sp_val),
+        walk_forward_args=(X, y_won, sp_values, race_ids, fold_cache),
+    )
+    fitted = {}
+    results = []
+    selection_frames = {}
     walk_forward_by_model = {}
-    for result in results:
-        try:
-            walk_forward = _walk_forward_metrics_for_model(
-                result['model'], X, y_won, sp_values, race_ids
-            )
-        except Exception as e:
-            log.warning(f"Walk-forward stability check failed for {result['model_type']}: {e}")
+    for mt in candidates:
+        job = jobs[mt]
+        if job['error'] is not None:
+            if mt == 'random_forest':
+                raise RuntimeError(f"random_forest final fit/evaluation failed: {job['error']}")
+            log.warning(f"Skipping {mt} challenger; final fit/evaluation failed: {job['error']}")
+            continue
+        model = job['model']
+        fitted[mt] = model
+        selection_frames[mt] = job['selections']
+        result = {
+            'model_type': mt, 'model_name': mt.replace('_', ' ').title(), 'model': model,
+            'metrics': job['metrics'], 'training_profile': job['profile'],
+        }
+        results.append(result)
+
+        walk_forward = job['walk_forward']
+        if walk_forward is None:
+            log.warning(f"Walk-forward stability check failed for {mt}: {job['walk_forward_error']}")
             walk_forward = {'n_splits': 0, 'n_splits_requested': WALK_FORWARD_N_SPLITS, 'folds': [], 'roi_std': 0.0, 'strike_rate_std': 0.0, 'embargo_rows': WALK_FORWARD_EMBARGO_ROWS}
         walk_forward['fold_boundaries'] = fold_boundaries
         result['metrics']['walk_forward'] = walk_forward
-        walk_forward_by_model[result['model_type']] = walk_forward
+        walk_forward_by_model[mt] = walk_forward
         log.info(
             "Walk-forward stability for %s: folds=%s roi_std=%.2f strike_rate_std=%.2f fold_rois=%s",
-            result['model_type'], walk_forward['n_splits'], walk_forward['roi_std'], walk_forward['strike_rate_std'],
+            mt, walk_forward['n_splits'], walk_forward['roi_std'], walk_forward['strike_rate_std'],
             [round(f['roi'], 1) for f in walk_forward['folds']],
         )
 
@@ -4101,7 +4718,7 @@ def run_model_competition(X, y_roi, y_won, sp_values, race_ids, meeting_dates, d
             continue
         try:
             walk_forward = _walk_forward_metrics_for_model(
-                result['model'], X, y_won, sp_values, race_ids
+                result['model'], X, y_won, sp_values, race_ids, fold_cache=fold_cache
             )
         except Exception as e:
             log.warning(f"Walk-forward stability check failed for {result['model_type']}: {e}")
@@ -4113,6 +4730,8 @@ def run_model_competition(X, y_roi, y_won, sp_values, race_ids, meeting_dates, d
             result['model_type'], walk_forward['n_splits'], walk_forward['roi_std'], walk_forward['strike_rate_std'],
             [round(f['roi'], 1) for f in walk_forward['folds']],
         )
+    if fold_cache is not None:
+        fold_cache.close()
 
     n_candidates = len(fitted)
     agreement_summary = {f'{n}_of_{n_candidates}': 0 for n in range(n_candidates, 0, -1)}
@@ -4250,9 +4869,17 @@ def save_best_model_to_db(pkl_file, combined_score, run_id, model_type='random_f
     if validation_metrics:
         validation_metrics = _stamp_selection_metrics(validation_metrics)
     with open(pkl_file, 'rb') as f:
-        pkl_bytes = f.read()
+        raw_pkl_bytes = f.read()
 
     saved_model = joblib.load(pkl_file)
+    # Stored compressed behind a manifest with a content hash; readers go
+    # through model_artifacts.load_model_bytes, which also reads the bare
+    # pickles older rows hold.
+    pkl_bytes = pack_model_bytes(raw_pkl_bytes, model=saved_model, model_type=model_type)
+    log.info(
+        "MODEL_ARTIFACT_PACKED model_type=%s raw_bytes=%s stored_bytes=%s",
+        model_type, len(raw_pkl_bytes), len(pkl_bytes),
+    )
     saved_features = getattr(saved_model, 'feature_names_in_', None)
     if saved_features is None:
         saved_features = getattr(saved_model, '_form_analyst_expected_features', [])
@@ -4618,7 +5245,7 @@ def rollback_to_champion(model_id, reason='Manual Champion rollback'):
         if not artifact_row or not artifact_row[0]:
             raise ValueError(f"Model {model_id} has no stored artifact and cannot be activated")
         try:
-            target_model = joblib.load(io.BytesIO(artifact_row[0]))
+            target_model = load_model_bytes(artifact_row[0])
         except Exception as e:
             raise ValueError(f"Model {model_id} artifact failed to load and cannot be activated: {e}")
         if _stored_feature_list(target_model) is None:
@@ -4696,7 +5323,7 @@ def _best_rejected_challenger(conn, exclude_id, expected_features=None):
                 metrics = {}
         if expected_features is not None and row[5]:
             try:
-                candidate_model = joblib.load(io.BytesIO(row[5]))
+                candidate_model = load_model_bytes(row[5])
             except Exception:
                 candidate_model = None
             candidate_features = getattr(candidate_model, 'feature_names_in_', None) if candidate_model else None
@@ -4889,7 +5516,7 @@ def _heal_stale_champion(champion_id, champion_metrics, run_id=None):
         pkl_bytes, is_active = row[0], row[1]
 
         try:
-            model = joblib.load(io.BytesIO(pkl_bytes))
+            model = load_model_bytes(pkl_bytes)
         except Exception as e:
             return {'healed': False, 'detail': f"champion id={champion_id} artifact failed to load: {e}"}
 
@@ -5110,7 +5737,7 @@ def check_active_champion_staleness(run_id=None):
         """), {'id': champion_id}).fetchone()
         if champion_row and champion_row[0]:
             try:
-                champion_model = joblib.load(io.BytesIO(champion_row[0]))
+                champion_model = load_model_bytes(champion_row[0])
                 champion_features = getattr(champion_model, 'feature_names_in_', None)
                 missing_feature_list = champion_features is None or len(list(champion_features)) == 0
             except Exception as e:
@@ -5271,7 +5898,7 @@ def ensure_champion_exists_after_run(run_id=None):
             if not ok:
                 continue
             try:
-                candidate_model = joblib.load(io.BytesIO(pkl_bytes))
+                candidate_model = load_model_bytes(pkl_bytes)
             except Exception:
                 continue
             candidate_features = _stored_feature_list(candidate_model)
@@ -5509,13 +6136,13 @@ def write_results(run_id, feature_recommendations, component_results,
                      validation_longest_losing_streak, validation_bankroll_growth,
                      validation_volatility, last_100, last_250, last_500, agreement_summary,
                      log_loss, brier_score, calibration, stability, walk_forward, selection_score,
-                     kelly_staking)
+                     kelly_staking, training_profile)
                     VALUES (:run_id, :model_type, :model_name, :roi, :profit_units,
                             :strike_rate, :bets, :drawdown, :longest_losing_streak,
                             :bankroll_growth, :volatility, :last_100, :last_250,
                             :last_500, :agreement_summary, :log_loss, :brier_score,
                             :calibration, :stability, :walk_forward, :selection_score,
-                            :kelly_staking)
+                            :kelly_staking, :training_profile)
                 """), {
                     'run_id': run_id,
                     'model_type': result['model_type'],
@@ -5539,7 +6166,17 @@ def write_results(run_id, feature_recommendations, component_results,
                     'walk_forward': json.dumps(metrics.get('walk_forward', {})),
                     'selection_score': result.get('selection_score'),
                     'kelly_staking': json.dumps(metrics.get('kelly_staking', {})),
+                    # Wall/CPU time and thread budget from the candidate
+                    # scheduler; NULL for the in-process ensemble variants.
+                    'training_profile': json.dumps(result['training_profile']) if result.get('training_profile') else None,
                 })
+                if result.get('training_profile'):
+                    profile = result['training_profile']
+                    log.info(
+                        "Track E training profile for %s: wall=%.1fs cpu=%.1fs threads=%s cpu_utilisation=%.0f%%",
+                        result['model_type'], profile.get('wall_seconds', 0.0), profile.get('cpu_seconds', 0.0),
+                        profile.get('threads'), 100.0 * profile.get('cpu_utilisation', 0.0),
+                    )
 
         conn.commit()
 
@@ -0,0 +1,245 @@
+"""
+combination_engine.py
+=====================
+Bitset co-occurrence counting for /api/data/combination-analysis.
+
+Each factor is a packed bitmap over runner positions (bit i set = runner i
+has the factor), with per-runner win flags and profits kept in aligned
+arrays. The support of a factor combination is the popcount of the AND of
+its factors' bitmaps, its wins are the popcount of that AND over the winner
+positions, and its profit is a masked sum over the profit array. Combinations are
+grown one factor at a time (Apriori): k-factor candidates are joined from
+pairs of frequent (k-1)-factor combinations sharing their first k-2
+factors, and one is only counted when every (k-1)-factor subset already
+met its own minimum support. That pruning is exact because the minimum
+never decreases with k and support can only fall as factors are added.
+
+Compared with enumerating every combination of every runner's factors in
+Python dicts, the work scales with the number of frequent combinations
+rather than with runners x C(factors, k).
+
+    engine = FactorBitmaps(factor_sets, won, profit, min_support=10)
+    for combo in engine.frequent_combinations({2: 10, 3: 10, 4: 15}):
+        combo.factors, combo.races, combo.wins, combo.profit
+"""
+
+from __future__ import annotations
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+# Upper bound on the candidate bitmaps ANDed and popcounted in one numpy
+# call. A candidate costs ceil(runners / 8) bytes, so at 200k runners the
+# default evaluates ~2.7k candidates per chunk.
+COMBINATION_CHUNK_BYTES = int(os.environ.get('COMBINATION_CHUNK_BYTES', 64 << 20))
+
+# Bit counts for every 16-bit word; bitmap rows are padded to whole words.
+_POPCOUNT16 = np.array([bin(value).count('1') for value in range(1 << 16)], dtype=np.uint8)
+
+Combination = namedtuple('Combination', 'factors races wins profit')
+
+
+def _popcount_rows(bits):
+    return _POPCOUNT16[bits.view(np.uint16)].sum(axis=1, dtype=np.int64)
+
+
+def _words(n_bits):
+    """Bytes needed for ``n_bits`` bits, rounded up to whole 16-bit words."""
+    return (n_bits + 15) // 16 * 2
+
+
+def _min_support_for(min_support, size):
+    if isinstance(min_support, dict):
+        return min_support.get(size, max(min_support.values()))
+    return int(min_support)
+
+
+class FactorBitmaps:
+    """Packed factor bitmaps over a fixed list of runners.
+
+    ``factor_sets`` holds one iterable of hashable factor labels per runner,
+    aligned with ``won`` (truthy when the runner won) and ``profit`` (the
+    runner's flat-stake profit). Factors seen on fewer than ``min_support``
+    runners never get a bitmap, since no combination containing them can
+    reach that support.
+    """
+
+    def __init__(self, factor_sets, won, profit, min_support=1):
+        factor_sets = [set(factors) for factors in factor_sets]
+        self.n_runners = len(factor_sets)
+        if len(won) != self.n_runners or len(profit) != self.n_runners:
+            raise ValueError("factor_sets, won and profit must be aligned (one entry per runner)")
+        self.n_bytes = _words(self.n_runners)
+
+        counts = {}
+        for factors in factor_sets:
+            for factor in factors:
+                counts[factor] = counts.get(factor, 0) + 1
+        self.labels = sorted(factor for factor, count in counts.items() if count >= min_support)
+        self._index = {factor: i for i, factor in enumerate(self.labels)}
+
+        label_ids, runner_ids = [], []
+        for runner, factors in enumerate(factor_sets):
+            for factor in factors:
+                label = self._index.get(factor)
+                if label is not None:
+                    label_ids.append(label)
+                    runner_ids.append(runner)
+        # Winners take the first bit positions, so a combination's wins are
+        # the popcount of its leading bytes and its profit over winners only
+        # unpacks those bytes. Non-winners usually share one profit (the lost
+        # stake) and are then priced from the count alone.
+        won = np.asarray(won, dtype=bool)
+        profit = np.asarray(profit, dtype=np.float64)
+        order = np.argsort(~won, kind='stable')
+        position = np.empty(self.n_runners, dtype=np.int64)
+        position[order] = np.arange(self.n_runners)
+        self.n_winners = int(won.sum())
+        self._win_bytes = _words(self.n_winners)
+        self._win_mask = np.packbits(np.arange(self._win_bytes * 8) < self.n_winners)
+        self._winner_profit = profit[order[:self.n_winners]]
+        self._loser_profit = profit[order[self.n_winners:]]
+        losers = np.unique(self._loser_profit)
+        self._loser_constant = float(losers[0]) if len(losers) == 1 else (0.0 if not len(losers) else None)
+
+        label_ids = np.asarray(label_ids, dtype=np.int64)
+        runner_ids = position[np.asarray(runner_ids, dtype=np.int64)]
+        self.bits = np.zeros((len(self.labels), self.n_bytes), dtype=np.uint8)
+        # np.packbits bit order: position i is bit (7 - i % 8) of byte i // 8.
+        np.bitwise_or.at(
+            self.bits, (label_ids, runner_ids >> 3),
+            np.left_shift(1, 7 - (runner_ids & 7)).astype(np.uint8),
+        )
+        self.support = _popcount_rows(self.bits)
+
+    def _counts(self, bits, chunk_bytes):
+        """(races, wins, profit) arrays for a 2-D block of combination bitmaps."""
+        races = _popcount_rows(bits)
+        wins = _popcount_rows(bits[:, :self._win_bytes] & self._win_mask)
+        profit = np.empty(len(bits), dtype=np.float64)
+        # Unpacked membership costs 8 bytes per runner per row once cast for
+        # the dot product, so it gets its own, smaller row budget.
+        unpacked_runners = self.n_winners if self._loser_constant is not None else self.n_runners
+        step = max(1, chunk_bytes // max(1, 8 * unpacked_runners))
+        for start in range(0, len(bits), step):
+            block = bits[start:start + step]
+            if self._loser_constant is not None:
+                members = np.unpackbits(block[:, :self._win_bytes], axis=1, count=self.n_winners)
+                profit[start:start + step] = members @ self._winner_profit
+            else:
+                members = np.unpackbits(block, axis=1, count=self.n_runners)
+                profit[start:start + step] = (
+                    members[:, :self.n_winners] @ self._winner_profit
+                    + members[:, self.n_winners:] @ self._loser_profit
+                )
+        if self._loser_constant is not None:
+            profit += (races - wins) * self._loser_constant
+        return races, wins, profit
+
+    def single_stats(self):
+        """Combination rows for each factor that has a bitmap."""
+        races, wins, profit = self._counts(self.bits, COMBINATION_CHUNK_BYTES)
+        return [
+            Combination((label,), int(races[i]), int(wins[i]), float(profit[i]))
+            for i, label in enumerate(self.labels)
+        ]
+
+    def frequent_combinations(self, min_support, max_size=None, chunk_bytes=None):
+        """Every combination of 2..max_size factors meeting its minimum support.
+
+        ``min_support`` is an int or a {size: minimum} dict (sizes missing
+        from the dict use its largest value); ``max_size`` defaults to the
+        largest size in that dict. Factors within a combination are sorted.
+        """
+        if max_size is None:
+            max_size = max(min_support) if isinstance(min_support, dict) else 2
+        chunk_bytes = COMBINATION_CHUNK_BYTES if chunk_bytes is None else chunk_bytes
+        rows_per_chunk = max(1, chunk_bytes // max(1, self.n_bytes))
+        if len(self.labels) ** (max_size - 1) >= 1 << 63:
+            raise ValueError(f"too many factors ({len(self.labels)}) for combinations of {max_size}")
+
+        # Frequent itemsets are rows of label indices, kept in lexicographic
+        # order so itemsets sharing a prefix are contiguous.
+        singles = np.flatnonzero(self.support >= _min_support_for(min_support, 2))
+        parents = singles[:, None]
+        parent_bits = self.bits[singles]
+        results = []
+        for size in range(2, max_size + 1):
+            left, right = _prefix_join(parents)
+            if not len(left):
+                break
+            candidates = np.concatenate([parents[left], parents[right, -1:]], axis=1)
+            if size > 2:
+                keep = self._subsets_frequent(candidates, parents)
+                left, right, candidates = left[keep], right[keep], candidates[keep]
+
+            minimum = _min_support_for(min_support, size)
+            next_parents, next_bits = [], []
+            for start in range(0, len(candidates), rows_per_chunk):
+                stop = start + rows_per_chunk
+                bits = parent_bits[left[start:stop]] & parent_bits[right[start:stop]]
+                keep = np.flatnonzero(_popcount_rows(bits) >= minimum)
+                if not len(keep):
+                    continue
+                bits = bits[keep]
+                itemsets = candidates[start:stop][keep]
+                races, wins, profit = self._counts(bits, chunk_bytes)
+                for itemset, n, w, pnl in zip(itemsets.tolist(), races.tolist(), wins.tolist(), profit.tolist()):
+                    results.append(Combination(tuple(self.labels[i] for i in itemset), n, w, pnl))
+                next_parents.append(itemsets)
+                if size < max_size:
+                    next_bits.append(bits)
+            if not next_parents:
+                break
+            parents = np.concatenate(next_parents)
+            parent_bits = np.concatenate(next_bits) if next_bits else None
+        return results
+
+    def _subsets_frequent(self, candidates, parents):
+        """Mask of candidates whose every (k-1)-subset is among ``parents``.
+
+        The prefix join already guarantees the two subsets that drop one of
+        the last two factors, so only the others are looked up.
+        """
+        base = len(self.labels)
+        parent_keys = _itemset_keys(parents, base)
+        keep = np.ones(len(candidates), dtype=bool)
+        for dropped in range(candidates.shape[1] - 2):
+            keys = _itemset_keys(np.delete(candidates, dropped, axis=1), base)
+            pos = np.minimum(np.searchsorted(parent_keys, keys), len(parent_keys) - 1)
+            keep &= parent_keys[pos] == keys
+        return keep
+
+
+def _itemset_keys(itemsets, base):
+    """One int64 per itemset row, ordered like the rows' lexicographic order."""
+    keys = np.zeros(len(itemsets), dtype=np.int64)
+    for column in itemsets.T:
+        keys = keys * base + column
+    return keys
+
+
+def _prefix_join(parents):
+    """(left, right) parent indices for every pair of rows sharing all but the
+    last item, left < right, in lexicographic order of the joined itemset."""
+    if len(parents) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    breaks = np.flatnonzero(np.any(parents[1:, :-1] != parents[:-1, :-1], axis=1)) + 1
+    starts = np.concatenate([[0], breaks])
+    stops = np.concatenate([breaks, [len(parents)]])
+    left, right = [], []
+    pairs_for = {}
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        size = stop - start
+        if size < 2:
+            continue
+        if size not in pairs_for:
+            pairs_for[size] = np.triu_indices(size, 1)
+        i, j = pairs_for[size]
+        left.append(i + start)
+        right.append(j + start)
+    if not left:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(left), np.concatenate(right)
@@ -0,0 +1,282 @@
+"""
+import_jobs.py
+==============
+Queue for PuntingForm meeting imports, backed by the ``import_jobs`` table.
+
+POST /api/meetings/<id>/import only inserts a job row and returns its id.
+The import itself (PuntingForm fetches, the Node analyzer, storing rows)
+runs on a worker thread, which records its stage and percentage on the row
+for the import page to poll at /api/import-jobs/<job_id>.
+
+    queue = ImportJobQueue(app, run_import)
+    job, created = queue.enqueue({'pf_meeting_id': '12345', 'date': '2026-10-19', ...}, user_id)
+
+Claiming a job is one conditional UPDATE (status 'queued' -> 'running', only
+while fewer than ``concurrency`` jobs are running), so several gunicorn
+workers sharing the table never run the same job twice or exceed the cap
+between them. On PostgreSQL the claim also holds a transaction-level
+advisory lock, since READ COMMITTED would otherwise let two claims of
+different rows both count the same running jobs. Transient
+PuntingForm failures (timeouts, connection errors, 429 and 5xx) put the job
+back in the queue with exponential backoff until max_attempts. A job whose
+worker died mid-import goes back in the queue once its heartbeat is older
+than IMPORT_JOB_STALE_SECONDS; every claim checks for those first, and the
+import page's status poll kicks the queue when the job it shows has stalled.
+
+``run_import(params, user_id, progress, previous_meeting_id)`` does the
+import and returns the new meeting id. It must be safe to repeat:
+previous_meeting_id is the meeting an earlier attempt stored (reported
+through ``progress(..., meeting_id=...)``), which a retry removes before
+importing again.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+from sqlalchemy import func, select, text, update
+from sqlalchemy.exc import IntegrityError
+
+from models import ImportJob, db
+from puntingform_service import PuntingFormAPIError
+
+log = logging.getLogger(__name__)
+
+IMPORT_JOB_CONCURRENCY = int(os.environ.get('IMPORT_JOB_CONCURRENCY', '2'))
+IMPORT_JOB_MAX_ATTEMPTS = int(os.environ.get('IMPORT_JOB_MAX_ATTEMPTS', '3'))
+# First retry delay; each further retry doubles it.
+IMPORT_JOB_RETRY_SECONDS = float(os.environ.get('IMPORT_JOB_RETRY_SECONDS', '15'))
+IMPORT_JOB_STALE_SECONDS = int(os.environ.get('IMPORT_JOB_STALE_SECONDS', '900'))
+# 'thread' runs jobs on a pool inside each web process. 'worker' only
+# enqueues and leaves the jobs to scripts/import_worker.py.
+IMPORT_JOB_RUNNER = os.environ.get('IMPORT_JOB_RUNNER', 'thread').strip().lower() or 'thread'
+
+ACTIVE_STATUSES = ('queued', 'running')
+# pg_advisory_xact_lock key serialising claims across processes.
+IMPORT_JOB_CLAIM_LOCK = 0x1A9031B5
+
+
+class ImportJobError(Exception):
+    """A permanent import failure (unknown meeting, empty fields CSV); never retried."""
+
+
+def is_transient(exc) -> bool:
+    if isinstance(exc, PuntingFormAPIError):
+        return exc.transient
+    return isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+
+
+def import_job_payload(job):
+    """The JSON shape the import page polls."""
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'stage': job.stage,
+        'progress': job.progress or 0,
+        'attempts': job.attempts or 0,
+        'max_attempts': job.max_attempts,
+        'error': job.error,
+        'meeting_id': job.meeting_id,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def _update_job(job_id, **values):
+    """Write job columns on their own connection, outside the import's session."""
+    with db.engine.begin() as conn:
+        return conn.execute(update(ImportJob).where(ImportJob.id == job_id).values(**values)).rowcount
+
+
+class ImportJobQueue:
+    def __init__(self, app, run_import, concurrency=None, runner=None,
+                 max_attempts=None, retry_seconds=None, stale_seconds=None):
+        self.app = app
+        self.run_import = run_import
+        self.concurrency = max(1, concurrency or IMPORT_JOB_CONCURRENCY)
+        self.runner = runner or IMPORT_JOB_RUNNER
+        self.max_attempts = max_attempts or IMPORT_JOB_MAX_ATTEMPTS
+        self.retry_seconds = IMPORT_JOB_RETRY_SECONDS if retry_seconds is None else retry_seconds
+        self.stale_seconds = IMPORT_JOB_STALE_SECONDS if stale_seconds is None else stale_seconds
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _active_job(self, dedupe_key):
+        return (
+            ImportJob.query
+            .filter(ImportJob.dedupe_key == dedupe_key, ImportJob.status.in_(ACTIVE_STATUSES))
+            .order_by(ImportJob.created_at)
+            .first()
+        )
+
+    def enqueue(self, params, user_id):
+        """(job, created). An import of the same meeting and date that is
+        still queued or running is returned instead of a new job.
+
+        The partial unique index on active dedupe_keys settles two requests
+        that both pass the check below: the second insert fails in its
+        savepoint and returns the job the first one created.
+        """
+        dedupe_key = f"{params['pf_meeting_id']}:{params['date']}"
+        existing = self._active_job(dedupe_key)
+        if existing is not None:
+            log.info("IMPORT_JOB_DEDUPED job=%s key=%s status=%s", existing.id, dedupe_key, existing.status)
+            return existing, False
+
+        now = datetime.utcnow()
+        job = ImportJob(
+            id=str(uuid.uuid4()), dedupe_key=dedupe_key, user_id=user_id, params=dict(params),
+            status='queued', stage='queued', progress=0, attempts=0,
+            max_attempts=self.max_attempts, run_after=now, created_at=now,
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(job)
+        except IntegrityError:
+            existing = self._active_job(dedupe_key)
+            if existing is None:
+                raise
+            db.session.commit()
+            log.info("IMPORT_JOB_DEDUPED job=%s key=%s status=%s race=true", existing.id, dedupe_key, existing.status)
+            return existing, False
+        db.session.commit()
+        log.info("IMPORT_JOB_QUEUED job=%s key=%s user=%s", job.id, dedupe_key, user_id)
+        self.kick()
+        return job, True
+
+    def kick(self):
+        """Have a pool thread drain the queue (no-op when runner='worker')."""
+        if self.runner != 'thread':
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='import-job')
+        self._executor.submit(self._drain_in_context)
+
+    def _drain_in_context(self):
+        with self.app.app_context():
+            try:
+                self.drain()
+            except Exception:
+                log.exception("IMPORT_JOB_DRAIN_FAILED")
+            finally:
+                db.session.remove()
+
+    def drain(self):
+        """Run claimable jobs one after another until none are left; returns how many ran."""
+        ran = 0
+        while True:
+            job_id = self.claim_next()
+            if job_id is None:
+                return ran
+            self.run(job_id)
+            ran += 1
+
+    def is_stale(self, job):
+        """True for a running job whose heartbeat is older than stale_seconds."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        return job.status == 'running' and job.heartbeat_at is not None and job.heartbeat_at < cutoff
+
+    def requeue_stale(self):
+        """Requeue (or fail, when out of attempts) running jobs whose heartbeat stopped."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        stale = (ImportJob.status == 'running', ImportJob.heartbeat_at < cutoff)
+        with db.engine.begin() as conn:
+            requeued = conn.execute(
+                update(ImportJob).where(*stale, ImportJob.attempts < ImportJob.max_attempts)
+                .values(status='queued', stage='requeued after stall', run_after=datetime.utcnow())
+            ).rowcount
+            failed = conn.execute(
+                update(ImportJob).where(*stale)
+                .values(status='failed', stage='failed', error='Import stalled (worker stopped responding)',
+                        finished_at=datetime.utcnow())
+            ).rowcount
+        if requeued or failed:
+            log.warning("IMPORT_JOB_STALE requeued=%s failed=%s", requeued, failed)
+
+    def claim_next(self):
+        """Atomically move the oldest due queued job to 'running'; its id, or None."""
+        self.requeue_stale()
+        now = datetime.utcnow()
+        candidates = [
+            job_id for (job_id,) in
+            db.session.query(ImportJob.id)
+            .filter(ImportJob.status == 'queued', ImportJob.run_after <= now)
+            .order_by(ImportJob.created_at)
+            .limit(self.concurrency)
+        ]
+        db.session.rollback()
+        for job_id in candidates:
+            if self._claim(job_id, now):
+                return job_id
+        return None
+
+    def _claim(self, job_id, now):
+        """Claim ``job_id`` if it is still queued and the cap has room, in one UPDATE."""
+        running_jobs = ImportJob.__table__.alias('running_jobs')
+        running = (
+            select(func.count(running_jobs.c.id))
+            .where(running_jobs.c.status == 'running')
+            .scalar_subquery()
+        )
+        with db.engine.begin() as conn:
+            if conn.dialect.name == 'postgresql':
+                conn.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': IMPORT_JOB_CLAIM_LOCK})
+            claimed = conn.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job_id, ImportJob.status == 'queued', running < self.concurrency)
+                .values(status='running', stage='starting', attempts=ImportJob.attempts + 1,
+                        started_at=now, heartbeat_at=now, error=None)
+            ).rowcount
+        return claimed == 1
+
+    def run(self, job_id):
+        """Run one claimed job and record how it ended."""
+        job = db.session.get(ImportJob, job_id)
+        params, user_id = dict(job.params), job.user_id
+        previous_meeting_id, attempt, dedupe_key = job.meeting_id, job.attempts, job.dedupe_key
+        db.session.rollback()
+        log.info("IMPORT_JOB_STARTED job=%s key=%s attempt=%s", job_id, dedupe_key, attempt)
+
+        def progress(stage, percent, meeting_id=None):
+            values = {'stage': stage, 'progress': int(percent), 'heartbeat_at': datetime.utcnow()}
+            if meeting_id is not None:
+                values['meeting_id'] = meeting_id
+            _update_job(job_id, **values)
+
+        try:
+            meeting_id = self.run_import(params, user_id, progress, previous_meeting_id)
+        except Exception as e:
+            db.session.rollback()
+            self._record_failure(job_id, attempt, e)
+            return
+        _update_job(
+            job_id, status='succeeded', stage='done', progress=100, meeting_id=meeting_id,
+            error=None, finished_at=datetime.utcnow(),
+        )
+        log.info("IMPORT_JOB_SUCCEEDED job=%s meeting=%s attempt=%s", job_id, meeting_id, attempt)
+
+    def _record_failure(self, job_id, attempt, exc):
+        max_attempts = db.session.query(ImportJob.max_attempts).filter(ImportJob.id == job_id).scalar()
+        db.session.rollback()
+        if not isinstance(exc, ImportJobError) and is_transient(exc) and attempt < (max_attempts or 1):
+            delay = self.retry_seconds * (2 ** (attempt - 1))
+            _update_job(
+                job_id, status='queued', stage='retrying', error=str(exc),
+                run_after=datetime.utcnow() + timedelta(seconds=delay),
+            )
+            log.warning("IMPORT_JOB_RETRY job=%s attempt=%s delay=%.0fs error=%s", job_id, attempt, delay, exc)
+            if self.runner == 'thread':
+                timer = threading.Timer(delay, self.kick)
+                timer.daemon = True
+                timer.start()
+            return
+        _update_job(job_id, status='failed', stage='failed', error=str(exc), finished_at=datetime.utcnow())
+        log.error("IMPORT_JOB_FAILED job=%s attempt=%s error=%s", job_id, attempt, exc,
+                  exc_info=not isinstance(exc, ImportJobError))
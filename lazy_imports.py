@@ -0,0 +1,63 @@
+"""
+lazy_imports.py
+===============
+Deferred imports for modules the web process loads on every boot.
+
+``import app`` pulls in the AFL, MMA and ML route modules so their URLs can
+be registered, but most requests never touch pandas, numpy or pyreadr.
+Module-level names bound with ``lazy_module`` look like the real module to
+the code that uses them and only import it on first attribute access, so the
+cost is paid by the first request that needs it rather than by every worker.
+
+    pd = lazy_module("pandas")      # nothing imported yet
+    pd.isna(value)                  # pandas imported here, once
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access."""
+
+    __slots__ = ("_name", "_module", "_lock")
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                module = self._module
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    object.__setattr__(self, "_module", module)
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __setattr__(self, attr, value):
+        # Keeps monkeypatch.setattr(afl_data.pyreadr, ...) pointing at the
+        # real module rather than the proxy.
+        setattr(self.load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
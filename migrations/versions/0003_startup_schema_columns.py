@@ -0,0 +1,82 @@
+"""Move the column checks that app.py ran on every import into a migration
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, type) in the order app.py and register_ml_shadow_routes used
+# to add them on import. Existing databases already carry most of these, so
+# each one is only added when the inspector says it is missing.
+STARTUP_COLUMNS = [
+    ('meetings', 'puntingform_id', sa.String(length=255)),
+    ('meetings', 'auto_imported', sa.Boolean()),
+    ('users', 'bet_tracker_starting_bankroll', sa.Float()),
+    ('races', 'speed_maps_json', sa.JSON()),
+    ('races', 'ratings_json', sa.JSON()),
+    ('races', 'sectionals_json', sa.JSON()),
+    ('predictions', 'best_bet_flagged_at', sa.DateTime()),
+    ('predictions', 'ladbrokes_signal_mask', sa.Integer()),
+    ('predictions', 'ladbrokes_signal_price', sa.Float()),
+    ('predictions', 'ladbrokes_signals_captured_at', sa.DateTime()),
+    ('predictions', 'value_edge_pct', sa.Float()),
+    ('predictions', 'value_edge_ml_win_prob_pct', sa.Float()),
+    ('predictions', 'value_edge_price', sa.Float()),
+    ('predictions', 'value_edge_captured_at', sa.DateTime()),
+    ('predictions', 'kelly_stake_pct', sa.Float()),
+    ('predictions', 'ml_score', sa.Float()),
+    ('horses', 'is_scratched', sa.Boolean()),
+    ('meetings', 'rail_position', sa.Integer()),
+    ('meetings', 'pace_bias', sa.Integer()),
+    ('components', 'component_key', sa.String(length=120)),
+]
+
+SERVER_DEFAULTS = {
+    ('meetings', 'auto_imported'): sa.false(),
+    ('users', 'bet_tracker_starting_bankroll'): sa.text('0.0'),
+    ('predictions', 'ladbrokes_signal_mask'): sa.text('0'),
+    ('horses', 'is_scratched'): sa.false(),
+    ('meetings', 'rail_position'): sa.text('0'),
+    ('meetings', 'pace_bias'): sa.text('0'),
+}
+
+NOT_NULL = {('predictions', 'ladbrokes_signal_mask')}
+
+
+def _existing_columns():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    return {
+        table: {col['name'] for col in inspector.get_columns(table)}
+        for table in {t for t, _, _ in STARTUP_COLUMNS} & tables
+    }
+
+
+def upgrade() -> None:
+    """Add any of the formerly startup-managed columns that are missing."""
+    existing = _existing_columns()
+    for table, column, column_type in STARTUP_COLUMNS:
+        if table not in existing or column in existing[table]:
+            continue
+        op.add_column(table, sa.Column(
+            column,
+            column_type,
+            nullable=(table, column) not in NOT_NULL,
+            server_default=SERVER_DEFAULTS.get((table, column)),
+        ))
+
+
+def downgrade() -> None:
+    """No-op: these columns predate the migration and are used by the models."""
+    pass
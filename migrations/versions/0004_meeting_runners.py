@@ -0,0 +1,62 @@
+"""Add the pre-parsed meeting runner table and meeting CSV column mapping
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create meeting_runners and the meetings columns it is keyed from.
+
+    db.create_all() in the release step already creates the table on fresh
+    databases, so each object is only added when it is missing. Rows are
+    filled by scripts/backfill_meeting_runners.py.
+    """
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    meeting_columns = {col['name'] for col in inspector.get_columns('meetings')}
+    if 'csv_columns' not in meeting_columns:
+        op.add_column('meetings', sa.Column('csv_columns', sa.JSON(), nullable=True))
+    if 'jurisdiction_state' not in meeting_columns:
+        op.add_column('meetings', sa.Column('jurisdiction_state', sa.String(length=10), nullable=True))
+    meeting_indexes = {index['name'] for index in inspector.get_indexes('meetings')}
+    if 'ix_meetings_jurisdiction_state' not in meeting_indexes:
+        op.create_index('ix_meetings_jurisdiction_state', 'meetings', ['jurisdiction_state'])
+
+    if 'meeting_runners' not in tables:
+        op.create_table(
+            'meeting_runners',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('meeting_id', sa.Integer(), sa.ForeignKey('meetings.id'), nullable=False),
+            sa.Column('horse_id', sa.Integer(), sa.ForeignKey('horses.id'), nullable=False, unique=True),
+            sa.Column('horse_key', sa.String(length=100)),
+            sa.Column('current_track', sa.String(length=100)),
+            sa.Column('current_state', sa.String(length=10)),
+            sa.Column('previous_track', sa.String(length=100)),
+            sa.Column('previous_state', sa.String(length=10)),
+            sa.Column('csv_finish_position', sa.Integer(), nullable=True),
+            sa.Column('csv_price', sa.Float(), nullable=True),
+            sa.Column('created_at', sa.DateTime()),
+        )
+        op.create_index('ix_meeting_runners_meeting_id', 'meeting_runners', ['meeting_id'])
+        op.create_index('ix_meeting_runners_states', 'meeting_runners', ['previous_state', 'current_state'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_meeting_runners_states', table_name='meeting_runners')
+    op.drop_index('ix_meeting_runners_meeting_id', table_name='meeting_runners')
+    op.drop_table('meeting_runners')
+    op.drop_index('ix_meetings_jurisdiction_state', table_name='meetings')
+    op.drop_column('meetings', 'jurisdiction_state')
+    op.drop_column('meetings', 'csv_columns')
@@ -0,0 +1,50 @@
+"""Add the meeting import job queue table
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create import_jobs unless db.create_all() in the release step already did."""
+    inspector = sa.inspect(op.get_bind())
+    if 'import_jobs' in set(inspector.get_table_names()):
+        return
+    op.create_table(
+        'import_jobs',
+        sa.Column('id', sa.String(length=36), primary_key=True),
+        sa.Column('dedupe_key', sa.String(length=120), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('stage', sa.String(length=50)),
+        sa.Column('progress', sa.Integer()),
+        sa.Column('attempts', sa.Integer()),
+        sa.Column('max_attempts', sa.Integer()),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('meeting_id', sa.Integer(), sa.ForeignKey('meetings.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('run_after', sa.DateTime()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_import_jobs_dedupe_key', 'import_jobs', ['dedupe_key'])
+    op.create_index('ix_import_jobs_status', 'import_jobs', ['status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_import_jobs_status', table_name='import_jobs')
+    op.drop_index('ix_import_jobs_dedupe_key', table_name='import_jobs')
+    op.drop_table('import_jobs')
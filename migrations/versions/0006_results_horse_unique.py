@@ -0,0 +1,32 @@
+"""Make results.horse_id unique so settlement can upsert on it
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Drop duplicate results (keeping each runner's newest row), then add the
+    unique index results_settlement's INSERT ... ON CONFLICT (horse_id) needs."""
+    inspector = sa.inspect(op.get_bind())
+    if 'uq_results_horse_id' in {index['name'] for index in inspector.get_indexes('results')}:
+        return
+    op.execute(
+        "DELETE FROM results WHERE id NOT IN (SELECT MAX(id) FROM results GROUP BY horse_id)"
+    )
+    op.create_index('uq_results_horse_id', 'results', ['horse_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_results_horse_id', table_name='results')
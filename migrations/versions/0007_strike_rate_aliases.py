@@ -0,0 +1,35 @@
+"""Add the strike_rate_aliases table for persisted fuzzy name matches
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create strike_rate_aliases unless db.create_all() in the release step already did."""
+    inspector = sa.inspect(op.get_bind())
+    if 'strike_rate_aliases' in set(inspector.get_table_names()):
+        return
+    op.create_table(
+        'strike_rate_aliases',
+        sa.Column('entity_type', sa.String(length=20), primary_key=True),
+        sa.Column('query_key', sa.String(length=255), primary_key=True),
+        sa.Column('matched_key', sa.String(length=255), nullable=False),
+        sa.Column('similarity', sa.Float()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('strike_rate_aliases')
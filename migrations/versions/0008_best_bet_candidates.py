@@ -0,0 +1,62 @@
+"""Add best_bet_candidates and meetings.best_bets_computed_at
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create best_bet_candidates and its meetings marker column.
+
+    db.create_all() in the release step already creates the table on fresh
+    databases, so each object is only added when it is missing. Existing
+    meetings keep a NULL marker and are computed by the release step's
+    derived-table backfill, or by scripts/backfill_best_bet_candidates.py.
+    """
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    meeting_columns = {col['name'] for col in inspector.get_columns('meetings')}
+    if 'best_bets_computed_at' not in meeting_columns:
+        op.add_column('meetings', sa.Column('best_bets_computed_at', sa.DateTime(), nullable=True))
+
+    if 'best_bet_candidates' not in tables:
+        op.create_table(
+            'best_bet_candidates',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('meeting_id', sa.Integer(), sa.ForeignKey('meetings.id'), nullable=False),
+            sa.Column('race_id', sa.Integer(), sa.ForeignKey('races.id'), nullable=False),
+            sa.Column('horse_id', sa.Integer(), sa.ForeignKey('horses.id'), nullable=False, unique=True),
+            sa.Column('rank_in_race', sa.Integer()),
+            sa.Column('is_top_pick', sa.Boolean()),
+            sa.Column('score', sa.Float()),
+            sa.Column('score_gap', sa.Float()),
+            sa.Column('win_probability_pct', sa.Float()),
+            sa.Column('reason_mask', sa.Integer(), nullable=False),
+            sa.Column('reasons', sa.JSON()),
+            sa.Column('component_keys', sa.JSON()),
+            sa.Column('analyzer_rank', sa.Integer()),
+            sa.Column('pfai_rank', sa.Integer()),
+            sa.Column('ml_rank', sa.Integer()),
+            sa.Column('ml_score', sa.Float()),
+            sa.Column('ml_score_gap', sa.Float()),
+            sa.Column('ml_fair_probability_pct', sa.Float()),
+            sa.Column('computed_at', sa.DateTime()),
+        )
+        op.create_index('ix_best_bet_candidates_meeting_id', 'best_bet_candidates', ['meeting_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_best_bet_candidates_meeting_id', table_name='best_bet_candidates')
+    op.drop_table('best_bet_candidates')
+    op.drop_column('meetings', 'best_bets_computed_at')
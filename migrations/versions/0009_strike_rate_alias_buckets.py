@@ -0,0 +1,34 @@
+"""Add strike_rate_aliases.bucket_fingerprint
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the column unless db.create_all() already created the table with it.
+
+    Existing rows keep a NULL fingerprint, which resolvers ignore, so every
+    stored alias is re-scored once and rewritten with its bucket.
+    """
+    inspector = sa.inspect(op.get_bind())
+    if 'strike_rate_aliases' not in set(inspector.get_table_names()):
+        return
+    columns = {col['name'] for col in inspector.get_columns('strike_rate_aliases')}
+    if 'bucket_fingerprint' not in columns:
+        op.add_column('strike_rate_aliases', sa.Column('bucket_fingerprint', sa.String(length=32)))
+
+
+def downgrade() -> None:
+    op.drop_column('strike_rate_aliases', 'bucket_fingerprint')
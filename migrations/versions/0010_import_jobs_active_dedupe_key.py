@@ -0,0 +1,49 @@
+"""Allow only one queued or running import job per dedupe_key
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+ACTIVE = "status IN ('queued', 'running')"
+
+
+def upgrade() -> None:
+    """Fail all but the oldest active job per dedupe_key, then add the partial
+    unique index ImportJobQueue.enqueue relies on to settle racing requests."""
+    inspector = sa.inspect(op.get_bind())
+    if 'import_jobs' not in set(inspector.get_table_names()):
+        return
+    if 'uq_import_jobs_active_dedupe_key' in {index['name'] for index in inspector.get_indexes('import_jobs')}:
+        return
+    op.execute(
+        f"""
+        UPDATE import_jobs SET status = 'failed', stage = 'failed',
+               error = 'Duplicate of an earlier import of the same meeting'
+        WHERE {ACTIVE} AND EXISTS (
+            SELECT 1 FROM import_jobs older
+            WHERE older.dedupe_key = import_jobs.dedupe_key
+              AND older.{ACTIVE}
+              AND (older.created_at < import_jobs.created_at
+                   OR (older.created_at = import_jobs.created_at AND older.id < import_jobs.id))
+        )
+        """
+    )
+    op.create_index(
+        'uq_import_jobs_active_dedupe_key', 'import_jobs', ['dedupe_key'], unique=True,
+        postgresql_where=sa.text(ACTIVE), sqlite_where=sa.text(ACTIVE),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_import_jobs_active_dedupe_key', table_name='import_jobs')
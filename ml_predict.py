@@ -16,7 +16,10 @@ import re
 import logging
 from collections import Counter, defaultdict
 import numpy as np
-from strike_rate_matching import build_strike_rate_lookup, get_sr_win_pct, normalize_name
+from strike_rate_matching import (
+    build_strike_rate_lookup, get_sr_win_pct, load_strike_rate_aliases, normalize_name,
+    save_strike_rate_aliases, strike_rate_resolver,
+)
 import pandas as pd
 from datetime import datetime
 
@@ -28,9 +31,19 @@ from datetime import datetime
 # before load_model() is ever called.
 import model_classes  # noqa: F401
 from model_classes import solve_joint_kelly
+import model_artifacts
 
 log = logging.getLogger(__name__)
 
+# joblib mmap_mode for the active champion's arrays ('' disables); see
+# model_artifacts.load_model_bytes.
+MODEL_MMAP_MODE = os.environ.get('ML_MODEL_MMAP_MODE', 'r').strip() or None
+
+# The last champion unpickled in this process, keyed by its artifact's
+# content hash, so repeat load_model() calls for an unchanged champion skip
+# the unpickle. Only new-format artifacts carry a hash in their header.
+_loaded_champion = {'sha256': None, 'model': None}
+
 
 class NoActiveChampionError(RuntimeError):
     """Raised when the model DB is reachable but has no active champion row.
@@ -948,11 +961,21 @@ def _log_live_feature_audit(model, meeting_id, race, feature_rows, raw_X, final_
             meeting_id, getattr(race, 'race_number', None), model_id, source_missing_summary,
         )
 
+def _load_champion_artifact(blob):
+    manifest = model_artifacts.read_manifest(blob)
+    sha256 = manifest['sha256'] if manifest else None
+    if sha256 and _loaded_champion['sha256'] == sha256:
+        return _loaded_champion['model']
+    model = model_artifacts.load_model_bytes(blob, mmap_mode=MODEL_MMAP_MODE)
+    if sha256:
+        _loaded_champion.update(sha256=sha256, model=model)
+    return model
+
+
 def load_model():
     """Load only the active Champion model from DB, with filesystem fallback for local dev."""
     try:
         from sqlalchemy import create_engine, text
-        import io, joblib
         db_url = os.environ.get('DATABASE_URL', '')
         if db_url.startswith('postgres://'):
             db_url = db_url.replace('postgres://', 'postgresql://', 1)
@@ -970,7 +993,7 @@ def load_model():
                 """
             )).fetchone()
             if row and row[5]:
-                model = joblib.load(io.BytesIO(bytes(row[5])))
+                model = _load_champion_artifact(bytes(row[5]))
                 build_metadata = getattr(model, '_form_analyst_build_metadata', {}) or {}
                 model._form_analyst_model_id = row[0]
                 model._form_analyst_run_id = row[1]
@@ -1160,6 +1183,13 @@ def _load_live_strike_rate_lookups(db_session):
                         sr_type, sr_type, sr_type, e)
             continue
         lookups[lookup_key] = build_strike_rate_lookup([(r[0], r[1], r[2]) for r in rows])
+        try:
+            # Savepoint: a missing aliases table must not abort the caller's transaction.
+            with db_session.begin_nested():
+                aliases = load_strike_rate_aliases(db_session, sr_type)
+            strike_rate_resolver(lookups[lookup_key]).add_aliases(aliases)
+        except Exception as e:
+            log.warning("Could not load %s name aliases (fuzzy matches will be re-scored): %s", sr_type, e)
         extra = {}
         for name, _wins, _runs, career_a2e, l100_a2e, career_runs in rows:
             norm = normalize_name(str(name or ''))
@@ -1172,6 +1202,25 @@ def _load_live_strike_rate_lookups(db_session):
     return lookups
 
 
+def _save_live_name_aliases(db_session, jockey_sr, trainer_sr):
+    """Store the fuzzy jockey/trainer matches this scoring run made, in a
+    savepoint of the caller's transaction, so later scoring runs reuse them."""
+    for sr_type, lookup in (('jockey', jockey_sr), ('trainer', trainer_sr)):
+        if not lookup:
+            continue
+        discovered = strike_rate_resolver(lookup).discovered
+        if not discovered:
+            continue
+        try:
+            with db_session.begin_nested():
+                saved = save_strike_rate_aliases(db_session, sr_type, discovered)
+        except Exception as e:
+            log.warning("Could not save %s name aliases: %s", sr_type, e)
+            continue
+        discovered.clear()
+        log.info("ML_PREDICTION_NAME_ALIASES_SAVED type=%s aliases=%s", sr_type, saved)
+
+
 def _load_pf_race_lookups_for_meeting(races):
     """Parse ratings_json/speed_maps_json off this meeting's race rows into
     per-runner lookups keyed by (PuntingForm raceId, tabNo) — the same ids
@@ -1270,7 +1319,7 @@ def _load_form_scores(db_session):
     return {normalize_name(str(name or '')): float(score) for name, score in rows if name}
 
 
-def predict_meeting(meeting_id, db_session, strike_rate_data=None):
+def predict_meeting(meeting_id, db_session, strike_rate_data=None, race_ids=None):
     """
     Generate ML scores for all non-scratched horses in a meeting.
 
@@ -1278,6 +1327,9 @@ def predict_meeting(meeting_id, db_session, strike_rate_data=None):
         meeting_id: int
         db_session: SQLAlchemy session
         strike_rate_data: optional dict {'jockeys': {...}, 'trainers': {...}}
+        race_ids: optional iterable of race ids; only those races are scored.
+            Scores are normalised within each race, so a subset scores
+            exactly as it would in a whole-meeting run.
 
     Returns:
         dict {horse_id: ml_score}  — higher = model likes this horse more
@@ -1343,7 +1395,10 @@ def predict_meeting(meeting_id, db_session, strike_rate_data=None):
     all_scores   = {}   # horse_id -> ml_score
     by_race      = {}   # race_id  -> {horse_id: ml_score}
 
-    races = db_session.query(Race).filter_by(meeting_id=meeting_id).all()
+    races_query = db_session.query(Race).filter_by(meeting_id=meeting_id)
+    if race_ids is not None:
+        races_query = races_query.filter(Race.id.in_(list(race_ids)))
+    races = races_query.all()
 
     pf_ratings_lookup, pf_speedmaps_lookup = _load_pf_race_lookups_for_meeting(races)
     log.info(
@@ -1451,6 +1506,7 @@ def predict_meeting(meeting_id, db_session, strike_rate_data=None):
 
         by_race[race.id] = race_scores
 
+    _save_live_name_aliases(db_session, jockey_sr, trainer_sr)
     return all_scores, by_race
 
 
@@ -13,7 +13,6 @@ Adds:
 """
 
 import logging
-from datetime import datetime
 
 from flask import render_template, jsonify, request, redirect, url_for
 from flask_login import login_required, current_user
@@ -31,102 +30,6 @@ def _ml_performance_meeting_name_sql(alias='m'):
     return f"LEFT({alias}.meeting_name, 6) >= '{ML_PERFORMANCE_MEETING_NAME_CUTOFF}'"
 
 
-def _meeting_date_string(meeting):
-    """Return YYYY-MM-DD for a meeting, using the date column or YYMMDD_Track name."""
-    if getattr(meeting, 'date', None):
-        return meeting.date.strftime('%Y-%m-%d')
-
-    name = meeting.meeting_name or ''
-    if '_' not in name:
-        return None
-
-    date_part = name.split('_', 1)[0]
-    if len(date_part) != 6 or not date_part.isdigit():
-        return None
-
-    return f"20{date_part[:2]}-{date_part[2:4]}-{date_part[4:6]}"
-
-
-def _normalise_runner_name(value):
-    return ' '.join((value or '').strip().lower().split())
-
-
-def _settle_meeting_results(db, meeting, recorded_by):
-    """Fetch PuntingForm results for one meeting and upsert any runner results."""
-    from models import Race, Result
-    from puntingform_service import PuntingFormService
-
-    if not meeting.puntingform_id:
-        return {'meeting_id': meeting.id, 'meeting_name': meeting.meeting_name, 'status': 'skipped', 'reason': 'not a PuntingForm meeting'}
-
-    date_str = _meeting_date_string(meeting)
-    if not date_str:
-        return {'meeting_id': meeting.id, 'meeting_name': meeting.meeting_name, 'status': 'skipped', 'reason': 'missing meeting date'}
-
-    pf_service = PuntingFormService()
-    response = pf_service.get_results(meeting.puntingform_id, date_str)
-    if response.get('IsError'):
-        return {'meeting_id': meeting.id, 'meeting_name': meeting.meeting_name, 'status': 'pending', 'reason': 'results not available'}
-
-    races_results = response.get('RaceDetails') or response.get('Result') or []
-    if not races_results:
-        return {'meeting_id': meeting.id, 'meeting_name': meeting.meeting_name, 'status': 'pending', 'reason': 'no race results returned'}
-
-    updated = created = matched = 0
-    for race_result in races_results:
-        race_num = race_result.get('RaceNumber') or race_result.get('RaceNo') or race_result.get('Race')
-        race = Race.query.filter_by(meeting_id=meeting.id, race_number=race_num).first()
-        if not race:
-            continue
-
-        horses_by_name = {_normalise_runner_name(h.horse_name): h for h in race.horses}
-        for runner in race_result.get('Runners', []) or []:
-            horse_name = runner.get('Name') or runner.get('Horse') or runner.get('RunnerName')
-            horse = horses_by_name.get(_normalise_runner_name(horse_name))
-            if not horse:
-                continue
-
-            finish_pos = runner.get('Position') or runner.get('FinishPosition') or runner.get('Place') or 0
-            try:
-                finish_pos = int(finish_pos or 0)
-            except (TypeError, ValueError):
-                finish_pos = 0
-            if finish_pos > 4:
-                finish_pos = 5
-
-            sp = runner.get('Price_SP') or runner.get('SP') or runner.get('StartingPrice')
-            try:
-                sp = float(sp) if sp not in (None, '') else None
-            except (TypeError, ValueError):
-                sp = None
-
-            matched += 1
-            if horse.result:
-                horse.result.finish_position = finish_pos
-                horse.result.sp = sp
-                horse.result.recorded_at = datetime.utcnow()
-                horse.result.recorded_by = recorded_by
-                updated += 1
-            else:
-                db.session.add(Result(
-                    horse_id=horse.id,
-                    finish_position=finish_pos,
-                    sp=sp,
-                    recorded_by=recorded_by,
-                ))
-                created += 1
-
-    return {
-        'meeting_id': meeting.id,
-        'meeting_name': meeting.meeting_name,
-        'status': 'settled' if matched else 'pending',
-        'matched': matched,
-        'created': created,
-        'updated': updated,
-    }
-
-
-
 NO_ACTIVE_CHAMPION_REASON = (
     'No picks: there is no active champion model right now. Scoring stays off until a model '
     'trained and validated under the current rules earns promotion — this is deliberate, not a failure.'
@@ -166,6 +69,10 @@ def _score_meeting_ml(db, meeting_id):
             pred.ml_score = ml_score
             updated += 1
 
+    # New ML ranks change the meeting's Best Bets candidates.
+    from app import refresh_best_bet_candidates
+
+    refresh_best_bet_candidates([meeting_id])
     return {'success': True, 'scored': updated}
 
 
@@ -207,18 +114,10 @@ def _unsettled_puntingform_meetings_sql():
 
 
 def register_ml_shadow_routes(app, db):
-    """Call this from app.py to add ML shadow routes."""
+    """Call this from app.py to add ML shadow routes.
 
-    with app.app_context():
-        try:
-            with db.engine.connect() as conn:
-                conn.execute(text(
-                    "ALTER TABLE predictions ADD COLUMN IF NOT EXISTS ml_score FLOAT"
-                ))
-                conn.commit()
-            log.info("✓ ml_score column ready on predictions table")
-        except Exception as e:
-            log.warning(f"ml_score migration: {e}")
+    The predictions.ml_score column is added by migration 0003 (release step).
+    """
 
     @app.route('/ml-shadow')
     @login_required
@@ -404,23 +303,23 @@ def register_ml_shadow_routes(app, db):
                 text(_unsettled_puntingform_meetings_sql())
             ).all()
 
-            details = []
+            from results_settlement import settle_meetings
+
+            ml_results = {}
             for meeting in unsettled_meetings:
                 try:
-                    score_result = _score_meeting_ml(db, meeting.id)
-                    settle_result = _settle_meeting_results(db, meeting, current_user.id)
-                    settle_result['ml_scored'] = score_result.get('scored', 0)
-                    if not score_result.get('success'):
-                        settle_result['ml_score_warning'] = score_result.get('reason')
-                    details.append(settle_result)
+                    ml_results[meeting.id] = _score_meeting_ml(db, meeting.id)
                 except Exception as exc:
-                    log.warning("ML shadow settle failed for meeting %s: %s", meeting.id, exc, exc_info=True)
-                    details.append({
-                        'meeting_id': meeting.id,
-                        'meeting_name': meeting.meeting_name,
-                        'status': 'error',
-                        'reason': str(exc),
-                    })
+                    log.warning("ML shadow scoring failed for meeting %s: %s", meeting.id, exc, exc_info=True)
+                    ml_results[meeting.id] = {'success': False, 'scored': 0, 'reason': str(exc)}
+
+            # One concurrent results sweep over every unsettled meeting.
+            details = settle_meetings(db, unsettled_meetings, current_user.id)
+            for settle_result in details:
+                score_result = ml_results[settle_result['meeting_id']]
+                settle_result['ml_scored'] = score_result.get('scored', 0)
+                if not score_result.get('success'):
+                    settle_result['ml_score_warning'] = score_result.get('reason')
 
             db.session.commit()
 
@@ -3,7 +3,8 @@ mma_sync.py - Weekly Railway cron job.
 
 What it does (in order):
   1. Scrapes ESPN for upcoming UFC events + fight cards
-  2. Re-calculates current fighter EMA stats from Postgres fight history
+  2. Updates fighter EMA stats from Postgres fight history (incrementally from
+     the persisted mma_fighter_stats_state; MMA_STATS_FULL_REBUILD=1 replays all)
   3. Loads the trained CatBoost model and generates win probabilities
   4. Writes upcoming events, fights, and predictions to Postgres
   5. Also scrapes ESPN for the most recently completed event to capture results
@@ -14,6 +15,9 @@ Railway cron schedule: 0 9 * * 0  (Sundays at 9am UTC)
 Environment variables required:
   DATABASE_URL  – already in Railway
   ODDS_API_KEY  – optional; if set, UFC fight odds are fetched and stored
+  MMA_STATS_FULL_REBUILD – optional; "1" ignores persisted stats state
+  MMA_ESPN_CACHE_DIR     – optional; ESPN page cache dir ("" disables it)
+  MMA_ESPN_MAX_PER_HOST  – optional; concurrent ESPN requests per host (4)
 """
 
 import os
@@ -23,7 +27,14 @@ import time
 import re
 import unicodedata
 import math
+import bisect
+import hashlib
 import logging
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from datetime import datetime, date, timedelta
 
 import requests
@@ -69,6 +80,17 @@ MIN_COMPLETE_CARD_RATIO = 0.75
 CANONICAL_CARD_SOURCES = {'espn_scoreboard_json', 'espn_summary_json', 'espn_embedded_json'}
 ESPN_SCOREBOARD_URL = 'https://site.api.espn.com/apis/site/v2/sports/mma/ufc/scoreboard'
 
+# ESPN fetch stage. Event cards and fighter profiles are fetched concurrently,
+# but never more than ESPN_MAX_PER_HOST requests in flight to any one host.
+# Pages that carry an ETag/Last-Modified are kept on disk and revalidated with
+# a conditional request; an unchanged page reuses its previously parsed result.
+# Set MMA_ESPN_CACHE_DIR to an empty string to disable the disk cache.
+ESPN_CACHE_DIR = os.environ.get('MMA_ESPN_CACHE_DIR', os.path.join(BASE_DIR, 'data', 'cache', 'espn'))
+ESPN_MAX_PER_HOST = max(1, int(os.environ.get('MMA_ESPN_MAX_PER_HOST', '4')))
+ESPN_FETCH_WORKERS = max(1, int(os.environ.get('MMA_ESPN_FETCH_WORKERS', '8')))
+# Bump when a page parser changes so memoised parse results are discarded.
+ESPN_PARSE_CACHE_VERSION = 1
+
 # ── Tunable model constants ───────────────────────────────────────────────────
 # These are reasonable-default heuristics, not values fit/validated against
 # held-out data in this repo (there is no in-repo training or backtesting
@@ -457,6 +479,16 @@ DEFAULT_VOL = 0.06
 # ── Fighter stats tracker (mirrors Octagon-AI FighterStats) ──────────────────
 
 class FighterStats:
+    # Scalar attributes persisted in mma_fighter_stats_state.state; the date
+    # attributes and recent_form are (de)serialised separately.
+    STATE_SCALAR_FIELDS = (
+        'total_time_sec', 'ema_slpm', 'ema_sapm', 'ema_td_acc', 'ema_td_avg',
+        'ema_td_def', 'ema_kd_rate', 'ema_sub_rate', 'ema_ctrl_pct',
+        'ema_sig_str_acc', 'ema_head_pct', 'ema_body_pct', 'ema_leg_pct',
+        'ema_dist_pct', 'ema_clinch_pct', 'ema_ground_pct',
+        'wins', 'losses', 'draws', 'total_fights', 'streak',
+    )
+
     def __init__(self):
         self.total_time_sec = 0
         self.first_fight_date = None
@@ -482,7 +514,29 @@ class FighterStats:
         self.draws = 0
         self.total_fights = 0
         self.streak = 0
-        self.recent_form = []
+        self.recent_form = deque(maxlen=5)
+
+    def to_state(self):
+        """JSON-serialisable snapshot used to resume the tracker on the next run."""
+        state = {field: getattr(self, field) for field in self.STATE_SCALAR_FIELDS}
+        state['first_fight_date'] = self.first_fight_date.isoformat() if self.first_fight_date is not None else None
+        state['last_fight_date'] = self.last_fight_date.isoformat() if self.last_fight_date is not None else None
+        state['fight_dates'] = [d.isoformat() for d in self.fight_dates]
+        state['recent_form'] = list(self.recent_form)
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        stats = cls()
+        for field in cls.STATE_SCALAR_FIELDS:
+            if field in state:
+                setattr(stats, field, state[field])
+        for field in ('first_fight_date', 'last_fight_date'):
+            if state.get(field):
+                setattr(stats, field, pd.Timestamp(state[field]))
+        stats.fight_dates = sorted(pd.Timestamp(d) for d in state.get('fight_dates') or [])
+        stats.recent_form.extend(state.get('recent_form') or [])
+        return stats
 
     def update(self, result, fight_date, f_time, s_landed, s_absorbed,
                td_landed, td_att, opp_td_att, opp_td_landed, kd, sub, ctrl,
@@ -492,7 +546,8 @@ class FighterStats:
         if self.first_fight_date is None:
             self.first_fight_date = fight_date
         self.last_fight_date = fight_date
-        self.fight_dates.append(fight_date)
+        # Kept sorted so get_stat_vector can bisect the two-year window.
+        bisect.insort(self.fight_dates, fight_date)
 
         t_min = f_time / 60.0 if f_time > 0 else 1.0
         f_slpm = s_landed / t_min
@@ -549,14 +604,12 @@ class FighterStats:
             self.streak = 0
 
         self.recent_form.append(result)
-        if len(self.recent_form) > 5:
-            self.recent_form.pop(0)
 
     def get_stat_vector(self, current_date):
         win_rate = self.wins / self.total_fights if self.total_fights > 0 else 0.5
         rust_days = (current_date - self.last_fight_date).days if self.last_fight_date else 365
         two_years_ago = current_date - pd.Timedelta(days=730)
-        recent_fights = len([d for d in self.fight_dates if d > two_years_ago])
+        recent_fights = len(self.fight_dates) - bisect.bisect_right(self.fight_dates, two_years_ago)
         f_ath_age = (current_date - self.first_fight_date).days / 365.25 if self.first_fight_date else 0
 
         return {
@@ -587,11 +640,453 @@ class FighterStats:
         }
 
 
+# ── Columnar fighter-state store (bulk replay / card scoring) ───────────────
+
+# EMA columns in FighterStats attribute order, with FighterStats' defaults.
+STORE_EMA_FIELDS = (
+    'ema_slpm', 'ema_sapm', 'ema_td_acc', 'ema_td_avg', 'ema_td_def',
+    'ema_kd_rate', 'ema_sub_rate', 'ema_ctrl_pct', 'ema_sig_str_acc',
+    'ema_head_pct', 'ema_body_pct', 'ema_leg_pct', 'ema_dist_pct',
+    'ema_clinch_pct', 'ema_ground_pct',
+)
+STORE_EMA_DEFAULTS = (0.0, 0.0, 0.4, 1.0, 0.5, 0.2, 0.2, 10.0, 0.45, 0.7, 0.15, 0.15, 0.8, 0.1, 0.1)
+# get_stat_vector key for each EMA column.
+STORE_EMA_STAT_KEYS = (
+    'slpm', 'sapm', 'td_acc', 'td_avg', 'td_def', 'kd_rate', 'sub_rate',
+    'ctrl_rate', 'sig_str_acc', 'head_pct', 'body_pct', 'leg_pct',
+    'dist_pct', 'clinch_pct', 'ground_pct',
+)
+_FORM_CODES = {'W': 1, 'L': 2}
+_FORM_LETTERS = {1: 'W', 2: 'L', 3: 'D'}
+_NAT_NS = -(2 ** 63)
+_NS_PER_DAY = 86_400 * 10 ** 9
+
+
+class FighterStatsStore:
+    """NumPy-backed equivalent of a ``{fighter_id: FighterStats}`` tracker.
+
+    One slot per fighter; EMA fields, counters, first/last dates and the
+    last-five form live in arrays indexed by slot, and every fight appearance
+    is appended to flat (slot, date) arrays so recent-fight windows are a
+    masked bincount.  ``update_batch`` applies a whole event's appearances
+    with vectorised EMA updates and produces the same numbers as calling
+    ``FighterStats.update`` fight by fight.
+    """
+
+    def __init__(self, capacity=256):
+        self.slots = {}
+        self.fighter_ids = []
+        self._alloc(max(int(capacity), 1))
+        self._fight_slot = []
+        self._fight_ns = []
+
+    def _alloc(self, capacity):
+        self.ema = np.tile(np.asarray(STORE_EMA_DEFAULTS, dtype=np.float64), (capacity, 1))
+        self.total_time_sec = np.zeros(capacity, dtype=np.float64)
+        self.wins = np.zeros(capacity, dtype=np.int64)
+        self.losses = np.zeros(capacity, dtype=np.int64)
+        self.draws = np.zeros(capacity, dtype=np.int64)
+        self.total_fights = np.zeros(capacity, dtype=np.int64)
+        self.streak = np.zeros(capacity, dtype=np.int64)
+        self.first_ns = np.full(capacity, _NAT_NS, dtype=np.int64)
+        self.last_ns = np.full(capacity, _NAT_NS, dtype=np.int64)
+        self.form = np.zeros((capacity, 5), dtype=np.int8)
+
+    def _grow(self, needed):
+        capacity = len(self.wins)
+        if needed <= capacity:
+            return
+        old = {name: getattr(self, name) for name in (
+            'ema', 'total_time_sec', 'wins', 'losses', 'draws', 'total_fights',
+            'streak', 'first_ns', 'last_ns', 'form')}
+        self._alloc(max(needed, capacity * 2))
+        for name, values in old.items():
+            getattr(self, name)[:capacity] = values
+
+    def __len__(self):
+        return len(self.fighter_ids)
+
+    def __contains__(self, fighter_id):
+        return fighter_id in self.slots
+
+    def slot_for(self, fighter_id):
+        slot = self.slots.get(fighter_id)
+        if slot is None:
+            slot = len(self.fighter_ids)
+            self._grow(slot + 1)
+            self.slots[fighter_id] = slot
+            self.fighter_ids.append(fighter_id)
+        return slot
+
+    # ── conversion to/from the object tracker ────────────────────────────────
+
+    @classmethod
+    def from_trackers(cls, stats_tracker):
+        store = cls(capacity=len(stats_tracker) + 64)
+        for fid, st in stats_tracker.items():
+            slot = store.slot_for(fid)
+            store.ema[slot] = [getattr(st, field) for field in STORE_EMA_FIELDS]
+            store.total_time_sec[slot] = st.total_time_sec
+            store.wins[slot] = st.wins
+            store.losses[slot] = st.losses
+            store.draws[slot] = st.draws
+            store.total_fights[slot] = st.total_fights
+            store.streak[slot] = st.streak
+            if st.first_fight_date is not None:
+                store.first_ns[slot] = pd.Timestamp(st.first_fight_date).value
+            if st.last_fight_date is not None:
+                store.last_ns[slot] = pd.Timestamp(st.last_fight_date).value
+            form = [_FORM_CODES.get(r, 3) for r in st.recent_form][-5:]
+            if form:
+                store.form[slot, 5 - len(form):] = form
+            if st.fight_dates:
+                store._fight_slot.append(np.full(len(st.fight_dates), slot, dtype=np.int64))
+                store._fight_ns.append(np.fromiter((pd.Timestamp(d).value for d in st.fight_dates),
+                                                   dtype=np.int64, count=len(st.fight_dates)))
+        return store
+
+    def _fight_columns(self):
+        if len(self._fight_slot) > 1:
+            self._fight_slot = [np.concatenate(self._fight_slot)]
+            self._fight_ns = [np.concatenate(self._fight_ns)]
+        if not self._fight_slot:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return self._fight_slot[0], self._fight_ns[0]
+
+    def to_trackers(self):
+        """Materialise ``{fighter_id: FighterStats}`` (e.g. for persistence)."""
+        fight_slot, fight_ns = self._fight_columns()
+        order = np.lexsort((fight_ns, fight_slot))
+        fight_slot, fight_ns = fight_slot[order], fight_ns[order]
+        bounds = np.searchsorted(fight_slot, np.arange(len(self.fighter_ids) + 1))
+
+        trackers = {}
+        for slot, fid in enumerate(self.fighter_ids):
+            st = FighterStats()
+            for col, field in enumerate(STORE_EMA_FIELDS):
+                setattr(st, field, float(self.ema[slot, col]))
+            total_time = float(self.total_time_sec[slot])
+            st.total_time_sec = int(total_time) if total_time.is_integer() else total_time
+            st.wins = int(self.wins[slot])
+            st.losses = int(self.losses[slot])
+            st.draws = int(self.draws[slot])
+            st.total_fights = int(self.total_fights[slot])
+            st.streak = int(self.streak[slot])
+            if self.first_ns[slot] != _NAT_NS:
+                st.first_fight_date = pd.Timestamp(int(self.first_ns[slot]))
+            if self.last_ns[slot] != _NAT_NS:
+                st.last_fight_date = pd.Timestamp(int(self.last_ns[slot]))
+            st.fight_dates = [pd.Timestamp(int(ns)) for ns in fight_ns[bounds[slot]:bounds[slot + 1]]]
+            st.recent_form.extend(_FORM_LETTERS[int(c)] for c in self.form[slot] if c)
+            trackers[fid] = st
+        return trackers
+
+    # ── updates ──────────────────────────────────────────────────────────────
+
+    def update_batch(self, fighter_ids, results, fight_dates, f_time, s_landed, s_absorbed,
+                     td_landed, td_att, opp_td_att, opp_td_landed, kd, sub, ctrl,
+                     sig_acc, head_p, body_p, leg_p, dist_p, clin_p, grou_p):
+        """Apply one batch of fight appearances (typically one event).
+
+        Arguments are parallel sequences in ``FighterStats.update`` order.  A
+        fighter appearing more than once is applied in input order.
+        """
+        n = len(fighter_ids)
+        if n == 0:
+            return
+        slots = np.fromiter((self.slot_for(fid) for fid in fighter_ids), dtype=np.int64, count=n)
+        dates_ns = np.fromiter((pd.Timestamp(d).value for d in fight_dates), dtype=np.int64, count=n)
+        codes = np.fromiter((_FORM_CODES.get(r, 3) for r in results), dtype=np.int8, count=n)
+        cols = [np.asarray(c, dtype=np.float64) for c in (
+            f_time, s_landed, s_absorbed, td_landed, td_att, opp_td_att, opp_td_landed,
+            kd, sub, ctrl, sig_acc, head_p, body_p, leg_p, dist_p, clin_p, grou_p)]
+
+        # Occurrence rank of each slot within the batch: rank-0 rows are
+        # disjoint, then rank-1, ... so fancy-indexed writes never collide.
+        rank = np.zeros(n, dtype=np.int64)
+        if len(np.unique(slots)) != n:
+            seen = {}
+            for i, slot in enumerate(slots.tolist()):
+                rank[i] = seen.get(slot, 0)
+                seen[slot] = rank[i] + 1
+        for r in range(int(rank.max()) + 1):
+            idx = np.flatnonzero(rank == r)
+            self._apply(slots[idx], dates_ns[idx], codes[idx], [c[idx] for c in cols])
+
+        self._fight_slot.append(slots)
+        self._fight_ns.append(dates_ns)
+
+    def _apply(self, slots, dates_ns, codes, cols):
+        (f_time, s_landed, s_absorbed, td_landed, td_att, opp_td_att, opp_td_landed,
+         kd, sub, ctrl, sig_acc, head_p, body_p, leg_p, dist_p, clin_p, grou_p) = cols
+        first_fight = self.total_fights[slots] == 0
+        self.total_fights[slots] += 1
+        self.total_time_sec[slots] += f_time
+        self.first_ns[slots] = np.where(self.first_ns[slots] == _NAT_NS, dates_ns, self.first_ns[slots])
+        self.last_ns[slots] = dates_ns
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_min = np.where(f_time > 0, f_time / 60.0, 1.0)
+            obs = np.column_stack([
+                s_landed / t_min,
+                s_absorbed / t_min,
+                np.where(td_att > 0, td_landed / td_att, 0.4),
+                (td_landed / t_min) * 15.0,
+                np.where(opp_td_att > 0, 1.0 - (opp_td_landed / opp_td_att), 0.5),
+                (kd / t_min) * 15.0,
+                (sub / t_min) * 15.0,
+                np.where(f_time > 0, (ctrl / f_time) * 100.0, 0),
+                sig_acc, head_p, body_p, leg_p, dist_p, clin_p, grou_p,
+            ])
+        alpha = EMA_SMOOTHING_ALPHA
+        self.ema[slots] = np.where(
+            first_fight[:, None], obs, alpha * obs + (1 - alpha) * self.ema[slots],
+        )
+
+        won = codes == 1
+        lost = codes == 2
+        streak = self.streak[slots]
+        self.wins[slots] += won
+        self.losses[slots] += lost
+        self.draws[slots] += ~(won | lost)
+        self.streak[slots] = np.where(
+            won, np.where(streak >= 0, streak + 1, 1),
+            np.where(lost, np.where(streak <= 0, streak - 1, -1), 0),
+        )
+        self.form[slots] = np.column_stack([self.form[slots, 1:], codes])
+
+    # ── reads ────────────────────────────────────────────────────────────────
+
+    def stat_vectors(self, fighter_ids, current_date):
+        """``FighterStats.get_stat_vector`` for many fighters in one pass."""
+        slots = np.fromiter((self.slots[fid] for fid in fighter_ids), dtype=np.int64, count=len(fighter_ids))
+        now_ns = pd.Timestamp(current_date).value
+        total = self.total_fights[slots]
+        win_rate = np.divide(self.wins[slots], total, out=np.full(len(slots), 0.5), where=total > 0)
+        last_ns = self.last_ns[slots]
+        first_ns = self.first_ns[slots]
+        rust_days = np.where(last_ns != _NAT_NS, (now_ns - last_ns) // _NS_PER_DAY, 365)
+        ath_age = np.where(first_ns != _NAT_NS, ((now_ns - first_ns) // _NS_PER_DAY) / 365.25, 0)
+
+        fight_slot, fight_ns = self._fight_columns()
+        recent = np.bincount(
+            fight_slot[fight_ns > now_ns - 730 * _NS_PER_DAY], minlength=len(self.fighter_ids),
+        )[slots] if len(fight_slot) else np.zeros(len(slots), dtype=np.int64)
+
+        ema = self.ema[slots]
+        vectors = []
+        for i, slot in enumerate(slots.tolist()):
+            vec = {key: float(ema[i, col]) for col, key in enumerate(STORE_EMA_STAT_KEYS)}
+            form = [_FORM_LETTERS[int(c)] for c in self.form[slot] if c]
+            total_time = float(self.total_time_sec[slot])
+            vec.update({
+                'exp_time': int(total_time) if total_time.is_integer() else total_time,
+                'wins': int(self.wins[slot]),
+                'losses': int(self.losses[slot]),
+                'streak': int(self.streak[slot]),
+                'win_rate': float(win_rate[i]),
+                'rust_days': int(rust_days[i]),
+                'recent_fights_count': int(recent[i]),
+                'ath_age': float(ath_age[i]),
+                'recent_form': '-'.join(reversed(form)) if form else 'N/A',
+            })
+            vectors.append(vec)
+        return vectors
+
+
 # ── ESPN scraping ─────────────────────────────────────────────────────────────
 
+_HOST_SLOTS = {}
+_HOST_SLOTS_LOCK = threading.Lock()
+_SCOREBOARD_JSON = {}
+_SCOREBOARD_JSON_LOCK = threading.Lock()
+ESPN_HTTP_STATS = {'requests': 0, 'not_modified': 0, 'stored': 0}
+_ESPN_HTTP_STATS_LOCK = threading.Lock()
+
+
+def _count_espn_http(key):
+    with _ESPN_HTTP_STATS_LOCK:
+        ESPN_HTTP_STATS[key] += 1
+
+
+def _host_slot(url):
+    """Bounded semaphore capping in-flight requests to the URL's host."""
+    host = urlparse(url).netloc.lower()
+    with _HOST_SLOTS_LOCK:
+        slot = _HOST_SLOTS.get(host)
+        if slot is None:
+            slot = _HOST_SLOTS[host] = threading.BoundedSemaphore(ESPN_MAX_PER_HOST)
+        return slot
+
+
+def _espn_cache_paths(url):
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return (
+        os.path.join(ESPN_CACHE_DIR, f'{key}.json'),
+        os.path.join(ESPN_CACHE_DIR, f'{key}.body'),
+    )
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _espn_cache_load(url):
+    """Return (meta, body) for a cached page, or (None, None)."""
+    if not ESPN_CACHE_DIR:
+        return None, None
+    meta_path, body_path = _espn_cache_paths(url)
+    try:
+        with open(meta_path, encoding='utf-8') as fh:
+            meta = json.load(fh)
+        with open(body_path, 'rb') as fh:
+            body = fh.read()
+    except (OSError, ValueError):
+        return None, None
+    # Body and metadata are written separately; a hash mismatch means a
+    # concurrent or interrupted write, so treat the entry as absent.
+    if meta.get('sha256') != hashlib.sha256(body).hexdigest():
+        return None, None
+    return meta, body
+
+
+def _espn_cache_store(url, meta, body=None):
+    if not ESPN_CACHE_DIR:
+        return
+    meta_path, body_path = _espn_cache_paths(url)
+    try:
+        os.makedirs(ESPN_CACHE_DIR, exist_ok=True)
+        if body is not None:
+            _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+    except OSError as exc:
+        log.warning("ESPN_CACHE_WRITE_FAILED url=%s error=%s", url, exc)
+
+
+class _CachedEspnResponse:
+    """Stands in for a requests.Response when the server answered 304."""
+
+    status_code = 200
+    from_cache = True
+
+    def __init__(self, url, meta, body):
+        self.url = meta.get('final_url') or url
+        self.headers = {'content-type': meta.get('content_type', '')}
+        self.content = body
+        self.encoding = meta.get('encoding')
+        self.cache_url = url
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return json.loads(self.content.decode(self.encoding or 'utf-8'))
+
+
+def espn_get(url, timeout=15, allow_redirects=True):
+    """GET an ESPN URL under the per-host limit, revalidating any cached copy.
+
+    Returns the live response, or a _CachedEspnResponse when the server says
+    the cached body is still current. Only 200 responses carrying an ETag or
+    Last-Modified validator are written to the cache.
+    """
+    meta, body = _espn_cache_load(url)
+    headers = dict(HEADERS)
+    if meta:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    with _host_slot(url):
+        r = requests.get(url, headers=headers, timeout=timeout, allow_redirects=allow_redirects)
+    _count_espn_http('requests')
+    status = getattr(r, 'status_code', None)
+    if status == 304 and meta:
+        _count_espn_http('not_modified')
+        return _CachedEspnResponse(url, meta, body)
+    resp_headers = getattr(r, 'headers', None) or {}
+    etag = resp_headers.get('ETag') or resp_headers.get('etag')
+    last_modified = resp_headers.get('Last-Modified') or resp_headers.get('last-modified')
+    content = getattr(r, 'content', None)
+    if status == 200 and (etag or last_modified) and isinstance(content, bytes):
+        _espn_cache_store(url, {
+            'etag': etag,
+            'last_modified': last_modified,
+            'final_url': getattr(r, 'url', url),
+            'content_type': resp_headers.get('content-type', ''),
+            'encoding': getattr(r, 'encoding', None),
+            'sha256': hashlib.sha256(content).hexdigest(),
+            'parsed': {},
+        }, content)
+        _count_espn_http('stored')
+        r.cache_url = url
+    return r
+
+
+def espn_cached_parse(response, kind):
+    """Previously parsed result for an unchanged (304) page, else None."""
+    if not getattr(response, 'from_cache', False):
+        return None
+    meta, _ = _espn_cache_load(response.cache_url)
+    entry = ((meta or {}).get('parsed') or {}).get(kind)
+    if not entry or entry.get('version') != ESPN_PARSE_CACHE_VERSION:
+        return None
+    return entry['value']
+
+
+def espn_remember_parse(response, kind, value):
+    """Attach a parse result to the cached page so a 304 can skip re-parsing."""
+    url = getattr(response, 'cache_url', None)
+    if not url:
+        return
+    meta, _ = _espn_cache_load(url)
+    if meta is None:
+        return
+    try:
+        meta.setdefault('parsed', {})[kind] = {'version': ESPN_PARSE_CACHE_VERSION, 'value': value}
+        _espn_cache_store(url, json.loads(json.dumps(meta)))
+    except (TypeError, ValueError):
+        return
+
+
+def fetch_concurrently(fn, items, max_workers=ESPN_FETCH_WORKERS):
+    """Map fn over items on a thread pool, preserving input order.
+
+    Per-host limits are enforced inside espn_get, so max_workers only bounds
+    the number of threads, not the load placed on any one ESPN host.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+def _scoreboard_json(year):
+    """Scoreboard API payload for a season, fetched at most once per run."""
+    url = _scoreboard_url_for_year(year)
+    with _SCOREBOARD_JSON_LOCK:
+        if url in _SCOREBOARD_JSON:
+            return _SCOREBOARD_JSON[url], url
+    r = espn_get(url)
+    r.raise_for_status()
+    data = r.json()
+    with _SCOREBOARD_JSON_LOCK:
+        _SCOREBOARD_JSON[url] = data
+    return data, url
+
+
 def get_soup(url):
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
+        r = espn_get(url)
         r.raise_for_status()
         return BeautifulSoup(r.content, 'html.parser')
     except Exception as e:
@@ -726,11 +1221,8 @@ def _log_scoreboard_event_structure(event):
 def _fetch_espn_scoreboard_event(event_id, year=None):
     years = [year] if year else [date.today().year, date.today().year + 1, date.today().year - 1]
     for yr in years:
-        url = _scoreboard_url_for_year(yr)
         try:
-            r = requests.get(url, headers=HEADERS, timeout=15)
-            r.raise_for_status()
-            data = r.json()
+            data, url = _scoreboard_json(yr)
         except Exception as e:
             log.warning(f"  ESPN scoreboard API fetch failed for {yr}: {e}")
             continue
@@ -760,15 +1252,20 @@ def _fetch_espn_scoreboard_card(event_id):
 def _fetch_espn_event_html(event_url):
     meta = {'status': None, 'final_url': event_url, 'content_type': '', 'byte_length': 0}
     try:
-        r = requests.get(event_url, headers=HEADERS, timeout=15, allow_redirects=True)
+        r = espn_get(event_url)
         meta.update({
             'status': getattr(r, 'status_code', None),
             'final_url': getattr(r, 'url', event_url),
             'content_type': getattr(r, 'headers', {}).get('content-type', ''),
             'byte_length': len(getattr(r, 'content', b'') or b''),
+            'response': r,
         })
         r.raise_for_status()
         html = (getattr(r, 'content', b'') or b'').decode(getattr(r, 'encoding', None) or 'utf-8', errors='replace')
+        parsed = espn_cached_parse(r, 'event_card')
+        if parsed is not None:
+            meta['parsed_card'] = parsed
+            return None, html, meta
         if is_espn_waf_challenge(html, meta):
             log.warning("ESPN_WAF_CHALLENGE=true status=%s final_url=%s bytes=%s", meta.get('status'), meta.get('final_url'), meta.get('byte_length'))
             return None, html, meta
@@ -783,51 +1280,64 @@ def scrape_fighter_profile(url):
     if not url or 'espn.com' not in url:
         return {}
     try:
-        soup = get_soup(url)
-        if not soup:
-            return {}
-        stats = {}
-        header_div = soup.find('div', class_=lambda x: x and 'PlayerHeader' in x)
-        if not header_div:
-            return {}
-        text = header_div.get_text(separator='|', strip=True)
-        parts = [p.strip() for p in text.split('|')]
-
-        def get_val(keys):
-            for i, p in enumerate(parts):
-                if p.lower() in [k.lower() for k in keys]:
-                    if i + 1 < len(parts):
-                        return parts[i + 1]
-            return None
+        r = espn_get(url)
+        r.raise_for_status()
+    except Exception as e:
+        log.warning(f"Failed to fetch {url}: {e}")
+        return {}
+    cached = espn_cached_parse(r, 'profile')
+    if cached is not None:
+        return dict(cached)
+    try:
+        stats = _parse_fighter_profile(BeautifulSoup(r.content, 'html.parser'))
+    except Exception as e:
+        log.warning(f"Profile scrape error {url}: {e}")
+        return {}
+    espn_remember_parse(r, 'profile', stats)
+    return stats
 
-        hw = get_val(['HT/WT', 'Height'])
-        if hw:
-            sub = hw.split(',')
-            if sub:
-                stats['Height'] = sub[0].strip()
-            if len(sub) > 1:
-                stats['Weight'] = sub[1].strip()
 
-        dob = get_val(['Birthdate', 'DOB'])
-        if dob:
-            stats['DOB'] = dob.split('(')[0].strip()
+def _parse_fighter_profile(soup):
+    """Height/reach/stance/record fields from a fighter profile page."""
+    stats = {}
+    header_div = soup.find('div', class_=lambda x: x and 'PlayerHeader' in x)
+    if not header_div:
+        return stats
+    text = header_div.get_text(separator='|', strip=True)
+    parts = [p.strip() for p in text.split('|')]
+
+    def get_val(keys):
+        for i, p in enumerate(parts):
+            if p.lower() in [k.lower() for k in keys]:
+                if i + 1 < len(parts):
+                    return parts[i + 1]
+        return None
 
-        reach = get_val(['Reach'])
-        if reach:
-            stats['Reach'] = reach.replace('"', '').strip()
+    hw = get_val(['HT/WT', 'Height'])
+    if hw:
+        sub = hw.split(',')
+        if sub:
+            stats['Height'] = sub[0].strip()
+        if len(sub) > 1:
+            stats['Weight'] = sub[1].strip()
 
-        stance = get_val(['Stance'])
-        if stance:
-            stats['Stance'] = stance
+    dob = get_val(['Birthdate', 'DOB'])
+    if dob:
+        stats['DOB'] = dob.split('(')[0].strip()
 
-        record = get_val(['Record', 'W-L-D'])
-        if record:
-            stats['Record'] = record
+    reach = get_val(['Reach'])
+    if reach:
+        stats['Reach'] = reach.replace('"', '').strip()
 
-        return stats
-    except Exception as e:
-        log.warning(f"Profile scrape error {url}: {e}")
-        return {}
+    stance = get_val(['Stance'])
+    if stance:
+        stats['Stance'] = stance
+
+    record = get_val(['Record', 'W-L-D'])
+    if record:
+        stats['Record'] = record
+
+    return stats
 
 
 def _parse_espn_schedule_json(data, seen_ids):
@@ -891,14 +1401,10 @@ def _fetch_espn_schedule_api(year, seen_ids):
     Returns a list of event dicts.
     """
     events = []
-    start = f"{year}0101"
-    end = f"{year}1231"
     url = _scoreboard_url_for_year(year)
     log.info(f"  Trying ESPN API: {url}")
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
-        r.raise_for_status()
-        data = r.json()
+        data, _ = _scoreboard_json(year)
     except Exception as e:
         log.warning(f"  ESPN API fetch failed: {e}")
         return events
@@ -1132,11 +1638,21 @@ def _parse_espn_card_segs(gp):
 
 
 def _enrich_fights_with_profiles(fights):
-    """Add f1_stats / f2_stats by scraping each fighter's ESPN profile URL."""
+    """Add f1_stats / f2_stats by scraping each fighter's ESPN profile URL.
+
+    Each distinct profile is fetched once, concurrently, under the per-host
+    request limit enforced by espn_get.
+    """
+    urls = []
+    for fight in fights:
+        for key in ('fighter_1_url', 'fighter_2_url'):
+            url = fight.get(key, '')
+            if url not in urls:
+                urls.append(url)
+    profiles = dict(zip(urls, fetch_concurrently(scrape_fighter_profile, urls)))
     for fight in fights:
-        fight['f1_stats'] = scrape_fighter_profile(fight.get('fighter_1_url', ''))
-        fight['f2_stats'] = scrape_fighter_profile(fight.get('fighter_2_url', ''))
-        time.sleep(0.3)
+        fight['f1_stats'] = dict(profiles[fight.get('fighter_1_url', '')])
+        fight['f2_stats'] = dict(profiles[fight.get('fighter_2_url', '')])
     return fights
 
 
@@ -1157,7 +1673,7 @@ def _fetch_espn_event_api(event_id):
     log.info(f"  Trying ESPN summary API: {url}")
     response_meta = {'status': None, 'final_url': url, 'content_type': '', 'byte_length': 0}
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15, allow_redirects=True)
+        r = espn_get(url)
         response_meta.update({
             'status': getattr(r, 'status_code', None),
             'final_url': getattr(r, 'url', url),
@@ -1388,6 +1904,11 @@ def scrape_event_details(event_url, event_id):
         return fights
 
     soup, html, response_meta = _fetch_espn_event_html(event_url)
+    parsed = response_meta.get('parsed_card')
+    if parsed is not None:
+        fights = [dict(f) for f in parsed['fights']]
+        log.info("ESPN_EVENT_PAGE_UNCHANGED event_id=%s bouts=%s; reusing parsed card", event_id, len(fights))
+        return _enrich_fights_with_profiles(fights) if parsed['needs_profiles'] else fights
     if not soup:
         if is_espn_waf_challenge(html, response_meta):
             log.warning("  ESPN WAF challenge detected for event %s; aborting all Fightcenter DOM parsers and preserving existing card", event_id)
@@ -1398,6 +1919,20 @@ def scrape_event_details(event_url, event_id):
         return []
     _save_espn_debug_html(event_id, html)
 
+    fights, needs_profiles = _parse_espn_event_page(event_id, soup, html, response_meta)
+    espn_remember_parse(response_meta.get('response'), 'event_card', {
+        'fights': fights,
+        'needs_profiles': needs_profiles,
+    })
+    return _enrich_fights_with_profiles(fights) if needs_profiles else fights
+
+
+def _parse_espn_event_page(event_id, soup, html, response_meta):
+    """Run the Fightcenter page parsers in priority order.
+
+    Returns (fights, needs_profiles); profile enrichment is left to the caller
+    so the parse result can be memoised against the unchanged page.
+    """
     fights = []
 
     # Strategy 1: embedded __espnfitt__ JSON (most reliable for completed events)
@@ -1430,7 +1965,7 @@ def scrape_event_details(event_url, event_id):
                         _log_espn_parser('embedded_json', True, response_meta, soup, raw)
                         _log_espn_parser('legacy_dom', False, response_meta, soup, [])
                         _log_espn_parser('heading_dom', False, response_meta, soup, [])
-                        return _enrich_fights_with_profiles(raw)
+                        return raw, True
             except Exception as e:
                 log.warning(f"  JSON parse error: {e}")
     _log_espn_parser('embedded_json', True, response_meta, soup, [])
@@ -1495,7 +2030,26 @@ def scrape_event_details(event_url, event_id):
             event_id,
         )
 
-    return fights
+    return fights, False
+
+
+def prefetch_event_cards(events):
+    """Scrape every event's card concurrently; returns {event_id: fights}."""
+    def _scrape(event):
+        try:
+            return scrape_event_details(event['url'], event['event_id'])
+        except Exception:
+            log.exception("  Card scrape failed for %s", event['event_id'])
+            return []
+
+    started = time.monotonic()
+    cards = fetch_concurrently(_scrape, events, max_workers=min(ESPN_FETCH_WORKERS, ESPN_MAX_PER_HOST))
+    log.info(
+        "ESPN_PREFETCH events=%s elapsed=%.1fs requests=%s not_modified=%s stored=%s",
+        len(events), time.monotonic() - started, ESPN_HTTP_STATS['requests'],
+        ESPN_HTTP_STATS['not_modified'], ESPN_HTTP_STATS['stored'],
+    )
+    return {event['event_id']: fights for event, fights in zip(events, cards)}
 
 
 # ── Database helpers ──────────────────────────────────────────────────────────
@@ -1504,9 +2058,25 @@ def get_conn():
     return psycopg2.connect(DATABASE_URL)
 
 
-def load_fight_history(conn):
-    """Load all historical fights from mma_fights + mma_events for stat calculation."""
-    sql = """
+_FIGHT_HISTORY_WHERE = """
+          e.is_completed = TRUE
+          AND e.date <= CURRENT_DATE
+          AND f.winner_name IS NOT NULL
+"""
+
+
+def load_fight_history(conn, after=None):
+    """Load historical fights from mma_fights + mma_events for stat calculation.
+
+    ``after`` is an optional (date, fight_id) watermark; only fights ordered
+    strictly after it are returned.
+    """
+    watermark_clause = ""
+    params = ()
+    if after is not None:
+        watermark_clause = "AND (e.date, f.id) > (%s, %s)"
+        params = tuple(after)
+    sql = f"""
         SELECT
             f.id AS fight_id,
             f.fighter_1_id, f.fighter_2_id,
@@ -1523,16 +2093,74 @@ def load_fight_history(conn):
             NULL AS sig_acc1, NULL AS sig_acc2
         FROM mma_fights f
         JOIN mma_events e ON f.event_id = e.id
-        WHERE e.is_completed = TRUE
-          AND e.date <= CURRENT_DATE
-          AND f.winner_name IS NOT NULL
-        ORDER BY e.date ASC
+        WHERE {_FIGHT_HISTORY_WHERE}
+          {watermark_clause}
+        ORDER BY e.date ASC, f.id ASC
     """
     with conn.cursor() as cur:
-        cur.execute(sql)
+        cur.execute(sql, params or None)
         return cur.fetchall()
 
 
+def fight_history_fingerprint(conn, upto, name_to_id=None):
+    """Return (row_count, md5) over every history fight at or before ``upto``.
+
+    Covers exactly the columns the stats replay reads, so any edit, deletion
+    or back-dated insert before the watermark changes the fingerprint. Fights
+    with a NULL fighter id are credited through ``name_to_id``, so when it is
+    given the ids those names resolve to are folded into the digest as well:
+    a renamed or newly added fighter row that re-points one of them forces a
+    full replay too.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT COUNT(*),
+                   MD5(COALESCE(STRING_AGG(
+                       CONCAT_WS('|', f.id, f.fighter_1_id, f.fighter_2_id,
+                                 f.fighter_1_name, f.fighter_2_name, f.winner_name,
+                                 f.round_ended, f.time_ended, e.date),
+                       ',' ORDER BY e.date, f.id), ''))
+            FROM mma_fights f
+            JOIN mma_events e ON f.event_id = e.id
+            WHERE {_FIGHT_HISTORY_WHERE}
+              AND (e.date, f.id) <= (%s, %s)
+            """,
+            tuple(upto),
+        )
+        count, digest = cur.fetchone()
+    if name_to_id is not None:
+        digest = _fold_unlinked_name_ids(conn, upto, name_to_id, digest)
+    return int(count or 0), digest
+
+
+def _fold_unlinked_name_ids(conn, upto, name_to_id, digest):
+    """Extend ``digest`` with the fighter id each unlinked history name resolves to."""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT f.fighter_1_id, f.fighter_2_id, f.fighter_1_name, f.fighter_2_name
+            FROM mma_fights f
+            JOIN mma_events e ON f.event_id = e.id
+            WHERE {_FIGHT_HISTORY_WHERE}
+              AND (f.fighter_1_id IS NULL OR f.fighter_2_id IS NULL)
+              AND (e.date, f.id) <= (%s, %s)
+            """,
+            tuple(upto),
+        )
+        rows = cur.fetchall()
+    names = set()
+    for fid1, fid2, n1, n2 in rows:
+        if not fid1:
+            names.add(normalize_name(n1))
+        if not fid2:
+            names.add(normalize_name(n2))
+    if not names:
+        return digest
+    resolved = ','.join(f"{name}={name_to_id.get(name)}" for name in sorted(n for n in names if n))
+    return hashlib.md5(f"{digest}|{resolved}".encode()).hexdigest()
+
+
 def load_fighters_bio(conn):
     """Load fighter bio data from mma_fighters."""
     sql = """
@@ -1556,11 +2184,126 @@ def load_fighters_bio(conn):
             } for r in rows}
 
 
-def rebuild_stats_from_db(conn):
+def ensure_stats_state_schema(conn):
+    """Tables holding the persisted FighterStats replay between cron runs."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS mma_fighter_stats_state (
+                fighter_id VARCHAR(64) PRIMARY KEY,
+                state JSONB NOT NULL,
+                updated_at TIMESTAMP DEFAULT NOW()
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS mma_stats_watermark (
+                id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                last_fight_date DATE NOT NULL,
+                last_fight_id INTEGER NOT NULL,
+                history_count INTEGER NOT NULL,
+                history_md5 VARCHAR(32) NOT NULL,
+                updated_at TIMESTAMP DEFAULT NOW()
+            )
+        """)
+    conn.commit()
+
+
+def load_stats_state(conn):
+    """Return (watermark, stats_tracker) from the persisted replay, or None."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT last_fight_date, last_fight_id, history_count, history_md5
+            FROM mma_stats_watermark WHERE id = 1
+        """)
+        row = cur.fetchone()
+        if not row:
+            return None
+        cur.execute("SELECT fighter_id, state FROM mma_fighter_stats_state")
+        stats_tracker = {}
+        for fid, state in cur.fetchall():
+            if isinstance(state, str):
+                state = json.loads(state)
+            stats_tracker[fid] = FighterStats.from_state(state)
+    watermark = {
+        'last_fight_date': row[0],
+        'last_fight_id': row[1],
+        'history_count': row[2],
+        'history_md5': row[3],
+    }
+    return watermark, stats_tracker
+
+
+def save_stats_state(conn, stats_tracker, watermark, fighter_ids=None, replace_all=False):
+    """Persist tracker state for ``fighter_ids`` (all when None) and the watermark."""
+    ids = list(stats_tracker) if fighter_ids is None else [fid for fid in fighter_ids if fid in stats_tracker]
+    with conn.cursor() as cur:
+        if replace_all:
+            cur.execute("DELETE FROM mma_fighter_stats_state")
+        if ids:
+            execute_values(
+                cur,
+                """
+                INSERT INTO mma_fighter_stats_state (fighter_id, state, updated_at)
+                VALUES %s
+                ON CONFLICT (fighter_id) DO UPDATE SET
+                    state = EXCLUDED.state,
+                    updated_at = NOW()
+                """,
+                [(fid, json.dumps(stats_tracker[fid].to_state())) for fid in ids],
+                template="(%s, %s::jsonb, NOW())",
+                page_size=500,
+            )
+        cur.execute(
+            """
+            INSERT INTO mma_stats_watermark
+                (id, last_fight_date, last_fight_id, history_count, history_md5, updated_at)
+            VALUES (1, %s, %s, %s, %s, NOW())
+            ON CONFLICT (id) DO UPDATE SET
+                last_fight_date = EXCLUDED.last_fight_date,
+                last_fight_id = EXCLUDED.last_fight_id,
+                history_count = EXCLUDED.history_count,
+                history_md5 = EXCLUDED.history_md5,
+                updated_at = NOW()
+            """,
+            (watermark['last_fight_date'], watermark['last_fight_id'],
+             watermark['history_count'], watermark['history_md5']),
+        )
+    conn.commit()
+
+
+def _resume_stats_state(conn, name_to_id):
+    """Load persisted tracker state if the history before its watermark is unchanged."""
+    loaded = load_stats_state(conn)
+    if not loaded:
+        log.info("STATS_STATE mode=full_rebuild reason=no_persisted_state")
+        return None
+    watermark, stats_tracker = loaded
+    upto = (watermark['last_fight_date'], watermark['last_fight_id'])
+    count, digest = fight_history_fingerprint(conn, upto, name_to_id)
+    if (count, digest) != (watermark['history_count'], watermark['history_md5']):
+        log.info(
+            "STATS_STATE mode=full_rebuild reason=history_edited watermark=%s|%s "
+            "persisted_count=%s current_count=%s",
+            upto[0], upto[1], watermark['history_count'], count,
+        )
+        return None
+    log.info(
+        "STATS_STATE mode=incremental watermark=%s|%s fighters=%s fights_before_watermark=%s",
+        upto[0], upto[1], len(stats_tracker), count,
+    )
+    return watermark, stats_tracker
+
+
+def rebuild_stats_from_db(conn, full_rebuild=False):
     """
     Rebuild EMA stats tracker from fight history in Postgres.
     Returns dict: fighter_id -> FighterStats
     Also builds name -> fighter_id map.
+
+    Tracker state is persisted per fighter together with a (date, fight_id)
+    watermark of the last fight applied. Later runs resume from that state and
+    replay only fights after the watermark; if any fight at or before the
+    watermark was edited, deleted or back-dated in, the whole history is
+    replayed instead. ``full_rebuild=True`` forces the latter.
     """
     log.info("Rebuilding fighter stats from DB fight history...")
     stats_tracker = {}
@@ -1570,7 +2313,8 @@ def rebuild_stats_from_db(conn):
     # Build identity maps. ESPN profile IDs are canonical when present;
     # names are only a fallback, and duplicate names are resolved after history
     # counts are known so newly-created ESPN rows do not disconnect old fights.
-    sql = "SELECT id, full_name, espn_url FROM mma_fighters"
+    # Ordered so the first-seen name wins deterministically across runs.
+    sql = "SELECT id, full_name, espn_url FROM mma_fighters ORDER BY id"
     with conn.cursor() as cur:
         cur.execute(sql)
         for fid, name, espn_url in cur.fetchall():
@@ -1581,8 +2325,21 @@ def rebuild_stats_from_db(conn):
             if espn_id and espn_id not in espn_to_id:
                 espn_to_id[espn_id] = fid
 
+    watermark = None
+    if not full_rebuild:
+        try:
+            ensure_stats_state_schema(conn)
+            resumed = _resume_stats_state(conn, name_to_id)
+        except Exception as e:
+            conn.rollback()
+            log.warning("STATS_STATE unavailable (%s); replaying full history", e)
+            resumed = None
+        if resumed:
+            watermark, stats_tracker = resumed
+
     # Load fights chronologically
-    rows = load_fight_history(conn)
+    after = (watermark['last_fight_date'], watermark['last_fight_id']) if watermark else None
+    rows = load_fight_history(conn, after=after)
     log.info(f"  Processing {len(rows)} historical fights")
 
     def pars_time(t_str, r_num):
@@ -1592,14 +2349,43 @@ def rebuild_stats_from_db(conn):
         except Exception:
             return 300  # default 5 min
 
+    # Replay through the columnar store one fight date at a time: every
+    # appearance on a date is applied in a single vectorised EMA update.
+    store = FighterStatsStore.from_trackers(stats_tracker)
+    touched = set()
+    last_applied = after
+    batch = []
+    batch_date = None
+
+    def flush(appearances):
+        if not appearances:
+            return
+        fids, results, dates, times = zip(*appearances)
+        n = len(fids)
+        minutes = np.asarray(times, dtype=np.float64) / 60
+        # We don't have per-round stats from historical seed — use defaults
+        store.update_batch(
+            fids, results, dates, times,
+            s_landed=3.5 * minutes, s_absorbed=3.5 * minutes,
+            td_landed=[1] * n, td_att=[2.5] * n, opp_td_att=[2.5] * n, opp_td_landed=[1] * n,
+            kd=[0] * n, sub=[0] * n, ctrl=[0] * n,
+            sig_acc=[0.45] * n, head_p=[0.7] * n, body_p=[0.15] * n, leg_p=[0.15] * n,
+            dist_p=[0.8] * n, clin_p=[0.1] * n, grou_p=[0.1] * n,
+        )
+
     for row in rows:
         fight_row_id, fid1, fid2, n1, n2, winner, method, rnd, t_str, fight_date = row[:10]
+        if fight_date:
+            last_applied = (fight_date, fight_row_id)
         if not fight_date:
             continue
         try:
             fight_date = pd.Timestamp(fight_date)
         except Exception:
             continue
+        if fight_date != batch_date:
+            flush(batch)
+            batch, batch_date = [], fight_date
 
         time_sec = pars_time(t_str, rnd) if t_str and rnd else 300
         result_1 = 'W' if winner == n1 else ('L' if winner else 'D')
@@ -1615,17 +2401,30 @@ def rebuild_stats_from_db(conn):
         for fid, result in [(fid1, result_1), (fid2, result_2)]:
             if not fid:
                 continue
-            if fid not in stats_tracker:
-                stats_tracker[fid] = FighterStats()
-            # We don't have per-round stats from historical seed — use defaults
-            stats_tracker[fid].update(
-                result, fight_date, time_sec,
-                s_landed=3.5 * (time_sec / 60), s_absorbed=3.5 * (time_sec / 60),
-                td_landed=1, td_att=2.5, opp_td_att=2.5, opp_td_landed=1,
-                kd=0, sub=0, ctrl=0,
-                sig_acc=0.45, head_p=0.7, body_p=0.15, leg_p=0.15,
-                dist_p=0.8, clin_p=0.1, grou_p=0.1
+            touched.add(fid)
+            batch.append((fid, result, fight_date, time_sec))
+    flush(batch)
+    if rows:
+        stats_tracker = store.to_trackers()
+
+    # Persist before aliasing: aliases share objects and are re-derived each run.
+    if last_applied is not None and (watermark is None or rows):
+        try:
+            ensure_stats_state_schema(conn)
+            count, digest = fight_history_fingerprint(conn, last_applied, name_to_id)
+            save_stats_state(
+                conn, stats_tracker,
+                {'last_fight_date': last_applied[0], 'last_fight_id': last_applied[1],
+                 'history_count': count, 'history_md5': digest},
+                fighter_ids=None if watermark is None else touched,
+                replace_all=watermark is None,
             )
+            log.info("STATS_STATE saved fighters=%s watermark=%s|%s",
+                     len(stats_tracker) if watermark is None else len(touched),
+                     last_applied[0], last_applied[1])
+        except Exception as e:
+            conn.rollback()
+            log.warning("STATS_STATE could not be saved (%s); next run replays full history", e)
 
     _alias_historical_stats_to_canonical_fighters(conn, stats_tracker)
     # Re-point normalized names/ESPN IDs at rows that actually carry historical stats.
@@ -1633,7 +2432,8 @@ def rebuild_stats_from_db(conn):
     espn_to_id = build_espn_to_fighter_id(conn, stats_tracker)
     _log_established_fighter_history_assertion(conn, stats_tracker)
     log.info("HISTORICAL_SOURCE source=completed_fight_database completed_fights=%s fighters=%s",
-             len(rows), len(stats_tracker))
+             len(rows) if watermark is None else watermark['history_count'] + len(rows),
+             len(stats_tracker))
     log.info(f"  Stats built for {len(stats_tracker)} fighters")
     return stats_tracker, name_to_id, espn_to_id
 
@@ -1783,6 +2583,92 @@ def predict_fight(model, st1, st2, b1, b2, g1, g2, is_apex=0, is_altitude=0,
         return 0.5, True
 
 
+_STAT_DIFF_FEATURES = (
+    ('slpm_diff', 'slpm'), ('sapm_diff', 'sapm'), ('td_avg_diff', 'td_avg'),
+    ('td_acc_diff', 'td_acc'), ('td_def_diff', 'td_def'), ('kd_diff', 'kd_rate'),
+    ('sub_diff', 'sub_rate'), ('ctrl_diff', 'ctrl_rate'), ('sig_acc_diff', 'sig_str_acc'),
+    ('head_pct_diff', 'head_pct'), ('body_pct_diff', 'body_pct'), ('leg_pct_diff', 'leg_pct'),
+    ('dist_pct_diff', 'dist_pct'), ('clinch_pct_diff', 'clinch_pct'),
+    ('ground_pct_diff', 'ground_pct'),
+)
+
+
+def build_feature_matrix(pairs):
+    """Column-wise ``build_feature_row`` for a whole card.
+
+    ``pairs`` is a list of dicts with the ``build_feature_row`` arguments
+    (st1, st2, b1, b2, g1, g2 and optional is_apex, is_altitude,
+    weight_class).  Returns a DataFrame in MODEL_FEATURE_NAMES order whose
+    rows equal the per-fight feature dicts.
+    """
+    def col(side, key, default=None, source='st'):
+        values = []
+        for p in pairs:
+            item = p[f'{source}{side}']
+            if source == 'st':
+                values.append(item[key] if default is None else item.get(key, default))
+            else:
+                values.append(item.get(key) or default)
+        return np.asarray(values, dtype=np.float64)
+
+    def glicko(side, key, default):
+        return np.asarray([p[f'g{side}'].get(key, default) for p in pairs], dtype=np.float64)
+
+    columns = {
+        'glicko_diff': np.clip(glicko(1, 'rating', 1500) - glicko(2, 'rating', 1500),
+                               -GLICKO_DIFF_CLIP, GLICKO_DIFF_CLIP),
+        'glicko_rd_diff': glicko(1, 'rd', 350) - glicko(2, 'rd', 350),
+        'age_diff': col(1, 'ath_age', 0) - col(2, 'ath_age', 0),
+        'height_diff': col(1, 'height', 175, 'b') - col(2, 'height', 175, 'b'),
+        'reach_diff': col(1, 'reach', 175, 'b') - col(2, 'reach', 175, 'b'),
+    }
+    for feature, key in _STAT_DIFF_FEATURES:
+        columns[feature] = col(1, key) - col(2, key)
+    columns.update({
+        'exp_diff': (col(1, 'exp_time') - col(2, 'exp_time')) / 60.0,
+        'streak_diff': col(1, 'streak') - col(2, 'streak'),
+        'win_rate_diff': col(1, 'win_rate') - col(2, 'win_rate'),
+        'rust_diff': col(1, 'rust_days') - col(2, 'rust_days'),
+        'activity_diff': col(1, 'recent_fights_count') - col(2, 'recent_fights_count'),
+        'is_apex': np.asarray([p.get('is_apex', 0) for p in pairs], dtype=np.int64),
+        'is_altitude': np.asarray([p.get('is_altitude', 0) for p in pairs], dtype=np.int64),
+        'stance_1': [p['b1'].get('stance') or 'Orthodox' for p in pairs],
+        'stance_2': [p['b2'].get('stance') or 'Orthodox' for p in pairs],
+        'weight_class': [map_weight_class(p.get('weight_class', '')) for p in pairs],
+    })
+    return pd.DataFrame(columns, columns=MODEL_FEATURE_NAMES)
+
+
+def predict_fights(model, pairs):
+    """Batched ``predict_fight``: one ``predict_proba`` call for a whole card.
+
+    Returns a list of (probability that fighter 1 wins, used_fallback).
+    """
+    if not pairs:
+        return []
+    if model is None:
+        return [(0.5, True)] * len(pairs)
+    try:
+        probs = model.predict_proba(build_feature_matrix(pairs))[:, 1]
+        return [(float(p), False) for p in probs]
+    except Exception as e:
+        log.warning(f"Batch prediction error ({len(pairs)} fights), scoring fights one by one: {e}")
+
+    # Only the bouts that fail on their own fall back to 50/50.
+    results = []
+    for i, pair in enumerate(pairs):
+        try:
+            prob = model.predict_proba(build_feature_matrix([pair]))[0, 1]
+            results.append((float(prob), False))
+        except Exception as e:
+            fight = pair.get('fight') or {}
+            label = (f"{fight['fighter_1']} vs {fight['fighter_2']}" if fight.get('fighter_1')
+                     else pair.get('bout_uid', f"#{i}"))
+            log.warning(f"Prediction error for fight {label}: {e}")
+            results.append((0.5, True))
+    return results
+
+
 def is_altitude(location):
     if not location:
         return 0
@@ -1811,16 +2697,8 @@ def fetch_scoreboard_fighters():
     result = {}
 
     for year in [today.year, today.year + 1]:
-        start = f"{year}0101"
-        end = f"{year}1231"
-        url = (
-            f"https://site.api.espn.com/apis/site/v2/sports/mma/ufc/scoreboard"
-            f"?limit=100&dates={start}-{end}"
-        )
         try:
-            r = requests.get(url, headers=HEADERS, timeout=15)
-            r.raise_for_status()
-            data = r.json()
+            data, _ = _scoreboard_json(year)
         except Exception as e:
             log.warning(f"  Scoreboard fighters fetch failed for {year}: {e}")
             continue
@@ -1874,6 +2752,35 @@ def espn_headshot_url(espn_url):
     )
 
 
+def _update_fighter_espn_info(cur, name, espn_url, fighter_id):
+    headshot = espn_headshot_url(espn_url)
+    cur.execute(
+        """
+        WITH matched AS (
+            SELECT id
+            FROM mma_fighters
+            WHERE (%s IS NOT NULL AND id = %s)
+               OR (%s IS NULL AND (
+                    LOWER(full_name) = LOWER(%s)
+                 OR LOWER(full_name) LIKE '%%' || LOWER(%s) || '%%'
+                 OR LOWER(%s) LIKE '%%' || LOWER(full_name) || '%%'
+               ))
+            ORDER BY CASE WHEN %s IS NOT NULL AND id = %s THEN 0
+                          WHEN LOWER(full_name) = LOWER(%s) THEN 1
+                          ELSE 2 END
+            LIMIT 1
+        )
+        UPDATE mma_fighters mf
+        SET espn_url = %s, headshot_url = %s
+        FROM matched
+        WHERE mf.id = matched.id
+          AND (mf.espn_url IS DISTINCT FROM %s OR mf.headshot_url IS DISTINCT FROM %s)
+        """,
+        (fighter_id, fighter_id, fighter_id, name, name, name,
+         fighter_id, fighter_id, name, espn_url, headshot, espn_url, headshot),
+    )
+
+
 def upsert_fighter_espn_info(conn, name, espn_url, fighter_id=None, commit=True):
     """Persist ESPN URL/headshot on the canonical fighter row.
 
@@ -1882,36 +2789,11 @@ def upsert_fighter_espn_info(conn, name, espn_url, fighter_id=None, commit=True)
     """
     if not espn_url:
         return
-    headshot = espn_headshot_url(espn_url)
-    if not headshot:
+    if not espn_headshot_url(espn_url):
         return
     try:
         with conn.cursor() as cur:
-            cur.execute(
-                """
-                WITH matched AS (
-                    SELECT id
-                    FROM mma_fighters
-                    WHERE (%s IS NOT NULL AND id = %s)
-                       OR (%s IS NULL AND (
-                            LOWER(full_name) = LOWER(%s)
-                         OR LOWER(full_name) LIKE '%%' || LOWER(%s) || '%%'
-                         OR LOWER(%s) LIKE '%%' || LOWER(full_name) || '%%'
-                       ))
-                    ORDER BY CASE WHEN %s IS NOT NULL AND id = %s THEN 0
-                                  WHEN LOWER(full_name) = LOWER(%s) THEN 1
-                                  ELSE 2 END
-                    LIMIT 1
-                )
-                UPDATE mma_fighters mf
-                SET espn_url = %s, headshot_url = %s
-                FROM matched
-                WHERE mf.id = matched.id
-                  AND (mf.espn_url IS DISTINCT FROM %s OR mf.headshot_url IS DISTINCT FROM %s)
-                """,
-                (fighter_id, fighter_id, fighter_id, name, name, name,
-                 fighter_id, fighter_id, name, espn_url, headshot, espn_url, headshot),
-            )
+            _update_fighter_espn_info(cur, name, espn_url, fighter_id)
         if commit:
             conn.commit()
     except Exception as e:
@@ -2012,24 +2894,16 @@ def parse_round(val):
     except (ValueError, TypeError):
         return None
 
-def upsert_fight(conn, event_id, fight, commit=True):
-    """Insert/update a fight by canonical event-scoped bout identifier."""
-    bout_uid = canonical_bout_uid(event_id, fight)
-    status = fight_status(fight)
-    is_active = status in {'confirmed', 'completed'}
-    r = fight.get('result') or {}
-
-    with conn.cursor() as cur:
-        cur.execute("""
-            INSERT INTO mma_fights
+_FIGHT_UPSERT_COLUMNS = """
                 (event_id, bout_uid, status, is_active, card_source, verified,
                  fighter_1_name, fighter_2_name,
                  weight_class, is_main_card, card_section, bout_order, is_title_fight,
                  f1_height, f1_reach, f1_stance, f1_record,
                  f2_height, f2_reach, f2_stance, f2_record,
                  winner_name, method, round_ended, time_ended,
-                 created_at, updated_at)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,NOW(),NOW())
+                 created_at, updated_at)"""
+_FIGHT_UPSERT_VALUES = "(%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,NOW(),NOW())"
+_FIGHT_UPSERT_CONFLICT = """
             ON CONFLICT (event_id, bout_uid) DO UPDATE SET
                 status = EXCLUDED.status,
                 is_active = EXCLUDED.is_active,
@@ -2054,27 +2928,45 @@ def upsert_fight(conn, event_id, fight, commit=True):
                 method = EXCLUDED.method,
                 round_ended = EXCLUDED.round_ended,
                 time_ended = EXCLUDED.time_ended,
-                updated_at = NOW()
-            RETURNING id
-        """, (
-            event_id, bout_uid, status, is_active,
-            fight.get('card_source', 'espn_scoreboard_json'), bool(fight.get('verified', True)),
-            fight['fighter_1'], fight['fighter_2'],
-            fight.get('weight_class', ''),
-            fight.get('is_main_card', False),
-            fight.get('card_section') or ('main_card' if fight.get('is_main_card') else 'prelims'),
-            fight.get('bout_order'),
-            fight.get('is_title_fight', False),
-            fight.get('f1_stats', {}).get('Height'),
-            fight.get('f1_stats', {}).get('Reach'),
-            fight.get('f1_stats', {}).get('Stance'),
-            fight.get('f1_stats', {}).get('Record'),
-            fight.get('f2_stats', {}).get('Height'),
-            fight.get('f2_stats', {}).get('Reach'),
-            fight.get('f2_stats', {}).get('Stance'),
-            fight.get('f2_stats', {}).get('Record'),
-            r.get('winner'), r.get('method'), parse_round(r.get('round')), r.get('time'),
-        ))
+                updated_at = NOW()"""
+
+
+def _fight_upsert_params(event_id, fight):
+    """Parameter tuple matching _FIGHT_UPSERT_COLUMNS for one fight."""
+    bout_uid = canonical_bout_uid(event_id, fight)
+    status = fight_status(fight)
+    is_active = status in {'confirmed', 'completed'}
+    r = fight.get('result') or {}
+    return (
+        event_id, bout_uid, status, is_active,
+        fight.get('card_source', 'espn_scoreboard_json'), bool(fight.get('verified', True)),
+        fight['fighter_1'], fight['fighter_2'],
+        fight.get('weight_class', ''),
+        fight.get('is_main_card', False),
+        fight.get('card_section') or ('main_card' if fight.get('is_main_card') else 'prelims'),
+        fight.get('bout_order'),
+        fight.get('is_title_fight', False),
+        fight.get('f1_stats', {}).get('Height'),
+        fight.get('f1_stats', {}).get('Reach'),
+        fight.get('f1_stats', {}).get('Stance'),
+        fight.get('f1_stats', {}).get('Record'),
+        fight.get('f2_stats', {}).get('Height'),
+        fight.get('f2_stats', {}).get('Reach'),
+        fight.get('f2_stats', {}).get('Stance'),
+        fight.get('f2_stats', {}).get('Record'),
+        r.get('winner'), r.get('method'), parse_round(r.get('round')), r.get('time'),
+    )
+
+
+def upsert_fight(conn, event_id, fight, commit=True):
+    """Insert/update a fight by canonical event-scoped bout identifier."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO mma_fights" + _FIGHT_UPSERT_COLUMNS
+            + "\n            VALUES " + _FIGHT_UPSERT_VALUES
+            + _FIGHT_UPSERT_CONFLICT + "\n            RETURNING id",
+            _fight_upsert_params(event_id, fight),
+        )
         fight_id = cur.fetchone()[0]
     if commit:
         conn.commit()
@@ -2218,12 +3110,11 @@ def deactivate_duplicate_active_matchups(conn, event_id, current_fight_id, bout_
     return len(duplicate_ids)
 
 
-def upsert_prediction(conn, fight_id, pred, commit=True):
-    sql = """
+_PREDICTION_UPSERT_SQL = """
         INSERT INTO mma_predictions
             (fight_id, predicted_winner, f1_win_probability, f2_win_probability,
              confidence, factors_json, model_version, generated_at)
-        VALUES (%s,%s,%s,%s,%s,%s,%s,NOW())
+        VALUES %s
         ON CONFLICT (fight_id) DO UPDATE SET
             predicted_winner   = EXCLUDED.predicted_winner,
             f1_win_probability = EXCLUDED.f1_win_probability,
@@ -2232,33 +3123,214 @@ def upsert_prediction(conn, fight_id, pred, commit=True):
             factors_json       = EXCLUDED.factors_json,
             model_version      = EXCLUDED.model_version,
             generated_at       = NOW()
-    """
+"""
+_PREDICTION_UPSERT_VALUES = "(%s,%s,%s,%s,%s,%s,%s,NOW())"
+
+
+def _ensure_prediction_constraint(cur):
     # Add unique constraint on fight_id to mma_predictions if not present
+    cur.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'mma_predictions_fight_id_key'
+            ) THEN
+                ALTER TABLE mma_predictions ADD CONSTRAINT mma_predictions_fight_id_key UNIQUE (fight_id);
+            END IF;
+        END $$;
+    """)
+
+
+def _prediction_params(fight_id, pred):
+    return (
+        fight_id,
+        pred['winner'],
+        pred['f1_prob'],
+        pred['f2_prob'],
+        pred['confidence'],
+        json.dumps(pred['factors']),
+        pred.get('model_version', MODEL_VERSION_CATBOOST),
+    )
+
+
+def upsert_prediction(conn, fight_id, pred, commit=True):
     with conn.cursor() as cur:
-        cur.execute("""
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM pg_constraint
-                    WHERE conname = 'mma_predictions_fight_id_key'
-                ) THEN
-                    ALTER TABLE mma_predictions ADD CONSTRAINT mma_predictions_fight_id_key UNIQUE (fight_id);
-                END IF;
-            END $$;
-        """)
-        cur.execute(sql, (
-            fight_id,
-            pred['winner'],
-            pred['f1_prob'],
-            pred['f2_prob'],
-            pred['confidence'],
-            json.dumps(pred['factors']),
-            pred.get('model_version', MODEL_VERSION_CATBOOST),
-        ))
+        _ensure_prediction_constraint(cur)
+        cur.execute(
+            _PREDICTION_UPSERT_SQL % _PREDICTION_UPSERT_VALUES,
+            _prediction_params(fight_id, pred),
+        )
     if commit:
         conn.commit()
 
 
+class EventCardWriter:
+    """Unit of work that persists one event's card in a handful of statements.
+
+    Collect the card with add_fight / set_prediction / drop_prediction, then
+    call flush() inside the caller's transaction. Fights, fighter links,
+    predictions and fighter ESPN info are written with multi-row statements
+    in the same order the per-row helpers above would leave the database:
+    when a bout appears twice on a card the later entry wins, duplicate
+    matchups are deactivated after the card's own predictions are written,
+    and stale-bout cleanup runs last via deactivate_stale_event_bouts.
+    """
+
+    def __init__(self, conn, event_id):
+        self.conn = conn
+        self.event_id = event_id
+        self._fights = []
+        self._predictions = {}
+        self._espn_info = []
+
+    def add_fight(self, fight, fid1=None, fid2=None):
+        """Queue a fight row; returns its canonical bout_uid."""
+        bout_uid = canonical_bout_uid(self.event_id, fight)
+        self._fights.append((bout_uid, fight, fid1, fid2))
+        for side, fid in (('fighter_1', fid1), ('fighter_2', fid2)):
+            if fight.get(f'{side}_url'):
+                self._espn_info.append((fight[side], fight[f'{side}_url'], fid))
+        return bout_uid
+
+    def set_prediction(self, bout_uid, pred):
+        self._predictions[bout_uid] = pred
+
+    def drop_prediction(self, bout_uid):
+        """Remove any stored prediction for a bout that failed the gate."""
+        self._predictions[bout_uid] = None
+
+    @property
+    def seen_bout_uids(self):
+        return {bout_uid for bout_uid, _, _, _ in self._fights}
+
+    def flush(self, payload_complete):
+        """Write the queued card without committing; returns a result dict.
+
+        fight_ids lines up with add_fight order, fight_id_by_uid maps each
+        bout_uid to its row, and the remaining keys count rows written or
+        invalidated by each step.
+        """
+        result = {
+            'fight_ids': [], 'fight_id_by_uid': {}, 'linked': 0,
+            'predictions_written': 0, 'predictions_dropped': 0,
+            'duplicates_deactivated': 0, 'stale_deactivated': 0,
+        }
+        if not self._fights:
+            deactivate_stale_event_bouts(self.conn, self.event_id, set(), payload_complete, commit=False)
+            return result
+        latest = {bout_uid: (fight, fid1, fid2) for bout_uid, fight, fid1, fid2 in self._fights}
+        with self.conn.cursor() as cur:
+            rows = execute_values(
+                cur,
+                "INSERT INTO mma_fights" + _FIGHT_UPSERT_COLUMNS + "\n            VALUES %s"
+                + _FIGHT_UPSERT_CONFLICT + "\n            RETURNING bout_uid, id",
+                [_fight_upsert_params(self.event_id, fight) for fight, _, _ in latest.values()],
+                template=_FIGHT_UPSERT_VALUES,
+                fetch=True,
+            )
+            ids = {bout_uid: fight_id for bout_uid, fight_id in rows}
+            result['fight_id_by_uid'] = ids
+            result['fight_ids'] = [ids[bout_uid] for bout_uid, _, _, _ in self._fights]
+
+            links = [(ids[uid], fid1, fid2) for uid, (_, fid1, fid2) in latest.items() if fid1 or fid2]
+            if links:
+                execute_values(cur, """
+                    UPDATE mma_fights AS f
+                    SET fighter_1_id = v.fid1, fighter_2_id = v.fid2
+                    FROM (VALUES %s) AS v(id, fid1, fid2)
+                    WHERE f.id = v.id
+                """, links, template="(%s, %s::text, %s::text)")
+                result['linked'] = len(links)
+
+            dropped = [ids[uid] for uid, pred in self._predictions.items() if pred is None]
+            result['predictions_dropped'] = invalidate_fight_predictions(self.conn, dropped) or 0
+            preds = [_prediction_params(ids[uid], pred) for uid, pred in self._predictions.items() if pred is not None]
+            if preds:
+                _ensure_prediction_constraint(cur)
+                execute_values(cur, _PREDICTION_UPSERT_SQL, preds, template=_PREDICTION_UPSERT_VALUES)
+                result['predictions_written'] = len(preds)
+
+            result['duplicates_deactivated'] = self._deactivate_duplicate_matchups(cur, latest, ids)
+            self._write_espn_info(cur)
+
+        result['stale_deactivated'] = deactivate_stale_event_bouts(
+            self.conn, self.event_id, self.seen_bout_uids, payload_complete, commit=False,
+        )
+        return result
+
+    def _deactivate_duplicate_matchups(self, cur, latest, ids):
+        """Batched deactivate_duplicate_active_matchups for the whole card.
+
+        Only the last bout per matchup is used as the keeper, matching the
+        row-at-a-time flow where a later replacement deactivates earlier ones.
+        """
+        keepers = {}
+        for uid, (fight, fid1, fid2) in latest.items():
+            if fid1 and fid2:
+                lo, hi = sorted([str(fid1), str(fid2)])
+                keepers[('id', lo, hi)] = (ids[uid], uid, lo, hi, None, None)
+            else:
+                n1, n2 = normalize_name(fight['fighter_1']), normalize_name(fight['fighter_2'])
+                keepers[('name',) + tuple(sorted([n1, n2]))] = (ids[uid], uid, None, None, n1, n2)
+        rows = [(self.event_id,) + keeper for keeper in keepers.values()]
+        duplicate_ids = execute_values(cur, """
+            UPDATE mma_fights AS f
+            SET is_active = FALSE, status = 'cancelled', updated_at = NOW()
+            FROM (VALUES %s) AS v(event_id, keep_id, keep_uid, fid_lo, fid_hi, n1, n2)
+            WHERE f.event_id = v.event_id
+              AND f.id <> v.keep_id
+              AND f.bout_uid <> v.keep_uid
+              AND COALESCE(f.is_active, TRUE) = TRUE
+              AND (
+                (v.fid_lo IS NOT NULL
+                 AND ARRAY[f.fighter_1_id, f.fighter_2_id]::text[] <@ ARRAY[v.fid_lo, v.fid_hi]::text[]
+                 AND ARRAY[v.fid_lo, v.fid_hi]::text[] <@ ARRAY[f.fighter_1_id, f.fighter_2_id]::text[])
+                OR
+                (v.fid_lo IS NULL
+                 AND LOWER(REGEXP_REPLACE(f.fighter_1_name, '[^a-zA-Z0-9 ]', '', 'g')) IN (v.n1, v.n2)
+                 AND LOWER(REGEXP_REPLACE(f.fighter_2_name, '[^a-zA-Z0-9 ]', '', 'g')) IN (v.n1, v.n2))
+              )
+            RETURNING f.id
+        """, rows, template="(%s, %s, %s, %s::text, %s::text, %s::text, %s::text)", fetch=True)
+        duplicate_ids = sorted({row[0] for row in duplicate_ids})
+        invalidate_fight_predictions(self.conn, duplicate_ids)
+        return len(duplicate_ids)
+
+    def _write_espn_info(self, cur):
+        """ESPN URL/headshot updates: one statement for resolved fighters.
+
+        Unresolved fighters still need upsert_fighter_espn_info's name
+        matching; each runs under a savepoint so a failure cannot roll back
+        the rest of the card.
+        """
+        by_id, by_name = {}, {}
+        for name, espn_url, fid in self._espn_info:
+            headshot = espn_headshot_url(espn_url)
+            if not headshot:
+                continue
+            if fid:
+                by_id[fid] = (fid, espn_url, headshot)
+            else:
+                by_name[name] = espn_url
+        if by_id:
+            execute_values(cur, """
+                UPDATE mma_fighters AS mf
+                SET espn_url = v.espn_url, headshot_url = v.headshot_url
+                FROM (VALUES %s) AS v(id, espn_url, headshot_url)
+                WHERE mf.id = v.id
+                  AND (mf.espn_url IS DISTINCT FROM v.espn_url OR mf.headshot_url IS DISTINCT FROM v.headshot_url)
+            """, list(by_id.values()), template="(%s::text, %s::text, %s::text)")
+        for name, espn_url in by_name.items():
+            cur.execute("SAVEPOINT mma_espn_info")
+            try:
+                _update_fighter_espn_info(cur, name, espn_url, None)
+                cur.execute("RELEASE SAVEPOINT mma_espn_info")
+            except Exception as e:
+                cur.execute("ROLLBACK TO SAVEPOINT mma_espn_info")
+                log.warning(f"Could not update ESPN info for {name}: {e}")
+
+
 # ── Main sync flow ────────────────────────────────────────────────────────────
 
 def main():
@@ -2282,7 +3354,9 @@ def main():
     # on mma_fighters for prediction.
     postgres_history_is_complete_enough(conn)
     try:
-        stats_tracker, name_to_id, espn_to_id = rebuild_stats_from_db(conn)
+        stats_tracker, name_to_id, espn_to_id = rebuild_stats_from_db(
+            conn, full_rebuild=os.environ.get('MMA_STATS_FULL_REBUILD') == '1',
+        )
         fighter_bio = load_fighters_bio(conn)
     except Exception as e:
         log.warning(
@@ -2337,6 +3411,10 @@ def main():
     log.info("Pre-fetching fighter ESPN data from scoreboard...")
     scoreboard_fighters = fetch_scoreboard_fighters()
 
+    # Fetch every card up front so the network stage runs concurrently; the
+    # per-event database work below stays serial, one transaction per event.
+    event_cards = prefetch_event_cards(events)
+
     today = pd.Timestamp.now()
     default_stats = FighterStats()
     default_sv = default_stats.get_stat_vector(today)
@@ -2344,8 +3422,7 @@ def main():
     for event in events:
         log.info(f"Processing: {event['event_name']} ({event['date']})")
 
-        # Scrape fight card
-        fights = scrape_event_details(event['url'], event['event_id'])
+        fights = event_cards[event['event_id']]
         log.info(f"  {len(fights)} fights on card")
 
         has_placeholder_fights = any(fight_has_placeholder(_fight) for _fight in fights)
@@ -2369,8 +3446,9 @@ def main():
                 )
 
         payload_complete = event_card_fetch_is_complete(conn, event['event_id'], fights)
-        seen_bout_uids = set()
+        writer = EventCardWriter(conn, event['event_id'])
 
+        card_pairs = []
         try:
             upsert_event(conn, event, commit=False)
 
@@ -2384,10 +3462,6 @@ def main():
                         if sb_entry:
                             fight[url_key] = sb_entry[1]
 
-                bout_uid = canonical_bout_uid(event['event_id'], fight)
-                fight_id = upsert_fight(conn, event['event_id'], fight, commit=False)
-                seen_bout_uids.add(bout_uid)
-
                 # Resolve fighter IDs (needed for headshot linking + predictions)
                 fid1 = resolve_fighter_id(fight['fighter_1'], name_to_id, fight.get('fighter_1_espn_id'), espn_to_id)
                 fid2 = resolve_fighter_id(fight['fighter_2'], name_to_id, fight.get('fighter_2_espn_id'), espn_to_id)
@@ -2395,18 +3469,9 @@ def main():
                 log_history_lookup(conn, fight['fighter_2'], fight.get('fighter_2_espn_id'), fid2, stats_tracker, name_to_id, espn_to_id)
                 odds_match = diagnose_odds_match(fight, event, odds_fights_by_date)
 
-                # Back-fill fighter_1_id / fighter_2_id on the fight row
-                link_fight_fighters(conn, fight_id, fid1, fid2, commit=False)
-                deactivate_duplicate_active_matchups(
-                    conn, event['event_id'], fight_id, bout_uid,
-                    fid1, fid2, fight['fighter_1'], fight['fighter_2'],
-                )
-
-                # Persist ESPN profile URLs + derived headshot URLs on fighter rows
-                if fight.get('fighter_1_url'):
-                    upsert_fighter_espn_info(conn, fight['fighter_1'], fight['fighter_1_url'], fid1, commit=False)
-                if fight.get('fighter_2_url'):
-                    upsert_fighter_espn_info(conn, fight['fighter_2'], fight['fighter_2_url'], fid2, commit=False)
+                # Queue the fight row, its fighter links, duplicate-matchup
+                # cleanup and ESPN profile/headshot URLs for the batch write.
+                bout_uid = writer.add_fight(fight, fid1, fid2)
 
                 # Skip prediction for completed fights that already have one
                 if event['is_completed']:
@@ -2433,8 +3498,7 @@ def main():
                     )
                 gate_reasons = prediction_gate_reasons(fight, fid1, fid2, stats_tracker, feature_count=feature_count, fighter_bio=fighter_bio)
                 if gate_reasons:
-                    with conn.cursor() as cur:
-                        cur.execute("DELETE FROM mma_predictions WHERE fight_id = %s", (fight_id,))
+                    writer.drop_prediction(bout_uid)
                     log.info("PREDICTION_GATE fight=%s vs %s eligible=false reasons=%s",
                              fight['fighter_1'], fight['fighter_2'], gate_reasons)
                     log.info("UFC329_DIAG fight=%s vs %s canonical_espn_ids=%s|%s db_fighter_ids=%s|%s history_counts=%s|%s feature_count=%s odds_api_match=%s prediction_eligible=false",
@@ -2457,20 +3521,27 @@ def main():
                          getattr(stats_tracker.get(fid2), 'total_fights', 0) if fid2 else 0,
                          feature_count, odds_match['matched'])
 
-                st1 = stat_vector_for_fighter(fid1, stats_tracker, fighter_bio, today, default_sv)
-                st2 = stat_vector_for_fighter(fid2, stats_tracker, fighter_bio, today, default_sv)
-
                 b1 = fighter_bio.get(fid1, {})
                 b2 = fighter_bio.get(fid2, {})
+                card_pairs.append({
+                    'bout_uid': bout_uid,
+                    'fight': fight,
+                    'odds_match': odds_match,
+                    'st1': stat_vector_for_fighter(fid1, stats_tracker, fighter_bio, today, default_sv),
+                    'st2': stat_vector_for_fighter(fid2, stats_tracker, fighter_bio, today, default_sv),
+                    'b1': b1,
+                    'b2': b2,
+                    'g1': {'rating': b1.get('glicko', 1500), 'rd': b1.get('glicko_rd', 350)},
+                    'g2': {'rating': b2.get('glicko', 1500), 'rd': b2.get('glicko_rd', 350)},
+                    'is_apex': is_apex_event(event['event_name'], event['location']),
+                    'is_altitude': is_altitude(event['location']),
+                    'weight_class': fight.get('weight_class', ''),
+                })
 
-                g1 = {'rating': b1.get('glicko', 1500), 'rd': b1.get('glicko_rd', 350)}
-                g2 = {'rating': b2.get('glicko', 1500), 'rd': b2.get('glicko_rd', 350)}
-
-                apex = is_apex_event(event['event_name'], event['location'])
-                alt = is_altitude(event['location'])
-
-                prob, used_fallback = predict_fight(model, st1, st2, b1, b2, g1, g2, apex, alt,
-                                    weight_class=fight.get('weight_class', ''))
+            # Score every eligible bout on the card with one predict_proba call.
+            for pair, (prob, used_fallback) in zip(card_pairs, predict_fights(model, card_pairs)):
+                fight, st1, st2, g1, g2 = pair['fight'], pair['st1'], pair['st2'], pair['g1'], pair['g2']
+                odds_match = pair['odds_match']
                 if used_fallback:
                     log.warning("PREDICTION_FALLBACK fight=%s vs %s — model unavailable/errored, writing 50/50",
                                 fight['fighter_1'], fight['fighter_2'])
@@ -2512,17 +3583,22 @@ def main():
                     }
                 }
 
-                upsert_prediction(conn, fight_id, pred, commit=False)
+                writer.set_prediction(pair['bout_uid'], pred)
                 log.info(f"  Predicted: {winner} ({confidence}) — "
                          f"{fight['fighter_1']} vs {fight['fighter_2']}")
 
-            deactivate_stale_event_bouts(conn, event['event_id'], seen_bout_uids, payload_complete, commit=False)
+            written = writer.flush(payload_complete)
             conn.commit()
+            log.info(
+                "CARD_WRITE event_id=%s fights=%s linked=%s predictions=%s dropped=%s duplicates=%s stale=%s",
+                event['event_id'], len(written['fight_id_by_uid']), written['linked'],
+                written['predictions_written'], written['predictions_dropped'],
+                written['duplicates_deactivated'], written['stale_deactivated'],
+            )
         except Exception:
             conn.rollback()
             log.exception("  Event sync failed; rolled back partial card update for %s", event['event_id'])
             continue
-        time.sleep(1)
 
     # Bulk-update headshot URLs for all fighters found in the scoreboard.
     # This catches any fighter whose headshot_url is still NULL in the DB but
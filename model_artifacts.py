@@ -0,0 +1,270 @@
+"""
+model_artifacts.py
+==================
+Storage format for the champion/challenger blobs in
+``backtest_best_model.pkl_data``.
+
+A stored artifact is a short self-describing header followed by a
+compressed joblib stream:
+
+    FAMODEL\\x01 | manifest length (4 bytes, big-endian) | manifest JSON | payload
+
+The manifest carries the codec, a SHA-256 of the uncompressed joblib bytes,
+the estimator class, its feature list and the library versions it was built
+with, so callers can inspect an artifact (and spot an unchanged one) without
+unpickling tens of MB of trees. The payload is the uncompressed joblib file
+run through a codec joblib itself recognises, so ``joblib.load`` can still
+open it on its own once the header is stripped (see ``artifact_payload``).
+
+Rows written before this format existed hold a bare joblib pickle.
+``load_model_bytes`` reads both, so nothing in the table has to be rewritten.
+
+    data = dump_model_bytes(model, model_type='catboost')
+    read_manifest(data)['feature_names']   # no unpickling
+    model = load_model_bytes(data)         # verifies the hash first
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import logging
+import lzma
+import os
+import struct
+import tempfile
+import zlib
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+ARTIFACT_MAGIC = b'FAMODEL\x01'
+ARTIFACT_FORMAT_VERSION = 1
+_LENGTH = struct.Struct('>I')
+
+# Codecs whose output joblib.load detects by magic bytes. zlib always exists
+# and gets RF ensembles to roughly a quarter of their pickled size. lz4 is not
+# in requirements.txt: only set ML_ARTIFACT_CODEC=lz4 when every process that
+# loads the champion (web, workers, the nightly job) has it installed.
+ARTIFACT_CODEC = os.environ.get('ML_ARTIFACT_CODEC', '').strip().lower() or 'zlib'
+ARTIFACT_COMPRESS_LEVEL = int(os.environ.get('ML_ARTIFACT_COMPRESS_LEVEL', '3'))
+# Uncompressed copies of artifacts, keyed by content hash, that
+# load_model_bytes(mmap_mode='r') memory-maps. One copy per host is shared
+# by every worker process loading the same champion.
+MODEL_CACHE_DIR = os.environ.get(
+    'ML_MODEL_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'form_analyst_models'),
+)
+# Copies kept in MODEL_CACHE_DIR; the least recently used beyond this are
+# deleted whenever a new one is written.
+MODEL_CACHE_KEEP = int(os.environ.get('ML_MODEL_CACHE_KEEP', '4'))
+
+
+class ModelArtifactError(ValueError):
+    """The artifact header is malformed or its payload fails the hash check."""
+
+
+def _lz4_frame():
+    try:
+        import lz4.frame
+    except ImportError:
+        return None
+    return lz4.frame
+
+
+def _compress(codec, raw, level):
+    if codec == 'zlib':
+        return zlib.compress(raw, level)
+    if codec == 'gzip':
+        return gzip.compress(raw, compresslevel=level)
+    if codec == 'lzma':
+        return lzma.compress(raw, preset=level)
+    if codec == 'lz4' and _lz4_frame() is not None:
+        return _lz4_frame().compress(raw, compression_level=level)
+    raise ModelArtifactError(f"unsupported model artifact codec {codec!r}")
+
+
+def _decompress(codec, payload):
+    if codec == 'zlib':
+        return zlib.decompress(payload)
+    if codec == 'gzip':
+        return gzip.decompress(payload)
+    if codec == 'lzma':
+        return lzma.decompress(payload)
+    if codec == 'lz4' and _lz4_frame() is not None:
+        return _lz4_frame().decompress(payload)
+    raise ModelArtifactError(f"model artifact codec {codec!r} is not available in this process")
+
+
+def default_codec():
+    return ARTIFACT_CODEC
+
+
+def is_model_artifact(data) -> bool:
+    return bytes(data[:len(ARTIFACT_MAGIC)]) == ARTIFACT_MAGIC
+
+
+def _library_versions():
+    import importlib.metadata as metadata
+
+    versions = {}
+    for dist in ('scikit-learn', 'numpy', 'joblib', 'catboost', 'lightgbm', 'xgboost'):
+        try:
+            versions[dist] = metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            continue
+    return versions
+
+
+def _feature_names(model):
+    names = getattr(model, 'feature_names_in_', None)
+    if names is None:
+        names = getattr(model, '_form_analyst_expected_features', None)
+    return [str(name) for name in names] if names is not None else None
+
+
+def pack_model_bytes(raw, model=None, model_type=None, codec=None, level=None) -> bytes:
+    """Wrap an uncompressed joblib file (``raw``) in the artifact format.
+
+    ``model`` is the same estimator, already loaded, and only feeds the
+    manifest's descriptive fields; it is never re-pickled.
+    """
+    raw = bytes(raw)
+    codec = codec or default_codec()
+    level = ARTIFACT_COMPRESS_LEVEL if level is None else level
+    payload = _compress(codec, raw, level)
+    manifest = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'codec': codec,
+        'compress_level': level,
+        'sha256': hashlib.sha256(raw).hexdigest(),
+        'raw_bytes': len(raw),
+        'payload_bytes': len(payload),
+        'model_class': f"{type(model).__module__}.{type(model).__qualname__}" if model is not None else None,
+        'model_type': model_type or getattr(model, '_form_analyst_model_type', None),
+        'feature_names': _feature_names(model) if model is not None else None,
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'libraries': _library_versions(),
+    }
+    header = json.dumps(manifest, sort_keys=True).encode('utf-8')
+    return ARTIFACT_MAGIC + _LENGTH.pack(len(header)) + header + payload
+
+
+def dump_model_bytes(model, model_type=None, codec=None, level=None) -> bytes:
+    """Serialise ``model`` with joblib and wrap it in the artifact format."""
+    import joblib
+
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    return pack_model_bytes(buf.getvalue(), model=model, model_type=model_type, codec=codec, level=level)
+
+
+def _split(data):
+    data = memoryview(data)
+    start = len(ARTIFACT_MAGIC)
+    if len(data) < start + _LENGTH.size:
+        raise ModelArtifactError("model artifact is truncated before its manifest")
+    (header_len,) = _LENGTH.unpack(data[start:start + _LENGTH.size])
+    header_end = start + _LENGTH.size + header_len
+    if len(data) < header_end:
+        raise ModelArtifactError("model artifact is truncated inside its manifest")
+    try:
+        manifest = json.loads(bytes(data[start + _LENGTH.size:header_end]).decode('utf-8'))
+    except ValueError as e:
+        raise ModelArtifactError(f"model artifact manifest is not valid JSON: {e}") from e
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ModelArtifactError(f"unsupported model artifact format_version={manifest.get('format_version')!r}")
+    return manifest, data[header_end:]
+
+
+def read_manifest(data):
+    """Manifest dict for a new-format artifact, None for a legacy pickle."""
+    if not is_model_artifact(data):
+        return None
+    return _split(data)[0]
+
+
+def artifact_payload(data) -> bytes:
+    """A file ``joblib.load`` opens directly: the compressed payload, or the
+    legacy pickle unchanged."""
+    if not is_model_artifact(data):
+        return bytes(data)
+    return bytes(_split(data)[1])
+
+
+def _raw_joblib_bytes(data):
+    manifest, payload = _split(data)
+    raw = _decompress(manifest.get('codec'), bytes(payload))
+    digest = hashlib.sha256(raw).hexdigest()
+    if digest != manifest.get('sha256'):
+        raise ModelArtifactError(
+            f"model artifact content hash mismatch: manifest={manifest.get('sha256')} actual={digest}"
+        )
+    return manifest, raw
+
+
+def _prune_cache(cache_dir, keep, current):
+    """Delete all but the ``keep`` most recently used copies (never ``current``).
+
+    A process still mapping a deleted copy keeps its pages; the file is only
+    rewritten if that artifact is loaded again.
+    """
+    copies = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.endswith('.joblib') and path != current:
+            try:
+                copies.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+    copies.sort(reverse=True)
+    for _mtime, path in copies[max(keep - 1, 0):]:
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        log.info("MODEL_ARTIFACT_CACHE_PRUNED path=%s", path)
+
+
+def _mmap_copy(sha256, raw, cache_dir):
+    """Path of the uncompressed joblib file for ``sha256``, written once per host."""
+    path = os.path.join(cache_dir, f"{sha256}.joblib")
+    if os.path.exists(path):
+        # Mark it recently used so pruning keeps the copies still being loaded.
+        os.utime(path)
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        log.info("MODEL_ARTIFACT_CACHED sha256=%s path=%s bytes=%s", sha256, path, len(raw))
+        _prune_cache(cache_dir, MODEL_CACHE_KEEP, path)
+    return path
+
+
+def load_model_bytes(data, mmap_mode=None, cache_dir=None):
+    """Unpickle a stored artifact, new format or legacy joblib pickle.
+
+    New-format payloads are hash-checked before anything is unpickled. With
+    mmap_mode='r' the decompressed joblib file is kept in cache_dir
+    (MODEL_CACHE_DIR) and its numpy arrays are memory-mapped from there
+    instead of copied into each process.
+    """
+    import joblib
+
+    if not is_model_artifact(data):
+        return joblib.load(io.BytesIO(bytes(data)))
+    manifest, raw = _raw_joblib_bytes(data)
+    if mmap_mode:
+        try:
+            path = _mmap_copy(manifest['sha256'], raw, cache_dir or MODEL_CACHE_DIR)
+            return joblib.load(path, mmap_mode=mmap_mode)
+        except OSError as e:
+            log.warning("MODEL_ARTIFACT_MMAP_FAILED sha256=%s error=%s", manifest['sha256'], e)
+    return joblib.load(io.BytesIO(raw))
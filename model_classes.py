@@ -11,11 +11,19 @@ unpickling there looks for the class on gunicorn's `__main__` and fails,
 because that class was never defined there. Giving the class a stable module
 path both processes can import normally fixes this for every future pickle.
 """
+import os
 import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 from sklearn.base import BaseEstimator, RegressorMixin, clone
 import numpy as np
 
+# Threads ConsensusRegressor.predict uses to score members concurrently when
+# the caller does not pass n_jobs. Tree libraries release the GIL while
+# predicting, so members overlap; 1 keeps scoring on the calling thread.
+CONSENSUS_PREDICT_THREADS = int(os.environ.get('ML_CONSENSUS_PREDICT_THREADS', '1'))
+
 
 class ConsensusRegressor(BaseEstimator, RegressorMixin):
     """Weighted consensus of model win-likelihood scores."""
@@ -40,15 +48,45 @@ class ConsensusRegressor(BaseEstimator, RegressorMixin):
         self.weights_ = self.weights_ / np.sum(self.weights_)
         return self
 
-    def predict(self, X):
-        preds = []
-        for est in self.estimators_:
-            if hasattr(est, 'predict_proba'):
-                proba = np.asarray(est.predict_proba(X), dtype=float)
-                preds.append(proba[:, 1] if proba.ndim == 2 and proba.shape[1] > 1 else proba.ravel())
+    def _inference_matrix(self, X):
+        """X as one C-contiguous float32 array in the fitted feature order.
+
+        Every member reads this shared buffer instead of converting its own
+        float64 copy of the DataFrame. Tree members evaluate in float32
+        anyway, so their scores are unchanged.
+        """
+        if hasattr(X, 'columns'):
+            feature_names = getattr(self, 'feature_names_in_', None)
+            if feature_names is not None and list(X.columns) != list(feature_names):
+                X = X[list(feature_names)]
+            X = X.to_numpy(dtype=np.float32)
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    @staticmethod
+    def _member_score(est, X):
+        if hasattr(est, 'predict_proba'):
+            proba = np.asarray(est.predict_proba(X), dtype=float)
+            return proba[:, 1] if proba.ndim == 2 and proba.shape[1] > 1 else proba.ravel()
+        return np.asarray(est.predict(X), dtype=float)
+
+    def member_scores(self, X, n_jobs=None):
+        """(n_rows, n_members) win-likelihood scores, one column per member."""
+        X = self._inference_matrix(X)
+        n_jobs = CONSENSUS_PREDICT_THREADS if n_jobs is None else n_jobs
+        # Members fitted on DataFrames warn on every array call; the array
+        # is already in their feature order (see _inference_matrix).
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', message='X does not have valid feature names')
+            if n_jobs > 1 and len(self.estimators_) > 1:
+                with ThreadPoolExecutor(max_workers=min(n_jobs, len(self.estimators_))) as pool:
+                    preds = list(pool.map(lambda est: self._member_score(est, X), self.estimators_))
             else:
-                preds.append(np.asarray(est.predict(X), dtype=float))
-        return np.average(np.column_stack(preds), axis=1, weights=self.weights_)
+                preds = [self._member_score(est, X) for est in self.estimators_]
+        return np.column_stack(preds)
+
+    def predict(self, X, n_jobs=None):
+        weights = np.asarray(self.weights_, dtype=float)
+        return self.member_scores(X, n_jobs=n_jobs) @ (weights / np.sum(weights))
 
 
 # Backward-compat shim for artifacts pickled BEFORE this class moved out of
@@ -157,3 +195,99 @@ def solve_joint_kelly(probs_odds,
         shrink = max_total_stake_pct / total
         scaled = {key: stake * shrink for key, stake in scaled.items()}
     return scaled
+
+
+def solve_joint_kelly_batch(probs, odds, race_offsets,
+                            kelly_fraction_multiplier=DEFAULT_KELLY_FRACTION_MULTIPLIER,
+                            max_total_stake_pct=DEFAULT_KELLY_MAX_TOTAL_STAKE_PCT,
+                            max_cells=1 << 21):
+    """solve_joint_kelly for many races at once, on flat arrays.
+
+    probs/odds: one entry per runner, grouped race by race; race i owns rows
+    race_offsets[i]:race_offsets[i + 1] (so len(race_offsets) == races + 1).
+    Returns (stakes, backed), both aligned with the input rows: the stake
+    fraction for each runner and whether the solver backed it. Runners the
+    scalar solver leaves out of its result have backed False and stake 0.0.
+
+    Each race's eligible runners are sorted by expected value into one row of
+    a padded (race, rank) matrix, so every trial inclusion's reserve and
+    no-winner probability are read off prefix sums instead of re-summed.
+    The prefix sums accumulate left to right exactly as the scalar solver's
+    sum() does, and the KKT check evaluates the same expression per runner,
+    so the stakes are bit-for-bit the scalar ones. max_cells bounds the
+    (race, trial, runner) block the KKT check materialises at once.
+    """
+    probs = np.asarray(probs, dtype=float)
+    odds = np.asarray(odds, dtype=float)
+    offsets = np.asarray(race_offsets, dtype=np.intp)
+    stakes = np.zeros(len(probs), dtype=float)
+    backed = np.zeros(len(probs), dtype=bool)
+    n_races = len(offsets) - 1
+    if len(probs) == 0 or n_races <= 0:
+        return stakes, backed
+
+    race_of_row = np.repeat(np.arange(n_races), np.diff(offsets))
+    with np.errstate(invalid='ignore', over='ignore'):
+        ev = probs * odds
+        eligible = (
+            np.isfinite(probs) & np.isfinite(odds) & (odds > 1.0)
+            & (probs > 0.0) & (probs < 1.0) & (ev > 1.0)
+        )
+    rows = np.flatnonzero(eligible)
+    if not len(rows):
+        return stakes, backed
+    # Descending EV within each race; ties keep input order, as the scalar
+    # solver's stable list.sort(reverse=True) does.
+    rows = rows[np.lexsort((rows, -ev[rows], race_of_row[rows]))]
+    _, starts, counts = np.unique(race_of_row[rows], return_index=True, return_counts=True)
+    n_groups, width = len(counts), int(counts.max())
+    group = np.repeat(np.arange(n_groups), counts)
+    rank = np.arange(len(rows)) - np.repeat(starts, counts)
+
+    # Padding (p=0, 1/o=0) after each race's last candidate leaves the prefix
+    # sums untouched; padded trials are masked out by `live` below.
+    P = np.zeros((n_groups, width))
+    O = np.ones((n_groups, width))
+    inv_odds = np.zeros((n_groups, width))
+    P[group, rank] = probs[rows]
+    O[group, rank] = odds[rows]
+    inv_odds[group, rank] = 1.0 / odds[rows]
+    live = np.arange(width)[None, :] < counts[:, None]
+    reserve = np.cumsum(inv_odds, axis=1)
+    no_winner = 1.0 - np.cumsum(P, axis=1)
+
+    lower = np.tril(np.ones((width, width), dtype=bool))
+    accepted = np.zeros((n_groups, width), dtype=bool)
+    step = max(1, int(max_cells) // (width * width))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for lo in range(0, n_groups, step):
+            hi = min(lo + step, n_groups)
+            # kkt[g, k, j]: runner j's stake when the first k + 1 candidates
+            # are backed, for every j <= k.
+            kkt = P[lo:hi, None, :] - (
+                no_winner[lo:hi, :, None] / (O[lo:hi, None, :] * (1.0 - reserve[lo:hi, :, None]))
+            )
+            positive = np.all((kkt > 0) | ~lower[None, :, :], axis=2)
+            accepted[lo:hi] = live[lo:hi] & (reserve[lo:hi] < 1.0) & positive
+    included = np.logical_and.accumulate(accepted, axis=1).sum(axis=1)
+
+    has_bets = included > 0
+    if not has_bets.any():
+        return stakes, backed
+    last = np.where(has_bets, included - 1, 0)
+    final_reserve = reserve[np.arange(n_groups), last][:, None]
+    final_no_winner = no_winner[np.arange(n_groups), last][:, None]
+    in_set = np.arange(width)[None, :] < included[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        raw = (P - (final_no_winner / (O * (1.0 - final_reserve)))) * kelly_fraction_multiplier
+    scaled = np.where(in_set & (raw > 0.0), raw, 0.0)
+    if max_total_stake_pct is not None:
+        total = np.cumsum(scaled, axis=1)[np.arange(n_groups), last]
+        over = has_bets & (total > max_total_stake_pct)
+        if over.any():
+            scaled[over] = scaled[over] * (max_total_stake_pct / total[over])[:, None]
+
+    picked = in_set[group, rank]
+    stakes[rows[picked]] = scaled[group, rank][picked]
+    backed[rows[picked]] = True
+    return stakes, backed
@@ -49,9 +49,18 @@ class Meeting(db.Model):
     auto_imported = db.Column(db.Boolean, default=False)  # True if imported from API
     rail_position = db.Column(db.Integer, default=0)   # 0=True, 1-15 = metres out
     pace_bias = db.Column(db.Integer, default=0)        # -2 to +2 (neg=backmarkers, pos=leaders)
-    
+    # Resolved once from csv_data by store_meeting_runners (app.py): detected
+    # track/finish/price columns plus debug headers. NULL = not parsed yet.
+    csv_columns = db.Column(db.JSON, nullable=True)
+    jurisdiction_state = db.Column(db.String(10), nullable=True, index=True)  # NSW_ACT, VIC, ... or NULL
+    # When refresh_best_bet_candidates (app.py) last rebuilt this meeting's
+    # best_bet_candidates rows. NULL = not computed, or invalidated since.
+    best_bets_computed_at = db.Column(db.DateTime, nullable=True)
+
     # Relationships
     races = db.relationship('Race', backref='meeting', lazy=True, cascade='all, delete-orphan')
+    runners = db.relationship('MeetingRunner', backref='meeting', lazy=True, cascade='all, delete-orphan')
+    best_bet_candidates = db.relationship('BestBetCandidate', backref='meeting', lazy=True, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Meeting {self.meeting_name}>'
@@ -160,6 +169,11 @@ class Result(db.Model):
     # Relationships
     horse = db.relationship('Horse', backref=db.backref('result', uselist=False, cascade='all, delete-orphan'))
     user = db.relationship('User', backref='recorded_results')
+
+    # One result per runner; results_settlement upserts on it.
+    __table_args__ = (
+        db.Index('uq_results_horse_id', 'horse_id', unique=True),
+    )
     
     @property
     def is_scratched(self):
@@ -177,6 +191,115 @@ class Result(db.Model):
         return f'<Result {self.horse_id}: P{self.finish_position} @ ${self.sp}>'
 
 
+class MeetingRunner(db.Model):
+    """One runner of a meeting's uploaded CSV, parsed once at import.
+
+    Holds the jurisdiction fields the Data page aggregates (current and
+    previous-run track/state, CSV finish position and price) so the analytics
+    never re-read Meeting.csv_data. Only meetings whose CSV carries both a
+    current and a previous-run track column get rows.
+    """
+    __tablename__ = 'meeting_runners'
+
+    id = db.Column(db.Integer, primary_key=True)
+    meeting_id = db.Column(db.Integer, db.ForeignKey('meetings.id'), nullable=False, index=True)
+    horse_id = db.Column(db.Integer, db.ForeignKey('horses.id'), nullable=False, unique=True)
+    horse_key = db.Column(db.String(100))  # Upper-cased horse name, for unique-horse counts
+    current_track = db.Column(db.String(100))
+    current_state = db.Column(db.String(10))  # Any JURISDICTION_TRACKS state, NULL when unmapped
+    previous_track = db.Column(db.String(100))
+    previous_state = db.Column(db.String(10))
+    csv_finish_position = db.Column(db.Integer, nullable=True)  # 0 = scratched in the CSV
+    csv_price = db.Column(db.Float, nullable=True)  # Decimal SP from the CSV price column
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    horse = db.relationship('Horse', backref=db.backref('meeting_runner', uselist=False, cascade='all, delete-orphan'))
+
+    __table_args__ = (
+        db.Index('ix_meeting_runners_states', 'previous_state', 'current_state'),
+    )
+
+    def __repr__(self):
+        return f'<MeetingRunner {self.meeting_id}: {self.previous_state}->{self.current_state}>'
+
+
+class BestBetCandidate(db.Model):
+    """A runner that qualified for the Best Bets page when its meeting was last
+    scored, with the odds-independent signals behind it.
+
+    Rebuilt per meeting by refresh_best_bet_candidates (app.py) whenever the
+    meeting is imported, rescored or re-priced. The page only overlays live
+    Ladbrokes odds on these rows. reason_mask holds BEST_BET_REASON_* bits.
+    """
+    __tablename__ = 'best_bet_candidates'
+
+    id = db.Column(db.Integer, primary_key=True)
+    meeting_id = db.Column(db.Integer, db.ForeignKey('meetings.id'), nullable=False, index=True)
+    race_id = db.Column(db.Integer, db.ForeignKey('races.id'), nullable=False)
+    horse_id = db.Column(db.Integer, db.ForeignKey('horses.id'), nullable=False, unique=True)
+    rank_in_race = db.Column(db.Integer)
+    is_top_pick = db.Column(db.Boolean, default=False)
+    score = db.Column(db.Float)
+    score_gap = db.Column(db.Float)  # Top pick: to the second; others: to the runner above
+    win_probability_pct = db.Column(db.Float)
+    reason_mask = db.Column(db.Integer, nullable=False, default=0)
+    reasons = db.Column(db.JSON)
+    component_keys = db.Column(db.JSON)  # Active component keys matched in the notes
+    analyzer_rank = db.Column(db.Integer)
+    pfai_rank = db.Column(db.Integer)
+    ml_rank = db.Column(db.Integer)
+    ml_score = db.Column(db.Float)
+    ml_score_gap = db.Column(db.Float)  # ML top-two gap, on the ML top pick only
+    ml_fair_probability_pct = db.Column(db.Float)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    horse = db.relationship('Horse', backref=db.backref('best_bet_candidate', uselist=False, cascade='all, delete-orphan'))
+    race = db.relationship('Race')
+
+    def __repr__(self):
+        return f'<BestBetCandidate {self.meeting_id}: horse {self.horse_id} mask={self.reason_mask}>'
+
+
+class ImportJob(db.Model):
+    """One queued PuntingForm meeting import (see import_jobs.py).
+
+    The web request only inserts a row; a worker thread claims it, runs the
+    import and records progress here for the import page to poll. dedupe_key
+    identifies the meeting being imported, so a second submission while one
+    is queued or running returns the same job instead of a duplicate meeting.
+    """
+    __tablename__ = 'import_jobs'
+    # At most one queued/running job per meeting, even when two requests race
+    # past ImportJobQueue.enqueue's check.
+    __table_args__ = (
+        db.Index(
+            'uq_import_jobs_active_dedupe_key', 'dedupe_key', unique=True,
+            postgresql_where=db.text("status IN ('queued', 'running')"),
+            sqlite_where=db.text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id = db.Column(db.String(36), primary_key=True)  # uuid4, returned to the client as job_id
+    dedupe_key = db.Column(db.String(120), nullable=False, index=True)  # "<pf meeting id>:<YYYY-MM-DD>"
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    params = db.Column(db.JSON, nullable=False)  # pf_meeting_id, date, track_condition, rail_position
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, running, succeeded, failed
+    stage = db.Column(db.String(50), default='queued')
+    progress = db.Column(db.Integer, default=0)  # 0-100
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=3)
+    error = db.Column(db.Text, nullable=True)
+    meeting_id = db.Column(db.Integer, db.ForeignKey('meetings.id', ondelete='SET NULL'), nullable=True)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow)  # retry backoff: not claimable before this
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # refreshed on every progress update
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<ImportJob {self.id} {self.dedupe_key} {self.status}>'
+
+
 class Component(db.Model):
     """Betting components with performance tracking for Best Bets feature"""
     __tablename__ = 'components'
@@ -242,6 +365,24 @@ class StrikeRate(db.Model):
         return f'<StrikeRate {self.type} {self.name}>'
 
 
+class StrikeRateAlias(db.Model):
+    """A jockey/trainer name key the fuzzy matching tier resolved to a
+    strike-rate entity, reused by later runs instead of re-scoring it."""
+    __tablename__ = 'strike_rate_aliases'
+
+    entity_type = db.Column(db.String(20), primary_key=True)
+    query_key = db.Column(db.String(255), primary_key=True)
+    matched_key = db.Column(db.String(255), nullable=False)
+    similarity = db.Column(db.Float)
+    # md5 of the surname bucket the match was scored against; the alias is
+    # re-scored once that bucket's candidates change.
+    bucket_fingerprint = db.Column(db.String(32))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<StrikeRateAlias {self.entity_type} {self.query_key} -> {self.matched_key}>'
+
+
 class Bet(db.Model):
     """James's personal bet log across all sports (admin-only Bet Tracker feature)"""
     __tablename__ = 'bets'
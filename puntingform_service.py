@@ -1,9 +1,15 @@
 import os
 import json
+import copy
 import csv
 import io
+import threading
+import time
 import requests
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from strike_rate_matching import normalize_name
 from sqlalchemy import create_engine, text
 from datetime import datetime
@@ -11,6 +17,22 @@ from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 log = logging.getLogger(__name__)
 
+V2_BASE_URL = 'https://api.puntingform.com.au/v2'
+
+# Keep-alive connections kept open per PuntingForm host, and the threads
+# fetch_concurrently spreads one meeting's requests over.
+PF_HTTP_POOL_SIZE = int(os.environ.get('PF_HTTP_POOL_SIZE', '16'))
+PF_FETCH_WORKERS = int(os.environ.get('PF_FETCH_WORKERS', '8'))
+# Response cache lifetimes in seconds (0 disables caching for that kind).
+# Scratchings change minute to minute on race day; fields, ratings and speed
+# maps for today or later can still change; meeting lists and anything for a
+# past date do not.
+PF_CACHE_TTL_SCRATCHINGS = float(os.environ.get('PF_CACHE_TTL_SCRATCHINGS', '60'))
+PF_CACHE_TTL_CURRENT = float(os.environ.get('PF_CACHE_TTL_CURRENT', '120'))
+PF_CACHE_TTL_MEETINGS = float(os.environ.get('PF_CACHE_TTL_MEETINGS', '3600'))
+PF_CACHE_TTL_PAST = float(os.environ.get('PF_CACHE_TTL_PAST', '21600'))
+PF_CACHE_MAX_ENTRIES = int(os.environ.get('PF_CACHE_MAX_ENTRIES', '2048'))
+
 
 def _safe_log_url(url):
     """Return a URL safe for logs while preserving diagnostic query params."""
@@ -23,22 +45,151 @@ def _safe_log_url(url):
     return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(safe_params), parts.fragment))
 
 
+class PuntingFormAPIError(Exception):
+    """A PuntingForm request failed.
+
+    ``transient`` is True for failures worth retrying later: timeouts,
+    connection errors, rate limiting (429) and 5xx responses.
+    """
+
+    def __init__(self, message, status_code=None, transient=False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.transient = transient
+
+
+class ResponseCache:
+    """Thread-safe TTL cache of parsed PuntingForm responses.
+
+    Keys are (endpoint, date, track) tuples; ``track`` holds whatever else
+    identifies the payload (track name, meeting id, race). Only successful
+    fetches are stored (and, given ``store_if``, only values it accepts), and
+    callers get their own copy of dict/list values.
+    Least recently used entries go first once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries=PF_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_fetch(self, key, ttl, fetch, store_if=None):
+        if ttl <= 0:
+            return fetch()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+        value = fetch()
+        if store_if is not None and not store_if(value):
+            return value
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def invalidate(self, endpoint=None):
+        """Drop every entry, or only those for ``endpoint``."""
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == endpoint]:
+                    del self._entries[key]
+
+
+# Shared by every PuntingFormService in the process.
+RESPONSE_CACHE = ResponseCache()
+
+
+def _v1_ok(data):
+    """V1 endpoints report failures as a 200 carrying IsError; never cache those."""
+    return not (isinstance(data, dict) and data.get('IsError'))
+
+
+def _ttl_for_date(date_str):
+    """Past-dated payloads are final; today's and upcoming ones can still change."""
+    if date_str and date_str < datetime.now().strftime('%Y-%m-%d'):
+        return PF_CACHE_TTL_PAST
+    return PF_CACHE_TTL_CURRENT
+
+
+def _pooled_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=PF_HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def fetch_concurrently(calls, max_workers=None):
+    """Run ``{key: (fn, *args)}`` on a thread pool.
+
+    Returns ``(results, errors)``, both keyed like ``calls``: a call that
+    raised has its exception in ``errors`` and no entry in ``results``.
+    """
+    results, errors = {}, {}
+    if not calls:
+        return results, errors
+    workers = max(1, min(max_workers or PF_FETCH_WORKERS, len(calls)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pf-fetch') as executor:
+        futures = {key: executor.submit(call[0], *call[1:]) for key, call in calls.items()}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                errors[key] = e
+    return results, errors
+
+
 class PuntingFormService:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, cache=None):
         self.api_key = api_key or os.getenv("PUNTINGFORM_API_KEY")
         if not self.api_key:
             raise ValueError("PuntingForm API key not found")
         self.base_url = 'https://www.puntingform.com.au/api/formdataservice'
+        # One keep-alive pool for every call, including the worker threads
+        # of fetch_meeting_payloads.
+        self.session = _pooled_session()
+        self.cache = RESPONSE_CACHE if cache is None else cache
 
-    def _make_request(self, url):
+    def _make_request(self, url, headers=None):
         """Make authenticated request"""
         try:
-            response = requests.get(url, timeout=30)
-            if not response.ok:
-                raise Exception(f"PuntingForm API error {response.status_code}: {response.text}")
-            return response
+            response = self.session.get(url, headers=headers, timeout=30)
         except requests.exceptions.RequestException as e:
-            raise Exception(f"API request failed: {str(e)}")
+            raise PuntingFormAPIError(f"API request failed: {str(e)}", transient=True) from e
+        if not response.ok:
+            raise PuntingFormAPIError(
+                f"PuntingForm API error {response.status_code}: {response.text}",
+                status_code=response.status_code,
+                transient=response.status_code == 429 or response.status_code >= 500,
+            )
+        return response
+
+    def _get_json(self, url, headers=None):
+        return self._make_request(url, headers=headers).json()
+
+    def _get_text(self, url, headers=None):
+        return self._make_request(url, headers=headers).text
+
+    def _v2_headers(self):
+        return {'accept': 'application/json', 'Authorization': f'Bearer {self.api_key}'}
+
+    def _meeting_list_data(self, date_str):
+        """Raw GetMeetingListExt payload for a dd-Mon-yyyy date."""
+        url = f"{self.base_url}/GetMeetingListExt/{date_str}?apikey={self.api_key}"
+        return self.cache.get_or_fetch(
+            ('GetMeetingListExt', date_str, None), PF_CACHE_TTL_MEETINGS, lambda: self._get_json(url),
+            store_if=_v1_ok,
+        )
 
     def get_meetings_list(self, date=None):
         """Get meetings list - V1 format"""
@@ -48,10 +199,7 @@ class PuntingFormService:
             date_obj = datetime.strptime(date, '%Y-%m-%d')
 
         date_str = date_obj.strftime('%d-%b-%Y')
-        url = f"{self.base_url}/GetMeetingListExt/{date_str}?apikey={self.api_key}"
-
-        response = self._make_request(url)
-        data = response.json()
+        data = self._meeting_list_data(date_str)
 
         if data.get('IsError'):
             raise Exception(f"API returned error: {data}")
@@ -66,25 +214,30 @@ class PuntingFormService:
                 'track_code': meeting['TrackCode'],
                 'state': meeting['State'],
                 'race_count': meeting['RaceCount'],
+                'race_numbers': list(meeting.get('RaceNumbers') or []),
                 'date': date_obj.strftime('%Y-%m-%d'),
                 'resulted': meeting.get('Resulted', False)
             })
 
         return {'meetings': meetings}
 
+    def _race_form_text(self, track, date, race_number):
+        date_str = datetime.strptime(date, '%Y-%m-%d').strftime('%d-%b-%Y')
+        url = f"{self.base_url}/GetFormText/{track.strip()}/{race_number}/{date_str}?apikey={self.api_key}"
+        return self.cache.get_or_fetch(
+            ('GetFormText', date, f"{track.strip().lower()}/{race_number}"), _ttl_for_date(date),
+            lambda: self._get_text(url),
+        )
+
     def get_fields_csv(self, track, date, race_number=None):
         """Get CSV data - V1 format"""
         date_obj = datetime.strptime(date, '%Y-%m-%d')
         date_str = date_obj.strftime('%d-%b-%Y')
 
         if race_number:
-            url = f"{self.base_url}/GetFormText/{track.strip()}/{race_number}/{date_str}?apikey={self.api_key}"
-            response = self._make_request(url)
-            return response.text
+            return self._race_form_text(track, date, race_number)
         else:
-            meeting_url = f"{self.base_url}/GetMeetingListExt/{date_str}?apikey={self.api_key}"
-            meeting_response = self._make_request(meeting_url)
-            meeting_data = meeting_response.json()
+            meeting_data = self._meeting_list_data(date_str)
 
             target_meeting = None
             for meeting in meeting_data.get('Result', []):
@@ -95,27 +248,95 @@ class PuntingFormService:
             if not target_meeting:
                 raise Exception(f"No meeting found for {track} on {date_str}")
 
-            all_csv = []
-            for race_num in target_meeting['RaceNumbers']:
-                race_url = f"{self.base_url}/GetFormText/{track.strip()}/{race_num}/{date_str}?apikey={self.api_key}"
-                race_response = self._make_request(race_url)
-                all_csv.append(race_response.text)
+            race_numbers = list(target_meeting['RaceNumbers'])
+            texts, errors = fetch_concurrently({
+                race_num: (self._race_form_text, track, date, race_num) for race_num in race_numbers
+            })
+            for race_num in race_numbers:
+                if race_num in errors:
+                    raise errors[race_num]
 
-            return '\n'.join(all_csv)
+            return '\n'.join(texts[race_num] for race_num in race_numbers)
 
     def get_results(self, track, date):
         """Get results - V1 format"""
         date_obj = datetime.strptime(date, '%Y-%m-%d')
         date_str = date_obj.strftime('%d-%b-%Y')
         url = f"{self.base_url}/GetResults/{track}/{date_str}?apikey={self.api_key}"
-        response = self._make_request(url)
-        return response.json()
+        return self.cache.get_or_fetch(
+            ('GetResults', date, track.strip().lower()), _ttl_for_date(date), lambda: self._get_json(url),
+            store_if=_v1_ok,
+        )
 
     def get_scratchings(self):
         """Get scratchings"""
         url = f"https://www.puntingform.com.au/api/ScratchingsService/GetAllScratchings?apikey={self.api_key}"
-        response = self._make_request(url)
-        return response.json()
+        return self.cache.get_or_fetch(
+            ('GetAllScratchings', None, None), PF_CACHE_TTL_SCRATCHINGS, lambda: self._get_json(url),
+            store_if=_v1_ok,
+        )
+
+    def get_v2_scratchings(self):
+        """V2 Updates/Scratchings payload (every current scratching, all tracks)."""
+        url = f"{V2_BASE_URL}/Updates/Scratchings?apiKey={self.api_key}"
+        return self.cache.get_or_fetch(
+            ('Updates/Scratchings', None, None), PF_CACHE_TTL_SCRATCHINGS,
+            lambda: self._get_json(url, headers=self._v2_headers()),
+        )
+
+    def get_meeting_ratings(self, meeting_id, date=None):
+        """V2 MeetingRatings payload (ratings and sectionals) for a meeting."""
+        url = f"{V2_BASE_URL}/Ratings/MeetingRatings?meetingId={meeting_id}&apiKey={self.api_key}"
+        return self.cache.get_or_fetch(
+            ('Ratings/MeetingRatings', date, str(meeting_id)), _ttl_for_date(date),
+            lambda: self._get_json(url, headers=self._v2_headers()),
+        )
+
+    def get_speedmap(self, meeting_id, race_number, date=None):
+        """V2 Speedmaps payload for one race."""
+        url = f"{V2_BASE_URL}/User/Speedmaps?meetingId={meeting_id}&raceNo={race_number}&apiKey={self.api_key}"
+        return self.cache.get_or_fetch(
+            ('User/Speedmaps', date, f"{meeting_id}/{race_number}"), _ttl_for_date(date),
+            lambda: self._get_json(url, headers=self._v2_headers()),
+        )
+
+    def fetch_meeting_payloads(self, meeting_id, track, date, race_numbers=(),
+                               include=('fields', 'ratings', 'speedmaps', 'scratchings', 'v2_scratchings')):
+        """Fetch one meeting's PuntingForm payloads concurrently.
+
+        Returns a dict with 'fields' (CSV text), 'ratings', 'scratchings'
+        (V1), 'v2_scratchings' and 'speedmaps' ({race_number: payload}) for
+        the kinds in ``include``, plus 'errors' mapping each failed fetch
+        ('speedmap:<race>' for a race) to its exception. A failed or skipped
+        kind is None.
+        """
+        calls = {}
+        if 'fields' in include:
+            calls['fields'] = (self.get_fields_csv, track, date)
+        if 'ratings' in include:
+            calls['ratings'] = (self.get_meeting_ratings, meeting_id, date)
+        if 'scratchings' in include:
+            calls['scratchings'] = (self.get_scratchings,)
+        if 'v2_scratchings' in include:
+            calls['v2_scratchings'] = (self.get_v2_scratchings,)
+        if 'speedmaps' in include:
+            for race_number in race_numbers:
+                calls[f'speedmap:{race_number}'] = (self.get_speedmap, meeting_id, race_number, date)
+
+        started = time.monotonic()
+        results, errors = fetch_concurrently(calls)
+        log.info(
+            "PF_MEETING_FETCH meeting=%s track=%s date=%s calls=%s errors=%s seconds=%.2f",
+            meeting_id, track, date, len(calls), sorted(errors), time.monotonic() - started,
+        )
+        payloads = {kind: results.get(kind) for kind in ('fields', 'ratings', 'scratchings', 'v2_scratchings')}
+        payloads['speedmaps'] = {
+            race_number: results[f'speedmap:{race_number}']
+            for race_number in race_numbers
+            if f'speedmap:{race_number}' in results
+        }
+        payloads['errors'] = errors
+        return payloads
 
     @staticmethod
     def _normalise_entity_name(name):
@@ -176,7 +397,7 @@ class PuntingFormService:
             jurisdiction,
         )
         log.info("Request URL (API key redacted): %s", _safe_log_url(request.url))
-        response = requests.Session().send(request, timeout=30)
+        response = self.session.send(request, timeout=30)
         content_type = response.headers.get('content-type', '')
         log.info("HTTP status code: %s", response.status_code)
         log.info("Response content type: %s", content_type)
@@ -0,0 +1,221 @@
+"""
+release_tasks.py - one-shot schema/seed step run once per deploy.
+
+These used to run inside app.py at import time, so every gunicorn worker (and
+every worker recycle) re-inspected the schema, issued ALTER TABLEs and
+re-seeded reference rows. They now run from scripts/release.py as a release
+step; the web process only serves requests.
+
+Order matters:
+  1. db.create_all() plus the AFL/MMA raw-SQL table sets (fresh databases)
+  2. Alembic upgrade to head (migrations/versions; column additions)
+  3. Reference data: component keys/seeds, budget tracker defaults, admin user
+  4. Derived tables for rows imported before they existed (meeting_runners,
+     best_bet_candidates)
+  5. Active ML production model audit log line
+"""
+
+import logging
+import os
+
+from sqlalchemy import inspect, text
+
+from models import db, User, Component
+from notes_parsing import normalize_component_key
+
+logger = logging.getLogger(__name__)
+
+# Revisions 0001/0002 were applied out of band before Alembic was wired into
+# deploys (scripts/ensure_db_columns.py and afl_db's own schema). A database
+# without an alembic_version table is stamped at this baseline and upgraded
+# from there.
+ALEMBIC_BASELINE_REVISION = '0002'
+
+STARTER_COMPONENTS = [
+    {'component_name': 'Age/Sex - 5yo Horse (Entire)',                 'appearances': 21,   'wins': 6,   'strike_rate': 28.6, 'roi_percentage': 224.8, 'is_active': True},
+    {'component_name': 'Days Since Run - Fresh Return (150-199 days)', 'appearances': 16,   'wins': 3,   'strike_rate': 18.8, 'roi_percentage': 193.1, 'is_active': True},
+    {'component_name': 'Colt - Base Bonus',                            'appearances': 841,  'wins': 120, 'strike_rate': 14.3, 'roi_percentage': 66.1,  'is_active': True},
+    {'component_name': 'Country: USA-bred',                            'appearances': 11,   'wins': 1,   'strike_rate': 9.1,  'roi_percentage': 63.6,  'is_active': True},
+    {'component_name': 'Market Expectation - Worst in Field',          'appearances': 8,    'wins': 2,   'strike_rate': 25.0, 'roi_percentage': 62.5,  'is_active': True},
+    {'component_name': 'Colt - 3yo Colt',                             'appearances': 2043, 'wins': 370, 'strike_rate': 18.1, 'roi_percentage': 49.2,  'is_active': True},
+    {'component_name': 'Running Position - Leader Staying',            'appearances': 14,   'wins': 2,   'strike_rate': 14.3, 'roi_percentage': 42.9,  'is_active': True},
+    {'component_name': 'Days Since Run - Too Fresh (250+ days)',       'appearances': 198,  'wins': 28,  'strike_rate': 14.1, 'roi_percentage': 31.8,  'is_active': True},
+    {'component_name': 'Age/Sex - 3yo',                               'appearances': 286,  'wins': 55,  'strike_rate': 19.2, 'roi_percentage': 27.7,  'is_active': True},
+]
+
+PROFITABLE_COMPONENTS = [
+    # ── Original list ────────────────────────────────────────────────────────
+    {'component_name': 'Age/Sex - 5yo Horse (Entire)',                          'appearances': 21,   'wins': 6,   'strike_rate': 28.6, 'roi_percentage': 224.8, 'is_active': True},
+    {'component_name': 'Colt - Base Bonus',                                     'appearances': 841,  'wins': 120, 'strike_rate': 14.3, 'roi_percentage': 66.1,  'is_active': True},
+    {'component_name': 'Colt - 3yo Colt',                                       'appearances': 2043, 'wins': 370, 'strike_rate': 18.1, 'roi_percentage': 49.2,  'is_active': True},
+    {'component_name': 'Running Position - Leader Staying',                     'appearances': 14,   'wins': 2,   'strike_rate': 14.3, 'roi_percentage': 42.9,  'is_active': True},
+    {'component_name': 'Days Since Run - Too Fresh (250+ days)',                'appearances': 198,  'wins': 28,  'strike_rate': 14.1, 'roi_percentage': 31.8,  'is_active': True},
+    {'component_name': 'Age/Sex - 3yo',                                         'appearances': 286,  'wins': 55,  'strike_rate': 19.2, 'roi_percentage': 27.7,  'is_active': True},
+    {'component_name': 'Pace Angle - Sprint Leader Run Down',                   'appearances': 123,  'wins': 32,  'strike_rate': 26.0, 'roi_percentage': 32.1,  'is_active': True},
+    {'component_name': 'Undefeated on Condition',                               'appearances': 31,   'wins': 7,   'strike_rate': 22.6, 'roi_percentage': 34.0,  'is_active': True},
+    # ── New — Top Pick Notes ROI ─────────────────────────────────────────────
+    {'component_name': 'Running Position - Backmarker Staying',                 'appearances': 6,    'wins': 1,   'strike_rate': 16.7, 'roi_percentage': 333.3, 'is_active': True},
+    {'component_name': 'Last Start - Photo Win (<0.5L)',                        'appearances': 212,  'wins': 48,  'strike_rate': 22.6, 'roi_percentage': 48.0,  'is_active': True},
+    {'component_name': 'Specialist - Undefeated Distance',                      'appearances': 220,  'wins': 54,  'strike_rate': 24.5, 'roi_percentage': 43.3,  'is_active': True},
+    {'component_name': 'Drop back in distance (200-400m)',                          'component_key': 'drop_back_distance_200_400', 'appearances': 45,   'wins': 11,  'strike_rate': 24.4, 'roi_percentage': 37.9,  'is_active': True},
+    {'component_name': 'Running Position - Backmarker Middle',                  'appearances': 37,   'wins': 6,   'strike_rate': 16.2, 'roi_percentage': 31.6,  'is_active': True},
+    {'component_name': 'Specialist - Undefeated Track+Distance',                'appearances': 146,  'wins': 43,  'strike_rate': 29.5, 'roi_percentage': 31.4,  'is_active': True},
+    {'component_name': 'First Up - Specialist Undefeated',                      'appearances': 62,   'wins': 21,  'strike_rate': 33.9, 'roi_percentage': 27.7,  'is_active': True},
+    {'component_name': 'Signal Agreement - Both Signals Agree',                 'appearances': 814,  'wins': 270, 'strike_rate': 33.2, 'roi_percentage': -15.1, 'is_active': True},
+    {'component_name': 'Ran places: 2nd 2nd 3rd',                               'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
+    {'component_name': 'Ran places: 1st 1st 2nd',                               'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
+    {'component_name': 'Ran places: 2nd 1st 1st',                               'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
+    {'component_name': 'Ran places: 2nd 3rd 2nd',                               'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
+    {'component_name': '100% PODIUM at track (1/1) - specialist bonus',         'appearances': 0,    'wins': 0,   'strike_rate': 0.0,  'roi_percentage': 0.0,   'is_active': True},
+]
+
+
+def init_migrate(app):
+    """Attach Flask-Migrate to app (once) and return the extension.
+
+    app.py only does this for ``flask ...`` CLI runs so web workers never
+    import alembic; the release step calls it before upgrading.
+    """
+    from flask_migrate import Migrate
+
+    if 'migrate' not in app.extensions:
+        Migrate(app, db)
+    return app.extensions['migrate']
+
+
+def ensure_schema_head(app):
+    """Create missing tables, then bring Alembic to head."""
+    from flask_migrate import stamp, upgrade
+
+    init_migrate(app)
+    db.create_all()
+    try:
+        from afl_db import init_afl_tables
+        init_afl_tables(db)
+        logger.info("AFL tables initialised")
+    except Exception as e:
+        logger.warning("AFL table init: %s", e)
+    try:
+        from mma_models import init_mma_tables
+        init_mma_tables(db)
+        logger.info("MMA tables initialised")
+    except Exception as e:
+        logger.warning("MMA table init: %s", e)
+
+    directory = os.path.join(app.root_path, 'migrations')
+    if 'alembic_version' not in inspect(db.engine).get_table_names():
+        logger.info("No alembic_version table; stamping baseline %s", ALEMBIC_BASELINE_REVISION)
+        stamp(directory=directory, revision=ALEMBIC_BASELINE_REVISION)
+    upgrade(directory=directory)
+
+
+def seed_components():
+    """Backfill component keys, seed starters on an empty table, upsert stats."""
+    keyed = 0
+    for component in Component.query.all():
+        desired_key = normalize_component_key(component.component_name)
+        if not component.component_key or component.component_key != desired_key:
+            component.component_key = desired_key
+            keyed += 1
+    if keyed:
+        db.session.commit()
+        logger.info("Backfilled stable keys for %s components", keyed)
+
+    if Component.query.count() == 0:
+        for comp_data in STARTER_COMPONENTS:
+            comp_data = dict(comp_data)
+            comp_data.setdefault('component_key', normalize_component_key(comp_data['component_name']))
+            db.session.add(Component(**comp_data))
+        db.session.commit()
+        logger.info("Added %s starter components", len(STARTER_COMPONENTS))
+
+    added = 0
+    for comp_data in PROFITABLE_COMPONENTS:
+        comp_key = comp_data.get('component_key') or normalize_component_key(comp_data['component_name'])
+        existing = Component.query.filter_by(component_key=comp_key).first()
+        if not existing:
+            existing = Component.query.filter_by(component_name=comp_data['component_name']).first()
+        if not existing:
+            component = Component(**comp_data)
+            component.component_key = comp_key
+            db.session.add(component)
+            added += 1
+        else:
+            existing.component_key   = comp_key
+            existing.component_name  = comp_data['component_name']
+            existing.appearances    = comp_data['appearances']
+            existing.wins           = comp_data['wins']
+            existing.strike_rate    = comp_data['strike_rate']
+            existing.roi_percentage = comp_data['roi_percentage']
+    db.session.commit()
+    logger.info("Profitable components: %s added, remainder updated", added)
+
+
+def ensure_admin_user():
+    admin = User.query.filter_by(username='admin').first()
+    if not admin:
+        admin = User(
+            username='admin',
+            email='admin@theformanalyst.com',
+            is_admin=True
+        )
+        admin.set_password(os.environ.get('ADMIN_PASSWORD', 'changeme123'))
+        db.session.add(admin)
+        db.session.commit()
+        logger.info("Created default admin user")
+
+
+def audit_active_production_model():
+    try:
+        from ml_predict import NoActiveChampionError, active_production_model_metadata
+        try:
+            active_production_model_metadata(emit_log=True)
+        except NoActiveChampionError as e:
+            # Running with no champion is a supported state, not a failure:
+            # the app serves everything else and simply shows no ML picks
+            # until a model earns promotion.
+            logger.warning("ML_ACTIVE_PRODUCTION_MODEL_AUDIT no_active_champion=True — no ML picks will be generated: %s", e)
+    except Exception as e:
+        logger.warning("ML_ACTIVE_PRODUCTION_MODEL_AUDIT unavailable during release: %s", e)
+
+
+def backfill_derived_tables():
+    """Fill meeting_runners and best_bet_candidates for meetings imported
+    before they existed (or, for candidates, left stale by a component change).
+
+    Imports and scoring keep both current afterwards; the analytics endpoints
+    and the Best Bets page only read them, so the first request after a deploy
+    never parses historic CSVs or rescores meetings.
+    """
+    from app import backfill_best_bet_candidates, backfill_meeting_runners
+
+    parsed = backfill_meeting_runners()
+    computed = backfill_best_bet_candidates()
+    logger.info("Derived tables backfilled: meeting_runners meetings=%s best_bet_candidates meetings=%s",
+                parsed, computed)
+
+
+def run_release_tasks(app):
+    """Run every release step inside an app context. Safe to re-run."""
+    with app.app_context():
+        ensure_schema_head(app)
+        try:
+            seed_components()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Component seed check: %s", e)
+        # Budget Tracker: seed default categories/debt config and ensure the current fortnight exists
+        try:
+            from budget_tracker import seed_budget_tracker_defaults, get_current_fortnight
+            seed_budget_tracker_defaults(db)
+            get_current_fortnight(db)
+            logger.info("Budget Tracker defaults seeded")
+        except Exception as e:
+            logger.warning("Budget Tracker seed check: %s", e)
+        ensure_admin_user()
+        try:
+            backfill_derived_tables()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Derived table backfill: %s", e)
+        audit_active_production_model()
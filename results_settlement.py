@@ -0,0 +1,235 @@
+"""
+results_settlement.py
+=====================
+Settle PuntingForm results for many meetings in one sweep.
+
+    details = settle_meetings(db, meetings, recorded_by=current_user.id)
+    db.session.commit()
+
+The sweep fetches every meeting's GetResults payload concurrently (at most
+RESULTS_SWEEP_CONCURRENCY at once, over PuntingFormService's pooled session),
+resolves each meeting's races and runners with a single query, and writes
+every matched runner's result with one INSERT ... ON CONFLICT (horse_id)
+statement per RESULTS_UPSERT_CHUNK rows, instead of a query per race and an
+ORM object per runner. after_results_settled runs once at the end.
+
+Each detail is the dict ml_shadow_routes has always reported per meeting:
+status is 'settled', 'pending' (results not out yet), 'skipped' (not a
+PuntingForm meeting, or no date) or 'error' (the fetch failed).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from datetime import datetime
+
+from puntingform_service import PuntingFormService, fetch_concurrently
+
+log = logging.getLogger(__name__)
+
+RESULTS_SWEEP_CONCURRENCY = int(os.environ.get('RESULTS_SWEEP_CONCURRENCY', '4'))
+# Rows per upsert statement; five bind parameters each keeps SQLite well
+# under its 32766-variable limit.
+RESULTS_UPSERT_CHUNK = int(os.environ.get('RESULTS_UPSERT_CHUNK', '1000'))
+
+
+def meeting_date_string(meeting):
+    """Return YYYY-MM-DD for a meeting, using the date column or YYMMDD_Track name."""
+    if getattr(meeting, 'date', None):
+        return meeting.date.strftime('%Y-%m-%d')
+
+    name = meeting.meeting_name or ''
+    if '_' not in name:
+        return None
+
+    date_part = name.split('_', 1)[0]
+    if len(date_part) != 6 or not date_part.isdigit():
+        return None
+
+    return f"20{date_part[:2]}-{date_part[2:4]}-{date_part[4:6]}"
+
+
+def normalise_runner_name(value):
+    return ' '.join((value or '').strip().lower().split())
+
+
+def _finish_position(runner):
+    finish_pos = runner.get('Position') or runner.get('FinishPosition') or runner.get('Place') or 0
+    try:
+        finish_pos = int(finish_pos or 0)
+    except (TypeError, ValueError):
+        finish_pos = 0
+    return 5 if finish_pos > 4 else finish_pos
+
+
+def _starting_price(runner):
+    sp = runner.get('Price_SP') or runner.get('SP') or runner.get('StartingPrice')
+    try:
+        return float(sp) if sp not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def race_results(response):
+    """[(race_number, runners)] from a V1 GetResults payload."""
+    races = response.get('RaceDetails') or response.get('Result') or []
+    parsed = []
+    for race_result in races:
+        race_num = race_result.get('RaceNumber') or race_result.get('RaceNo') or race_result.get('Race')
+        try:
+            race_num = int(race_num)
+        except (TypeError, ValueError):
+            continue
+        parsed.append((race_num, race_result.get('Runners', []) or []))
+    return parsed
+
+
+def _meeting_runners(db, meeting_id):
+    """{(race_number, normalised name): (horse_id, has_result)} in one query."""
+    from models import Horse, Race, Result
+
+    rows = (
+        db.session.query(Race.race_number, Horse.id, Horse.horse_name, Result.id)
+        .join(Horse, Horse.race_id == Race.id)
+        .outerjoin(Result, Result.horse_id == Horse.id)
+        .filter(Race.meeting_id == meeting_id)
+        .order_by(Horse.id)
+        .all()
+    )
+    runners = {}
+    for race_number, horse_id, horse_name, result_id in rows:
+        runners.setdefault((race_number, normalise_runner_name(horse_name)), (horse_id, result_id is not None))
+    return runners
+
+
+def _upsert_statement(db, chunk):
+    from models import Result
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    stmt = insert(Result.__table__).values(chunk)
+    return stmt.on_conflict_do_update(
+        index_elements=['horse_id'],
+        set_={column: stmt.excluded[column] for column in ('finish_position', 'sp', 'recorded_at', 'recorded_by')},
+    )
+
+
+def upsert_results(db, rows):
+    """Insert or overwrite one results row per horse_id. Runs in the caller's
+    transaction; the caller commits."""
+    from models import Result
+
+    for start in range(0, len(rows), RESULTS_UPSERT_CHUNK):
+        chunk = rows[start:start + RESULTS_UPSERT_CHUNK]
+        stmt = _upsert_statement(db, chunk)
+        if stmt is not None:
+            db.session.execute(stmt)
+            continue
+        # No ON CONFLICT support: one UPDATE batch and one INSERT batch.
+        horse_ids = [row['horse_id'] for row in chunk]
+        existing = dict(
+            db.session.query(Result.horse_id, Result.id).filter(Result.horse_id.in_(horse_ids)).all()
+        )
+        db.session.bulk_update_mappings(
+            Result, [dict(row, id=existing[row['horse_id']]) for row in chunk if row['horse_id'] in existing],
+        )
+        db.session.bulk_insert_mappings(Result, [row for row in chunk if row['horse_id'] not in existing])
+
+
+def after_results_settled(db, meeting_ids):
+    """Run once per sweep, after its upsert, for the meetings that gained results."""
+    # The upsert bypasses the ORM, so Horse.result objects already loaded in
+    # this session are stale until reloaded.
+    db.session.expire_all()
+    log.info("RESULTS_SETTLED meetings=%s", len(meeting_ids))
+
+
+def _detail(meeting, status, **extra):
+    return dict({'meeting_id': meeting.id, 'meeting_name': meeting.meeting_name, 'status': status}, **extra)
+
+
+def settle_meetings(db, meetings, recorded_by, pf_service=None, max_workers=None):
+    """Fetch and store PuntingForm results for ``meetings``; one detail dict each,
+    in order. Runs in the caller's transaction; the caller commits."""
+    started = time.monotonic()
+    meeting_ids = [meeting.id for meeting in meetings]
+    details = {}
+    pending = []
+    for meeting in meetings:
+        if not meeting.puntingform_id:
+            details[meeting.id] = _detail(meeting, 'skipped', reason='not a PuntingForm meeting')
+            continue
+        date_str = meeting_date_string(meeting)
+        if not date_str:
+            details[meeting.id] = _detail(meeting, 'skipped', reason='missing meeting date')
+            continue
+        pending.append((meeting, date_str))
+
+    if pending and pf_service is None:
+        pf_service = PuntingFormService()
+    responses, errors = fetch_concurrently(
+        {meeting.id: (pf_service.get_results, meeting.puntingform_id, date_str) for meeting, date_str in pending},
+        max_workers=max_workers or RESULTS_SWEEP_CONCURRENCY,
+    )
+
+    now = datetime.utcnow()
+    rows = []
+    settled_ids = []
+    for meeting, _date_str in pending:
+        if meeting.id in errors:
+            log.warning("RESULTS_FETCH_FAILED meeting=%s error=%s", meeting.id, errors[meeting.id])
+            details[meeting.id] = _detail(meeting, 'error', reason=str(errors[meeting.id]))
+            continue
+        response = responses[meeting.id]
+        if response.get('IsError'):
+            details[meeting.id] = _detail(meeting, 'pending', reason='results not available')
+            continue
+        races = race_results(response)
+        if not races:
+            details[meeting.id] = _detail(meeting, 'pending', reason='no race results returned')
+            continue
+
+        runners = _meeting_runners(db, meeting.id)
+        seen = set()
+        created = updated = 0
+        for race_num, race_runners in races:
+            for runner in race_runners:
+                horse_name = runner.get('Name') or runner.get('Horse') or runner.get('RunnerName')
+                match = runners.get((race_num, normalise_runner_name(horse_name)))
+                if not match or match[0] in seen:
+                    continue
+                horse_id, has_result = match
+                seen.add(horse_id)
+                rows.append({
+                    'horse_id': horse_id,
+                    'finish_position': _finish_position(runner),
+                    'sp': _starting_price(runner),
+                    'recorded_at': now,
+                    'recorded_by': recorded_by,
+                })
+                if has_result:
+                    updated += 1
+                else:
+                    created += 1
+        matched = created + updated
+        if matched:
+            settled_ids.append(meeting.id)
+        details[meeting.id] = _detail(
+            meeting, 'settled' if matched else 'pending', matched=matched, created=created, updated=updated,
+        )
+
+    if rows:
+        upsert_results(db, rows)
+        after_results_settled(db, settled_ids)
+    log.info(
+        "RESULTS_SWEEP meetings=%s fetched=%s settled=%s rows=%s seconds=%.2f",
+        len(meeting_ids), len(pending), len(settled_ids), len(rows), time.monotonic() - started,
+    )
+    return [details[meeting_id] for meeting_id in meeting_ids]
@@ -15,22 +15,21 @@ Read-only by default. Reports:
 Usage:
     DATABASE_URL=postgres://... python3 scripts/audit_champion_feature_lists.py
 """
-import io
 import json
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import joblib
 from sqlalchemy import create_engine, text
 
-# Registers ConsensusRegressor on this script's __main__ module so joblib.load
+# Registers ConsensusRegressor on this script's __main__ module so load_model_bytes
 # below can unpickle ensemble/ensemble_equal_weight/ensemble_catboost_weighted
 # artifacts, both new (module path 'model_classes') and old (module path
 # '__main__', from before that class moved out of backtest.py). See
 # model_classes.py for why this is needed.
 import model_classes  # noqa: F401,E402
+from model_artifacts import load_model_bytes  # noqa: E402
 
 
 def stored_feature_list(model):
@@ -71,7 +70,7 @@ def main():
             features, note = None, "NO ARTIFACT"
         else:
             try:
-                features = stored_feature_list(joblib.load(io.BytesIO(bytes(pkl))))
+                features = stored_feature_list(load_model_bytes(pkl))
                 note = "" if features else "NO FEATURE LIST"
             except Exception as exc:
                 features, note = None, f"LOAD FAILED: {exc}"
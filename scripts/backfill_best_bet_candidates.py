@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Backfill best_bet_candidates for meetings scored before the table existed.
+
+New imports, ML scoring, scratching updates and pace-bias changes refresh a
+meeting's candidates as they rescore it; component edits recompute the last
+BEST_BET_COMPONENT_RECOMPUTE_HOURS of meetings and leave older ones stale. The
+release step runs the same backfill on deploy. The Best Bets page never
+computes candidates itself, so run this to fill in stale meetings between
+deploys.
+
+Usage:
+    # Compute every meeting whose best_bets_computed_at is still NULL.
+    python scripts/backfill_best_bet_candidates.py
+
+    # Only meetings uploaded in the last 48 hours.
+    python scripts/backfill_best_bet_candidates.py --hours 48
+
+    # Recompute every meeting, e.g. after changing the candidate reasons.
+    python scripts/backfill_best_bet_candidates.py --rebuild
+
+Environment:
+    DATABASE_URL must be set (same as the web app).
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, backfill_best_bet_candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=100,
+                        help='Meetings computed per commit (default: 100)')
+    parser.add_argument('--hours', type=int, default=None,
+                        help='Only meetings uploaded in the last N hours (default: all)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Recompute every meeting, not only those never computed')
+    args = parser.parse_args()
+
+    since = datetime.utcnow() - timedelta(hours=args.hours) if args.hours else None
+    with app.app_context():
+        computed = backfill_best_bet_candidates(since=since, batch_size=args.batch_size, rebuild=args.rebuild)
+    print(f"Computed Best Bets candidates for {computed} meetings")
+
+
+if __name__ == '__main__':
+    main()
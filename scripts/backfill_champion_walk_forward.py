@@ -30,7 +30,6 @@ Environment:
     DATABASE_URL must be set (same as backtest.py).
 """
 import argparse
-import io
 import json
 import logging
 import os
@@ -38,8 +37,6 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import joblib
-
 import backtest
 
 log = logging.getLogger(__name__)
@@ -108,7 +105,7 @@ def main():
 
         if not pkl_bytes:
             raise SystemExit(f"Model id={champion_id} has no stored pkl_data to re-fit for walk-forward folds.")
-        model = joblib.load(io.BytesIO(pkl_bytes))
+        model = backtest.load_model_bytes(pkl_bytes)
 
         log.info("Loading historical data and rebuilding the training set (same pipeline as backtest.py)...")
         df, strike_rate_data = backtest.load_historical_data()
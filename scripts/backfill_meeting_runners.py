@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Backfill meeting_runners (and meetings.csv_columns / jurisdiction_state) for
+meetings imported before the table existed.
+
+New imports fill the table in process_and_store_results, and the release
+step (scripts/release.py) parses any meeting still missing. The jurisdiction
+and state analytics only read the table and report meetings not parsed yet.
+Run this by hand to parse without a deploy, or to --rebuild.
+
+Usage:
+    # Parse every meeting whose csv_columns is still NULL.
+    python scripts/backfill_meeting_runners.py
+
+    # Re-parse every meeting, e.g. after changing the column detection or
+    # the JURISDICTION_TRACKS map.
+    python scripts/backfill_meeting_runners.py --rebuild
+
+Environment:
+    DATABASE_URL must be set (same as the web app).
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, backfill_meeting_runners
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=100,
+                        help='Meetings parsed per commit (default: 100)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Re-parse every meeting, not only those never parsed')
+    args = parser.parse_args()
+
+    with app.app_context():
+        parsed = backfill_meeting_runners(batch_size=args.batch_size, rebuild=args.rebuild)
+    print(f"Parsed {parsed} meetings into meeting_runners")
+
+
+if __name__ == '__main__':
+    main()
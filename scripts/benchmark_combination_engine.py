@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for combination_engine.FactorBitmaps.
+
+Builds synthetic tagged runners (12 factors each, drawn from a skewed
+vocabulary so some factors are common and most are rare). It times the
+per-runner itertools enumeration that /api/data/combination-analysis used
+to do against FactorBitmaps.frequent_combinations with the route's tiered
+minimums ({2: 10, 3: 10, 4: 15}), and checks both give the same
+combinations, races, wins and profit.
+
+Usage:
+    python scripts/benchmark_combination_engine.py
+    python scripts/benchmark_combination_engine.py --sizes 5000 --seed 7
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from itertools import combinations
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from combination_engine import FactorBitmaps  # noqa: E402
+
+MIN_RACES = {2: 10, 3: 10, 4: 15}
+
+
+def synthetic_runners(n, seed, factors_per_runner=12, vocabulary=400):
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    labels = [f"Factor:{rank}" for rank in range(vocabulary)]
+    factor_sets, won, profit = [], [], []
+    for _ in range(n):
+        factors = set()
+        while len(factors) < factors_per_runner:
+            factors.update(rng.choices(labels, weights=weights, k=factors_per_runner - len(factors)))
+        sp = rng.choice([1.8, 2.5, 3.5, 5.0, 8.0, 13.0, 21.0])
+        is_winner = rng.random() < 1.0 / sp
+        factor_sets.append(sorted(factors))
+        won.append(is_winner)
+        profit.append(sp * 10 - 10 if is_winner else -10.0)
+    return factor_sets, won, profit
+
+
+def itertools_counts(factor_sets, won, profit):
+    stats = defaultdict(lambda: [0, 0, 0.0])
+    for factors, is_winner, runner_profit in zip(factor_sets, won, profit):
+        for size in MIN_RACES:
+            for combo in combinations(factors, size):
+                entry = stats[combo]
+                entry[0] += 1
+                entry[1] += 1 if is_winner else 0
+                entry[2] += runner_profit
+    return {
+        combo: (races, wins, round(total, 6))
+        for combo, (races, wins, total) in stats.items()
+        if races >= MIN_RACES[len(combo)]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2000, 20000])
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    print(f"{'runners':>8} {'itertools s':>12} {'bitmaps s':>10}  combinations")
+    for size in args.sizes:
+        factor_sets, won, profit = synthetic_runners(size, args.seed)
+
+        started = time.perf_counter()
+        reference = itertools_counts(factor_sets, won, profit)
+        itertools_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        engine = FactorBitmaps(factor_sets, won, profit, min_support=MIN_RACES[2])
+        found = engine.frequent_combinations(MIN_RACES)
+        bitmaps_s = time.perf_counter() - started
+
+        result = {combo.factors: (combo.races, combo.wins, round(combo.profit, 6)) for combo in found}
+        if result != reference:
+            raise SystemExit(f"bitmap counts differ from the itertools enumeration at {size} runners")
+        print(f"{size:>8} {itertools_s:12.2f} {bitmaps_s:10.2f}  {len(result)}")
+
+
+if __name__ == '__main__':
+    main()
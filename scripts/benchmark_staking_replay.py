@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark for app.replay_staking_strategies.
+
+Replays synthetic chronological selections through every strategy from
+_staking_strategy_definitions at 10k and 100k selections. It times the
+array-based replay (curves, stake history, largest stakes and invariant
+checks) next to the per-strategy, per-bet loop it replaced, and exits
+non-zero unless every strategy's result is identical between the two.
+
+Usage:
+    python scripts/benchmark_staking_replay.py
+    python scripts/benchmark_staking_replay.py --sizes 10000 --seed 7
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault(
+    'DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.gettempdir(), 'benchmark_staking_replay.db'),
+)
+
+import app  # noqa: E402
+
+
+def synthetic_selections(n, seed):
+    rng = random.Random(seed)
+    selections = []
+    for i in range(n):
+        sp = rng.choice([1.8, 2.5, 3.5, 5.0, 8.0, 13.0, 21.0])
+        probability = min(0.95, (1.0 / sp) * rng.uniform(0.85, 1.2))
+        selections.append({
+            'sp': sp,
+            'probability': probability * 1.1,
+            'kelly_probability': probability,
+            'finish_position': 1 if rng.random() < probability * 0.97 else rng.randint(2, 12),
+            'sort_key': f"2020-01-01T{i:08d}",
+            'race_number': 1 + i % 10,
+            'race_id': i,
+        })
+    return selections
+
+
+def previous_replay(selections, starting_bankroll, minimum_stake=0.0, maximum_stake=None):
+    """The per-strategy, per-bet replay that replay_staking_strategies replaced.
+
+    Returns the ``strategies`` list of the payload, built by stepping every
+    strategy through every selection with _staking_stake.
+    """
+    ordered = sorted(selections, key=lambda s: (s.get('sort_key') or '', s.get('race_number') or 0, s.get('race_id') or 0))
+    days = 0
+    if len(ordered) >= 2:
+        try:
+            d0 = datetime.fromisoformat(str(ordered[0].get('sort_key'))[:10]).date()
+            d1 = datetime.fromisoformat(str(ordered[-1].get('sort_key'))[:10]).date()
+            days = max((d1 - d0).days, 0)
+        except Exception:
+            days = 0
+    results = []
+    for strat in app._staking_strategy_definitions():
+        bankroll = float(starting_bankroll)
+        peak = bankroll
+        max_dd = 0.0
+        stake_history = []; curve = []; wins = 0; bets = 0; losing = winning = max_losing = max_winning = 0; largest_stakes = []
+        for i, sel in enumerate(ordered, start=1):
+            bankroll_before = max(0.0, bankroll)
+            stake, kelly_fraction = app._staking_stake(strat, bankroll_before, sel, minimum_stake, maximum_stake)
+            won = sel.get('finish_position') == 1
+            sp = float(sel.get('sp') or 0)
+            if won:
+                post_race_bankroll = bankroll_before - stake + stake * sp
+            else:
+                post_race_bankroll = bankroll_before - stake
+            bankroll = max(0.0, post_race_bankroll)
+            profit = bankroll - bankroll_before
+            if stake > 0:
+                stake_history.append({
+                    'stake': stake,
+                    'profit_loss': profit,
+                    'bankroll_before': bankroll_before,
+                    'bankroll_after': bankroll,
+                })
+                bets += 1
+                largest_stakes.append({
+                    'bet': i,
+                    'stake': round(stake, 2),
+                    'bankroll': round(bankroll_before, 2),
+                    'stake_bankroll_pct': round((stake / bankroll_before * 100.0) if bankroll_before else 0.0, 4),
+                    'kelly_fraction': round(kelly_fraction, 6) if kelly_fraction is not None else None,
+                    'race_id': sel.get('race_id'),
+                    'race_number': sel.get('race_number'),
+                    'sort_key': sel.get('sort_key'),
+                    'sp': round(float(sel.get('sp') or 0), 4),
+                    'probability': round(app._normalise_probability_fraction(sel.get('probability')) or 0.0, 6),
+                    'kelly_probability': round(app._normalise_probability_fraction(sel.get('kelly_probability', sel.get('probability'))) or 0.0, 6),
+                    'finish_position': sel.get('finish_position'),
+                })
+            if stake > 0 and won:
+                wins += 1; winning += 1; losing = 0
+            elif stake > 0:
+                losing += 1; winning = 0
+            max_losing = max(max_losing, losing); max_winning = max(max_winning, winning)
+            peak = max(peak, bankroll)
+            dd = ((peak - bankroll) / peak * 100) if peak else 0.0
+            max_dd = max(max_dd, dd)
+            curve.append({'bet': i, 'bankroll': round(bankroll, 2), 'bankroll_before': round(bankroll_before, 2), 'stake': round(stake, 2), 'profit': round(profit, 2)})
+        n = bets; final = bankroll; total_profit = final - float(starting_bankroll)
+        stake_values = [row['stake'] for row in stake_history]
+        profit_values = [row['profit_loss'] for row in stake_history]
+        total_staked = sum(stake_values)
+        largest_individual_stake = max(stake_values) if stake_values else 0.0
+        average_stake = (total_staked / len(stake_values)) if stake_values else 0.0
+        largest_stakes = sorted(largest_stakes, key=lambda r: r['stake'], reverse=True)[:5]
+        avg_profit = sum(profit_values) / len(profit_values) if profit_values else 0.0
+        variance = sum((x - avg_profit) ** 2 for x in profit_values) / len(profit_values) if profit_values else 0.0
+        volatility = math.sqrt(variance)
+        cagr = 0.0
+        if days > 0 and final > 0 and starting_bankroll > 0:
+            scaled_log_growth = math.log(final / starting_bankroll) * (365.25 / days)
+            cagr = (math.exp(min(scaled_log_growth, 700.0)) - 1) * 100
+        risk_adjusted = (total_profit / max_dd) if max_dd > 0 else (total_profit if total_profit > 0 else 0.0)
+        results.append({
+            'key': strat['key'], 'name': strat['name'], 'final_bankroll': round(final, 2), 'peak_bankroll': round(peak, 2), 'total_profit': round(total_profit, 2),
+            'roi': round((total_profit / total_staked * 100) if total_staked else 0.0, 2), 'cagr': round(cagr, 2), 'maximum_drawdown': round(max_dd, 2),
+            'largest_losing_streak': max_losing, 'largest_winning_streak': max_winning, 'largest_individual_stake': round(largest_individual_stake, 2),
+            'average_stake': round(average_stake, 2), 'number_of_bets': n, 'number_of_winning_bets': wins,
+            'strike_rate': round((wins / n * 100) if n else 0.0, 2), 'return_on_turnover': round((total_profit / total_staked * 100) if total_staked else 0.0, 2),
+            'volatility': round(volatility, 2), 'bankroll_growth_multiple': round((final / starting_bankroll) if starting_bankroll else 0.0, 4),
+            'total_staked': round(total_staked, 2), 'risk_adjusted_return': round(risk_adjusted, 4), 'largest_stakes': largest_stakes, 'stake_history': stake_history, 'curve': curve,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--bankroll', type=float, default=10000.0)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    print(f"{'selections':>10} {'previous s':>11} {'replay s':>9} {'speedup':>8}  strategies")
+    for size in args.sizes:
+        selections = synthetic_selections(size, args.seed)
+        started = time.perf_counter()
+        previous = previous_replay(selections, args.bankroll)
+        previous_s = time.perf_counter() - started
+        started = time.perf_counter()
+        result = app.replay_staking_strategies(selections, args.bankroll)
+        replay_s = time.perf_counter() - started
+        for strategy, expected in zip(result['strategies'], previous):
+            if strategy != expected:
+                raise SystemExit(f"{strategy['key']}: replay differs from the previous implementation at {size}")
+        print(f"{size:>10} {previous_s:11.2f} {replay_s:9.2f} {previous_s / replay_s:7.1f}x  {len(result['strategies'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Run queued PuntingForm meeting imports outside the web processes.
+
+By default each web process runs import jobs on its own small thread pool
+(IMPORT_JOB_RUNNER=thread). Set IMPORT_JOB_RUNNER=worker on the web service
+and run this script as a separate process to keep the Node analyzer and
+PuntingForm fetches off the web workers entirely. Jobs are claimed through
+the import_jobs table, so several copies can run side by side;
+IMPORT_JOB_CONCURRENCY caps how many imports run at once across all of them.
+
+Usage:
+    python scripts/import_worker.py
+    python scripts/import_worker.py --once        # drain the queue and exit
+
+Environment:
+    DATABASE_URL must be set (same as the web app).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, import_job_queue
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--poll-seconds', type=float, default=2.0,
+                        help='Wait between queue checks when idle (default: 2)')
+    parser.add_argument('--once', action='store_true',
+                        help='Run every claimable job, then exit')
+    args = parser.parse_args()
+
+    with app.app_context():
+        while True:
+            ran = import_job_queue.drain()
+            if ran:
+                print(f"Ran {ran} import job(s)")
+            if args.once:
+                break
+            time.sleep(args.poll_seconds)
+
+
+if __name__ == '__main__':
+    main()
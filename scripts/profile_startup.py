@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Import-time profile for the web process.
+
+Runs ``python -X importtime -c "import app"`` in a clean interpreter and
+prints the total wall time plus the slowest modules by cumulative import
+time. Exits non-zero when the import takes longer than the budget, so it can
+be used as a deploy smoke check as well as for investigation.
+
+Usage:
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --budget 6 --top 25 --module app
+
+Environment:
+    STARTUP_BUDGET_SECONDS  default budget when --budget is not given (8.0)
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_import(module='app', env=None):
+    """Return (wall_seconds, [(cumulative_us, self_us, name), ...])."""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return wall, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--budget', type=float, default=float(os.environ.get('STARTUP_BUDGET_SECONDS', 8.0)))
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    wall, rows = profile_import(args.module)
+    print(f"import {args.module}: {wall:.2f}s wall (budget {args.budget:.2f}s)")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+    if wall > args.budget:
+        print(f"OVER BUDGET by {wall - args.budget:.2f}s")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -26,19 +26,18 @@ Usage:
     DATABASE_URL=postgres://... python3 scripts/promote_interim_champion.py 77 --promote
 """
 import argparse
-import io
 import json
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import joblib
 from sqlalchemy import text
 
-# Registers ConsensusRegressor on __main__ so joblib.load can unpickle ensemble
+# Registers ConsensusRegressor on __main__ so load_model_bytes can unpickle ensemble
 # artifacts saved under either module path — see model_classes.py.
 import model_classes  # noqa: F401
+from model_artifacts import load_model_bytes  # noqa: E402
 
 
 def main():
@@ -113,7 +112,7 @@ def main():
         problems.append("no stored artifact — cannot score a live race")
     else:
         try:
-            model = joblib.load(io.BytesIO(pkl_bytes))
+            model = load_model_bytes(pkl_bytes)
         except Exception as e:
             model = None
             problems.append(f"artifact failed to load: {e}")
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Release step: create missing tables, apply Alembic migrations and seed
+reference data, once per deploy, before web workers start.
+
+This is everything app.py used to do at import time (see release_tasks.py).
+It is idempotent, so re-running it against an up-to-date database only
+re-checks the seed rows.
+
+Usage:
+    DATABASE_URL=postgres://... python scripts/release.py
+
+Railway: set this as the service's pre-deploy command. Heroku-style hosts
+pick it up from the Procfile "release:" entry.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from release_tasks import run_release_tasks
+
+
+if __name__ == '__main__':
+    run_release_tasks(app)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Settle PuntingForm results for every meeting that still has active runners
+without a result (the same set as the ML Shadow "settle all" button).
+
+Results are fetched for all of those meetings concurrently
+(RESULTS_SWEEP_CONCURRENCY at once, default 4) and written in one upsert;
+see results_settlement.py. Safe to run on a schedule: meetings whose results
+are not out yet are reported as pending and picked up by the next run.
+
+Usage:
+    python scripts/settle_results.py
+    python scripts/settle_results.py --user-id 1     # record results as this user
+
+Environment:
+    DATABASE_URL and PUNTINGFORM_API_KEY must be set (same as the web app).
+"""
+import argparse
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app import app
+from ml_shadow_routes import _unsettled_puntingform_meetings_sql
+from models import Meeting, db
+from results_settlement import settle_meetings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--user-id', type=int, default=None,
+                        help='users.id to record as recorded_by (default: none)')
+    args = parser.parse_args()
+
+    with app.app_context():
+        meetings = Meeting.query.from_statement(text(_unsettled_puntingform_meetings_sql())).all()
+        details = settle_meetings(db, meetings, args.user_id)
+        db.session.commit()
+
+    statuses = Counter(detail['status'] for detail in details)
+    results = sum(detail.get('matched', 0) for detail in details)
+    print(f"Checked {len(details)} meetings: {dict(statuses)}; {results} runner results written")
+    for detail in details:
+        if detail['status'] == 'error':
+            print(f"  {detail['meeting_name']}: {detail['reason']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,14 @@
+import hashlib
+import os
 import re
+import threading
 import unicodedata
-from collections import Counter, defaultdict
+from bisect import bisect_right
+from collections import Counter, OrderedDict, defaultdict
 from datetime import date, datetime
 
+from sqlalchemy import text
+
 _TITLES = {"mr", "mrs", "ms", "miss"}
 # Apprentice claim suffix, e.g. "J Smith (a3)" or "J Smith a1.5" — matched
 # before punctuation stripping (parenthesised form) and again as a trailing
@@ -322,44 +328,11 @@ def build_strike_rate_lookup(rows):
 
 
 def lookup_strike_rate(name, sr_lookup):
-    if not name or not sr_lookup:
-        return None, "unmatched"
-    meta = sr_lookup.get("_lookup_meta", {}) if isinstance(sr_lookup, dict) else {}
-    maps = meta.get("maps")
-    keys = name_key_parts(name)
-    if maps:
-        for kind in ("exact", "all_initials", "first_initial", "surname"):
-            data = maps.get(kind, {}).get(keys[kind])
-            if data:
-                return data, ("initials" if kind in {"all_initials", "first_initial"} else "surname_unique" if kind == "surname" else "exact")
-        exact_map = maps.get("exact", {})
-        surname_index = maps.get("_surname_prefix_index", {})
-        if keys["exact"] and exact_map and not _is_partnership_name(name):
-            matched_key, score = _fuzzy_match_exact_key(keys["exact"], exact_map, surname_index)
-            if matched_key:
-                data = exact_map[matched_key]
-                audit = sr_lookup.get("_fuzzy_audit") if isinstance(sr_lookup, dict) else None
-                if audit is not None:
-                    audit.append({
-                        "query": name, "matched_name": data.get("name"), "similarity": round(score, 4),
-                    })
-                return data, "fuzzy"
-    data = sr_lookup.get(keys["exact"])
-    return (data, "exact") if data else (None, "unmatched")
+    return strike_rate_resolver(sr_lookup).lookup(name)
 
 
 def get_sr_win_pct(name, sr_lookup):
-    data, method = lookup_strike_rate(name, sr_lookup)
-    stats = sr_lookup.get("_match_stats") if isinstance(sr_lookup, dict) else None
-    if stats is not None:
-        stats[method] += 1
-    if not data:
-        return -1.0
-    runs = data.get("L100Runs", 0)
-    wins = data.get("L100Wins", 0)
-    if runs < 10:
-        return -1.0
-    return (wins / runs) * 100.0
+    return strike_rate_resolver(sr_lookup).win_pct(name)
 
 
 def build_strike_rate_history_lookup(rows):
@@ -373,6 +346,10 @@ def build_strike_rate_history_lookup(rows):
     (snapshot_date, data) tuples sorted ascending by date, so callers can pick
     the snapshot that actually existed as of a given race date instead of
     always using the latest one.
+
+    Alongside each entry list, _lookup_meta["dates"][kind][key] holds the same
+    snapshot dates as a plain sorted list, so get_sr_win_pct_asof can bisect
+    it instead of scanning every snapshot.
     """
     grouped = defaultdict(list)
     surname_keys = defaultdict(set)
@@ -400,17 +377,36 @@ def build_strike_rate_history_lookup(rows):
         surname_keys[keys["surname"]].add(keys["exact"])
 
     maps = {"exact": {}, "all_initials": {}, "first_initial": {}, "surname": {}}
+    dates = {kind: {} for kind in maps}
     for (kind, key), entries in grouped.items():
         maps[kind][key] = sorted(entries, key=lambda item: item[0])
+        dates[kind][key] = [snapshot_date for snapshot_date, _data in maps[kind][key]]
     for surname, exact_keys in surname_keys.items():
         if len(exact_keys) == 1:
-            maps["surname"][surname] = maps["exact"][next(iter(exact_keys))]
+            exact_key = next(iter(exact_keys))
+            maps["surname"][surname] = maps["exact"][exact_key]
+            dates["surname"][surname] = dates["exact"][exact_key]
     maps["_surname_prefix_index"] = _surname_prefix_index(maps["exact"])
 
-    legacy = {"_lookup_meta": {"maps": maps}, "_match_stats": defaultdict(int), "_fuzzy_audit": []}
+    legacy = {
+        "_lookup_meta": {"maps": maps, "dates": dates},
+        "_match_stats": defaultdict(int),
+        "_fuzzy_audit": [],
+    }
     return legacy
 
 
+def _snapshot_asof(meta, kind, key, entries, as_of_date):
+    """The latest (snapshot_date, data) entry dated on or before as_of_date, or None."""
+    kind_dates = meta.setdefault("dates", {}).setdefault(kind, {})
+    dates = kind_dates.get(key)
+    if dates is None:
+        # History built without the date arrays (e.g. by hand in a test).
+        dates = kind_dates[key] = [snapshot_date for snapshot_date, _data in entries]
+    index = bisect_right(dates, as_of_date)
+    return entries[index - 1] if index else None
+
+
 def get_sr_win_pct_asof(name, history_lookup, as_of_date):
     """
     Point-in-time counterpart to get_sr_win_pct: strike rate as it stood on (or
@@ -421,54 +417,254 @@ def get_sr_win_pct_asof(name, history_lookup, as_of_date):
     after the race would reintroduce the exact look-ahead leak this exists to
     remove.
     """
-    as_of_date = _coerce_date(as_of_date)
-    if not name or not history_lookup or not as_of_date:
+    return strike_rate_resolver(history_lookup).win_pct_asof(name, as_of_date)
+
+
+def _pct(data):
+    runs = data.get("L100Runs", 0)
+    wins = data.get("L100Wins", 0)
+    if runs < 10:
         return -1.0
-    meta = history_lookup.get("_lookup_meta", {}) if isinstance(history_lookup, dict) else {}
-    maps = meta.get("maps") or {}
-    keys = name_key_parts(name)
-    stats = history_lookup.get("_match_stats") if isinstance(history_lookup, dict) else None
-
-    for kind in ("exact", "all_initials", "first_initial", "surname"):
-        entries = maps.get(kind, {}).get(keys[kind])
-        if not entries:
-            continue
-        eligible = [data for snapshot_date, data in entries if snapshot_date <= as_of_date]
-        if not eligible:
-            continue
-        data = eligible[-1]
+    return (wins / runs) * 100.0
+
+
+# ── Name resolver ───────────────────────────────────────────────────────────
+# Training rows and live scoring calls repeat the same few hundred jockey and
+# trainer names tens of thousands of times. StrikeRateResolver normalises
+# each distinct raw name once (kept in an LRU of STRIKE_RATE_RESOLVER_CACHE_SIZE
+# names) and runs the fuzzy tier once per distinct exact key. Fuzzy matches
+# can be seeded from, and written back to, the strike_rate_aliases table
+# (load_strike_rate_aliases / save_strike_rate_aliases), so a later run skips
+# the Jaro-Winkler scan for names it has already matched. Each alias records a
+# fingerprint of the surname bucket it was scored against and is only used
+# while that bucket is unchanged, so a name added to or dropped from the
+# roster makes the query re-scored rather than stuck on an old best match.
+#
+# Every call still counts into the lookup's _match_stats and _fuzzy_audit
+# exactly as before, so log_match_stats reports the same per-row numbers.
+STRIKE_RATE_RESOLVER_CACHE_SIZE = int(os.environ.get("STRIKE_RATE_RESOLVER_CACHE_SIZE", "4096"))
+
+_TIER_METHODS = (
+    ("exact", "exact"),
+    ("all_initials", "initials"),
+    ("first_initial", "initials"),
+    ("surname", "surname_unique"),
+)
+
+
+class StrikeRateResolver:
+    """Resolves raw names against one lookup from build_strike_rate_lookup or
+    build_strike_rate_history_lookup; get one with strike_rate_resolver(lookup)
+    so every caller holding that lookup shares it.
+
+    ``discovered`` collects the fuzzy matches it scored itself (not seeded
+    from aliases) as (matched key, similarity, bucket fingerprint); callers
+    clear it once they have saved them."""
+
+    def __init__(self, sr_lookup, aliases=None, maxsize=None):
+        self.sr_lookup = sr_lookup if isinstance(sr_lookup, dict) else {}
+        self.meta = self.sr_lookup.get("_lookup_meta") or {}
+        self.maps = self.meta.get("maps") or {}
+        self.maxsize = max(1, maxsize or STRIKE_RATE_RESOLVER_CACHE_SIZE)
+        self.aliases = {}
+        self.discovered = {}
+        self.hits = 0
+        self.misses = 0
+        self._names = OrderedDict()
+        self._fuzzy = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        if aliases:
+            self.add_aliases(aliases)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_aliases(self, aliases):
+        """Seed fuzzy matches: {query exact key: (matched exact key, similarity,
+        bucket fingerprint)}. Aliases scored against a different candidate
+        bucket, or without a fingerprint, are ignored and re-scored."""
+        exact_map = self.maps.get("exact", {})
+        for query_key, (matched_key, score, *rest) in aliases.items():
+            bucket = rest[0] if rest else None
+            if matched_key in exact_map and bucket and bucket == self._bucket_fingerprint(query_key):
+                with self._lock:
+                    self.aliases[query_key] = (matched_key, float(score or 0.0))
+
+    def _bucket_fingerprint(self, exact_key):
+        """md5 of the candidate keys the fuzzy tier compares ``exact_key`` against."""
+        surname, _ = _split_surname_initials(exact_key or "")
+        if not surname:
+            return None
+        prefix = surname[:1]
+        digest = self._buckets.get(prefix)
+        if digest is None:
+            bucket = self.maps.get("_surname_prefix_index", {}).get(prefix, [])
+            digest = hashlib.md5("\n".join(sorted(bucket)).encode()).hexdigest()
+            self._buckets[prefix] = digest
+        return digest
+
+    def _resolve(self, name):
+        """(exact key, [(kind, key, method)] tiers present in the maps, fuzzy allowed)."""
+        with self._lock:
+            entry = self._names.get(name)
+            if entry is not None:
+                self._names.move_to_end(name)
+                self.hits += 1
+                return entry
+        keys = name_key_parts(name)
+        tiers = tuple(
+            (kind, keys[kind], method) for kind, method in _TIER_METHODS
+            if self.maps.get(kind, {}).get(keys[kind])
+        )
+        entry = (keys["exact"], tiers, bool(keys["exact"]) and not _is_partnership_name(name))
+        with self._lock:
+            self.misses += 1
+            self._names[name] = entry
+            if len(self._names) > self.maxsize:
+                self._names.popitem(last=False)
+        return entry
+
+    def _fuzzy_match(self, exact_key):
+        """(matched exact key, similarity) or (None, 0.0), computed once per key."""
+        match = self._fuzzy.get(exact_key)
+        if match is None:
+            match = self.aliases.get(exact_key)
+            if match is None:
+                match = _fuzzy_match_exact_key(
+                    exact_key, self.maps.get("exact", {}), self.maps.get("_surname_prefix_index", {}),
+                )
+                if match[0]:
+                    self.discovered[exact_key] = match + (self._bucket_fingerprint(exact_key),)
+            self._fuzzy[exact_key] = match
+        return match
+
+    def _record(self, method, name=None, data=None, score=None):
+        stats = self.sr_lookup.get("_match_stats")
         if stats is not None:
-            stats["initials" if kind in {"all_initials", "first_initial"} else "surname_unique" if kind == "surname" else "exact"] += 1
-        runs = data.get("L100Runs", 0)
-        wins = data.get("L100Wins", 0)
-        if runs < 10:
+            stats[method] += 1
+        if method == "fuzzy":
+            self._audit(name, data, score)
+
+    def _audit(self, name, data, score):
+        audit = self.sr_lookup.get("_fuzzy_audit")
+        if audit is not None:
+            audit.append({"query": name, "matched_name": data.get("name"), "similarity": round(score, 4)})
+
+    def lookup(self, name):
+        """(data, method) for the current-snapshot lookup; see lookup_strike_rate."""
+        if not name or not self.sr_lookup:
+            return None, "unmatched"
+        exact_key, tiers, fuzzy_ok = self._resolve(name)
+        if self.maps:
+            for kind, key, method in tiers:
+                return self.maps[kind][key], method
+            exact_map = self.maps.get("exact", {})
+            if fuzzy_ok and exact_map:
+                matched_key, score = self._fuzzy_match(exact_key)
+                if matched_key:
+                    data = exact_map[matched_key]
+                    self._audit(name, data, score)
+                    return data, "fuzzy"
+        data = self.sr_lookup.get(exact_key) if exact_key else None
+        return (data, "exact") if data else (None, "unmatched")
+
+    def win_pct(self, name):
+        """get_sr_win_pct through this resolver."""
+        data, method = self.lookup(name)
+        stats = self.sr_lookup.get("_match_stats")
+        if stats is not None:
+            stats[method] += 1
+        return _pct(data) if data else -1.0
+
+    def win_pct_asof(self, name, as_of_date):
+        """get_sr_win_pct_asof through this resolver."""
+        as_of_date = _coerce_date(as_of_date)
+        if not name or not self.sr_lookup or not as_of_date:
             return -1.0
-        return (wins / runs) * 100.0
-
-    exact_map = maps.get("exact", {})
-    surname_index = maps.get("_surname_prefix_index", {})
-    if keys["exact"] and exact_map and not _is_partnership_name(name):
-        matched_key, score = _fuzzy_match_exact_key(keys["exact"], exact_map, surname_index)
-        if matched_key:
-            eligible = [data for snapshot_date, data in exact_map[matched_key] if snapshot_date <= as_of_date]
-            if eligible:
-                data = eligible[-1]
-                if stats is not None:
-                    stats["fuzzy"] += 1
-                audit = history_lookup.get("_fuzzy_audit") if isinstance(history_lookup, dict) else None
-                if audit is not None:
-                    audit.append({
-                        "query": name, "matched_name": data.get("name"), "similarity": round(score, 4),
-                    })
-                runs = data.get("L100Runs", 0)
-                wins = data.get("L100Wins", 0)
-                if runs < 10:
-                    return -1.0
-                return (wins / runs) * 100.0
-
-    if stats is not None:
-        stats["unmatched"] += 1
-    return -1.0
+        exact_key, tiers, fuzzy_ok = self._resolve(name)
+        for kind, key, method in tiers:
+            snapshot = _snapshot_asof(self.meta, kind, key, self.maps[kind][key], as_of_date)
+            if snapshot is not None:
+                self._record(method)
+                return _pct(snapshot[1])
+
+        exact_map = self.maps.get("exact", {})
+        if fuzzy_ok and exact_map:
+            matched_key, score = self._fuzzy_match(exact_key)
+            if matched_key:
+                snapshot = _snapshot_asof(self.meta, "exact", matched_key, exact_map[matched_key], as_of_date)
+                if snapshot is not None:
+                    self._record("fuzzy", name, snapshot[1], score)
+                    return _pct(snapshot[1])
+
+        self._record("unmatched")
+        return -1.0
+
+    def cache_info(self):
+        return {
+            "names": len(self._names), "hits": self.hits, "misses": self.misses,
+            "fuzzy_keys": len(self._fuzzy), "aliases": len(self.aliases), "discovered": len(self.discovered),
+        }
+
+
+def strike_rate_resolver(sr_lookup):
+    """The resolver shared by everyone holding ``sr_lookup`` (created on first
+    use). Plain dicts without _lookup_meta get a throwaway resolver."""
+    if isinstance(sr_lookup, dict) and isinstance(sr_lookup.get("_lookup_meta"), dict):
+        meta = sr_lookup["_lookup_meta"]
+        resolver = meta.get("resolver")
+        if resolver is None:
+            resolver = meta["resolver"] = StrikeRateResolver(sr_lookup)
+        return resolver
+    return StrikeRateResolver(sr_lookup)
+
+
+def load_strike_rate_aliases(conn, entity_type):
+    """{query exact key: (matched exact key, similarity, bucket fingerprint)}
+    stored for 'jockey' or 'trainer'. ``conn`` is a Connection or Session."""
+    rows = conn.execute(
+        text(
+            "SELECT query_key, matched_key, similarity, bucket_fingerprint FROM strike_rate_aliases "
+            "WHERE entity_type = :entity_type"
+        ),
+        {"entity_type": entity_type},
+    ).fetchall()
+    return {
+        query_key: (matched_key, float(similarity or 0.0), bucket)
+        for query_key, matched_key, similarity, bucket in rows
+    }
+
+
+def save_strike_rate_aliases(conn, entity_type, aliases):
+    """Upsert fuzzy matches found by a resolver (its ``discovered`` dict); returns
+    how many rows were written. Runs in the caller's transaction."""
+    if not aliases:
+        return 0
+    now = datetime.utcnow()
+    conn.execute(
+        text(
+            "INSERT INTO strike_rate_aliases "
+            "(entity_type, query_key, matched_key, similarity, bucket_fingerprint, updated_at) "
+            "VALUES (:entity_type, :query_key, :matched_key, :similarity, :bucket_fingerprint, :updated_at) "
+            "ON CONFLICT (entity_type, query_key) DO UPDATE SET "
+            "matched_key = excluded.matched_key, similarity = excluded.similarity, "
+            "bucket_fingerprint = excluded.bucket_fingerprint, updated_at = excluded.updated_at"
+        ),
+        [
+            {"entity_type": entity_type, "query_key": query_key, "matched_key": matched_key,
+             "similarity": round(float(score), 4), "bucket_fingerprint": rest[0] if rest else None,
+             "updated_at": now}
+            for query_key, (matched_key, score, *rest) in sorted(aliases.items())
+        ],
+    )
+    return len(aliases)
 
 
 MATCH_TIERS = ("exact", "initials", "surname_unique", "fuzzy", "unmatched")
@@ -1,7 +1,12 @@
 import logging
+import random
+from datetime import date, timedelta
 
+import strike_rate_matching
 from strike_rate_matching import (
-    build_strike_rate_lookup, get_sr_win_pct, lookup_strike_rate, log_match_stats, normalize_name,
+    _coerce_date, _fuzzy_match_exact_key, _is_partnership_name, build_strike_rate_history_lookup,
+    build_strike_rate_lookup, get_sr_win_pct, get_sr_win_pct_asof, lookup_strike_rate, log_match_stats,
+    name_key_parts, normalize_name,
 )
 
 
@@ -169,14 +174,192 @@ def test_puntingform_entity_type_mapping_labels():
             captured.append(request.url)
             return FakeResponse()
 
-    import puntingform_service
-    original = puntingform_service.requests.Session
-    try:
-        puntingform_service.requests.Session = lambda: FakeSession()
-        service._fetch_v2_strike_rate_rows("jockey", jurisdiction=2)
-        service._fetch_v2_strike_rate_rows("trainer", jurisdiction=2)
-    finally:
-        puntingform_service.requests.Session = original
+    service.session = FakeSession()
+    service._fetch_v2_strike_rate_rows("jockey", jurisdiction=2)
+    service._fetch_v2_strike_rate_rows("trainer", jurisdiction=2)
 
     assert "entityType=1" in captured[0]
     assert "entityType=2" in captured[1]
+
+
+def _linear_scan_sr_win_pct_asof(name, history_lookup, as_of_date):
+    """get_sr_win_pct_asof as it was before the bisect lookup, kept as the parity oracle."""
+    as_of_date = _coerce_date(as_of_date)
+    if not name or not history_lookup or not as_of_date:
+        return -1.0, None
+    maps = history_lookup["_lookup_meta"]["maps"]
+    keys = name_key_parts(name)
+
+    def pct(data):
+        runs, wins = data.get("L100Runs", 0), data.get("L100Wins", 0)
+        return -1.0 if runs < 10 else (wins / runs) * 100.0
+
+    for kind in ("exact", "all_initials", "first_initial", "surname"):
+        entries = maps.get(kind, {}).get(keys[kind])
+        if not entries:
+            continue
+        eligible = [data for snapshot_date, data in entries if snapshot_date <= as_of_date]
+        if eligible:
+            return pct(eligible[-1]), kind
+    exact_map = maps.get("exact", {})
+    if keys["exact"] and exact_map and not _is_partnership_name(name):
+        matched_key, _score = _fuzzy_match_exact_key(keys["exact"], exact_map, maps["_surname_prefix_index"])
+        if matched_key:
+            eligible = [data for snapshot_date, data in exact_map[matched_key] if snapshot_date <= as_of_date]
+            if eligible:
+                return pct(eligible[-1]), "fuzzy"
+    return -1.0, "unmatched"
+
+
+def _history_rows(seed=7):
+    rng = random.Random(seed)
+    names = ["Damien Oliver", "Craig Williams", "James McDonald", "Jamie Kah", "Blake Shinn",
+             "Tommy Berry", "Nash Rawiller", "Kerrin McEvoy", "Ben Melham", "Mark Zahra"]
+    start = date(2025, 1, 1)
+    rows = []
+    for name in names:
+        for _ in range(rng.randint(1, 25)):
+            rows.append((name, rng.randint(0, 30), rng.randint(0, 100), start + timedelta(days=rng.randint(0, 400))))
+    # Same-day duplicates: the later row in input order wins, as before.
+    rows.append(("Jamie Kah", 20, 100, start + timedelta(days=50)))
+    rows.append(("Jamie Kah", 40, 100, start + timedelta(days=50)))
+    rng.shuffle(rows)
+    return rows
+
+
+def test_history_asof_matches_linear_scan_for_every_tier_and_date():
+    rows = _history_rows()
+    history = build_strike_rate_history_lookup(rows)
+    queries = ["Damien Oliver", "D Oliver", "J McDonald", "Shinn", "Damien J Olliver", "K. McEvoy (a2)",
+               "Jamie Kah", "Nobody Known", "Oliver & Williams", "", None]
+    as_of_dates = [date(2024, 12, 31), date(2025, 1, 1), date(2025, 2, 20), "2025-06-30",
+                   date(2026, 3, 1), None]
+
+    for query in queries:
+        for as_of in as_of_dates:
+            expected, kind = _linear_scan_sr_win_pct_asof(query, history, as_of)
+            assert get_sr_win_pct_asof(query, history, as_of) == expected, (query, as_of, kind)
+
+    stats = history["_match_stats"]
+    assert stats["exact"] and stats["initials"] and stats["surname_unique"] and stats["fuzzy"]
+
+
+def test_history_asof_bisects_date_arrays_and_memoises_fuzzy_matches(monkeypatch):
+    history = build_strike_rate_history_lookup([
+        ("Damien Oliver", 10, 100, date(2025, 1, 1)),
+        ("Damien Oliver", 20, 100, date(2025, 3, 1)),
+        ("Craig Williams", 15, 100, date(2025, 2, 1)),
+    ])
+    meta = history["_lookup_meta"]
+    assert meta["dates"]["exact"]["damien oliver"] == [date(2025, 1, 1), date(2025, 3, 1)]
+
+    fuzzy_calls = []
+    real_fuzzy = strike_rate_matching._fuzzy_match_exact_key
+
+    def counting_fuzzy(*args):
+        fuzzy_calls.append(args[0])
+        return real_fuzzy(*args)
+
+    monkeypatch.setattr(strike_rate_matching, "_fuzzy_match_exact_key", counting_fuzzy)
+    values = [get_sr_win_pct_asof("Damien J Olliver", history, day)
+              for day in (date(2025, 2, 1), date(2025, 3, 1), date(2024, 1, 1))]
+
+    assert values == [10.0, 20.0, -1.0]
+    assert fuzzy_calls == ["damien j olliver"]
+    assert len(history["_fuzzy_audit"]) == 2
+
+
+def test_resolver_is_shared_per_lookup_and_matches_per_call_results(monkeypatch):
+    rows = [("Damien Oliver", 20, 100), ("Craig Williams", 15, 100), ("James McDonald", 25, 100),
+            ("Blake Shinn", 8, 50), ("A & S Freedman", 10, 100)]
+    queries = ["Damien Oliver", "D Oliver", "J McDonald", "Shinn", "Damien J Olliver", "K. McEvoy (a2)",
+               "A & S Freedmann", "", None] * 3
+    expected = [get_sr_win_pct(query, build_strike_rate_lookup(rows)) for query in queries]
+
+    lookup = build_strike_rate_lookup(rows)
+    resolver = strike_rate_matching.strike_rate_resolver(lookup)
+    assert strike_rate_matching.strike_rate_resolver(lookup) is resolver
+
+    fuzzy_calls = []
+    real_fuzzy = strike_rate_matching._fuzzy_match_exact_key
+
+    def counting_fuzzy(*args):
+        fuzzy_calls.append(args[0])
+        return real_fuzzy(*args)
+
+    monkeypatch.setattr(strike_rate_matching, "_fuzzy_match_exact_key", counting_fuzzy)
+    assert [get_sr_win_pct(query, lookup) for query in queries] == expected
+
+    assert sorted(fuzzy_calls) == ["damien j olliver", "k mcevoy"]
+    assert list(resolver.discovered) == ["damien j olliver"]
+    assert resolver.discovered["damien j olliver"][0] == "damien oliver"
+    info = resolver.cache_info()
+    assert (info["names"], info["misses"], info["hits"]) == (7, 7, 14)
+    stats = lookup["_match_stats"]
+    assert (stats["exact"], stats["initials"], stats["surname_unique"], stats["fuzzy"], stats["unmatched"]) == (3, 6, 3, 3, 12)
+    assert len(lookup["_fuzzy_audit"]) == 3
+
+
+def test_resolver_lru_evicts_least_recent_name():
+    resolver = strike_rate_matching.StrikeRateResolver(
+        build_strike_rate_lookup([("Damien Oliver", 20, 100)]), maxsize=2,
+    )
+    for name in ("Damien Oliver", "D Oliver", "Damien Oliver", "Oliver"):
+        resolver.lookup(name)
+    assert list(resolver._names) == ["Damien Oliver", "Oliver"]
+    assert (resolver.hits, resolver.misses) == (1, 3)
+
+
+def test_name_aliases_round_trip_and_skip_fuzzy_scoring(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+
+    from models import StrikeRateAlias
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'aliases.db'}")
+    StrikeRateAlias.__table__.create(engine)
+    rows = [("Damien Oliver", 20, 100), ("Craig Williams", 15, 100)]
+
+    first = strike_rate_matching.strike_rate_resolver(build_strike_rate_lookup(rows))
+    assert first.win_pct("Damien J Olliver") == 20.0
+    with engine.begin() as conn:
+        assert strike_rate_matching.save_strike_rate_aliases(conn, "jockey", first.discovered) == 1
+        strike_rate_matching.save_strike_rate_aliases(conn, "jockey", first.discovered)
+        strike_rate_matching.save_strike_rate_aliases(conn, "trainer", {"c waller": ("chris waller", 1.0)})
+        aliases = strike_rate_matching.load_strike_rate_aliases(conn, "jockey")
+    assert list(aliases) == ["damien j olliver"]
+    assert aliases["damien j olliver"][0] == "damien oliver"
+
+    monkeypatch.setattr(strike_rate_matching, "_fuzzy_match_exact_key",
+                        lambda *args: (_ for _ in ()).throw(AssertionError("fuzzy tier re-scored")))
+    lookup = build_strike_rate_lookup(rows)
+    second = strike_rate_matching.strike_rate_resolver(lookup)
+    # An alias whose matched entity is no longer in the lookup is dropped.
+    second.add_aliases(dict(aliases, **{"x nobody": ("someone gone", 0.99)}))
+    assert second.win_pct("Damien J Olliver") == 20.0
+    assert set(second.aliases) == {"damien j olliver"}
+    assert second.discovered == {}
+    assert lookup["_match_stats"]["fuzzy"] == 1
+
+
+def test_name_alias_is_rescored_when_its_surname_bucket_changes():
+    rows = [("Damien Oliver", 20, 100), ("Craig Williams", 15, 100)]
+    first = strike_rate_matching.strike_rate_resolver(build_strike_rate_lookup(rows))
+    first.win_pct("Damien J Olliver")
+    aliases = dict(first.discovered)
+    matched_key, _score, bucket = aliases["damien j olliver"]
+    assert matched_key == "damien oliver" and bucket
+
+    unchanged = strike_rate_matching.StrikeRateResolver(build_strike_rate_lookup(rows))
+    unchanged.add_aliases(aliases)
+    assert set(unchanged.aliases) == {"damien j olliver"}
+
+    # A closer name joins the "o" bucket: the stored match must not be reused.
+    grown = strike_rate_matching.StrikeRateResolver(
+        build_strike_rate_lookup(rows + [("Damien Olliverr", 5, 100)]),
+    )
+    grown.add_aliases(aliases)
+    legacy = {"damien j olliver": ("damien oliver", 0.97)}
+    grown.add_aliases(legacy)
+    assert grown.aliases == {}
+    assert grown.win_pct("Damien J Olliver") == 5.0
+    assert grown.discovered["damien j olliver"][0] == "damien olliverr"
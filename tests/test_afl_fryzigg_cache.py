@@ -0,0 +1,133 @@
+"""
+tests/test_afl_fryzigg_cache.py
+===============================
+Offline checks for the persistent Fryzigg RDS cache in afl_data.py:
+conditional revalidation, hash-keyed Feather copy, stale fallback.
+"""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyreadr")
+pytest.importorskip("pyarrow")
+
+import afl_data
+
+
+class _FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size=1):
+        yield self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise afl_data.requests.HTTPError(f"status {self.status_code}")
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fryzigg_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("ALLOW_FRYZIGG_RDS", "1")
+    monkeypatch.setattr(afl_data, "FRYZIGG_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(afl_data, "FRYZIGG_CACHE_RDS_PATH", tmp_path / "fryziggafl.rds")
+    monkeypatch.setattr(afl_data, "FRYZIGG_CACHE_META_PATH", tmp_path / "fryziggafl.meta.json")
+    monkeypatch.setattr(afl_data, "_FRYZIGG_CACHE", {"df": None, "loaded": False})
+
+    parses = []
+
+    def fake_read_r(path):
+        parses.append(path)
+        return {None: pd.DataFrame({"Match_Date": ["2024-03-14"], " Player_ID ": [11]})}
+
+    monkeypatch.setattr(afl_data.pyreadr, "read_r", fake_read_r)
+    return tmp_path, parses
+
+
+def _reset_process_cache(monkeypatch):
+    monkeypatch.setattr(afl_data, "_FRYZIGG_CACHE", {"df": None, "loaded": False})
+
+
+def test_first_download_parses_and_writes_columnar_copy(fryzigg_env, monkeypatch):
+    cache_dir, parses = fryzigg_env
+    calls = []
+
+    def fake_get(url, headers=None, **kwargs):
+        calls.append(headers)
+        return _FakeResponse(200, b"rds-v1", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    monkeypatch.setattr(afl_data.requests, "get", fake_get)
+    df = afl_data._download_fryzigg_rds()
+
+    assert list(df.columns) == ["match_date", "player_id"]
+    assert len(parses) == 1
+    assert "If-None-Match" not in calls[0]
+    meta = afl_data._fryzigg_read_cache_meta()
+    assert meta["etag"] == '"v1"'
+    assert afl_data._fryzigg_columnar_path(meta["sha256"]).exists()
+
+
+def test_not_modified_memory_maps_columnar_copy_without_reparsing(fryzigg_env, monkeypatch):
+    cache_dir, parses = fryzigg_env
+    monkeypatch.setattr(
+        afl_data.requests, "get",
+        lambda url, headers=None, **kw: _FakeResponse(200, b"rds-v1", {"ETag": '"v1"'}),
+    )
+    afl_data._download_fryzigg_rds()
+    _reset_process_cache(monkeypatch)
+
+    sent = []
+
+    def fake_get(url, headers=None, **kwargs):
+        sent.append(headers)
+        return _FakeResponse(304)
+
+    monkeypatch.setattr(afl_data.requests, "get", fake_get)
+    df = afl_data._download_fryzigg_rds()
+
+    assert sent[0]["If-None-Match"] == '"v1"'
+    assert len(parses) == 1
+    assert df["player_id"].tolist() == [11]
+
+
+def test_changed_file_reparses_and_prunes_old_columnar_copy(fryzigg_env, monkeypatch):
+    cache_dir, parses = fryzigg_env
+    monkeypatch.setattr(afl_data.requests, "get", lambda url, **kw: _FakeResponse(200, b"rds-v1"))
+    afl_data._download_fryzigg_rds()
+    _reset_process_cache(monkeypatch)
+
+    monkeypatch.setattr(afl_data.requests, "get", lambda url, **kw: _FakeResponse(200, b"rds-v2"))
+    afl_data._download_fryzigg_rds()
+
+    assert len(parses) == 2
+    assert len(list(cache_dir.glob("fryzigg_*.feather"))) == 1
+
+
+def test_network_failure_falls_back_to_cached_copy(fryzigg_env, monkeypatch):
+    cache_dir, parses = fryzigg_env
+    monkeypatch.setattr(afl_data.requests, "get", lambda url, **kw: _FakeResponse(200, b"rds-v1"))
+    afl_data._download_fryzigg_rds()
+    _reset_process_cache(monkeypatch)
+
+    def offline(url, **kwargs):
+        raise afl_data.requests.ConnectionError("offline")
+
+    monkeypatch.setattr(afl_data.requests, "get", offline)
+    df = afl_data._download_fryzigg_rds()
+
+    assert len(df) == 1
+    assert len(parses) == 1
+
+
+def test_network_failure_without_cache_raises(fryzigg_env, monkeypatch):
+    def offline(url, **kwargs):
+        raise afl_data.requests.ConnectionError("offline")
+
+    monkeypatch.setattr(afl_data.requests, "get", offline)
+    with pytest.raises(afl_data.requests.RequestException):
+        afl_data._download_fryzigg_rds()
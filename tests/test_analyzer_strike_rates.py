@@ -0,0 +1,54 @@
+import pytest
+from flask import Flask
+
+import app as appmod
+from models import db
+
+STRIKE_RATES = {
+    'jockeys': {'damien oliver': {'L100Wins': 20, 'L100Runs': 100},
+                'craig williams': {'L100Wins': 15, 'L100Runs': 100}},
+    'trainers': {'chris waller': {'L100Wins': 30, 'L100Runs': 100}},
+}
+ROWS = [
+    {'horse jockey': 'Damien J Olliver', 'horse trainer': 'C Waller'},
+    {'horse jockey': 'Craig Williams', 'horse trainer': 'Chris Waller'},
+]
+
+
+@pytest.fixture()
+def analyzer_app(tmp_path, monkeypatch):
+    analyzer_app = Flask(__name__)
+    analyzer_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'analyzer.db'}"
+    db.init_app(analyzer_app)
+    monkeypatch.setattr(appmod, '_analyzer_strike_rate_lookups', {})
+    with analyzer_app.app_context():
+        db.create_all()
+        yield analyzer_app
+        db.session.remove()
+
+
+def test_analyzer_strike_rates_are_passed_through_unchanged_by_default(analyzer_app, monkeypatch):
+    monkeypatch.setattr(appmod, 'ANALYZER_RESOLVE_STRIKE_RATE_NAMES', False)
+    monkeypatch.setattr(appmod, 'build_strike_rate_lookup',
+                        lambda rows: (_ for _ in ()).throw(AssertionError("lookup built")))
+
+    assert appmod.analyzer_strike_rate_data(ROWS, STRIKE_RATES) is STRIKE_RATES
+
+
+def test_resolved_names_reuse_one_lookup_per_strike_rate_snapshot(analyzer_app, monkeypatch):
+    monkeypatch.setattr(appmod, 'ANALYZER_RESOLVE_STRIKE_RATE_NAMES', True)
+    built = []
+    real_build = appmod.build_strike_rate_lookup
+    monkeypatch.setattr(appmod, 'build_strike_rate_lookup', lambda rows: built.append(rows) or real_build(rows))
+
+    first = appmod.analyzer_strike_rate_data(ROWS, STRIKE_RATES)
+    again = appmod.analyzer_strike_rate_data(ROWS, STRIKE_RATES)
+
+    assert first == again
+    assert first['jockeys']['Damien J Olliver'] == {'L100Wins': 20, 'L100Runs': 100}
+    assert first['trainers']['C Waller'] == {'L100Wins': 30, 'L100Runs': 100}
+    assert len(built) == 2
+
+    changed = dict(STRIKE_RATES, trainers={'chris waller': {'L100Wins': 31, 'L100Runs': 101}})
+    appmod.analyzer_strike_rate_data(ROWS, changed)
+    assert len(built) == 3
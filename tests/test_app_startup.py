@@ -0,0 +1,77 @@
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_migration(name):
+    path = ROOT / "migrations" / "versions" / name
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_importing_app_does_not_touch_the_database(tmp_path):
+    db_path = tmp_path / "startup.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    env.pop("PUNTINGFORM_API_KEY", None)
+    env.pop("RUN_RELEASE_TASKS_ON_STARTUP", None)
+
+    proc = subprocess.run(
+        [sys.executable, "-c", "import app"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert not db_path.exists()
+
+
+def test_lazy_client_builds_on_first_attribute_access_only():
+    import app as appmod
+
+    built = []
+
+    class _Service:
+        api_key = "k"
+
+    def factory():
+        built.append(1)
+        return _Service()
+
+    lazy = appmod.LazyClient(factory)
+    assert built == []
+    assert lazy.api_key == "k"
+    assert lazy.api_key == "k"
+    assert built == [1]
+
+
+def test_startup_columns_migration_only_adds_missing_columns(tmp_path):
+    pytest.importorskip("alembic")
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+
+    migration = _load_migration("0003_startup_schema_columns.py")
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(sa.text("CREATE TABLE meetings (id INTEGER PRIMARY KEY, puntingform_id VARCHAR(255))"))
+        conn.execute(sa.text("CREATE TABLE predictions (id INTEGER PRIMARY KEY)"))
+
+    for _ in range(2):
+        with engine.begin() as conn:
+            with Operations.context(MigrationContext.configure(conn)):
+                migration.upgrade()
+
+    inspector = sa.inspect(engine)
+    meetings = {c["name"] for c in inspector.get_columns("meetings")}
+    predictions = {c["name"]: c for c in inspector.get_columns("predictions")}
+    assert {"puntingform_id", "auto_imported", "rail_position", "pace_bias"} <= meetings
+    assert {"kelly_stake_pct", "ml_score", "ladbrokes_signal_mask", "value_edge_pct"} <= set(predictions)
+    assert predictions["ladbrokes_signal_mask"]["nullable"] is False
+    assert "users" not in inspector.get_table_names()
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("threadpoolctl")
+
+import backtest
+
+
+def _split(n=480, seed=4):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 3)), columns=["a", "b", "c"])
+    y = pd.Series((X["a"] + rng.normal(scale=0.8, size=n) > 0.9).astype(int))
+    sp = rng.uniform(1.5, 12.0, size=n)
+    race_ids = [i // 8 for i in range(n)]
+    cut = int(n * 0.8)
+    train = (X.iloc[:cut], y.iloc[:cut])
+    validation = (X.iloc[cut:], y.iloc[cut:], race_ids[cut:], sp[cut:])
+    return X, y, sp, race_ids, train, validation
+
+
+def _candidates():
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.tree import DecisionTreeClassifier
+
+    return {
+        "random_forest": RandomForestClassifier(n_estimators=20, max_depth=4, random_state=0, n_jobs=-1),
+        "tree": DecisionTreeClassifier(max_depth=3, random_state=0),
+        "broken": LogisticRegression(C=-1.0),
+    }
+
+
+def test_thread_budget_replaces_all_core_settings_only():
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.ensemble import RandomForestClassifier
+
+    model = CalibratedClassifierCV(RandomForestClassifier(n_jobs=-1), method="isotonic")
+
+    backtest._apply_thread_budget(model, 2)
+
+    params = model.get_params(deep=True)
+    assert params["estimator__n_jobs"] == 2
+    assert params["n_jobs"] is None
+
+
+def test_thread_budgets_split_cpus_and_honour_overrides():
+    budgets = backtest._candidate_thread_budgets(
+        ["catboost", "xgboost", "mlp"], workers=2, cpu_count=8,
+        overrides=backtest._candidate_thread_overrides("catboost=6, mlp=1,bogus"),
+    )
+
+    assert budgets == {"catboost": 6, "xgboost": 4, "mlp": 1}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_train_candidates_collects_results_in_candidate_order(workers, tmp_path, monkeypatch):
+    monkeypatch.setenv("ML_FOLD_CACHE_DIR", str(tmp_path))
+    X, y, sp, race_ids, train, validation = _split()
+    fold_cache = backtest.WalkForwardFoldCache(X, y, sp, race_ids, n_splits=3, embargo_rows=10)
+
+    jobs = backtest._train_candidates(
+        _candidates(), train, validation,
+        walk_forward_args=(X, y, sp, race_ids, fold_cache), workers=workers, cpu_count=2,
+    )
+    fold_cache.close()
+
+    assert list(jobs) == ["random_forest", "tree", "broken"]
+    assert jobs["broken"]["error"] and "model" not in jobs["broken"]
+    for mt in ("random_forest", "tree"):
+        job = jobs[mt]
+        assert job["error"] is None
+        assert job["metrics"]["number_of_bets"] == len(set(validation[2]))
+        assert list(job["selections"].index) == sorted(set(validation[2]))
+        assert job["walk_forward"]["n_splits"] == 3
+        assert job["profile"]["threads"] == (1 if workers == 2 else 2)
+        assert job["profile"]["wall_seconds"] >= job["profile"]["fit_seconds"] >= 0
+    assert jobs["random_forest"]["model"].get_params()["n_jobs"] == jobs["random_forest"]["profile"]["threads"]
+
+
+def test_process_pool_matches_in_process_results():
+    X, y, sp, race_ids, train, validation = _split(seed=9)
+    candidates = {k: v for k, v in _candidates().items() if k != "broken"}
+
+    serial = backtest._train_candidates(candidates, train, validation, workers=1, cpu_count=2)
+    pooled = backtest._train_candidates(
+        {k: v for k, v in _candidates().items() if k != "broken"}, train, validation, workers=2, cpu_count=2,
+    )
+
+    for mt in candidates:
+        assert pooled[mt]["metrics"]["roi"] == serial[mt]["metrics"]["roi"]
+        assert pooled[mt]["profile"]["pid"] != os.getpid()
+        assert serial[mt]["profile"]["pid"] == os.getpid()
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+import backtest
+
+
+def _dataset(n=400, seed=11):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=["a", "b", "c", "d"])
+    X.loc[rng.random(n) < 0.15, "b"] = np.nan
+    X.loc[: n // 3, "d"] = np.nan  # all-missing in the earliest fold's training prefix
+    y = pd.Series((X["a"].fillna(0) + rng.normal(scale=0.8, size=n) > 0.8).astype(int))
+    sp = rng.uniform(1.5, 15.0, size=n)
+    # Interleaved races so a race's rows are not contiguous.
+    race_ids = [int(i // 8) * 10 + (i % 2) for i in range(n)]
+    return X, y, sp, race_ids
+
+
+def test_fold_matrices_match_per_fold_pandas_imputation():
+    X, y, sp, race_ids = _dataset()
+    cache = backtest.WalkForwardFoldCache(X, y, sp, race_ids, n_splits=3, embargo_rows=10, memmap=False)
+
+    assert len(cache.folds) == 3
+    for fold, (train_idx, test_idx) in zip(cache.folds, backtest._safe_time_series_splits(len(X), 3, 10)):
+        median = X.iloc[train_idx].median()
+        expected_train = X.iloc[train_idx].fillna(median).to_numpy(dtype=np.float32)
+        expected_test = X.iloc[test_idx].fillna(median).to_numpy(dtype=np.float32)
+        np.testing.assert_array_equal(fold.X_train.to_numpy(), expected_train)
+        np.testing.assert_array_equal(fold.X_test.to_numpy(), expected_test)
+        assert fold.X_train.dtypes.eq(np.float32).all()
+        assert list(fold.y_test) == list(y.iloc[test_idx])
+        assert fold.race_ids_test == [race_ids[i] for i in test_idx]
+
+
+def test_memmapped_folds_are_read_only_and_removed_on_close(tmp_path, monkeypatch):
+    monkeypatch.setenv("ML_FOLD_CACHE_DIR", str(tmp_path))
+    X, y, sp, race_ids = _dataset()
+    cache = backtest.WalkForwardFoldCache(X, y, sp, race_ids, n_splits=3, embargo_rows=10, memmap=True)
+
+    block = cache.folds[0].X_train.to_numpy()
+    base = block
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+    assert not block.flags.writeable
+    assert len(list(tmp_path.glob("track_e_folds_*/*.npy"))) == 6
+
+    cache.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_segment_selection_matches_groupby_idxmax():
+    rng = np.random.default_rng(5)
+    race_ids = list(rng.integers(0, 40, size=300))
+    pred = np.round(rng.random(300), 1)  # plenty of within-race ties
+    frame = pd.DataFrame({"race_id": race_ids, "pred": pred})
+
+    expected = frame.groupby("race_id")["pred"].idxmax().to_numpy()
+    got = backtest._segment_argmax(pred, backtest._race_segments(race_ids))
+
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_walk_forward_with_shared_cache_matches_per_model_folds():
+    from sklearn.tree import DecisionTreeClassifier
+
+    X, y, sp, race_ids = _dataset()
+    model = DecisionTreeClassifier(max_depth=3, random_state=0)
+    cache = backtest.WalkForwardFoldCache(X, y, sp, race_ids, memmap=False)
+
+    shared = backtest._walk_forward_metrics_for_model(model, X, y, sp, race_ids, fold_cache=cache)
+    standalone = backtest._walk_forward_metrics_for_model(model, X, y, sp, race_ids)
+
+    assert shared["n_splits"] > 0
+    assert shared == standalone
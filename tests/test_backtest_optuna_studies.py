@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+optuna = pytest.importorskip("optuna")
+pytest.importorskip("xgboost")
+
+import backtest
+
+FEATURES = ["f0", "f1", "f2", "f3"]
+
+
+@pytest.fixture(scope="module")
+def tuning_data():
+    rng = np.random.default_rng(3)
+    X = pd.DataFrame(rng.normal(size=(320, len(FEATURES))), columns=FEATURES)
+    logits = 1.2 * X["f0"] - 0.8 * X["f2"] + rng.normal(scale=0.7, size=len(X))
+    y = pd.Series((logits > 0.9).astype(int))
+    return X, y
+
+
+def _finished(study):
+    states = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+    return study.get_trials(deepcopy=False, states=states)
+
+
+def _search(tuning_data, storage_url, n_trials, run_key, **kwargs):
+    X, y = tuning_data
+    return backtest._run_optuna_search(
+        "xgboost", X, y, FEATURES, n_trials=n_trials, timeout=120,
+        storage_url=storage_url, run_key=run_key, **kwargs,
+    )
+
+
+def test_study_resumes_and_only_tops_up_to_the_trial_budget(tuning_data, tmp_path):
+    storage_url = f"sqlite:///{tmp_path / 'studies.db'}"
+
+    first = _search(tuning_data, storage_url, 3, "2026-10-18")
+    first_numbers = [t.number for t in _finished(first)]
+    resumed = _search(tuning_data, storage_url, 5, "2026-10-18")
+
+    assert len(first_numbers) == 3
+    assert [t.number for t in _finished(resumed)][:3] == first_numbers
+    assert len(_finished(resumed)) == 5
+    assert resumed.study_name == backtest._optuna_study_prefix("xgboost", FEATURES) + "2026-10-18"
+
+
+def test_new_run_warm_starts_from_previous_best_trials(tuning_data, tmp_path, monkeypatch):
+    storage_url = f"sqlite:///{tmp_path / 'studies.db'}"
+    monkeypatch.setattr(backtest, "OPTUNA_WARM_START_TRIALS", 2)
+    previous = _search(tuning_data, storage_url, 4, "2026-10-18")
+    ranked = sorted(previous.get_trials(states=(optuna.trial.TrialState.COMPLETE,)), key=lambda t: t.value, reverse=True)
+
+    tonight = _search(tuning_data, storage_url, 2, "2026-10-19")
+
+    assert [t.params for t in tonight.trials[:2]] == [t.params for t in ranked[:2]]
+
+
+def test_feature_contract_change_starts_a_separate_study():
+    assert backtest._optuna_study_prefix("xgboost", FEATURES) != backtest._optuna_study_prefix("xgboost", FEATURES[::-1])
+    assert backtest._optuna_study_prefix("xgboost", FEATURES) != backtest._optuna_study_prefix("catboost", FEATURES)
+
+
+def test_objective_prunes_after_first_fold(tuning_data):
+    X, y = tuning_data
+    fold_cache = backtest.WalkForwardFoldCache(X, y, splits=backtest._optuna_tuning_folds(len(X)), memmap=False)
+    reports = []
+
+    class _PruningTrial(optuna.trial.FixedTrial):
+        def report(self, value, step):
+            reports.append(step)
+
+        def should_prune(self):
+            return True
+
+    trial = _PruningTrial({
+        "n_estimators": 80, "max_depth": 3, "learning_rate": 0.1, "subsample": 0.9, "colsample_bytree": 0.9,
+    })
+
+    assert len(fold_cache.folds) == backtest.OPTUNA_CV_FOLDS
+    with pytest.raises(optuna.TrialPruned):
+        backtest._optuna_objective(trial, "xgboost", fold_cache, n_threads=1)
+    assert reports == [0]
+
+
+def test_worker_processes_share_one_study(tuning_data, tmp_path):
+    assert backtest._pool_start_method() in ("forkserver", "spawn")
+    storage_url = f"sqlite:///{tmp_path / 'studies.db'}"
+
+    study = _search(tuning_data, storage_url, 4, "2026-10-18", worker_processes=2)
+
+    assert 4 <= len(_finished(study)) <= 5
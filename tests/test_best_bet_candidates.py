@@ -0,0 +1,251 @@
+from datetime import date, datetime
+
+import pytest
+from flask import Flask
+
+import app as appmod
+from models import BestBetCandidate, Component, Horse, Meeting, Prediction, Race, User, db
+
+
+@pytest.fixture()
+def candidates_app(tmp_path):
+    candidates_app = Flask(__name__)
+    candidates_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'candidates.db'}"
+    db.init_app(candidates_app)
+    with candidates_app.app_context():
+        db.create_all()
+        db.session.add(Component(component_name='Form Price - Short ($2-$5)',
+                                 component_key='form_price_short_2_5', is_active=True))
+        db.session.commit()
+        yield candidates_app
+        db.session.remove()
+
+
+def _add_meeting():
+    user = User(username='punter', email='punter@example.com', password_hash='x')
+    meeting = Meeting(user=user, meeting_name='261019_Randwick', date=date(2026, 10, 19),
+                      uploaded_at=datetime.utcnow())
+    race = Race(meeting=meeting, race_number=1)
+    runners = [
+        # name, jockey, score, win probability, ml_score, notes
+        ('Alpha', 'J One', 90.0, '85.0%', 5.0, ''),
+        ('Beta', 'J Two', 80.0, '10.0%', 90.0, ''),
+        ('Gamma', 'J One', 50.0, '5.0%', 5.0, '+ 10.0 : Form price $4.00'),
+        ('Delta', 'J One', 40.0, '0.0%', None, ''),
+    ]
+    for name, jockey, score, win_probability, ml_score, notes in runners:
+        horse = Horse(race=race, horse_name=name, jockey=jockey)
+        horse.prediction = Prediction(score=score, win_probability=win_probability, ml_score=ml_score, notes=notes)
+    db.session.add(meeting)
+    db.session.commit()
+    return meeting
+
+
+def test_refresh_stores_only_runners_with_a_reason(candidates_app):
+    meeting = _add_meeting()
+
+    assert appmod.refresh_best_bet_candidates([meeting.id]) == 3
+    db.session.commit()
+
+    rows = {c.horse.horse_name: c for c in BestBetCandidate.query.order_by(BestBetCandidate.rank_in_race)}
+    assert list(rows) == ['Alpha', 'Beta', 'Gamma']
+    alpha, beta, gamma = rows['Alpha'], rows['Beta'], rows['Gamma']
+
+    assert (alpha.rank_in_race, alpha.is_top_pick, alpha.score_gap) == (1, True, 10.0)
+    assert alpha.reason_mask == appmod.BEST_BET_REASON_HIGH_CONFIDENCE
+    assert alpha.reasons == ['high_confidence']
+
+    assert (beta.rank_in_race, beta.is_top_pick, beta.score_gap) == (2, False, 10.0)
+    assert beta.reason_mask == (appmod.BEST_BET_REASON_JOCKEY_SOLE_RIDE | appmod.BEST_BET_REASON_ML_TOP_PICK
+                                | appmod.BEST_BET_REASON_VALUE_EDGE)
+    assert (beta.ml_rank, beta.ml_score_gap, beta.ml_fair_probability_pct) == (1, 85.0, 90.0)
+
+    assert gamma.reason_mask == appmod.BEST_BET_REASON_COMPONENTS
+    assert gamma.component_keys == ['form_price_short_2_5']
+    assert gamma.score_gap == 30.0
+    assert db.session.get(Meeting, meeting.id).best_bets_computed_at is not None
+
+
+def test_refresh_replaces_rows_and_backfill_recomputes_invalidated_meetings(candidates_app):
+    meeting = _add_meeting()
+    appmod.refresh_best_bet_candidates([meeting.id])
+    db.session.commit()
+
+    Horse.query.filter_by(horse_name='Alpha').one().is_scratched = True
+    appmod.refresh_best_bet_candidates([meeting.id])
+    db.session.commit()
+    names = [c.horse.horse_name for c in BestBetCandidate.query.order_by(BestBetCandidate.rank_in_race)]
+    assert names == ['Beta', 'Gamma']
+    assert BestBetCandidate.query.filter_by(horse_id=Horse.query.filter_by(horse_name='Beta').one().id).one().is_top_pick
+
+    assert appmod.backfill_best_bet_candidates() == 0
+    assert appmod.invalidate_best_bet_candidates() == 1
+    db.session.commit()
+    assert db.session.get(Meeting, meeting.id).best_bets_computed_at is None
+
+    Component.query.delete()
+    assert appmod.backfill_best_bet_candidates() == 1
+    assert [c.horse.horse_name for c in BestBetCandidate.query] == ['Beta']
+    assert db.session.get(Meeting, meeting.id).best_bets_computed_at is not None
+
+
+def _add_priced_meeting():
+    """Two races with every kind of reason, plus the Ladbrokes payload per race uuid."""
+    user = User(username='pricer', email='pricer@example.com', password_hash='x')
+    meeting = Meeting(user=user, meeting_name='261019_Flemington', date=date(2026, 10, 19),
+                      uploaded_at=datetime.utcnow())
+    races = {
+        1: [
+            # name, jockey, score, win probability, pfai, ml_score, notes, price, scratched
+            ('Alpha', 'J Busy', 90.0, '85.0%', 90.0, 90.0, '', 3.0, False),
+            ('Beta', 'J Busy', 70.0, '10.0%', 70.0, 50.0, '+ 10.0 : Form price $4.00', 4.5, False),
+            ('Gamma', 'J Solo', 50.0, '5.0%', 50.0, 30.0, '', 9.0, False),
+            ('Delta', 'J Busy', 60.0, '5.0%', 80.0, 70.0, '', 2.0, True),
+        ],
+        2: [
+            ('Echo', 'J Busy', 80.0, '40.0%', 60.0, 5.0, '', 1.8, False),
+            ('Foxtrot', 'J Busy', 60.0, '30.0%', 70.0, 95.0, '', 11.0, False),
+            ('Golf', 'J Other', 40.0, '20.0%', 20.0, None, '', 6.0, False),
+            ('Hotel', 'J Other', 30.0, '10.0%', 10.0, 1.0, '', 26.0, False),
+        ],
+    }
+    payloads = {}
+    for race_number, runners in races.items():
+        race = Race(meeting=meeting, race_number=race_number, distance=1200)
+        odds = {}
+        for name, jockey, score, win_probability, pfai, ml_score, notes, price, scratched in runners:
+            horse = Horse(race=race, horse_name=name, jockey=jockey, is_scratched=scratched,
+                          csv_data={'pfaiScore': pfai})
+            horse.prediction = Prediction(score=score, win_probability=win_probability,
+                                          ml_score=ml_score, notes=notes)
+            odds[appmod.normalize_runner_name(name)] = {
+                'name': name, 'win': price, 'is_scratched': scratched, 'is_available': not scratched,
+            }
+        payloads[f'race-{race_number}'] = {'status': 'Open', 'fetched_at': '2026-10-19T00:00:00Z',
+                                           'age_seconds': 0, 'odds': odds}
+    db.session.add(meeting)
+    db.session.commit()
+    return meeting, payloads
+
+
+def _render_best_bets(flask_app, monkeypatch, payloads, query='/best-bets?mode=all&hours=24'):
+    from types import SimpleNamespace
+
+    monkeypatch.setattr(appmod, 'current_user', SimpleNamespace(is_admin=True))
+    monkeypatch.setattr(appmod, 'match_race_info',
+                        lambda track, date_str, race_number: {'uuid': f'race-{race_number}'})
+    monkeypatch.setattr(appmod, 'fetch_race_odds', lambda uuid: payloads[uuid])
+    monkeypatch.setattr(appmod, 'render_template', lambda template, **context: context)
+    with flask_app.test_request_context(query):
+        return appmod.best_bets.__wrapped__()
+
+
+def test_best_bets_route_matches_full_race_ladbrokes_evaluation(candidates_app, monkeypatch):
+    meeting, payloads = _add_priced_meeting()
+    appmod.refresh_best_bet_candidates([meeting.id])
+    db.session.commit()
+    meeting_id = meeting.id
+
+    context = _render_best_bets(candidates_app, monkeypatch, payloads)
+    shown = {bet['horse_id']: bet for bet in context['best_bets']}
+    assert context['meetings_pending'] == 0
+
+    # The previous route: evaluate every runner of every race against its live
+    # market and keep those with any qualifying reason.
+    components_by_key = appmod.build_active_component_lookup(Component.query.filter_by(is_active=True).all())
+    races = Race.query.filter_by(meeting_id=meeting_id).order_by(Race.race_number).all()
+    jockey_rides = {}
+    for race in races:
+        for horse in race.horses:
+            jockey_rides[horse.jockey] = jockey_rides.get(horse.jockey, 0) + 1
+    expected = {}
+    for race in races:
+        full = appmod.evaluate_ladbrokes_best_bet_signals(race, meeting, payloads[f'race-{race.race_number}'])
+        top_ids = appmod.top_signal_horse_ids(race.horses)
+        for horse in race.horses:
+            if not horse.prediction or horse.is_scratched:
+                continue
+            fields = full[horse.id]
+            components = [m['key'] for m in appmod.parse_notes_component_matches(horse.prediction.notes).values()
+                          if m['key'] in components_by_key]
+            if (components or appmod._parse_win_probability_pct(horse.prediction.win_probability) >= 80
+                    or jockey_rides[horse.jockey] == 1 or appmod.signals_all_agree_top(horse.id, top_ids)
+                    or fields['best_bet_signal_count'] or fields['is_value_edge_promoted']):
+                expected[horse.id] = fields
+
+        # The live half is the same whether it sees the whole race or only the candidates.
+        ranks = appmod.best_bet_model_ranks(race)
+        subset = [horse.id for horse in race.horses if horse.id in shown]
+        assert appmod.apply_ladbrokes_signals({hid: ranks[hid] for hid in subset}, race.horses,
+                                              payloads[f'race-{race.race_number}']) == {hid: full[hid] for hid in subset}
+
+    names = {h.id: h.horse_name for h in Horse.query}
+    assert sorted(names[hid] for hid in shown) == sorted(names[hid] for hid in expected) == [
+        'Alpha', 'Beta', 'Foxtrot', 'Gamma',
+    ]
+    for horse_id, fields in expected.items():
+        assert {key: shown[horse_id][key] for key in fields} == fields
+    assert shown[Horse.query.filter_by(horse_name='Alpha').one().id]['best_bet_signal_count'] == 3
+    assert shown[Horse.query.filter_by(horse_name='Foxtrot').one().id]['is_value_edge_promoted']
+
+
+def test_best_bets_route_never_computes_candidates(candidates_app, monkeypatch):
+    meeting, payloads = _add_priced_meeting()
+
+    context = _render_best_bets(candidates_app, monkeypatch, payloads)
+
+    assert context['best_bets'] == []
+    assert context['meetings_pending'] == 1
+    assert BestBetCandidate.query.count() == 0
+    assert db.session.get(Meeting, meeting.id).best_bets_computed_at is None
+
+
+def test_meeting_view_flags_come_from_candidate_reason_mask(candidates_app):
+    meeting, _payloads = _add_priced_meeting()
+    meeting_id = meeting.id
+    appmod.refresh_best_bet_candidates([meeting_id])
+    db.session.commit()
+
+    def view_horse(name):
+        db.session.expunge_all()
+        results = appmod.get_meeting_results(meeting_id)
+        return next(h for race in results['races'] for h in race['horses'] if h['horse_name'] == name)
+
+    alpha = view_horse('Alpha')
+    assert alpha['is_best_bet']
+    assert alpha['best_bet_reasons'] == ['High confidence: 85% win probability',
+                                         'Analyzer, PFAI and ML all agree top selection']
+    assert not view_horse('Beta')['is_best_bet']
+
+    candidate = BestBetCandidate.query.filter_by(horse_id=alpha['horse_id']).one()
+    candidate.reason_mask &= ~appmod.BEST_BET_REASON_SIGNAL_AGREEMENT
+    db.session.commit()
+    assert not view_horse('Alpha')['is_best_bet']
+
+
+def test_ml_scoring_and_component_changes_recompute_candidates(candidates_app, monkeypatch):
+    import ml_predict
+    import ml_shadow_routes
+    from datetime import timedelta
+
+    meeting = _add_meeting()
+    appmod.refresh_best_bet_candidates([meeting.id])
+    db.session.commit()
+    horses = {h.horse_name: h.id for h in Horse.query}
+
+    monkeypatch.setattr(ml_predict, 'predict_meeting', lambda meeting_id, session: (
+        {horses['Alpha']: 95.0, horses['Beta']: 5.0, horses['Gamma']: 1.0}, {},
+    ))
+    assert ml_shadow_routes._score_meeting_ml(db, meeting.id) == {'success': True, 'scored': 3}
+    db.session.commit()
+    assert BestBetCandidate.query.filter_by(horse_id=horses['Alpha']).one().ml_rank == 1
+    assert db.session.get(Meeting, meeting.id).best_bets_computed_at is not None
+
+    old = Meeting(user_id=meeting.user_id, meeting_name='250101_Caulfield',
+                  uploaded_at=datetime.utcnow() - timedelta(hours=appmod.BEST_BET_COMPONENT_RECOMPUTE_HOURS + 1))
+    db.session.add(old)
+    Component.query.delete()
+    assert appmod.recompute_best_bet_candidates_for_components() == 1
+    assert BestBetCandidate.query.filter_by(horse_id=horses['Gamma']).count() == 0
+    assert db.session.get(Meeting, meeting.id).best_bets_computed_at is not None
+    assert appmod.pending_best_bet_meeting_count() == 1
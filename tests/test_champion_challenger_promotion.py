@@ -5,6 +5,8 @@ import sys
 import types
 from datetime import datetime, timedelta
 
+import pytest
+
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 # numpy/pandas are core, always-installed dependencies (unlike sklearn/
@@ -483,6 +485,42 @@ def test_bootstrap_significance_gate_skipped_with_fewer_than_two_folds():
     assert backtest._paired_bootstrap_p_value([], []) is None
 
 
+def test_bootstrap_p_value_does_not_depend_on_chunk_size():
+    rng = backtest.np.random.default_rng(3)
+    challenger = rng.normal(1.0, 10.0, size=40)
+    champion = rng.normal(0.0, 10.0, size=40)
+
+    whole = backtest._paired_bootstrap_p_value(challenger, champion, n_resamples=5001)
+    for chunk_bytes in (1, 16 * 40 * 7 + 3, 1 << 20):
+        assert backtest._paired_bootstrap_p_value(
+            challenger, champion, n_resamples=5001, chunk_bytes=chunk_bytes,
+        ) == whole
+
+
+def test_block_bootstrap_resamples_whole_meetings():
+    challenger = [10.0, -30.0, 12.0, 11.0, -28.0, 9.0]
+    champion = [0.0] * 6
+    # Distinct labels are the ordinary paired bootstrap.
+    assert backtest._paired_bootstrap_p_value(
+        challenger, champion, blocks=list("abcdef"),
+    ) == backtest._paired_bootstrap_p_value(challenger, champion)
+
+    # One block per meeting: the two big losses share a meeting, so most
+    # resamples either include both or neither.
+    meetings = ["2026-01-03", "2026-01-10", "2026-01-03", "2026-01-17", "2026-01-10", "2026-01-17"]
+    blocked = backtest._paired_bootstrap_p_value(challenger, champion, blocks=meetings)
+    assert 0.0 < blocked < 1.0
+    assert backtest._paired_bootstrap_p_value(challenger, champion, blocks=["same"] * 6) is None
+
+
+def test_block_bootstrap_rejects_a_label_count_that_does_not_match():
+    challenger = [10.0, -30.0, 12.0]
+    champion = [0.0] * 3
+    for blocks in (list("ab"), list("abcd")):
+        with pytest.raises(ValueError, match="labels for 3 paired observations"):
+            backtest._paired_bootstrap_p_value(challenger, champion, blocks=blocks)
+
+
 def test_validation_windows_overlap_note_flags_disjoint_windows():
     challenger_window = {'start': '2026-06-01', 'end': '2026-06-30'}
     champion_window = {'start': '2026-01-01', 'end': '2026-01-31'}
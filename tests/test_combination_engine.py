@@ -0,0 +1,81 @@
+import random
+from collections import defaultdict
+from itertools import combinations
+
+import pytest
+
+from combination_engine import FactorBitmaps
+
+MIN_RACES = {2: 10, 3: 10, 4: 15}
+
+
+def _runners(n=400, seed=3, losing_profit=None):
+    rng = random.Random(seed)
+    labels = [f"F{i}" for i in range(14)]
+    factor_sets, won, profit = [], [], []
+    for _ in range(n):
+        factor_sets.append(rng.sample(labels, rng.randint(2, 7)))
+        is_winner = rng.random() < 0.2
+        won.append(is_winner)
+        if is_winner:
+            profit.append(rng.choice([1.5, 3.0, 7.0]) * 10)
+        else:
+            profit.append(-10.0 if losing_profit is None else losing_profit(rng))
+    return factor_sets, won, profit
+
+
+def _reference(factor_sets, won, profit, min_races):
+    stats = defaultdict(lambda: [0, 0, 0.0])
+    for factors, is_winner, runner_profit in zip(factor_sets, won, profit):
+        for size in min_races:
+            for combo in combinations(sorted(factors), size):
+                stats[combo][0] += 1
+                stats[combo][1] += int(is_winner)
+                stats[combo][2] += runner_profit
+    return {
+        combo: (races, wins, round(total, 6))
+        for combo, (races, wins, total) in stats.items()
+        if races >= min_races[len(combo)]
+    }
+
+
+def _found(engine, min_races, **kwargs):
+    return {
+        combo.factors: (combo.races, combo.wins, round(combo.profit, 6))
+        for combo in engine.frequent_combinations(min_races, **kwargs)
+    }
+
+
+def test_frequent_combinations_match_itertools_enumeration():
+    factor_sets, won, profit = _runners()
+    engine = FactorBitmaps(factor_sets, won, profit, min_support=MIN_RACES[2])
+
+    assert _found(engine, MIN_RACES) == _reference(factor_sets, won, profit, MIN_RACES)
+
+
+def test_uneven_losing_profit_and_tiny_chunks_give_identical_counts():
+    factor_sets, won, profit = _runners(n=203, seed=9, losing_profit=lambda rng: -rng.choice([5.0, 10.0]))
+    engine = FactorBitmaps(factor_sets, won, profit, min_support=3)
+    min_races = {2: 3, 3: 5, 4: 8}
+
+    expected = _reference(factor_sets, won, profit, min_races)
+    assert _found(engine, min_races, chunk_bytes=1) == expected
+    assert _found(engine, min_races) == expected
+
+
+def test_factors_below_min_support_get_no_bitmap_and_sizes_respect_tiers():
+    factor_sets = [['A', 'B', 'C']] * 12 + [['A', 'B', 'C', 'Rare']] * 2
+    won = [True] + [False] * 13
+    profit = [40.0] + [-10.0] * 13
+    engine = FactorBitmaps(factor_sets, won, profit, min_support=10)
+
+    assert engine.labels == ['A', 'B', 'C']
+    found = engine.frequent_combinations({2: 10, 3: 15})
+    assert sorted(combo.factors for combo in found) == [('A', 'B'), ('A', 'C'), ('B', 'C')]
+    assert found[0].races == 14 and found[0].wins == 1 and found[0].profit == pytest.approx(-90.0)
+    assert len(engine.frequent_combinations({2: 10, 3: 14})) == 4
+
+
+def test_misaligned_inputs_are_rejected():
+    with pytest.raises(ValueError):
+        FactorBitmaps([['A'], ['B']], [True], [1.0, -1.0])
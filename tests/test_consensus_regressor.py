@@ -0,0 +1,65 @@
+import warnings
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from model_classes import ConsensusRegressor
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame(rng.normal(size=(600, 6)), columns=[f"f{i}" for i in range(6)])
+    y = (X["f0"] - X["f3"] + rng.normal(scale=0.7, size=600) > 0).astype(int)
+    model = ConsensusRegressor([
+        ("rf", RandomForestClassifier(n_estimators=25, random_state=0)),
+        ("lr", LogisticRegression()),
+        ("mlp", Pipeline([("scale", StandardScaler()), ("mlp", MLPClassifier((8,), max_iter=300, random_state=0))])),
+    ], weights=[3.0, 1.0, 1.0]).fit(X, y)
+    return model, X
+
+
+def _dataframe_scores(model, X):
+    """The pre-vectorised path: every member on the float64 DataFrame."""
+    preds = [np.asarray(est.predict_proba(X), dtype=float)[:, 1] for est in model.estimators_]
+    return np.average(np.column_stack(preds), axis=1, weights=model.weights_)
+
+
+def test_float32_plan_matches_dataframe_scores(fitted):
+    model, X = fitted
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        scores = model.predict(X)
+
+    assert scores.dtype == np.float64
+    np.testing.assert_allclose(scores, _dataframe_scores(model, X), rtol=0, atol=1e-6)
+
+
+def test_columns_are_put_back_in_fitted_order(fitted):
+    model, X = fitted
+
+    shuffled = X[list(reversed(X.columns))]
+
+    np.testing.assert_array_equal(model.predict(shuffled), model.predict(X))
+    with pytest.raises(KeyError):
+        model.predict(X.drop(columns=["f2"]))
+
+
+def test_threaded_members_match_serial(fitted):
+    model, X = fitted
+
+    serial = model.member_scores(X, n_jobs=1)
+
+    assert serial.shape == (len(X), 3)
+    np.testing.assert_array_equal(model.member_scores(X, n_jobs=3), serial)
+    np.testing.assert_array_equal(model.predict(X.to_numpy(), n_jobs=2), model.predict(X))
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+from flask import Flask
+
+from import_jobs import ImportJobError, ImportJobQueue, is_transient
+from models import ImportJob, User, db
+from puntingform_service import PuntingFormAPIError
+
+PARAMS = {'pf_meeting_id': '777', 'date': '2026-10-19', 'track_condition': 'good', 'rail_position': 0}
+
+
+@pytest.fixture()
+def jobs_app(tmp_path):
+    jobs_app = Flask(__name__)
+    jobs_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'jobs.db'}"
+    db.init_app(jobs_app)
+    with jobs_app.app_context():
+        db.create_all()
+        user = User(username='importer', email='importer@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        jobs_app.user_id = user.id
+        yield jobs_app
+        db.session.remove()
+
+
+def _queue(jobs_app, run_import, **kwargs):
+    kwargs.setdefault('runner', 'worker')
+    kwargs.setdefault('retry_seconds', 0)
+    return ImportJobQueue(jobs_app, run_import, **kwargs)
+
+
+def _job(job_id):
+    db.session.expire_all()
+    return db.session.get(ImportJob, job_id)
+
+
+def test_transient_classification():
+    assert is_transient(PuntingFormAPIError('busy', status_code=503, transient=True))
+    assert not is_transient(PuntingFormAPIError('bad key', status_code=401))
+    assert is_transient(requests.exceptions.ReadTimeout('slow'))
+    assert not is_transient(ValueError('bad csv'))
+
+
+def test_enqueue_returns_the_active_job_for_the_same_meeting(jobs_app):
+    queue = _queue(jobs_app, lambda *args: 1)
+
+    first, created = queue.enqueue(PARAMS, jobs_app.user_id)
+    again, created_again = queue.enqueue(dict(PARAMS, track_condition='soft'), jobs_app.user_id)
+
+    assert created and not created_again
+    assert again.id == first.id
+    assert ImportJob.query.count() == 1
+
+
+def test_enqueue_race_past_the_active_check_returns_the_first_job(jobs_app, monkeypatch):
+    queue = _queue(jobs_app, lambda *args: 1)
+    first, _ = queue.enqueue(PARAMS, jobs_app.user_id)
+
+    # The second request checked before the first one's insert committed.
+    real_active_job = queue._active_job
+    checks = []
+
+    def active_job_after_the_race(key):
+        checks.append(key)
+        return None if len(checks) == 1 else real_active_job(key)
+
+    monkeypatch.setattr(queue, '_active_job', active_job_after_the_race)
+
+    again, created = queue.enqueue(PARAMS, jobs_app.user_id)
+
+    assert not created
+    assert again.id == first.id
+    assert len(checks) == 2
+    assert ImportJob.query.count() == 1
+
+    _job(first.id).status = 'succeeded'
+    db.session.commit()
+    assert queue.enqueue(PARAMS, jobs_app.user_id)[1]
+
+
+def test_job_reports_progress_and_retries_transient_failures(jobs_app):
+    calls = []
+
+    def run_import(params, user_id, progress, previous_meeting_id):
+        calls.append(previous_meeting_id)
+        progress('fetching fields', 20)
+        if len(calls) == 1:
+            progress('storing race data', 85, meeting_id=41)
+            raise PuntingFormAPIError('PuntingForm API error 503: busy', status_code=503, transient=True)
+        return 42
+
+    queue = _queue(jobs_app, run_import)
+    job, _ = queue.enqueue(PARAMS, jobs_app.user_id)
+
+    assert queue.drain() == 2
+    job = _job(job.id)
+    assert calls == [None, 41]
+    assert (job.status, job.stage, job.progress, job.attempts) == ('succeeded', 'done', 100, 2)
+    assert job.meeting_id == 42
+    assert job.error is None
+
+
+def test_permanent_failures_and_exhausted_retries_fail_the_job(jobs_app):
+    def not_found(params, user_id, progress, previous_meeting_id):
+        raise ImportJobError('Meeting not found')
+
+    def always_busy(params, user_id, progress, previous_meeting_id):
+        raise requests.exceptions.ConnectTimeout('timed out')
+
+    job, _ = _queue(jobs_app, not_found).enqueue(PARAMS, jobs_app.user_id)
+    _queue(jobs_app, not_found).drain()
+    job = _job(job.id)
+    assert (job.status, job.attempts, job.error) == ('failed', 1, 'Meeting not found')
+
+    busy_queue = _queue(jobs_app, always_busy, max_attempts=3)
+    job, _ = busy_queue.enqueue(dict(PARAMS, pf_meeting_id='778'), jobs_app.user_id)
+    assert busy_queue.drain() == 3
+    job = _job(job.id)
+    assert (job.status, job.attempts) == ('failed', 3)
+
+
+def test_concurrency_cap_and_stalled_jobs(jobs_app):
+    queue = _queue(jobs_app, lambda *args: 1, concurrency=1, stale_seconds=60)
+    running, _ = queue.enqueue(PARAMS, jobs_app.user_id)
+    waiting, _ = queue.enqueue(dict(PARAMS, pf_meeting_id='779'), jobs_app.user_id)
+    assert queue.claim_next() == running.id
+
+    # One import already running fills the cap, checked inside the claiming UPDATE.
+    assert queue.claim_next() is None
+    assert not queue._claim(waiting.id, datetime.utcnow())
+    assert _job(waiting.id).status == 'queued'
+
+    # A running job whose heartbeat stopped is requeued and claimed again.
+    stalled = _job(running.id)
+    stalled.heartbeat_at = datetime.utcnow() - timedelta(minutes=5)
+    db.session.commit()
+    assert queue.is_stale(_job(running.id))
+    assert queue.claim_next() == running.id
+    assert _job(running.id).attempts == 2
+    assert _job(waiting.id).status == 'queued'
@@ -0,0 +1,65 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from lazy_imports import lazy_module
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules only the ML/AFL/MMA handlers need. None of them may load on
+# `import app`; see lazy_imports.py and WEB_PROCESS_ROLE in app.py.
+DEFERRED_MODULES = {
+    "pandas", "numpy", "pyreadr", "pyarrow", "sklearn", "catboost", "joblib",
+    "bs4", "alembic", "anthropic", "tweepy", "ml_predict", "backtest", "mma_sync",
+}
+
+
+def _profile_startup():
+    path = ROOT / "scripts" / "profile_startup.py"
+    spec = importlib.util.spec_from_file_location("profile_startup", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def app_import_profile(tmp_path_factory):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path_factory.mktemp('importtime') / 'app.db'}")
+    for key in ("PUNTINGFORM_API_KEY", "RUN_RELEASE_TASKS_ON_STARTUP", "WEB_PROCESS_ROLE", "FLASK_RUN_FROM_CLI"):
+        env.pop(key, None)
+    return _profile_startup().profile_import("app", env=env)
+
+
+def test_app_import_defers_heavy_modules(app_import_profile):
+    _, rows = app_import_profile
+    imported = {name.strip() for _, _, name in rows}
+
+    assert "app" in imported
+    assert not {name.split(".")[0] for name in imported} & DEFERRED_MODULES
+
+
+def test_app_import_stays_within_budget(app_import_profile):
+    wall, rows = app_import_profile
+    budget = float(os.environ.get("STARTUP_BUDGET_SECONDS", 8.0))
+    app_cumulative_us = next(cumulative for cumulative, _, name in rows if name.strip() == "app")
+
+    assert app_cumulative_us / 1e6 < budget
+    assert wall < budget
+
+
+def test_lazy_module_imports_on_first_attribute_access(tmp_path, monkeypatch):
+    (tmp_path / "lazy_probe_mod.py").write_text("VALUE = 41\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_probe_mod", raising=False)
+
+    probe = lazy_module("lazy_probe_mod")
+    assert not probe.loaded
+    assert "lazy_probe_mod" not in sys.modules
+
+    assert probe.VALUE == 41
+    assert probe.loaded
+    probe.VALUE = 42
+    assert sys.modules["lazy_probe_mod"].VALUE == 42
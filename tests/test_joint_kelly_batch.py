@@ -0,0 +1,62 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Declared in requirements-dev.txt; a missing install should fail, not skip.
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from model_classes import solve_joint_kelly, solve_joint_kelly_batch
+
+# Prices on a realistic ladder plus the degenerate ones the scalar solver
+# guards against; probabilities include exact ties in expected value.
+_odds = st.one_of(
+    st.sampled_from([1.0, 1.01, 1.5, 2.0, 2.5, 3.0, 4.0, 6.0, 11.0, 26.0, 101.0, 0.0, -2.0, float("nan")]),
+    st.floats(min_value=1.0, max_value=60.0, allow_nan=False),
+)
+_prob = st.one_of(
+    st.sampled_from([0.0, 0.05, 0.1, 0.25, 0.5, 0.999, 1.0, float("nan")]),
+    st.floats(min_value=0.0, max_value=1.0, allow_nan=False),
+)
+_race = st.lists(st.tuples(_prob, _odds), max_size=14)
+
+
+def _batch(races, **kwargs):
+    offsets = np.cumsum([0] + [len(race) for race in races])
+    probs = [p for race in races for p, _ in race]
+    odds = [o for race in races for _, o in race]
+    stakes, backed = solve_joint_kelly_batch(probs, odds, offsets, **kwargs)
+    return [
+        {j: stakes[offsets[i] + j] for j in range(len(race)) if backed[offsets[i] + j]}
+        for i, race in enumerate(races)
+    ]
+
+
+@settings(max_examples=300, deadline=None)
+@given(
+    races=st.lists(_race, max_size=8),
+    multiplier=st.sampled_from([0.25, 0.5, 1.0]),
+    cap=st.sampled_from([None, 0.05, 0.20, 1.0]),
+)
+def test_batch_solver_matches_the_scalar_solver_exactly(races, multiplier, cap):
+    expected = [
+        solve_joint_kelly([(j, p, o) for j, (p, o) in enumerate(race)], multiplier, cap)
+        for race in races
+    ]
+
+    assert _batch(races, kelly_fraction_multiplier=multiplier, max_total_stake_pct=cap) == expected
+
+
+def test_batch_solver_chunks_the_kkt_check_without_changing_stakes():
+    races = [[(0.5, 3.0), (0.25, 6.0), (0.1, 8.0)], [(0.3, 3.0)], [], [(0.6, 2.5), (0.3, 4.0)]] * 50
+
+    assert _batch(races, max_cells=1) == _batch(races)
+    assert _batch(races)[:4] == [
+        solve_joint_kelly([(j, p, o) for j, (p, o) in enumerate(race)]) for race in races[:4]
+    ]
+
+
+def test_batch_solver_handles_no_runners():
+    stakes, backed = solve_joint_kelly_batch([], [], [0])
+
+    assert stakes.shape == backed.shape == (0,)
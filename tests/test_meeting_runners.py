@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+from flask import Flask
+
+import app as appmod
+from models import Horse, Meeting, MeetingRunner, Race, User, db
+
+TRACK_TO_STATE = appmod._build_track_to_state()
+
+CSV_WITH_FORM = (
+    "track,race number,horse name,form track,finish position,sp,form track condition\n"
+    "Randwick,1,Alpha,Flemington,1,$4.50,Good 4\n"
+    "Randwick,1,Beta,Randwick,scr,SCR,Soft 5\n"
+)
+
+
+def _columns(csv_data=CSV_WITH_FORM):
+    return appmod._resolve_meeting_csv_columns(csv_data)
+
+
+def test_resolve_meeting_csv_columns_detects_jurisdiction_columns_once():
+    columns = _columns()
+    assert columns['current_track_column'] == 'track'
+    assert columns['previous_track_column'] == 'form track'
+    assert columns['finish_column'] == 'finish position'
+    assert columns['price_column'] == 'sp'
+    assert columns['first_track'] == 'Randwick'
+    assert columns['headers'] is None
+    assert 'finish position' in columns['result_headers']
+
+
+def test_resolve_meeting_csv_columns_keeps_headers_only_without_previous_track():
+    columns = _columns("track,race number,horse name\nRandwick,1,Alpha\n")
+    assert columns['previous_track_column'] is None
+    assert columns['headers'] == ['track', 'race number', 'horse name']
+    assert appmod._resolve_meeting_csv_columns('   ') is None
+    assert appmod._resolve_meeting_csv_columns(None) is None
+
+
+def test_meeting_runner_row_parses_states_finish_and_price():
+    columns = _columns()
+    row = appmod._meeting_runner_row(
+        7, 42, ' Alpha ',
+        {'track': 'Randwick', 'form track': 'Flemington (VIC)', 'finish position': '1st', 'sp': '$4.50'},
+        columns, TRACK_TO_STATE,
+    )
+    assert row == {
+        'meeting_id': 7, 'horse_id': 42, 'horse_key': 'ALPHA',
+        'current_track': 'Randwick', 'current_state': 'NSW_ACT',
+        'previous_track': 'Flemington', 'previous_state': 'VIC',
+        'csv_finish_position': 1, 'csv_price': 4.5,
+    }
+
+    scratched = appmod._meeting_runner_row(7, 43, 'Beta', {'track': 'Randwick', 'form track': 'Nowhere', 'finish position': 'scr', 'sp': 'SCR'}, columns, TRACK_TO_STATE)
+    assert scratched['csv_finish_position'] == 0
+    assert scratched['csv_price'] is None
+    assert scratched['previous_state'] is None
+
+    header_row = {'track': 'track', 'form track': 'form track', 'horse name': 'horse name'}
+    assert appmod._meeting_runner_row(7, 44, None, header_row, columns, TRACK_TO_STATE) is None
+
+
+def test_meeting_jurisdiction_state_falls_back_to_meeting_name_track():
+    assert appmod._meeting_jurisdiction_state(_columns(), '260701_Ascot', TRACK_TO_STATE) == 'NSW_ACT'
+    assert appmod._meeting_jurisdiction_state({}, '260701_Ascot', TRACK_TO_STATE) == 'WA'
+    assert appmod._meeting_jurisdiction_state({'first_track': 'Sha Tin'}, '260701_Sha Tin', TRACK_TO_STATE) is None
+
+
+def test_analytics_endpoints_only_read_and_report_unparsed_meetings(tmp_path, monkeypatch):
+    analytics_app = Flask(__name__)
+    analytics_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'analytics.db'}"
+    db.init_app(analytics_app)
+    monkeypatch.setattr(appmod, 'current_user', SimpleNamespace(is_admin=True))
+    with analytics_app.app_context():
+        db.create_all()
+        user = User(username='analyst', email='analyst@example.com', password_hash='x')
+        meeting = Meeting(user=user, meeting_name='260701_Randwick', csv_data=CSV_WITH_FORM)
+        Horse(race=Race(meeting=meeting, race_number=1), horse_name='Alpha',
+              csv_data={'track': 'Randwick', 'form track': 'Flemington', 'finish position': '1', 'sp': '$4.50'})
+        db.session.add(meeting)
+        db.session.commit()
+
+        with analytics_app.test_request_context('/api/data/state-performance'):
+            states = appmod.api_state_performance.__wrapped__().get_json()
+        with analytics_app.test_request_context('/api/data/jurisdiction-strength'):
+            jurisdictions = appmod.api_jurisdiction_strength.__wrapped__().get_json()
+
+        assert states == {'states': [], 'meetings_unparsed': 1}
+        assert jurisdictions['meta']['meetings_unparsed'] == 1
+        assert jurisdictions['meta']['meetings_processed'] == 0
+        db.session.expire_all()
+        assert db.session.get(Meeting, meeting.id).csv_columns is None
+        assert MeetingRunner.query.count() == 0
+
+        assert appmod.backfill_meeting_runners() == 1
+        with analytics_app.test_request_context('/api/data/jurisdiction-strength'):
+            jurisdictions = appmod.api_jurisdiction_strength.__wrapped__().get_json()
+        assert jurisdictions['meta']['meetings_unparsed'] == 0
+        assert jurisdictions['meta']['interstate_rows'] == 1
+        db.session.remove()
@@ -0,0 +1,84 @@
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+import app as appmod
+from models import Component, Horse, Meeting, Prediction, Race, Result, User, db
+
+
+@pytest.fixture()
+def view_app(tmp_path):
+    view_app = Flask(__name__)
+    view_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'meeting_view.db'}"
+    db.init_app(view_app)
+    with view_app.app_context():
+        db.create_all()
+        yield view_app
+        db.session.remove()
+
+
+def _add_meeting(name, n_races, runners_per_race=8):
+    user = User.query.first()
+    if user is None:
+        user = User(username='viewer', email='viewer@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.add(Component(component_name='Jockey - Hot Form (L100 25%+ SR)', component_key='jockey_hot_form_l100_25_sr', is_active=True,
+                                 roi_percentage=12.0, strike_rate=20.0, appearances=50))
+    meeting = Meeting(user=user, meeting_name=name)
+    for race_number in range(n_races, 0, -1):
+        race = Race(meeting=meeting, race_number=race_number)
+        for i in range(runners_per_race):
+            horse = Horse(race=race, horse_name=f"{name} R{race_number} H{i}", jockey=f"J{i}")
+            horse.prediction = Prediction(score=float(i), win_probability=f"{i * 10}%",
+                                          notes='+20.0: Jockey hot form', ml_score=float(i))
+            if i == 0:
+                horse.result = Result(finish_position=1, sp=4.5)
+    db.session.add(meeting)
+    db.session.commit()
+    meeting_id = meeting.id
+    db.session.expunge_all()
+    return meeting_id
+
+
+def _count_queries(fn):
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_execute)
+    try:
+        value = fn()
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_execute)
+    db.session.expunge_all()
+    return value, statements
+
+
+@pytest.mark.parametrize('include_results', [False, True])
+def test_meeting_view_query_count_does_not_grow_with_races_or_runners(view_app, include_results):
+    small = _add_meeting('Small', n_races=2, runners_per_race=4)
+    large = _add_meeting('Large', n_races=10, runners_per_race=12)
+
+    with view_app.test_request_context('/'):
+        _, small_statements = _count_queries(lambda: appmod.get_meeting_results(small, include_results))
+        results, large_statements = _count_queries(lambda: appmod.get_meeting_results(large, include_results))
+
+    # meeting, races, horses, predictions, [results], active components, best-bet candidates
+    assert len(large_statements) == len(small_statements) == (7 if include_results else 6)
+    assert [race['race_number'] for race in results['races']] == list(range(1, 11))
+    assert sum(len(race['horses']) for race in results['races']) == 120
+
+
+def test_meeting_view_includes_results_and_component_matches(view_app):
+    meeting_id = _add_meeting('Flemington', n_races=1, runners_per_race=3)
+
+    with view_app.test_request_context('/'):
+        results = appmod.get_meeting_results(meeting_id, include_results=True)
+
+    horses = {horse['horse_name']: horse for horse in results['races'][0]['horses']}
+    assert horses['Flemington R1 H0']['result_finish'] == 1
+    assert horses['Flemington R1 H0']['result_sp'] == 4.5
+    assert horses['Flemington R1 H1']['result_finish'] is None
+    assert horses['Flemington R1 H2']['matched_component_keys'] == ['jockey_hot_form_l100_25_sr']
@@ -0,0 +1,160 @@
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("psycopg2")
+
+import mma_sync
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((sql, params))
+        self.rowcount = len(params[0]) if sql.lstrip().startswith("DELETE") and params else 0
+
+    def fetchall(self):
+        return [(fid,) for fid in self.conn.stale_ids]
+
+
+class _Conn:
+    def __init__(self, duplicate_ids=(), stale_ids=()):
+        self.statements = []
+        self.batches = []
+        self.duplicate_ids = list(duplicate_ids)
+        self.stale_ids = list(stale_ids)
+        self.next_id = 100
+
+    def cursor(self):
+        return _Cursor(self)
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    db = _Conn()
+
+    def fake_execute_values(cur, sql, rows, template=None, page_size=100, fetch=False):
+        rows = list(rows)
+        db.batches.append((sql, rows, template))
+        if "INSERT INTO mma_fights" in sql:
+            out = []
+            for row in rows:
+                db.next_id += 1
+                out.append((row[1], db.next_id))
+            return out
+        if fetch:
+            return [(fid,) for fid in db.duplicate_ids]
+        return None
+
+    monkeypatch.setattr(mma_sync, "execute_values", fake_execute_values)
+    return db
+
+
+def _fight(uid, f1="A", f2="B", **extra):
+    fight = {"bout_uid": uid, "fighter_1": f1, "fighter_2": f2, "status": ""}
+    fight.update(extra)
+    return fight
+
+
+def _batch(db, marker):
+    return [b for b in db.batches if marker in b[0]]
+
+
+def test_flush_writes_card_in_multi_row_statements(conn):
+    writer = mma_sync.EventCardWriter(conn, "401")
+    uids = [writer.add_fight(_fight(str(i), f"A{i}", f"B{i}"), f"a{i}", f"b{i}") for i in range(5)]
+    for uid in uids[:3]:
+        writer.set_prediction(uid, {"winner": "A", "f1_prob": 0.6, "f2_prob": 0.4, "confidence": "60.0%", "factors": {}})
+    writer.drop_prediction(uids[4])
+
+    result = writer.flush(payload_complete=False)
+
+    assert result["fight_ids"] == [101, 102, 103, 104, 105]
+    assert result["fight_id_by_uid"] == dict(zip(uids, result["fight_ids"]))
+    assert len(_batch(conn, "INSERT INTO mma_fights")) == 1
+    assert len(_batch(conn, "SET fighter_1_id")[0][1]) == 5
+    assert [row[0] for row in _batch(conn, "INSERT INTO mma_predictions")[0][1]] == [101, 102, 103]
+    assert result["predictions_written"] == 3
+    deletes = [params for sql, params in conn.statements if sql.startswith("DELETE FROM mma_predictions")]
+    assert deletes[0] == ([105],)
+    assert not any("mma_fights" in sql and "UPDATE" in sql and "bout_uid <> ALL" in sql for sql, _ in conn.statements)
+
+
+def test_repeated_bout_keeps_last_entry_and_shares_fight_id(conn):
+    writer = mma_sync.EventCardWriter(conn, "401")
+    first = writer.add_fight(_fight("x", weight_class="Lightweight"), "a", "b")
+    writer.set_prediction(first, {"winner": "A", "f1_prob": 0.6, "f2_prob": 0.4, "confidence": "60.0%", "factors": {}})
+    second = writer.add_fight(_fight("x", weight_class="Welterweight"), "a", "b")
+    writer.drop_prediction(second)
+
+    result = writer.flush(payload_complete=False)
+
+    fight_rows = _batch(conn, "INSERT INTO mma_fights")[0][1]
+    assert [row[8] for row in fight_rows] == ["Welterweight"]
+    assert result["fight_ids"] == [101, 101]
+    assert _batch(conn, "INSERT INTO mma_predictions") == []
+
+
+def test_duplicate_matchups_use_last_bout_as_keeper_and_invalidate(conn):
+    conn.duplicate_ids = [7, 7, 8]
+    writer = mma_sync.EventCardWriter(conn, "401")
+    writer.add_fight(_fight("old", "A", "B"), "fa", "fb")
+    writer.add_fight(_fight("new", "B", "A"), "fb", "fa")
+    writer.add_fight(_fight("tba", "C Name", "D Name"))
+
+    result = writer.flush(payload_complete=False)
+
+    sql, rows, _ = _batch(conn, "keep_uid")[0]
+    assert "f.id <> v.keep_id" in sql and "RETURNING f.id" in sql
+    assert rows == [
+        ("401", 102, "espn:401:new", "fa", "fb", None, None),
+        ("401", 103, "espn:401:tba", None, None, "c name", "d name"),
+    ]
+    assert result["duplicates_deactivated"] == 2
+    assert ([7, 8],) in [params for sql, params in conn.statements if sql.startswith("DELETE")]
+
+
+def test_stale_cleanup_uses_every_seen_bout(conn):
+    conn.stale_ids = [55]
+    writer = mma_sync.EventCardWriter(conn, "401")
+    for i in range(4):
+        writer.add_fight(_fight(str(i), f"A{i}", f"B{i}"), f"a{i}", f"b{i}")
+
+    result = writer.flush(payload_complete=True)
+
+    stale_sql, params = next((sql, p) for sql, p in conn.statements if "bout_uid <> ALL" in sql)
+    assert params[0] == "401"
+    assert sorted(params[1]) == sorted(writer.seen_bout_uids)
+    assert result["stale_deactivated"] == 1
+
+
+def test_espn_info_batches_resolved_and_savepoints_name_matches(conn):
+    writer = mma_sync.EventCardWriter(conn, "401")
+    writer.add_fight(_fight(
+        "1", "Known", "Unknown",
+        fighter_1_url="https://www.espn.com/mma/fighter/_/id/11/known",
+        fighter_2_url="https://www.espn.com/mma/fighter/_/id/22/unknown",
+    ), "known-id", None)
+
+    writer.flush(payload_complete=False)
+
+    rows = _batch(conn, "UPDATE mma_fighters")[0][1]
+    assert rows == [("known-id", "https://www.espn.com/mma/fighter/_/id/11/known", mma_sync.espn_headshot_url("https://www.espn.com/mma/fighter/_/id/11/known"))]
+    sqls = [sql.strip().split()[0] for sql, _ in conn.statements]
+    assert sqls[-3:] == ["SAVEPOINT", "WITH", "RELEASE"]
+    assert conn.statements[-2][1][3] == "Unknown"
+
+
+def test_empty_card_writes_nothing(conn):
+    result = mma_sync.EventCardWriter(conn, "401").flush(payload_complete=True)
+
+    assert result["fight_ids"] == []
+    assert conn.batches == [] and conn.statements == []
@@ -0,0 +1,166 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("bs4")
+pytest.importorskip("psycopg2")
+
+import mma_sync
+
+
+class _Resp:
+    def __init__(self, status_code, body=b"", headers=None, url=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+        self.url = url
+        self.encoding = "utf-8"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise mma_sync.requests.HTTPError(f"status {self.status_code}")
+
+
+class _Server:
+    """Serves one body per URL and answers 304 when the ETag still matches."""
+
+    def __init__(self, pages):
+        self.pages = dict(pages)
+        self.sent = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent.append((url, dict(headers or {})))
+        body = self.pages[url]
+        etag = '"%s"' % abs(hash(body))
+        if (headers or {}).get("If-None-Match") == etag:
+            return _Resp(304, url=url)
+        return _Resp(200, body, {"ETag": etag, "content-type": "text/html"}, url=url)
+
+
+@pytest.fixture
+def espn_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(mma_sync, "ESPN_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(mma_sync, "_HOST_SLOTS", {})
+    monkeypatch.setattr(mma_sync, "_SCOREBOARD_JSON", {})
+    return tmp_path
+
+
+PROFILE_URL = "https://www.espn.com/mma/fighter/_/id/1/a"
+PROFILE_HTML = (
+    b"<html><div class='PlayerHeader__Bio'><span>HT/WT</span><span>5' 10\", 155 lbs</span>"
+    b"<span>Reach</span><span>72\"</span><span>Stance</span><span>Orthodox</span></div></html>"
+)
+
+
+def test_espn_get_revalidates_and_serves_cached_body(espn_env, monkeypatch):
+    server = _Server({PROFILE_URL: PROFILE_HTML})
+    monkeypatch.setattr(mma_sync.requests, "get", server.get)
+
+    first = mma_sync.espn_get(PROFILE_URL)
+    second = mma_sync.espn_get(PROFILE_URL)
+
+    assert "If-None-Match" not in server.sent[0][1]
+    assert server.sent[1][1]["If-None-Match"] == first.headers["ETag"]
+    assert second.from_cache is True
+    assert second.status_code == 200
+    assert second.content == PROFILE_HTML
+
+
+def test_responses_without_validators_are_not_cached(espn_env, monkeypatch):
+    monkeypatch.setattr(mma_sync.requests, "get", lambda url, **kw: _Resp(200, b"{}", url=url))
+
+    mma_sync.espn_get(PROFILE_URL)
+
+    assert list(espn_env.iterdir()) == []
+
+
+def test_unchanged_profile_skips_reparsing(espn_env, monkeypatch):
+    server = _Server({PROFILE_URL: PROFILE_HTML})
+    monkeypatch.setattr(mma_sync.requests, "get", server.get)
+    parse_calls = []
+    real_parse = mma_sync._parse_fighter_profile
+
+    def counting_parse(soup):
+        parse_calls.append(soup)
+        return real_parse(soup)
+
+    monkeypatch.setattr(mma_sync, "_parse_fighter_profile", counting_parse)
+
+    first = mma_sync.scrape_fighter_profile(PROFILE_URL)
+    second = mma_sync.scrape_fighter_profile(PROFILE_URL)
+
+    assert first == {"Height": "5' 10\"", "Weight": "155 lbs", "Reach": "72", "Stance": "Orthodox"}
+    assert second == first
+    assert len(parse_calls) == 1
+
+
+def test_unchanged_event_page_reuses_parsed_card(espn_env, monkeypatch):
+    event_url = "https://www.espn.com/mma/fightcenter/_/id/401"
+    server = _Server({event_url: b"<html><body>fightcenter</body></html>"})
+    monkeypatch.setattr(mma_sync.requests, "get", server.get)
+    monkeypatch.setattr(mma_sync, "_fetch_espn_scoreboard_card", lambda event_id: [])
+    monkeypatch.setattr(mma_sync, "_fetch_espn_event_api", lambda event_id: [])
+    parse_calls = []
+
+    def fake_page_parse(event_id, soup, html, meta):
+        parse_calls.append(event_id)
+        return [{"fighter_1": "A", "fighter_2": "B", "fighter_1_url": "", "fighter_2_url": ""}], False
+
+    monkeypatch.setattr(mma_sync, "_parse_espn_event_page", fake_page_parse)
+
+    first = mma_sync.scrape_event_details(event_url, "401")
+    second = mma_sync.scrape_event_details(event_url, "401")
+
+    assert second == first
+    assert [(f["fighter_1"], f["fighter_2"]) for f in second] == [("A", "B")]
+    assert parse_calls == ["401"]
+
+
+def test_fetches_respect_per_host_limit(espn_env, monkeypatch):
+    monkeypatch.setattr(mma_sync, "ESPN_MAX_PER_HOST", 2)
+    lock = threading.Lock()
+    in_flight = {}
+    peak = {}
+
+    def slow_get(url, **kwargs):
+        host = mma_sync.urlparse(url).netloc
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+        time.sleep(0.02)
+        with lock:
+            in_flight[host] -= 1
+        return _Resp(200, b"{}", url=url)
+
+    monkeypatch.setattr(mma_sync.requests, "get", slow_get)
+    urls = [f"https://www.espn.com/p/{i}" for i in range(8)] + [f"https://site.api.espn.com/s/{i}" for i in range(8)]
+
+    responses = mma_sync.fetch_concurrently(mma_sync.espn_get, urls, max_workers=8)
+
+    assert [r.url for r in responses] == urls
+    assert peak == {"www.espn.com": 2, "site.api.espn.com": 2}
+
+
+def test_enrich_fetches_each_profile_once(espn_env, monkeypatch):
+    calls = []
+
+    def fake_profile(url):
+        calls.append(url)
+        return {"Record": url[-1]} if url else {}
+
+    monkeypatch.setattr(mma_sync, "scrape_fighter_profile", fake_profile)
+    fights = [
+        {"fighter_1_url": "https://www.espn.com/a", "fighter_2_url": "https://www.espn.com/b"},
+        {"fighter_1_url": "https://www.espn.com/a", "fighter_2_url": ""},
+    ]
+
+    enriched = mma_sync._enrich_fights_with_profiles(fights)
+
+    assert sorted(calls) == ["", "https://www.espn.com/a", "https://www.espn.com/b"]
+    assert [(f["f1_stats"], f["f2_stats"]) for f in enriched] == [
+        ({"Record": "a"}, {"Record": "b"}),
+        ({"Record": "a"}, {}),
+    ]
+    assert enriched[0]["f1_stats"] is not enriched[1]["f1_stats"]
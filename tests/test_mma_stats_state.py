@@ -0,0 +1,169 @@
+import json
+from datetime import date
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("psycopg2")
+
+import mma_sync
+
+
+def _fight_row(fight_id, day, f1="a", f2="b", winner="A"):
+    return (fight_id, f1, f2, f1.upper(), f2.upper(), winner, "KO", 1, "2:30", day) + (None,) * 12
+
+
+class _StateDB:
+    """Minimal in-memory stand-in for the queries rebuild_stats_from_db issues."""
+
+    def __init__(self, history):
+        self.history = list(history)
+        self.fighters = []
+        self.state = {}
+        self.watermark = None
+        self.history_queries = []
+
+    def cursor(self):
+        return _StateCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def rows_upto(self, upto):
+        return [r for r in self.history if (r[9], r[0]) <= tuple(upto)]
+
+
+class _StateCursor:
+    def __init__(self, db):
+        self.db = db
+        self._one = None
+        self._all = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        db = self.db
+        self._one, self._all = None, []
+        if "FROM mma_stats_watermark" in sql:
+            self._one = db.watermark
+        elif "FROM mma_fighter_stats_state" in sql and sql.lstrip().startswith("SELECT"):
+            self._all = list(db.state.items())
+        elif "INSERT INTO mma_stats_watermark" in sql:
+            db.watermark = tuple(params)
+        elif "DELETE FROM mma_fighter_stats_state" in sql:
+            db.state.clear()
+        elif "FROM mma_fighters ORDER BY id" in sql:
+            self._all = list(db.fighters)
+        elif "fighter_1_id IS NULL OR f.fighter_2_id IS NULL" in sql:
+            self._all = [r[1:5] for r in db.rows_upto(params) if not r[1] or not r[2]]
+        elif "MD5(" in sql:
+            rows = db.rows_upto(params)
+            self._one = (len(rows), str(hash(tuple(r[:10] for r in rows))))
+        elif "FROM mma_fights f" in sql and "SELECT\n            f.id AS fight_id" in sql:
+            db.history_queries.append(params)
+            rows = sorted(db.history, key=lambda r: (r[9], r[0]))
+            if params:
+                rows = [r for r in rows if (r[9], r[0]) > tuple(params)]
+            self._all = rows
+
+    def fetchone(self):
+        return self._one
+
+    def fetchall(self):
+        return self._all
+
+
+@pytest.fixture
+def state_db(monkeypatch):
+    def fake_execute_values(cur, sql, rows, template=None, page_size=None):
+        for fid, state in rows:
+            cur.db.state[fid] = json.loads(state)
+
+    monkeypatch.setattr(mma_sync, "execute_values", fake_execute_values)
+    monkeypatch.setattr(mma_sync, "_log_established_fighter_history_assertion", lambda conn, st: None)
+    return _StateDB([
+        _fight_row(1, date(2023, 1, 10), "a", "b", "A"),
+        _fight_row(2, date(2023, 6, 3), "a", "c", "C"),
+        _fight_row(3, date(2024, 2, 17), "b", "c", "B"),
+    ])
+
+
+def _vectors(tracker, when):
+    return {fid: st.get_stat_vector(when) for fid, st in tracker.items()}
+
+
+def test_stat_state_round_trip_preserves_stat_vector():
+    stats = mma_sync.FighterStats()
+    for i, result in enumerate("WWLDWWL"):
+        stats.update(result, pd.Timestamp(2020 + i, 3, 1), 600 + i, 40, 30, 2, 5, 4, 1, 1, 0, 120,
+                     0.5, 0.6, 0.2, 0.2, 0.7, 0.2, 0.1)
+
+    restored = mma_sync.FighterStats.from_state(json.loads(json.dumps(stats.to_state())))
+
+    when = pd.Timestamp(2026, 1, 1)
+    assert restored.get_stat_vector(when) == stats.get_stat_vector(when)
+    assert list(restored.recent_form) == list("LDWWL")
+
+
+def test_recent_fight_count_matches_linear_scan():
+    stats = mma_sync.FighterStats()
+    for day in ["2021-05-01", "2022-01-01", "2023-01-02", "2023-06-01", "2024-12-31"]:
+        stats.update("W", pd.Timestamp(day), 300, 10, 10, 0, 0, 0, 0, 0, 0, 0,
+                     0.45, 0.7, 0.15, 0.15, 0.8, 0.1, 0.1)
+
+    for when in ["2023-01-01", "2025-01-01", "2026-06-01"]:
+        now = pd.Timestamp(when)
+        cutoff = now - pd.Timedelta(days=730)
+        expected = len([d for d in stats.fight_dates if d > cutoff])
+        assert stats.get_stat_vector(now)["recent_fights_count"] == expected
+
+
+def test_incremental_run_applies_only_fights_after_watermark(state_db):
+    full, _, _ = mma_sync.rebuild_stats_from_db(state_db)
+    assert state_db.watermark[:2] == (date(2024, 2, 17), 3)
+
+    state_db.history.append(_fight_row(4, date(2025, 3, 1), "a", "b", "B"))
+    incremental, _, _ = mma_sync.rebuild_stats_from_db(state_db)
+
+    assert state_db.history_queries[-1] == (date(2024, 2, 17), 3)
+    assert state_db.watermark[:2] == (date(2025, 3, 1), 4)
+
+    replayed, _, _ = mma_sync.rebuild_stats_from_db(state_db, full_rebuild=True)
+    when = pd.Timestamp(2026, 1, 1)
+    assert _vectors(incremental, when) == _vectors(replayed, when)
+
+
+def test_edited_history_falls_back_to_full_rebuild(state_db):
+    mma_sync.rebuild_stats_from_db(state_db)
+
+    state_db.history[0] = _fight_row(1, date(2023, 1, 10), "a", "b", "B")
+    tracker, _, _ = mma_sync.rebuild_stats_from_db(state_db)
+
+    assert state_db.history_queries[-1] is None
+    assert tracker["a"].losses == 2
+    assert tracker["b"].wins == 2
+
+
+def test_re_pointed_name_for_unlinked_fight_falls_back_to_full_rebuild(state_db):
+    unlinked = _fight_row(4, date(2024, 8, 1), "a", "b", "B")
+    state_db.history.append((4, None, "b", "Dan Hooker") + unlinked[4:])
+    state_db.fighters = [("d1", "Dan Hooker", None)]
+    mma_sync.rebuild_stats_from_db(state_db)
+    assert state_db.state["d1"]["losses"] == 1
+
+    mma_sync.rebuild_stats_from_db(state_db)
+    assert state_db.history_queries[-1] == (date(2024, 8, 1), 4)
+
+    state_db.fighters = [("d0", "Dan Hooker", None), ("d1", "Dan Hooker", None)]
+    tracker, _, _ = mma_sync.rebuild_stats_from_db(state_db)
+
+    assert state_db.history_queries[-1] is None
+    assert "d1" not in state_db.state
+    assert state_db.state["d0"]["losses"] == 1
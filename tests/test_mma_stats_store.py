@@ -0,0 +1,163 @@
+import os
+import random
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+pytest.importorskip("psycopg2")
+
+import mma_sync
+
+
+def _random_history(seed=7, fighters=12, events=40):
+    rng = random.Random(seed)
+    ids = [f"f{i}" for i in range(fighters)]
+    history = []
+    day = pd.Timestamp(2018, 1, 6)
+    for _ in range(events):
+        day += pd.Timedelta(days=rng.randint(5, 60))
+        card = rng.sample(ids, 6)
+        for a, b in zip(card[::2], card[1::2]):
+            result = rng.choice("WWLLD")
+            f_time = rng.choice([0, 45, 300, 612, 900])
+            common = dict(
+                td_landed=rng.randint(0, 4), td_att=rng.choice([0, 2, 5]),
+                opp_td_att=rng.choice([0, 3]), opp_td_landed=rng.randint(0, 2),
+                kd=rng.randint(0, 1), sub=rng.randint(0, 2), ctrl=rng.randint(0, 200),
+                sig_acc=rng.random(), head_p=rng.random(), body_p=rng.random(), leg_p=rng.random(),
+                dist_p=rng.random(), clin_p=rng.random(), grou_p=rng.random(),
+            )
+            history.append((a, result, day, f_time, rng.randint(0, 80), rng.randint(0, 80), common))
+            other = {"W": "L", "L": "W"}.get(result, "D")
+            history.append((b, other, day, f_time, rng.randint(0, 80), rng.randint(0, 80), common))
+    return history
+
+
+def _replay_objects(history):
+    tracker = {}
+    for fid, result, day, f_time, landed, absorbed, kw in history:
+        tracker.setdefault(fid, mma_sync.FighterStats()).update(
+            result, day, f_time, landed, absorbed, **kw)
+    return tracker
+
+
+def _replay_store(history):
+    store = mma_sync.FighterStatsStore(capacity=2)
+    by_day = {}
+    for item in history:
+        by_day.setdefault(item[2], []).append(item)
+    for day in sorted(by_day):
+        rows = by_day[day]
+        keys = list(rows[0][6])
+        store.update_batch(
+            [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows], [r[3] for r in rows],
+            [r[4] for r in rows], [r[5] for r in rows],
+            *[[r[6][k] for r in rows] for k in keys],
+        )
+    return store
+
+
+def test_store_replay_matches_fighter_stats_exactly():
+    history = _random_history()
+    objects = _replay_objects(history)
+    store = _replay_store(history)
+
+    when = pd.Timestamp(2024, 5, 1, 13, 30)
+    fids = sorted(objects)
+    batched = store.stat_vectors(fids, when)
+    for fid, vec in zip(fids, batched):
+        assert vec == objects[fid].get_stat_vector(when)
+
+    rebuilt = store.to_trackers()
+    for fid in fids:
+        assert rebuilt[fid].get_stat_vector(when) == objects[fid].get_stat_vector(when)
+        assert rebuilt[fid].to_state() == objects[fid].to_state()
+
+
+def test_store_applies_repeat_appearances_in_input_order():
+    store = mma_sync.FighterStatsStore()
+    obj = mma_sync.FighterStats()
+    day = pd.Timestamp(2024, 1, 1)
+    args = [("W", 300, 10, 5), ("L", 600, 40, 60), ("W", 120, 3, 1)]
+    for result, f_time, landed, absorbed in args:
+        obj.update(result, day, f_time, landed, absorbed, 1, 2, 2, 1, 0, 0, 30, 0.5, 0.6, 0.2, 0.2, 0.7, 0.2, 0.1)
+    n = len(args)
+    store.update_batch(
+        ["x"] * n, [a[0] for a in args], [day] * n, [a[1] for a in args],
+        [a[2] for a in args], [a[3] for a in args], [1] * n, [2] * n, [2] * n, [1] * n,
+        [0] * n, [0] * n, [30] * n, [0.5] * n, [0.6] * n, [0.2] * n, [0.2] * n, [0.7] * n, [0.2] * n, [0.1] * n,
+    )
+    assert store.stat_vectors(["x"], day)[0] == obj.get_stat_vector(day)
+
+
+def _card(tracker, when):
+    fids = sorted(tracker)
+    bios = {fid: {"height": 170 + i, "reach": None if i % 3 else 180.0, "stance": ["Orthodox", "Southpaw", None][i % 3],
+                  "glicko": 1300 + 60 * i, "glicko_rd": 80 + i}
+            for i, fid in enumerate(fids)}
+    pairs = []
+    for i, (a, b) in enumerate(zip(fids[::2], fids[1::2])):
+        pairs.append({
+            "st1": tracker[a].get_stat_vector(when), "st2": tracker[b].get_stat_vector(when),
+            "b1": bios[a], "b2": bios[b],
+            "g1": {"rating": bios[a]["glicko"], "rd": bios[a]["glicko_rd"]},
+            "g2": {"rating": bios[b]["glicko"], "rd": bios[b]["glicko_rd"]},
+            "is_apex": i % 2, "is_altitude": 0,
+            "weight_class": ["Lightweight", "women's flyweight", "", "185 lbs"][i % 4],
+        })
+    return pairs
+
+
+def _row_args(p):
+    return (p["st1"], p["st2"], p["b1"], p["b2"], p["g1"], p["g2"], p["is_apex"], p["is_altitude"])
+
+
+def test_build_feature_matrix_matches_per_fight_rows():
+    when = pd.Timestamp(2024, 5, 1)
+    pairs = _card(_replay_objects(_random_history()), when)
+
+    matrix = mma_sync.build_feature_matrix(pairs)
+
+    assert list(matrix.columns) == mma_sync.MODEL_FEATURE_NAMES
+    for i, p in enumerate(pairs):
+        row = mma_sync.build_feature_row(*_row_args(p), weight_class=p["weight_class"])
+        assert matrix.iloc[i].to_dict() == row
+
+
+def test_predict_fights_matches_predict_fight_with_shipped_model():
+    pytest.importorskip("catboost")
+    if not os.path.exists(mma_sync.MODEL_PATH):
+        pytest.skip("CatBoost model file not present")
+    model = mma_sync.load_model()
+    if model is None:
+        pytest.skip("CatBoost model could not be loaded")
+
+    when = pd.Timestamp(2024, 5, 1)
+    pairs = _card(_replay_objects(_random_history()), when)
+
+    batched = mma_sync.predict_fights(model, pairs)
+    single = [mma_sync.predict_fight(model, *_row_args(p), weight_class=p["weight_class"]) for p in pairs]
+
+    assert [fallback for _, fallback in batched] == [False] * len(pairs)
+    assert np.allclose([p for p, _ in batched], [p for p, _ in single], rtol=0, atol=1e-12)
+
+
+def test_predict_fights_falls_back_without_model():
+    assert mma_sync.predict_fights(None, [{}, {}]) == [(0.5, True), (0.5, True)]
+    assert mma_sync.predict_fights(None, []) == []
+
+
+def test_predict_fights_falls_back_only_for_the_failing_bout():
+    when = pd.Timestamp(2024, 5, 1)
+    pairs = _card(_replay_objects(_random_history()), when)
+    pairs[1] = dict(pairs[1], st1={}, fight={"fighter_1": "A", "fighter_2": "B"})
+
+    class Model:
+        def predict_proba(self, X):
+            return np.column_stack([np.full(len(X), 0.3), np.full(len(X), 0.7)])
+
+    results = mma_sync.predict_fights(Model(), pairs)
+
+    assert results[1] == (0.5, True)
+    assert [r for i, r in enumerate(results) if i != 1] == [(0.7, False)] * (len(pairs) - 1)
@@ -0,0 +1,120 @@
+import io
+import os
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+joblib = pytest.importorskip("joblib")
+
+import model_artifacts
+from model_classes import ConsensusRegressor
+
+
+def _model(n_estimators=30):
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, 4)), columns=["a", "b", "c", "d"])
+    y = (X["a"] + rng.normal(scale=0.5, size=400) > 0).astype(int)
+    model = ConsensusRegressor([
+        ("rf", RandomForestClassifier(n_estimators=n_estimators, random_state=0)),
+        ("lr", LogisticRegression()),
+    ]).fit(X, y)
+    model._form_analyst_model_type = "ensemble"
+    return model, X
+
+
+def test_round_trip_is_compressed_and_described_by_its_manifest():
+    model, X = _model()
+    raw = io.BytesIO()
+    joblib.dump(model, raw)
+
+    data = model_artifacts.dump_model_bytes(model)
+    manifest = model_artifacts.read_manifest(data)
+
+    assert model_artifacts.is_model_artifact(data)
+    assert len(data) < len(raw.getvalue()) / 2
+    assert manifest["codec"] == model_artifacts.default_codec()
+    assert manifest["model_class"] == "model_classes.ConsensusRegressor"
+    assert manifest["model_type"] == "ensemble"
+    assert manifest["feature_names"] == ["a", "b", "c", "d"]
+    assert manifest["raw_bytes"] == len(raw.getvalue())
+    np.testing.assert_array_equal(model_artifacts.load_model_bytes(data).predict(X), model.predict(X))
+
+
+def test_payload_alone_is_a_joblib_file():
+    model, X = _model(n_estimators=5)
+    data = model_artifacts.dump_model_bytes(model, codec="gzip")
+
+    loaded = joblib.load(io.BytesIO(model_artifacts.artifact_payload(data)))
+
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+
+def test_legacy_pickles_still_load():
+    model, X = _model(n_estimators=5)
+    legacy = io.BytesIO()
+    joblib.dump(model, legacy)
+
+    assert model_artifacts.read_manifest(legacy.getvalue()) is None
+    assert model_artifacts.artifact_payload(legacy.getvalue()) == legacy.getvalue()
+    np.testing.assert_array_equal(model_artifacts.load_model_bytes(legacy.getvalue()).predict(X), model.predict(X))
+    assert model_artifacts.load_model_bytes(pickle.dumps({"k": 1})) == {"k": 1}
+
+
+def test_tampered_payload_fails_the_content_hash():
+    data = model_artifacts.pack_model_bytes(pickle.dumps({"k": 1}), codec="zlib")
+    manifest = model_artifacts.read_manifest(data)
+    tampered = data.replace(manifest["sha256"].encode(), b"0" * 64)
+
+    with pytest.raises(model_artifacts.ModelArtifactError, match="hash mismatch"):
+        model_artifacts.load_model_bytes(tampered)
+    with pytest.raises(model_artifacts.ModelArtifactError, match="truncated"):
+        model_artifacts.load_model_bytes(data[:12])
+
+
+def test_mmap_load_reuses_one_uncompressed_copy(tmp_path):
+    model, X = _model(n_estimators=5)
+    data = model_artifacts.dump_model_bytes(model)
+
+    first = model_artifacts.load_model_bytes(data, mmap_mode="r", cache_dir=str(tmp_path))
+    cached = list(tmp_path.iterdir())
+    second = model_artifacts.load_model_bytes(data, mmap_mode="r", cache_dir=str(tmp_path))
+
+    assert [p.name for p in cached] == [f"{model_artifacts.read_manifest(data)['sha256']}.joblib"]
+    assert list(tmp_path.iterdir()) == cached
+    assert isinstance(first.estimators_[1].coef_, np.memmap)
+    np.testing.assert_array_equal(second.predict(X), model.predict(X))
+
+
+def test_mmap_cache_keeps_only_the_most_recently_used_copies(monkeypatch, tmp_path):
+    monkeypatch.setattr(model_artifacts, "MODEL_CACHE_KEEP", 2)
+    artifacts = [model_artifacts.pack_model_bytes(pickle.dumps({"k": i})) for i in range(3)]
+    names = [f"{model_artifacts.read_manifest(data)['sha256']}.joblib" for data in artifacts]
+
+    model_artifacts.load_model_bytes(artifacts[0], mmap_mode="r", cache_dir=str(tmp_path))
+    model_artifacts.load_model_bytes(artifacts[1], mmap_mode="r", cache_dir=str(tmp_path))
+    os.utime(tmp_path / names[1], (1, 1))
+    model_artifacts.load_model_bytes(artifacts[0], mmap_mode="r", cache_dir=str(tmp_path))
+    assert model_artifacts.load_model_bytes(artifacts[2], mmap_mode="r", cache_dir=str(tmp_path)) == {"k": 2}
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([names[0], names[2]])
+    assert model_artifacts.read_manifest(artifacts[0])["codec"] == "zlib"
+
+
+def test_ml_predict_reuses_the_loaded_champion_for_an_unchanged_artifact(monkeypatch, tmp_path):
+    ml_predict = pytest.importorskip("ml_predict")
+    monkeypatch.setitem(ml_predict._loaded_champion, "sha256", None)
+    monkeypatch.setattr(model_artifacts, "MODEL_CACHE_DIR", str(tmp_path))
+    model, _ = _model(n_estimators=5)
+    data = model_artifacts.dump_model_bytes(model)
+
+    first = ml_predict._load_champion_artifact(data)
+
+    assert ml_predict._load_champion_artifact(data) is first
+    assert ml_predict._load_champion_artifact(model_artifacts.dump_model_bytes(model, codec="gzip")) is first
+    assert ml_predict._load_champion_artifact(model_artifacts.dump_model_bytes(_model(3)[0])) is not first
@@ -1,6 +1,8 @@
-from unittest.mock import patch
+import json
+from types import SimpleNamespace
 
-from puntingform_service import PuntingFormService
+import puntingform_service
+from puntingform_service import PuntingFormService, ResponseCache
 
 
 class FakeResponse:
@@ -20,8 +22,9 @@ def test_fetch_v2_strike_rate_rows_accepts_text_plain_with_expected_csv_header(m
         def send(self, request, timeout):
             return FakeResponse()
 
-    with patch('puntingform_service.requests.Session', return_value=FakeSession()):
-        rows, headers = PuntingFormService()._fetch_v2_strike_rate_rows('trainer', jurisdiction=2)
+    service = PuntingFormService()
+    service.session = FakeSession()
+    rows, headers = service._fetch_v2_strike_rate_rows('trainer', jurisdiction=2)
 
     assert headers[:3] == ['StartDate', 'EntityId', 'EntityName']
     assert rows == [
@@ -33,3 +36,88 @@ def test_fetch_v2_strike_rate_rows_accepts_text_plain_with_expected_csv_header(m
             'Last100Wins': '4',
         }
     ]
+
+
+class RecordingSession:
+    """Answers GETs from a {url fragment: payload} table and records each URL."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.urls = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.urls.append(url)
+        for fragment, payload in self.routes.items():
+            if fragment in url:
+                if isinstance(payload, int):
+                    return SimpleNamespace(ok=False, status_code=payload, text='busy')
+                text = payload if isinstance(payload, str) else json.dumps(payload)
+                return SimpleNamespace(ok=True, status_code=200, text=text, json=lambda text=text: json.loads(text))
+        raise AssertionError(f"unexpected request {url}")
+
+
+def _service(monkeypatch, routes):
+    monkeypatch.setenv('PUNTINGFORM_API_KEY', 'test-key')
+    service = PuntingFormService(cache=ResponseCache())
+    service.session = RecordingSession(routes)
+    return service
+
+
+MEETING_LIST = {'Result': [{
+    'MeetingId': 555, 'Track': 'Randwick', 'TrackCode': 'RAND', 'State': 'NSW',
+    'RaceCount': 2, 'RaceNumbers': [1, 2],
+}]}
+
+
+def test_meeting_list_and_scratchings_are_served_from_cache_until_expiry(monkeypatch):
+    service = _service(monkeypatch, {'GetMeetingListExt': MEETING_LIST, 'GetAllScratchings': {'Result': []}})
+
+    first = service.get_meetings_list('2026-10-19')
+    first['meetings'][0]['track_name'] = 'mutated by caller'
+    second = service.get_meetings_list('2026-10-19')
+    service.get_scratchings()
+    service.get_scratchings()
+
+    assert second['meetings'][0]['track_name'] == 'Randwick'
+    assert second['meetings'][0]['race_numbers'] == [1, 2]
+    assert len(service.session.urls) == 2
+
+    monkeypatch.setattr(puntingform_service, 'PF_CACHE_TTL_SCRATCHINGS', 0)
+    service.get_scratchings()
+    assert len(service.session.urls) == 3
+
+
+def test_v1_error_payloads_are_not_cached(monkeypatch):
+    service = _service(monkeypatch, {'GetResults': {'IsError': True, 'Error': 'not resulted'}})
+
+    service.get_results('Randwick', '2026-10-19')
+    service.get_results('Randwick', '2026-10-19')
+
+    assert len(service.session.urls) == 2
+
+
+def test_fetch_meeting_payloads_fetches_every_race_and_collects_failures(monkeypatch):
+    service = _service(monkeypatch, {
+        'GetMeetingListExt': MEETING_LIST,
+        'GetFormText/Randwick/1/': 'race number,horse name\n1,Alpha',
+        'GetFormText/Randwick/2/': 'race number,horse name\n2,Bravo',
+        'MeetingRatings': {'payLoad': [{'runner': 'Alpha'}]},
+        'raceNo=1': {'payLoad': [{'items': []}]},
+        'raceNo=2': 503,
+        'GetAllScratchings': {'Result': []},
+        'Updates/Scratchings': {'payLoad': []},
+    })
+
+    payloads = service.fetch_meeting_payloads('555', 'Randwick', '2026-10-19', race_numbers=[1, 2])
+
+    assert payloads['fields'] == 'race number,horse name\n1,Alpha\nrace number,horse name\n2,Bravo'
+    assert payloads['ratings'] == {'payLoad': [{'runner': 'Alpha'}]}
+    assert payloads['speedmaps'] == {1: {'payLoad': [{'items': []}]}}
+    assert set(payloads['errors']) == {'speedmap:2'}
+    assert payloads['errors']['speedmap:2'].transient is True
+
+    # Everything but the failed speed map is now cached.
+    requests_before = len(service.session.urls)
+    again = service.fetch_meeting_payloads('555', 'Randwick', '2026-10-19', race_numbers=[1, 2])
+    assert again['fields'] == payloads['fields']
+    assert len(service.session.urls) == requests_before + 1
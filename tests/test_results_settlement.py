@@ -0,0 +1,116 @@
+from datetime import date
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from models import Horse, Meeting, Race, Result, User, db
+from puntingform_service import PuntingFormAPIError
+from results_settlement import settle_meetings
+
+
+@pytest.fixture()
+def settle_app(tmp_path):
+    settle_app = Flask(__name__)
+    settle_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'settle.db'}"
+    db.init_app(settle_app)
+    with settle_app.app_context():
+        db.create_all()
+        user = User(username='settler', email='settler@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        settle_app.config['USER_ID'] = user.id
+        yield settle_app
+        db.session.remove()
+
+
+def _add_meeting(track, n_races=2, runners=3, puntingform_id=True):
+    user = User.query.first()
+    meeting = Meeting(user=user, meeting_name=f"261018_{track}", date=date(2026, 10, 18),
+                      puntingform_id=track if puntingform_id else None)
+    for race_number in range(1, n_races + 1):
+        race = Race(meeting=meeting, race_number=race_number)
+        for i in range(1, runners + 1):
+            Horse(race=race, horse_name=f"{track} R{race_number} H{i}")
+    db.session.add(meeting)
+    db.session.commit()
+    return meeting
+
+
+def _results(track, n_races=2, runners=3):
+    return {'RaceDetails': [
+        {'RaceNumber': race_number, 'Runners': [
+            {'Name': f"  {track.upper()} r{race_number}  h{i} ", 'Position': i + 3, 'Price_SP': f"{i}.50"}
+            for i in range(1, runners + 1)
+        ]}
+        for race_number in range(1, n_races + 1)
+    ]}
+
+
+class FakeResults:
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.calls = []
+
+    def get_results(self, track, date_str):
+        self.calls.append((track, date_str))
+        payload = self.payloads[track]
+        if isinstance(payload, Exception):
+            raise payload
+        return payload
+
+
+def test_sweep_settles_every_meeting_with_one_runner_query_each_and_one_upsert(settle_app):
+    meetings = [_add_meeting(track) for track in ('Randwick', 'Flemington', 'Eagle Farm')]
+    already = Horse.query.filter_by(horse_name='Randwick R1 H1').one()
+    db.session.add(Result(horse_id=already.id, finish_position=2, sp=9.0))
+    db.session.commit()
+    service = FakeResults({
+        'Randwick': _results('Randwick'),
+        'Flemington': {'IsError': True},
+        'Eagle Farm': PuntingFormAPIError('PuntingForm API error 503: busy', status_code=503, transient=True),
+    })
+
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_execute)
+    try:
+        details = settle_meetings(db, meetings, settle_app.config['USER_ID'], pf_service=service)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_execute)
+    db.session.commit()
+
+    assert sorted(service.calls) == [('Eagle Farm', '2026-10-18'), ('Flemington', '2026-10-18'),
+                                     ('Randwick', '2026-10-18')]
+    assert [d['status'] for d in details] == ['settled', 'pending', 'error']
+    assert (details[0]['matched'], details[0]['created'], details[0]['updated']) == (6, 5, 1)
+    assert details[1]['reason'] == 'results not available'
+    assert '503' in details[2]['reason']
+
+    assert len([s for s in statements if 'FROM races JOIN horses' in s]) == 1
+    assert len([s for s in statements if s.lstrip().upper().startswith('INSERT INTO RESULTS')]) == 1
+
+    results = {r.horse.horse_name: (r.finish_position, r.sp) for r in Result.query.all()}
+    assert len(results) == 6
+    assert results['Randwick R1 H1'] == (4, 1.5)
+    assert results['Randwick R2 H3'] == (5, 3.5)
+
+
+def test_sweep_is_idempotent_and_skips_non_puntingform_meetings(settle_app):
+    meeting = _add_meeting('Randwick', n_races=1)
+    manual = _add_meeting('Manual', n_races=1, puntingform_id=False)
+    service = FakeResults({'Randwick': _results('Randwick', n_races=1)})
+
+    first = settle_meetings(db, [meeting, manual], None, pf_service=service)
+    db.session.commit()
+    second = settle_meetings(db, [meeting, manual], None, pf_service=service)
+    db.session.commit()
+
+    assert first[1] == {'meeting_id': manual.id, 'meeting_name': '261018_Manual', 'status': 'skipped',
+                        'reason': 'not a PuntingForm meeting'}
+    assert (first[0]['created'], second[0]['created'], second[0]['updated']) == (3, 0, 3)
+    assert Result.query.count() == 3
+    assert Horse.query.filter_by(horse_name='Randwick R1 H2').one().result.finish_position == 5
@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+import app as appmod
+import ml_predict
+from models import Horse, Meeting, Prediction, Race, User, db
+from puntingform_service import PuntingFormAPIError
+
+
+def _horse(name, is_scratched=False, notes='+20.0: Jockey hot form'):
+    prediction = None if notes is None else SimpleNamespace(notes=notes)
+    return SimpleNamespace(horse_name=name, is_scratched=is_scratched, prediction=prediction)
+
+
+def test_changed_race_ids_only_flags_races_whose_field_moved():
+    races = [
+        SimpleNamespace(id=1, horses=[_horse('Alpha'), _horse('Beta')]),
+        SimpleNamespace(id=2, horses=[_horse('Gamma'), _horse('Delta')]),
+        SimpleNamespace(id=3, horses=[_horse('Echo', is_scratched=True, notes='Scratched'), _horse('Foxtrot')]),
+    ]
+
+    assert appmod.scratchings_changed_race_ids(races, {'echo'}) == set()
+    assert appmod.scratchings_changed_race_ids(races, {'echo', 'gamma'}) == {2}
+    assert appmod.scratchings_changed_race_ids(races, set()) == {3}
+
+
+def test_changed_race_ids_repairs_predictions_out_of_step_with_state():
+    races = [
+        SimpleNamespace(id=1, horses=[_horse('Alpha', notes=None)]),
+        SimpleNamespace(id=2, horses=[_horse('Beta', notes='Scratched')]),
+        SimpleNamespace(id=3, horses=[_horse('Gamma', is_scratched=True)]),
+    ]
+
+    assert appmod.scratchings_changed_race_ids(races, {'gamma'}) == {1, 2, 3}
+
+
+@pytest.fixture()
+def meeting_app(tmp_path, monkeypatch):
+    meeting_app = Flask(__name__)
+    meeting_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'scratchings.db'}"
+    db.init_app(meeting_app)
+
+    csv_lines = ['race number,horse name,horse number']
+    with meeting_app.app_context():
+        db.create_all()
+        user = User(username='steward', email='steward@example.com', password_hash='x')
+        meeting = Meeting(user=user, meeting_name='260101_Randwick', puntingform_id='Randwick')
+        for race_number in (1, 2, 3):
+            race = Race(meeting=meeting, race_number=race_number, track_condition='Good 4')
+            for tab in (1, 2, 3):
+                name = f"Runner {race_number}{tab}"
+                horse = Horse(race=race, horse_name=name, csv_data={'horse number': str(tab)})
+                horse.prediction = Prediction(score=50.0 + tab, predicted_odds='$4.00', win_probability='25%',
+                                              notes='+20.0: Jockey hot form', ml_score=float(tab))
+                csv_lines.append(f"{race_number},{name},{tab}")
+        db.session.add(meeting)
+        db.session.commit()
+        meeting_app.config['MEETING_ID'] = meeting.id
+
+    official = {'scratched': set()}
+    calls = {'analyzer_races': [], 'ml_race_ids': [], 'fetched_speedmaps': []}
+
+    def run_analyzer(csv_data, track_condition, is_advanced=False, strike_rate_data=None):
+        rows = appmod.parseCSV(csv_data)
+        calls['analyzer_races'].append(sorted({int(row['race number']) for row in rows}))
+        return [
+            {'horse': row, 'score': 70.0, 'trueOdds': '$3.00', 'winProbability': '33.3%',
+             'performanceComponent': '', 'baseProbability': '', 'notes': 'repriced'}
+            for row in rows
+        ]
+
+    def predict_meeting(meeting_id, db_session, strike_rate_data=None, race_ids=None):
+        calls['ml_race_ids'].append(set(race_ids))
+        horses = db_session.query(Horse).filter(Horse.race_id.in_(race_ids), Horse.is_scratched.is_(False)).all()
+        return {horse.id: 99.0 for horse in horses}, {}
+
+    def v2_scratchings_unavailable():
+        raise PuntingFormAPIError('PuntingForm API error 503: busy', status_code=503, transient=True)
+
+    def fetch_meeting_payloads(meeting_id, track, date, race_numbers=(), include=()):
+        calls['fetched_speedmaps'].append(list(race_numbers))
+        return {'fields': '\n'.join(csv_lines), 'ratings': None, 'scratchings': None,
+                'v2_scratchings': None, 'speedmaps': {}, 'errors': {}}
+
+    pf_service = SimpleNamespace(
+        api_key='x',
+        get_meetings_list=lambda date_str: {'meetings': [{'track_name': 'Randwick', 'meeting_id': 7}]},
+        get_scratchings=lambda: {},
+        get_v2_scratchings=v2_scratchings_unavailable,
+        fetch_meeting_payloads=fetch_meeting_payloads,
+    )
+    monkeypatch.setattr(appmod, 'pf_service', pf_service)
+    monkeypatch.setattr(appmod, '_extract_v1_scratched_set', lambda data, track: (set(official['scratched']), []))
+    monkeypatch.setattr(appmod.requests, 'get', lambda *a, **k: SimpleNamespace(ok=False))
+    monkeypatch.setattr(appmod, 'run_analyzer', run_analyzer)
+    monkeypatch.setattr(ml_predict, 'predict_meeting', predict_meeting)
+
+    meeting_app.official = official
+    meeting_app.calls = calls
+    yield meeting_app
+    with meeting_app.app_context():
+        db.session.remove()
+
+
+def _update(meeting_app, query=''):
+    update = appmod.update_scratchings.__wrapped__
+    with meeting_app.test_request_context(f'/api/meetings/x/update-scratchings{query}', method='POST'):
+        response = update(meeting_app.config['MEETING_ID'])
+        payload = response.get_json()
+        scores = {
+            horse.horse_name: (horse.prediction.score, horse.prediction.ml_score, horse.is_scratched)
+            for horse in Horse.query.all()
+        }
+        db.session.remove()
+    return payload, scores
+
+
+def test_update_scratchings_reprices_only_the_race_that_changed(meeting_app):
+    meeting_app.official['scratched'] = {(2, 2)}
+
+    payload, scores = _update(meeting_app)
+
+    assert payload['success'] is True
+    assert payload['mode'] == 'delta'
+    assert payload['races_recomputed'] == [2]
+    assert payload['predictions_upserted'] == 3
+    assert payload['ml_rescored'] == 2
+    assert meeting_app.calls['analyzer_races'] == [[2]]
+    assert meeting_app.calls['fetched_speedmaps'] == [[2]]
+    assert len(meeting_app.calls['ml_race_ids']) == 1
+    assert scores['Runner 22'] == (0.0, None, True)
+    assert scores['Runner 21'] == (70.0, 99.0, False)
+    assert scores['Runner 11'] == (51.0, 1.0, False)
+    assert scores['Runner 33'] == (53.0, 3.0, False)
+
+    payload, _ = _update(meeting_app)
+    assert payload['races_recomputed'] == []
+    assert meeting_app.calls['analyzer_races'] == [[2]]
+
+
+def test_update_scratchings_full_mode_reprices_every_race(meeting_app):
+    payload, scores = _update(meeting_app, '?full=1')
+
+    assert payload['mode'] == 'full'
+    assert payload['races_recomputed'] == [1, 2, 3]
+    assert meeting_app.calls['analyzer_races'] == [[1, 2, 3]]
+    assert {score for score, _, _ in scores.values()} == {70.0}
@@ -1,7 +1,11 @@
 import math
 from pathlib import Path
 
-from app import calculate_kelly_fraction, replay_staking_strategies, _derive_ml_race_book
+import numpy as np
+import pytest
+
+import app as appmod
+from app import calculate_kelly_fraction, replay_staking_strategies, _derive_ml_race_book, _staking_stake, _staking_strategy_definitions
 
 
 def _sel(sp, prob, won, key):
@@ -143,6 +147,59 @@ def test_bankroll_audit_invariants_and_largest_stakes():
     assert quarter_kelly['number_of_bets'] < len(sels)
 
 
+def test_replay_matches_per_bet_staking_stake_with_limits_and_ruin():
+    sels = [_sel(sp, prob, won, f'2024-01-{day:02d}') for day, (sp, prob, won) in enumerate([
+        (3.0, .5, False), (1.5, .7, True), (1.0, .9, True), (6.0, .3, True),
+        (2.2, .55, False), (2.2, .55, False), (11.0, .2, False), (2.0, .6, True),
+    ], start=1)]
+    for minimum_stake, maximum_stake in [(0.0, None), (5.0, 150.0)]:
+        data = replay_staking_strategies(sels, 1000, minimum_stake, maximum_stake)
+        for strategy in data['strategies']:
+            strat = next(s for s in _staking_strategy_definitions() if s['key'] == strategy['key'])
+            bankroll = 1000.0
+            for point, sel in zip(strategy['curve'], sels):
+                before = max(0.0, bankroll)
+                stake, _ = _staking_stake(strat, before, sel, minimum_stake, maximum_stake)
+                sp = float(sel['sp'])
+                bankroll = max(0.0, before - stake + stake * sp if sel['finish_position'] == 1 else before - stake)
+                assert point['stake'] == round(stake, 2)
+                assert point['bankroll_before'] == round(before, 2)
+                assert point['bankroll'] == round(bankroll, 2)
+            assert strategy['final_bankroll'] == round(bankroll, 2)
+            assert strategy['number_of_bets'] == sum(1 for point in strategy['curve'] if point['stake'] > 0)
+
+
+def test_fixed_stakes_hand_over_to_the_loop_once_the_bankroll_runs_short():
+    sels = [_sel(2.0, .6, won, f'2024-01-{day:02d}') for day, won in enumerate([True, False, False, False, False], start=1)]
+    strategies = [s for s in _staking_strategy_definitions() if s['key'] in ('flat_10', 'win_10')]
+    columns = appmod._staking_replay_columns(sels)
+
+    for stakes, afters in appmod._replay_staking_paths(strategies, columns, 25.0):
+        assert stakes == [10.0, 10.0, 10.0, 10.0, 5.0]
+        assert afters == [35.0, 25.0, 15.0, 5.0, 0.0]
+
+
+def test_round_to_cents_matches_round():
+    values = [0.0, -0.0, 0.125, 0.285, 1.005, 2.675, -2.675, 10.0, 1e-20, -0.001, 123456.785, 2.0 ** 45 + 0.5, 2.0 ** 52 + 1, 1e30, math.inf]
+    values += [i / 1000 for i in range(-3000, 3000)]
+    assert appmod._round_to_cents(np.array(values)) == [round(v, 2) for v in values]
+
+
+def test_invariants_check_strategy_keys_against_independent_constants(monkeypatch):
+    drifted = [dict(strat, pct=0.015) if strat['key'] == 'flat_2_pct' else strat for strat in _staking_strategy_definitions()]
+    monkeypatch.setattr(appmod, '_staking_strategy_definitions', lambda: drifted)
+
+    with pytest.raises(ValueError, match='flat_2_pct: stake is not 2%'):
+        replay_staking_strategies([_sel(2.0, .6, True, '2024-01-01')], 1000)
+
+
+def test_largest_stakes_keep_earliest_bets_on_tied_stakes():
+    sels = [_sel(2.0, .6, i % 2 == 0, f'2024-01-{i:02d}') for i in range(1, 9)]
+    data = replay_staking_strategies(sels, 1000)
+    flat_10 = next(r for r in data['strategies'] if r['key'] == 'flat_10')
+    assert [row['bet'] for row in flat_10['largest_stakes']] == [1, 2, 3, 4, 5]
+
+
 def test_summary_metrics_are_derived_from_actual_replay_stakes():
     sels = [
         _sel(2.0, .6, False, '2024-01-01'),